@@ -0,0 +1,493 @@
+"""命令行入口：不依赖 Qt 运行处理流程
+
+    python -m app.cli transcribe  videos/ --language en --jobs 4
+    python -m app.cli subtitle    subs/*.srt --translate --target-language ENGLISH
+    python -m app.cli synthesize  video.mp4 --subtitle video.ass
+    python -m app.cli full        videos/ --output-dir out/ --jobs 2
+
+输入可以是文件或目录（目录下按支持的格式筛选文件）。进度以 JSON Lines
+输出到 stdout，每行一个事件：
+
+    {"event": "progress", "file": "...", "progress": 40, "message": "..."}
+
+事件类型为 start / progress / done / error，最后一行为 summary。日志写入
+stderr 与日志文件。配置全部来自命令行参数，不读取 GUI 的 settings.json。
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.config import MODEL_PATH, SUBTITLE_STYLE_PATH, setup_environment
+from app.core.entities import (
+    FasterWhisperModelEnum,
+    FullProcessTask,
+    SubtitleConfig,
+    SubtitleLayoutEnum,
+    SubtitleTask,
+    SupportedAudioFormats,
+    SupportedSubtitleFormats,
+    SupportedVideoFormats,
+    SynthesisConfig,
+    SynthesisTask,
+    TranscribeConfig,
+    TranscribeModelEnum,
+    TranscribeOutputFormatEnum,
+    TranscribeTask,
+    TranslatorServiceEnum,
+    VideoQualityEnum,
+)
+from app.core.translate.types import TargetLanguage
+
+COMMAND_TRANSCRIBE = "transcribe"
+COMMAND_SUBTITLE = "subtitle"
+COMMAND_SYNTHESIZE = "synthesize"
+COMMAND_FULL = "full"
+
+TRANSLATORS = {
+    "llm": TranslatorServiceEnum.OPENAI,
+    "google": TranslatorServiceEnum.GOOGLE,
+    "bing": TranslatorServiceEnum.BING,
+    "deeplx": TranslatorServiceEnum.DEEPLX,
+}
+
+MEDIA_SUFFIXES = {f".{fmt.value}" for fmt in SupportedVideoFormats} | {
+    f".{fmt.value}" for fmt in SupportedAudioFormats
+}
+VIDEO_SUFFIXES = {f".{fmt.value}" for fmt in SupportedVideoFormats}
+SUBTITLE_SUFFIXES = {f".{fmt.value}" for fmt in SupportedSubtitleFormats}
+
+# 各命令接受的输入扩展名
+INPUT_SUFFIXES = {
+    COMMAND_TRANSCRIBE: MEDIA_SUFFIXES,
+    COMMAND_SUBTITLE: SUBTITLE_SUFFIXES,
+    COMMAND_SYNTHESIZE: VIDEO_SUFFIXES,
+    COMMAND_FULL: VIDEO_SUFFIXES,
+}
+
+
+@dataclass
+class CliJob:
+    """一个文件的处理任务（可被 pickle 传给工作进程）"""
+
+    command: str
+    file_path: str
+    task: Any
+
+
+# ----------------------------------------------------------------------
+# 参数解析
+# ----------------------------------------------------------------------
+
+
+def _enum_arg(enum_cls):
+    """按成员名（不区分大小写）或取值解析枚举参数"""
+
+    def parse(value: str):
+        for member in enum_cls:
+            if value.upper() == member.name or value == member.value:
+                return member
+        names = ", ".join(m.name.lower() for m in enum_cls)
+        raise argparse.ArgumentTypeError(f"无效取值 {value!r}，可选: {names}")
+
+    parse.__name__ = enum_cls.__name__
+    return parse
+
+
+def _add_transcribe_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("转录")
+    group.add_argument(
+        "--language", default="", help="源语言代码（如 en、zh），留空自动检测"
+    )
+    group.add_argument(
+        "--model",
+        type=_enum_arg(FasterWhisperModelEnum),
+        default=FasterWhisperModelEnum.LARGE_V2,
+        help="FasterWhisper 模型（small / large_v2 / large_v3 / large_v3_turbo）",
+    )
+    group.add_argument(
+        "--whisper-program",
+        default="faster-whisper-xxl",
+        help="FasterWhisper 可执行文件",
+    )
+    group.add_argument("--model-dir", default=str(MODEL_PATH), help="模型目录")
+    group.add_argument("--device", choices=["cuda", "cpu"], default="cuda")
+    group.add_argument(
+        "--format",
+        type=_enum_arg(TranscribeOutputFormatEnum),
+        default=TranscribeOutputFormatEnum.SRT,
+        help="转录输出格式（srt / ass / vtt / txt / all）",
+    )
+    group.add_argument("--prompt", default=None, help="转录提示词")
+
+
+def _add_subtitle_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("字幕处理")
+    group.add_argument("--no-split", action="store_true", help="不重新断句")
+    group.add_argument("--optimize", action="store_true", help="LLM 优化字幕")
+    group.add_argument("--translate", action="store_true", help="翻译字幕")
+    group.add_argument("--translator", choices=sorted(TRANSLATORS), default="llm")
+    group.add_argument(
+        "--target-language",
+        type=_enum_arg(TargetLanguage),
+        default=TargetLanguage.SIMPLIFIED_CHINESE,
+    )
+    group.add_argument("--reflect", action="store_true", help="反思翻译")
+    group.add_argument(
+        "--layout",
+        type=_enum_arg(SubtitleLayoutEnum),
+        default=SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+        help="字幕布局（translate_on_top / original_on_top / only_original / only_translate）",
+    )
+    group.add_argument("--style", default="default", help="字幕样式名称")
+    group.add_argument("--custom-prompt", default=None)
+    group.add_argument("--thread-num", type=int, default=10)
+    group.add_argument("--batch-size", type=int, default=10)
+    group.add_argument("--max-word-count-cjk", type=int, default=25)
+    group.add_argument("--max-word-count-english", type=int, default=20)
+    group.add_argument(
+        "--llm-base-url", default=os.environ.get("OPENAI_BASE_URL", "")
+    )
+    group.add_argument("--llm-api-key", default=os.environ.get("OPENAI_API_KEY", ""))
+    group.add_argument("--llm-model", default=os.environ.get("OPENAI_MODEL", ""))
+    group.add_argument(
+        "--deeplx-endpoint", default=os.environ.get("DEEPLX_ENDPOINT", "")
+    )
+
+
+def _add_synthesis_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("视频合成")
+    group.add_argument(
+        "--soft-subtitle", action="store_true", help="封装软字幕而不是烧录硬字幕"
+    )
+    group.add_argument(
+        "--quality",
+        type=_enum_arg(VideoQualityEnum),
+        default=VideoQualityEnum.MEDIUM,
+        help="合成质量（ultra_high / high / medium / low）",
+    )
+    group.add_argument(
+        "--parallel-burn",
+        action="store_true",
+        help="硬字幕按关键帧分段并行烧录（多核 CPU 上更快）",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="无界面运行字幕处理流程"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    commands = {
+        COMMAND_TRANSCRIBE: ("转录音视频生成字幕", [_add_transcribe_args]),
+        COMMAND_SUBTITLE: ("字幕断句、优化、翻译", [_add_subtitle_args]),
+        COMMAND_SYNTHESIZE: ("将字幕合成到视频", [_add_synthesis_args]),
+        COMMAND_FULL: (
+            "转录 + 字幕处理 + 视频合成",
+            [_add_transcribe_args, _add_subtitle_args, _add_synthesis_args],
+        ),
+    }
+    for name, (help_text, adders) in commands.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("inputs", nargs="+", help="输入文件或目录")
+        sub.add_argument("-o", "--output-dir", default=None, help="输出目录")
+        sub.add_argument(
+            "-j", "--jobs", type=int, default=1, help="并行处理的文件数（进程数）"
+        )
+        sub.add_argument(
+            "-r", "--recursive", action="store_true", help="递归扫描输入目录"
+        )
+        if name == COMMAND_SYNTHESIZE:
+            sub.add_argument(
+                "--subtitle",
+                default=None,
+                help="字幕文件；缺省时使用视频同目录下同名的 .ass/.srt",
+            )
+        for add in adders:
+            add(sub)
+    return parser
+
+
+# ----------------------------------------------------------------------
+# 配置与任务
+# ----------------------------------------------------------------------
+
+
+def build_transcribe_config(
+    args: argparse.Namespace, need_word_time_stamp: bool = False
+) -> TranscribeConfig:
+    return TranscribeConfig(
+        transcribe_model=TranscribeModelEnum.FASTER_WHISPER,
+        transcribe_language=args.language,
+        need_word_time_stamp=need_word_time_stamp,
+        output_format=args.format,
+        faster_whisper_program=args.whisper_program,
+        faster_whisper_model=args.model,
+        faster_whisper_model_dir=args.model_dir,
+        faster_whisper_device=args.device,
+        faster_whisper_prompt=args.prompt,
+    )
+
+
+def build_subtitle_config(args: argparse.Namespace) -> SubtitleConfig:
+    style_path = SUBTITLE_STYLE_PATH / f"{args.style}.txt"
+    return SubtitleConfig(
+        base_url=args.llm_base_url,
+        api_key=args.llm_api_key,
+        llm_model=args.llm_model,
+        deeplx_endpoint=args.deeplx_endpoint,
+        translator_service=TRANSLATORS[args.translator],
+        need_translate=args.translate,
+        need_optimize=args.optimize,
+        need_reflect=args.reflect,
+        thread_num=args.thread_num,
+        batch_size=args.batch_size,
+        subtitle_layout=args.layout,
+        max_word_count_cjk=args.max_word_count_cjk,
+        max_word_count_english=args.max_word_count_english,
+        need_split=not args.no_split,
+        target_language=args.target_language,
+        subtitle_style=(
+            style_path.read_text(encoding="utf-8") if style_path.exists() else ""
+        ),
+        custom_prompt_text=args.custom_prompt,
+    )
+
+
+def build_synthesis_config(args: argparse.Namespace) -> SynthesisConfig:
+    return SynthesisConfig(
+        need_video=True,
+        soft_subtitle=args.soft_subtitle,
+        video_quality=args.quality,
+        parallel_burn=args.parallel_burn,
+    )
+
+
+def collect_inputs(
+    inputs: Iterable[str], suffixes: set, recursive: bool = False
+) -> List[str]:
+    """展开输入中的目录，按扩展名筛选并去重（保持顺序）"""
+    files: Dict[str, None] = {}
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            for child in sorted(path.glob(pattern)):
+                if child.is_file() and child.suffix.lower() in suffixes:
+                    files[str(child.resolve())] = None
+        elif path.is_file():
+            files[str(path.resolve())] = None
+        else:
+            raise FileNotFoundError(f"输入不存在: {item}")
+    return list(files)
+
+
+def _find_sibling_subtitle(video_path: str) -> Optional[str]:
+    for suffix in (".ass", ".srt"):
+        candidate = Path(video_path).with_suffix(suffix)
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+def build_jobs(args: argparse.Namespace) -> List[CliJob]:
+    """为每个输入文件创建任务"""
+    files = collect_inputs(args.inputs, INPUT_SUFFIXES[args.command], args.recursive)
+    if args.command == COMMAND_SYNTHESIZE and args.subtitle and len(files) > 1:
+        raise ValueError("--subtitle 只能用于单个视频")
+
+    jobs = []
+    for file_path in files:
+        stem = Path(file_path).stem
+        out_dir = Path(args.output_dir or Path(file_path).parent)
+        task: Any
+        if args.command == COMMAND_TRANSCRIBE:
+            task = TranscribeTask(
+                file_path=file_path,
+                output_path=str(out_dir / f"{stem}.srt"),
+                transcribe_config=build_transcribe_config(args),
+            )
+        elif args.command == COMMAND_SUBTITLE:
+            config = build_subtitle_config(args)
+            output_name = stem.replace("【原始字幕】", "").replace("【下载字幕】", "")
+            suffix = (
+                f"-{config.translator_service.value}"
+                if config.need_translate and config.translator_service
+                else ""
+            )
+            task = SubtitleTask(
+                subtitle_path=file_path,
+                output_path=str(out_dir / f"【字幕】{output_name}{suffix}.srt"),
+                subtitle_config=config,
+                need_next_task=False,
+            )
+        elif args.command == COMMAND_SYNTHESIZE:
+            subtitle_path = args.subtitle or _find_sibling_subtitle(file_path)
+            if not subtitle_path:
+                raise FileNotFoundError(f"未找到视频对应的字幕文件: {file_path}")
+            task = SynthesisTask(
+                video_path=file_path,
+                subtitle_path=subtitle_path,
+                output_path=str(out_dir / f"{stem}_final.mp4"),
+                synthesis_config=build_synthesis_config(args),
+            )
+        else:
+            task = FullProcessTask(
+                file_path=file_path,
+                output_path=str(out_dir / stem / f"{stem}_final.mp4"),
+                transcribe_config=build_transcribe_config(
+                    args, need_word_time_stamp=not args.no_split
+                ),
+                subtitle_config=build_subtitle_config(args),
+                synthesis_config=build_synthesis_config(args),
+            )
+        jobs.append(CliJob(args.command, file_path, task))
+    return jobs
+
+
+# ----------------------------------------------------------------------
+# 执行
+# ----------------------------------------------------------------------
+
+
+def _job_output(job: CliJob) -> Optional[str]:
+    return getattr(job.task, "output_path", None)
+
+
+def run_job(job: CliJob, events) -> bool:
+    """在当前进程中执行一个任务，事件写入 events（需要 put 方法）"""
+    from app.core import pipeline
+
+    # 进程池中的工作进程不经过 main()
+    setup_environment()
+    last: List[Any] = [None]
+
+    def emit(event: str, **fields) -> None:
+        events.put({"event": event, "file": job.file_path, **fields})
+
+    def progress(value: int, message: str) -> None:
+        # 相同的进度不重复输出
+        if last[0] == (value, message):
+            return
+        last[0] = (value, message)
+        emit("progress", progress=int(value), message=message)
+
+    runners = {
+        COMMAND_TRANSCRIBE: pipeline.run_transcribe,
+        COMMAND_SUBTITLE: pipeline.run_subtitle,
+        COMMAND_SYNTHESIZE: pipeline.run_synthesis,
+        COMMAND_FULL: pipeline.run_full,
+    }
+    emit("start", command=job.command)
+    started = time.perf_counter()
+    try:
+        runners[job.command](job.task, progress)
+    except Exception as e:
+        emit("error", error=str(e))
+        return False
+    emit(
+        "done",
+        output=_job_output(job),
+        elapsed=round(time.perf_counter() - started, 3),
+    )
+    return True
+
+
+class _PrintEvents:
+    """单进程运行时直接输出事件"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def put(self, event: Dict[str, Any]) -> None:
+        write_event(event, self.stream)
+
+
+def write_event(event: Dict[str, Any], stream=None) -> None:
+    stream = stream or sys.stdout
+    stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def run_jobs(jobs: Sequence[CliJob], max_workers: int = 1, stream=None) -> int:
+    """执行所有任务，返回失败数
+
+    max_workers > 1 时使用进程池，每个文件独占一个进程；事件经队列汇总到主
+    进程输出，保证每行完整。
+    """
+    stream = stream or sys.stdout
+    failed = 0
+    if max_workers <= 1 or len(jobs) <= 1:
+        events = _PrintEvents(stream)
+        for job in jobs:
+            failed += not run_job(job, events)
+        return failed
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        queue = manager.Queue()
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(jobs)), mp_context=ctx
+        ) as executor:
+            futures = {executor.submit(run_job, job, queue): job for job in jobs}
+            pending = set(futures)
+            while pending:
+                try:
+                    write_event(queue.get(timeout=0.2), stream)
+                except Empty:
+                    pass
+                for future in [f for f in pending if f.done()]:
+                    pending.discard(future)
+                    try:
+                        failed += not future.result()
+                    except Exception as e:
+                        # 工作进程异常退出
+                        failed += 1
+                        write_event(
+                            {
+                                "event": "error",
+                                "file": futures[future].file_path,
+                                "error": str(e),
+                            },
+                            stream,
+                        )
+        while True:
+            try:
+                write_event(queue.get_nowait(), stream)
+            except Empty:
+                break
+    return failed
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    setup_environment()
+    args = build_parser().parse_args(argv)
+    try:
+        jobs = build_jobs(args)
+    except (FileNotFoundError, ValueError) as e:
+        write_event({"event": "error", "file": None, "error": str(e)})
+        return 2
+
+    failed = run_jobs(jobs, max_workers=args.jobs)
+    write_event(
+        {
+            "event": "summary",
+            "total": len(jobs),
+            "succeeded": len(jobs) - failed,
+            "failed": failed,
+        }
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
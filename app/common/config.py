@@ -221,6 +221,12 @@ class Config(QConfig):
     whisper_api_key = ConfigItem("WhisperAPI", "WhisperApiKey", "")
     whisper_api_model = OptionsConfigItem("WhisperAPI", "WhisperApiModel", "")
     whisper_api_prompt = ConfigItem("WhisperAPI", "WhisperApiPrompt", "")
+    whisper_api_upload_profile = OptionsConfigItem(
+        "WhisperAPI",
+        "UploadProfile",
+        "opus",
+        OptionsValidator(["opus", "mp3", "original"]),
+    )
 
     # ------------------- 字幕配置 -------------------
     need_optimize = ConfigItem("Subtitle", "NeedOptimize", False, BoolValidator())
@@ -244,6 +250,7 @@ class Config(QConfig):
     # ------------------- 字幕合成配置 -------------------
     soft_subtitle = ConfigItem("Video", "SoftSubtitle", False, BoolValidator())
     need_video = ConfigItem("Video", "NeedVideo", True, BoolValidator())
+    parallel_burn = ConfigItem("Video", "ParallelBurn", False, BoolValidator())
     video_quality = OptionsConfigItem(
         "Video",
         "VideoQuality",
@@ -0,0 +1,42 @@
+from typing import Callable, Optional
+
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+
+class LazyInterface(QWidget):
+    """子界面占位，首次显示时才创建真正的界面
+
+    导航栏注册的是占位控件，启动时不导入、不构造不可见的界面。
+
+    Args:
+        object_name: 路由键，与真实界面的 objectName 一致
+        factory: 接收父控件并返回真实界面的函数（在其中导入界面模块）
+    """
+
+    def __init__(
+        self,
+        object_name: str,
+        factory: Callable[[QWidget], QWidget],
+        parent: Optional[QWidget] = None,
+    ):
+        super().__init__(parent)
+        self.setObjectName(object_name)
+        self._factory = factory
+        self._widget: Optional[QWidget] = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def loaded(self) -> bool:
+        return self._widget is not None
+
+    def widget(self) -> QWidget:
+        """返回真实界面，尚未创建时立即创建"""
+        if self._widget is None:
+            self._widget = self._factory(self)
+            self._layout.addWidget(self._widget)
+        return self._widget
+
+    def showEvent(self, e):
+        self.widget()
+        super().showEvent(e)
@@ -16,7 +16,6 @@ from qfluentwidgets import FluentIcon as FIF
 from ..common.config import cfg
 from ..core.constant import INFOBAR_DURATION_ERROR, INFOBAR_DURATION_SUCCESS
 from ..core.entities import TranscribeLanguageEnum
-from ..core.llm import check_whisper_connection
 from .EditComboBoxSettingCard import EditComboBoxSettingCard
 from .LineEditSettingCard import LineEditSettingCard
 
@@ -91,6 +90,16 @@ class WhisperAPISettingWidget(QWidget):
             self.setting_group,
         )
 
+        # 上传音频编码
+        self.upload_profile_card = ComboBoxSettingCard(
+            cfg.whisper_api_upload_profile,
+            FIF.SPEED_HIGH,
+            self.tr("上传编码"),
+            self.tr("上传前转码为 16kHz 单声道，opus 体积最小"),
+            ["opus", "mp3", "original"],
+            self.setting_group,
+        )
+
         # 添加测试连接按钮
         self.check_connection_card = PushSettingCard(
             self.tr("测试连接"),
@@ -106,6 +115,7 @@ class WhisperAPISettingWidget(QWidget):
         self.model_card.comboBox.setMinimumWidth(200)
         self.language_card.comboBox.setMinimumWidth(200)
         self.prompt_card.lineEdit.setMinimumWidth(200)
+        self.upload_profile_card.comboBox.setMinimumWidth(200)
 
         # 使用 addSettingCard 添加所有卡片到组
         self.setting_group.addSettingCard(self.base_url_card)
@@ -113,6 +123,7 @@ class WhisperAPISettingWidget(QWidget):
         self.setting_group.addSettingCard(self.model_card)
         self.setting_group.addSettingCard(self.language_card)
         self.setting_group.addSettingCard(self.prompt_card)
+        self.setting_group.addSettingCard(self.upload_profile_card)
         self.setting_group.addSettingCard(self.check_connection_card)
 
         # 连接测试按钮信号
@@ -209,6 +220,8 @@ class WhisperConnectionThread(QThread):
     def run(self):
         """执行连接测试"""
         try:
+            from ..core.llm import check_whisper_connection
+
             success, result = check_whisper_connection(
                 self.base_url, self.api_key, self.model
             )
@@ -46,13 +46,26 @@ FASER_WHISPER_PATH = BIN_PATH / "Faster-Whisper-XXL"
 LOG_LEVEL = logging.INFO
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-# 环境变量添加 bin 路径，添加到PATH开头以优先使用
-os.environ["PATH"] = str(FASER_WHISPER_PATH) + os.pathsep + os.environ["PATH"]
-os.environ["PATH"] = str(BIN_PATH) + os.pathsep + os.environ["PATH"]
+_environment_ready = False
 
-# 添加 VLC 路径
-os.environ["PYTHON_VLC_MODULE_PATH"] = str(BIN_PATH / "vlc")
 
-# 创建路径
-for p in [CACHE_PATH, LOG_PATH, WORK_PATH, MODEL_PATH]:
-    p.mkdir(parents=True, exist_ok=True)
+def setup_environment() -> None:
+    """准备运行环境（可重复调用，只执行一次）
+
+    导入本模块不产生副作用；程序入口（main.py、app.cli）在启动时调用。
+    """
+    global _environment_ready
+    if _environment_ready:
+        return
+    _environment_ready = True
+
+    # 环境变量添加 bin 路径，添加到PATH开头以优先使用
+    os.environ["PATH"] = str(FASER_WHISPER_PATH) + os.pathsep + os.environ["PATH"]
+    os.environ["PATH"] = str(BIN_PATH) + os.pathsep + os.environ["PATH"]
+
+    # 添加 VLC 路径
+    os.environ["PYTHON_VLC_MODULE_PATH"] = str(BIN_PATH / "vlc")
+
+    # 创建路径
+    for p in [CACHE_PATH, LOG_PATH, WORK_PATH, MODEL_PATH]:
+        p.mkdir(parents=True, exist_ok=True)
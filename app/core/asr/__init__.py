@@ -1,11 +1,31 @@
-from .bcut import BcutASR
-from .chunked_asr import ChunkedASR
-from .faster_whisper import FasterWhisperASR
-from .jianying import JianYingASR
+"""语音识别模块
+
+各识别引擎依赖较重（openai、GPUtil、pydub 等），按需在首次访问时导入。
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
 from .status import ASRStatus
-from .transcribe import transcribe
-from .whisper_api import WhisperAPI
-from .whisper_cpp import WhisperCppASR
+
+if TYPE_CHECKING:
+    from .bcut import BcutASR
+    from .chunked_asr import ChunkedASR
+    from .faster_whisper import FasterWhisperASR
+    from .jianying import JianYingASR
+    from .transcribe import transcribe
+    from .whisper_api import WhisperAPI
+    from .whisper_cpp import WhisperCppASR
+
+_LAZY_EXPORTS = {
+    "BcutASR": ".bcut",
+    "ChunkedASR": ".chunked_asr",
+    "FasterWhisperASR": ".faster_whisper",
+    "JianYingASR": ".jianying",
+    "WhisperAPI": ".whisper_api",
+    "WhisperCppASR": ".whisper_cpp",
+    "transcribe": ".transcribe",
+}
 
 __all__ = [
     "BcutASR",
@@ -17,3 +37,12 @@ __all__ = [
     "transcribe",
     "ASRStatus",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
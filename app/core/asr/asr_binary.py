@@ -0,0 +1,212 @@
+"""ASRData 二进制容器（.asrd）
+
+流程各阶段之间以及缓存使用的内部格式，SRT/ASS 等只用于导出。与文本字幕
+相比不丢失信息（译文、多行文本、词级/句级标记原样保存），读写也不需要
+逐行解析。
+
+文件布局（小端，版本 1）::
+
+    header   48 字节，见 _HEADER
+    starts   int64[count]       开始时间（毫秒）
+    ends     int64[count]       结束时间（毫秒）
+    text_off uint64[count + 1]  原文在解码后文本中的字符偏移
+    trans_off uint64[count + 1] 译文在解码后文本中的字符偏移
+    text     UTF-8 原文拼接
+    trans    UTF-8 译文拼接
+
+定长头部与 8 字节对齐的数组在前，加载时通过 mmap 直接按数组读取，文本
+各自整体解码一次后按偏移切片。
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from ..utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from .asr_data import ASRData
+
+logger = setup_logger("asr_binary")
+
+SUFFIX = ".asrd"
+MAGIC = b"VCAS"
+VERSION = 1
+
+FLAG_WORD_LEVEL = 1
+
+# magic, version, flags, count, reserved, text_bytes, trans_bytes,
+# source_size, source_mtime_ns
+_HEADER = struct.Struct("<4sHHIIQQqq")
+
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class ASRBinaryError(ValueError):
+    """文件不是有效的 .asrd 容器或版本不受支持"""
+
+
+def _typed(values, typecode: str) -> bytes:
+    data = array(typecode, values)
+    if not _NATIVE_LITTLE_ENDIAN:
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_array(buffer: memoryview, offset: int, typecode: str, count: int):
+    size = array(typecode).itemsize * count
+    chunk = buffer[offset : offset + size]
+    if len(chunk) != size:
+        raise ASRBinaryError("数据长度不足")
+    if _NATIVE_LITTLE_ENDIAN:
+        with chunk.cast(typecode) as view:
+            return view.tolist(), offset + size
+    data = array(typecode, chunk.tobytes())
+    data.byteswap()
+    return data.tolist(), offset + size
+
+
+def _source_stamp(source_path: Optional[str]) -> Tuple[int, int]:
+    if not source_path:
+        return -1, -1
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def dump(asr_data: "ASRData", path: str, source_path: Optional[str] = None) -> None:
+    """写入 .asrd 文件
+
+    Args:
+        asr_data: 字幕数据
+        path: 输出路径
+        source_path: 对应的源字幕文件；记录其大小与修改时间，源文件变化后
+            load_sidecar 不再使用该文件
+    """
+    segments = asr_data.segments
+    texts = [seg.text for seg in segments]
+    translations = [seg.translated_text or "" for seg in segments]
+    text_offsets, trans_offsets = [0], [0]
+    for text, translation in zip(texts, translations):
+        text_offsets.append(text_offsets[-1] + len(text))
+        trans_offsets.append(trans_offsets[-1] + len(translation))
+    text_blob = "".join(texts).encode("utf-8")
+    trans_blob = "".join(translations).encode("utf-8")
+
+    flags = FLAG_WORD_LEVEL if asr_data.is_word_timestamp() else 0
+    source_size, source_mtime_ns = _source_stamp(source_path)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        len(segments),
+        0,
+        len(text_blob),
+        len(trans_blob),
+        source_size,
+        source_mtime_ns,
+    )
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(_typed((int(seg.start_time) for seg in segments), "q"))
+        f.write(_typed((int(seg.end_time) for seg in segments), "q"))
+        f.write(_typed(text_offsets, "Q"))
+        f.write(_typed(trans_offsets, "Q"))
+        f.write(text_blob)
+        f.write(trans_blob)
+    os.replace(tmp_path, path)
+
+
+def _parse(buffer: memoryview) -> Tuple["ASRData", Tuple[int, int]]:
+    from .asr_data import ASRData, ASRDataSeg
+
+    if len(buffer) < _HEADER.size:
+        raise ASRBinaryError("文件过短")
+    (
+        magic,
+        version,
+        flags,
+        count,
+        _reserved,
+        text_bytes,
+        trans_bytes,
+        source_size,
+        source_mtime_ns,
+    ) = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ASRBinaryError("不是 .asrd 文件")
+    if version != VERSION:
+        raise ASRBinaryError(f"不支持的 .asrd 版本: {version}")
+
+    offset = _HEADER.size
+    starts, offset = _read_array(buffer, offset, "q", count)
+    ends, offset = _read_array(buffer, offset, "q", count)
+    text_offsets, offset = _read_array(buffer, offset, "Q", count + 1)
+    trans_offsets, offset = _read_array(buffer, offset, "Q", count + 1)
+    text = str(buffer[offset : offset + text_bytes], "utf-8")
+    offset += text_bytes
+    translation = str(buffer[offset : offset + trans_bytes], "utf-8")
+
+    segments = [
+        ASRDataSeg(
+            text[text_offsets[i] : text_offsets[i + 1]],
+            starts[i],
+            ends[i],
+            translation[trans_offsets[i] : trans_offsets[i + 1]],
+        )
+        for i in range(count)
+    ]
+    asr_data = ASRData(segments)
+    asr_data.set_word_level_hint(bool(flags & FLAG_WORD_LEVEL))
+    return asr_data, (source_size, source_mtime_ns)
+
+
+def _load(path: str) -> Tuple["ASRData", Tuple[int, int]]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ASRBinaryError("文件为空")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as buffer:
+                return _parse(buffer)
+
+
+def load(path: str) -> "ASRData":
+    """读取 .asrd 文件"""
+    return _load(path)[0]
+
+
+def sidecar_path(source_path: str) -> str:
+    """源字幕文件对应的 .asrd 路径（如 a.srt -> a.srt.asrd）"""
+    return f"{source_path}{SUFFIX}"
+
+
+def save_sidecar(asr_data: "ASRData", source_path: str) -> str:
+    """在源字幕文件旁写入 .asrd，返回其路径；源文件需已写入"""
+    path = sidecar_path(source_path)
+    dump(asr_data, path, source_path=source_path)
+    return path
+
+
+def load_sidecar(source_path: str) -> Optional["ASRData"]:
+    """读取源字幕文件旁的 .asrd
+
+    源文件的大小或修改时间与写入时记录的不一致（例如被编辑过）、文件
+    不存在或已损坏时返回 None，调用方应改为解析源文件。
+    """
+    path = sidecar_path(source_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        asr_data, stamp = _load(path)
+        if stamp != _source_stamp(source_path):
+            return None
+        return asr_data
+    except (OSError, ValueError) as e:
+        logger.warning("读取 %s 失败，改为解析源文件: %s", path, e)
+        return None
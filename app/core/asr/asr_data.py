@@ -1,15 +1,28 @@
+import io
 import json
 import math
 import os
 import platform
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple
-
-from langdetect import LangDetectException, detect
+from typing import Callable, List, Optional, TextIO, Tuple
 
 from ..entities import SubtitleLayoutEnum
 from ..utils.text_utils import is_mainly_cjk
+from . import asr_binary
+from .interval_index import IntervalIndex
+from .subtitle_writer import (  # noqa: F401  兼容原有导入路径
+    DEFAULT_ASS_STYLE,
+    build_ass_header,
+    format_ass_dialogues,
+    ms_to_ass_time,
+    ms_to_srt_time,
+    write_ass,
+    write_json,
+    write_srt,
+    write_txt,
+    write_vtt,
+)
 
 # 多语言分词模式(支持词级和字符级语言)
 _WORD_SPLIT_PATTERN = (
@@ -30,6 +43,9 @@ _WORD_SPLIT_PATTERN = (
     r"|[\u1000-\u109f]"  # 缅甸文
 )
 
+# 写字幕文件时的缓冲区大小，词级字幕可达数万条
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 def handle_long_path(path: str) -> str:
     r"""Handle Windows long path limitation by adding \\?\ prefix.
@@ -80,19 +96,12 @@ class ASRDataSeg:
     @staticmethod
     def _ms_to_srt_time(ms: int) -> str:
         """Convert milliseconds to SRT time format (HH:MM:SS,mmm)"""
-        total_seconds, milliseconds = divmod(ms, 1000)
-        minutes, seconds = divmod(total_seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{int(milliseconds):03}"
+        return ms_to_srt_time(ms)
 
     @staticmethod
     def _ms_to_ass_ts(ms: int) -> str:
         """Convert milliseconds to ASS timestamp format (H:MM:SS.cc)"""
-        total_seconds, milliseconds = divmod(ms, 1000)
-        minutes, seconds = divmod(total_seconds, 60)
-        hours, minutes = divmod(minutes, 60)
-        centiseconds = int(milliseconds / 10)
-        return f"{int(hours):01}:{int(minutes):02}:{int(seconds):02}.{centiseconds:02}"
+        return ms_to_ass_time(ms)
 
     @property
     def transcript(self) -> str:
@@ -107,8 +116,52 @@ class ASRData:
     def __init__(self, segments: List[ASRDataSeg]):
         filtered_segments = [seg for seg in segments if seg.text and seg.text.strip()]
         filtered_segments.sort(key=lambda x: x.start_time)
+        self._index: Optional[IntervalIndex] = None
+        self._word_level: Optional[bool] = None
         self.segments = filtered_segments
 
+    @property
+    def segments(self) -> List[ASRDataSeg]:
+        return self._segments
+
+    @segments.setter
+    def segments(self, segments: List[ASRDataSeg]) -> None:
+        self._segments = segments
+        self._index = None
+        self._word_level = None
+
+    def time_index(self) -> IntervalIndex:
+        """Time interval index over segments, built lazily.
+
+        Methods that change segments invalidate it; code that mutates
+        segments in place from outside must call invalidate_index().
+        """
+        if self._index is None or len(self._index) != len(self._segments):
+            self._index = IntervalIndex.from_segments(self._segments)
+        return self._index
+
+    def invalidate_index(self) -> None:
+        self._index = None
+        self._word_level = None
+
+    def set_word_level_hint(self, word_level: bool) -> None:
+        """记录已知的词级/句级标记（如从 .asrd 读取），跳过 is_word_timestamp 的检测
+
+        片段变化后标记随索引一起失效。
+        """
+        self._word_level = word_level
+
+    def copy(self) -> "ASRData":
+        """Return a copy whose segments can be modified independently."""
+        data = ASRData(
+            [
+                ASRDataSeg(seg.text, seg.start_time, seg.end_time, seg.translated_text)
+                for seg in self.segments
+            ]
+        )
+        data._word_level = self._word_level
+        return data
+
     def __iter__(self):
         return iter(self.segments)
 
@@ -149,6 +202,8 @@ class ASRData:
         Returns:
             True 如果80%+的片段符合词级模式
         """
+        if self._word_level is not None:
+            return self._word_level
         if not self.segments:
             return False
 
@@ -225,25 +280,50 @@ class ASRData:
     ) -> None:
         """Save ASRData to file in specified format.
 
+        内容逐条写入文件，不在内存中拼接整份字幕。
+
         Args:
             save_path: Output file path
             ass_style: ASS style string (optional, uses default if None)
             layout: Subtitle layout mode
         """
         save_path = handle_long_path(save_path)
+        suffix = Path(save_path).suffix.lower()
+        writers = {
+            ".srt": lambda f: write_srt(f, self.segments, layout),
+            ".vtt": lambda f: write_vtt(f, self.segments, layout),
+            ".txt": lambda f: write_txt(f, self.segments, layout),
+            ".json": lambda f: write_json(f, self.segments),
+            ".ass": lambda f: write_ass(f, self.segments, ass_style, layout),
+        }
+        if suffix == asr_binary.SUFFIX:
+            asr_binary.dump(self, save_path)
+            return
+        if suffix not in writers:
+            raise ValueError(f"Unsupported file extension: {save_path}")
+
         Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+        self._write_file(save_path, writers[suffix])
 
-        if save_path.endswith(".srt"):
-            self.to_srt(save_path=save_path, layout=layout)
-        elif save_path.endswith(".txt"):
-            self.to_txt(save_path=save_path, layout=layout)
-        elif save_path.endswith(".json"):
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(self.to_json(), f, ensure_ascii=False)
-        elif save_path.endswith(".ass"):
-            self.to_ass(save_path=save_path, style_str=ass_style, layout=layout)
-        else:
-            raise ValueError(f"Unsupported file extension: {save_path}")
+    @staticmethod
+    def _write_file(save_path: str, writer: Callable[[TextIO], None]) -> None:
+        with open(
+            handle_long_path(save_path),
+            "w",
+            encoding="utf-8",
+            buffering=_WRITE_BUFFER_SIZE,
+        ) as f:
+            writer(f)
+
+    @classmethod
+    def _render(cls, writer: Callable[[TextIO], None], save_path=None) -> str:
+        """生成字符串内容，指定 save_path 时同时写入文件"""
+        buffer = io.StringIO()
+        writer(buffer)
+        content = buffer.getvalue()
+        if save_path:
+            cls._write_file(save_path, lambda f: f.write(content))
+        return content
 
     def to_txt(
         self,
@@ -251,26 +331,7 @@ class ASRData:
         layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
     ) -> str:
         """Convert to plain text subtitle format (without timestamps)"""
-        result = []
-        for seg in self.segments:
-            original = seg.text
-            translated = seg.translated_text
-
-            if layout == SubtitleLayoutEnum.ORIGINAL_ON_TOP:
-                text = f"{original}\n{translated}" if translated else original
-            elif layout == SubtitleLayoutEnum.TRANSLATE_ON_TOP:
-                text = f"{translated}\n{original}" if translated else original
-            elif layout == SubtitleLayoutEnum.ONLY_ORIGINAL:
-                text = original
-            else:  # ONLY_TRANSLATE
-                text = translated if translated else original
-            result.append(text)
-        text = "\n".join(result)
-        if save_path:
-            save_path = handle_long_path(save_path)
-            with open(save_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(result))
-        return text
+        return self._render(lambda f: write_txt(f, self.segments, layout), save_path)
 
     def to_srt(
         self,
@@ -278,28 +339,7 @@ class ASRData:
         save_path=None,
     ) -> str:
         """Convert to SRT subtitle format"""
-        srt_lines = []
-        for n, seg in enumerate(self.segments, 1):
-            original = seg.text
-            translated = seg.translated_text
-
-            if layout == SubtitleLayoutEnum.ORIGINAL_ON_TOP:
-                text = f"{original}\n{translated}" if translated else original
-            elif layout == SubtitleLayoutEnum.TRANSLATE_ON_TOP:
-                text = f"{translated}\n{original}" if translated else original
-            elif layout == SubtitleLayoutEnum.ONLY_ORIGINAL:
-                text = original
-            else:  # ONLY_TRANSLATE
-                text = translated if translated else original
-
-            srt_lines.append(f"{n}\n{seg.to_srt_ts()}\n{text}\n")
-
-        srt_text = "\n".join(srt_lines)
-        if save_path:
-            save_path = handle_long_path(save_path)
-            with open(save_path, "w", encoding="utf-8") as f:
-                f.write(srt_text)
-        return srt_text
+        return self._render(lambda f: write_srt(f, self.segments, layout), save_path)
 
     def to_lrc(self, save_path=None) -> str:
         """Convert to LRC subtitle format"""
@@ -332,105 +372,25 @@ class ASRData:
         Returns:
             ASS format subtitle content
         """
-        if not style_str:
-            style_str = (
-                "[V4+ Styles]\n"
-                "Format: Name,Fontname,Fontsize,PrimaryColour,SecondaryColour,OutlineColour,BackColour,"
-                "Bold,Italic,Underline,StrikeOut,ScaleX,ScaleY,Spacing,Angle,BorderStyle,Outline,Shadow,"
-                "Alignment,MarginL,MarginR,MarginV,Encoding\n"
-                "Style: Default,MicrosoftYaHei-Bold,40,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,-1,0,0,0,100,100,"
-                "0,0,1,2,0,2,10,10,15,1\n"
-                "Style: Secondary,MicrosoftYaHei-Bold,30,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,-1,0,0,0,100,100,"
-                "0,0,1,2,0,2,10,10,15,1"
-            )
-
-        ass_content = (
-            "[Script Info]\n"
-            "; Script generated by VideoCaptioner\n"
-            "; https://github.com/weifeng2333\n"
-            "ScriptType: v4.00+\n"
-            "PlayResX: 1280\n"
-            "PlayResY: 720\n\n"
-            f"{style_str}\n\n"
-            "[Events]\n"
-            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        return self._render(
+            lambda f: write_ass(f, self.segments, style_str, layout), save_path
         )
 
-        dialogue_template = "Dialogue: 0,{},{},{},,0,0,0,,{}\n"
-        for seg in self.segments:
-            start_time, end_time = seg.to_ass_ts()
-            original = seg.text
-            translated = seg.translated_text
-            has_translation = bool(translated and translated.strip())
-
-            if layout == SubtitleLayoutEnum.TRANSLATE_ON_TOP:
-                if has_translation:
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Secondary", original
-                    )
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Default", translated
-                    )
-                else:
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Default", original
-                    )
-            elif layout == SubtitleLayoutEnum.ORIGINAL_ON_TOP:
-                if has_translation:
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Secondary", translated
-                    )
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Default", original
-                    )
-                else:
-                    ass_content += dialogue_template.format(
-                        start_time, end_time, "Default", original
-                    )
-            elif layout == SubtitleLayoutEnum.ONLY_ORIGINAL:
-                ass_content += dialogue_template.format(
-                    start_time, end_time, "Default", original
-                )
-            else:  # ONLY_TRANSLATE
-                text = translated if has_translation else original
-                ass_content += dialogue_template.format(
-                    start_time, end_time, "Default", text
-                )
-
-        if save_path:
-            save_path = handle_long_path(save_path)
-            with open(save_path, "w", encoding="utf-8") as f:
-                f.write(ass_content)
-        return ass_content
-
-    def to_vtt(self, save_path=None) -> str:
+    def to_vtt(
+        self,
+        save_path=None,
+        layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+    ) -> str:
         """Convert to WebVTT subtitle format
 
         Args:
             save_path: Optional save path
+            layout: Subtitle layout mode
 
         Returns:
             WebVTT format subtitle content
         """
-        raise NotImplementedError("WebVTT format is not supported")
-        # # WebVTT头部
-        # vtt_lines = ["WEBVTT\n"]
-
-        # for n, seg in enumerate(self.segments, 1):
-        #     # 转换时间戳格式从毫秒到 HH:MM:SS.mmm
-        #     start_time = seg._ms_to_srt_time(seg.start_time).replace(",", ".")
-        #     end_time = seg._ms_to_srt_time(seg.end_time).replace(",", ".")
-
-        #     # 添加序号（可选）和时间戳
-        #     vtt_lines.append(f"{n}\n{start_time} --> {end_time}\n{seg.transcript}\n")
-
-        # vtt_text = "\n".join(vtt_lines)
-
-        # if save_path:
-        #     with open(save_path, "w", encoding="utf-8") as f:
-        #         f.write(vtt_text)
-
-        # return vtt_text
+        return self._render(lambda f: write_vtt(f, self.segments, layout), save_path)
 
     def merge_segments(
         self, start_index: int, end_index: int, merged_text: Optional[str] = None
@@ -450,6 +410,7 @@ class ASRData:
             )
         merged_seg = ASRDataSeg(merged_text, merged_start_time, merged_end_time)
         self.segments[start_index : end_index + 1] = [merged_seg]
+        self.invalidate_index()
 
     def merge_with_next_segment(self, index: int) -> None:
         """Merge segment at index with next segment."""
@@ -461,6 +422,7 @@ class ASRData:
         merged_seg = ASRDataSeg(merged_text, current_seg.start_time, next_seg.end_time)
         self.segments[index] = merged_seg
         del self.segments[index + 1]
+        self.invalidate_index()
 
     def optimize_timing(self, threshold_ms: int = 1000) -> "ASRData":
         """Optimize subtitle display timing by adjusting adjacent segment boundaries.
@@ -489,6 +451,7 @@ class ASRData:
                 current_seg.end_time = mid_time
                 next_seg.start_time = mid_time
 
+        self.invalidate_index()
         return self
 
     def __str__(self):
@@ -498,8 +461,11 @@ class ASRData:
     def from_subtitle_file(file_path: str) -> "ASRData":
         """Load ASRData from subtitle file.
 
+        A fresh .asrd sidecar written next to the file (see
+        asr_binary.save_sidecar) is loaded instead of parsing the text.
+
         Args:
-            file_path: Subtitle file path (supports .srt, .vtt, .ass, .json)
+            file_path: Subtitle file path (supports .srt, .vtt, .ass, .json, .asrd)
 
         Returns:
             Parsed ASRData instance
@@ -508,30 +474,34 @@ class ASRData:
             FileNotFoundError: File does not exist
             ValueError: Unsupported file format
         """
+        from .subtitle_reader import iter_subtitle
+
         file_path_obj = Path(file_path)
         if not file_path_obj.exists():
             raise FileNotFoundError(f"File not found: {file_path_obj}")
 
-        try:
-            content = file_path_obj.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            content = file_path_obj.read_text(encoding="gbk")
-
         suffix = file_path_obj.suffix.lower()
-
-        if suffix == ".srt":
-            return ASRData.from_srt(content)
-        elif suffix == ".vtt":
-            if "<c>" in content:
-                return ASRData.from_youtube_vtt(content)
-            return ASRData.from_vtt(content)
-        elif suffix == ".ass":
-            return ASRData.from_ass(content)
-        elif suffix == ".json":
+        if suffix == asr_binary.SUFFIX:
+            return asr_binary.load(str(file_path_obj))
+        cached = asr_binary.load_sidecar(str(file_path_obj))
+        if cached is not None:
+            return cached
+        if suffix == ".json":
+            try:
+                content = file_path_obj.read_text(encoding="utf-8")
+            except UnicodeDecodeError:
+                content = file_path_obj.read_text(encoding="gbk")
             return ASRData.from_json(json.loads(content))
-        else:
+        if suffix not in (".srt", ".vtt", ".ass"):
             raise ValueError(f"Unsupported file format: {suffix}")
 
+        try:
+            with open(file_path_obj, encoding="utf-8") as f:
+                return ASRData(list(iter_subtitle(f, suffix)))
+        except UnicodeDecodeError:
+            with open(file_path_obj, encoding="gbk") as f:
+                return ASRData(list(iter_subtitle(f, suffix)))
+
     @staticmethod
     def from_json(json_data: dict) -> "ASRData":
         """Create ASRData from JSON data"""
@@ -551,8 +521,8 @@ class ASRData:
     def from_srt(srt_str: str) -> "ASRData":
         """Create ASRData from SRT format string.
 
-        Uses language detection to distinguish between bilingual subtitles
-        (original + translation) and multiline single-language subtitles.
+        Distinguishes bilingual subtitles (original + translation) from
+        multiline single-language subtitles, see subtitle_reader.iter_srt.
 
         Args:
             srt_str: SRT format subtitle string
@@ -560,61 +530,9 @@ class ASRData:
         Returns:
             Parsed ASRData instance
         """
-        segments = []
-        srt_time_pattern = re.compile(
-            r"(\d{2}):(\d{2}):(\d{1,2})[.,](\d{3})\s-->\s(\d{2}):(\d{2}):(\d{1,2})[.,](\d{3})"
-        )
-        blocks = re.split(r"\n\s*\n", srt_str.strip())
-
-        # Detect bilingual mode: all 4-line + 70% different languages
-        def is_different_lang(block: str) -> bool:
-            lines = block.splitlines()
-            if len(lines) != 4:
-                return False
-            try:
-                return detect(lines[2]) != detect(lines[3])
-            except LangDetectException:
-                return False
-
-        all_four_lines = all(len(b.splitlines()) == 4 for b in blocks)
-        is_bilingual = (
-            all_four_lines and sum(map(is_different_lang, blocks[:50])) / 50 >= 0.7
-        )
-
-        # Process all blocks based on detected mode
-        for block in blocks:
-            lines = block.splitlines()
-            if len(lines) < 3:
-                continue
-
-            match = srt_time_pattern.match(lines[1])
-            if not match:
-                continue
-
-            time_parts = list(map(int, match.groups()))
-            start_time = sum(
-                [
-                    time_parts[0] * 3600000,
-                    time_parts[1] * 60000,
-                    time_parts[2] * 1000,
-                    time_parts[3],
-                ]
-            )
-            end_time = sum(
-                [
-                    time_parts[4] * 3600000,
-                    time_parts[5] * 60000,
-                    time_parts[6] * 1000,
-                    time_parts[7],
-                ]
-            )
+        from .subtitle_reader import iter_srt
 
-            if is_bilingual and len(lines) == 4:
-                segments.append(ASRDataSeg(lines[2], start_time, end_time, lines[3]))
-            else:
-                segments.append(ASRDataSeg(" ".join(lines[2:]), start_time, end_time))
-
-        return ASRData(segments)
+        return ASRData(list(iter_srt(io.StringIO(srt_str))))
 
     @staticmethod
     def from_vtt(vtt_str: str) -> "ASRData":
@@ -626,50 +544,9 @@ class ASRData:
         Returns:
             ASRData instance
         """
-        segments = []
-        content = vtt_str.split("\n\n")[2:]
-
-        timestamp_pattern = re.compile(
-            r"(\d{2}):(\d{2}):(\d{2})\.(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2})\.(\d{3})"
-        )
-
-        for block in content:
-            lines = block.strip().split("\n")
-            if len(lines) < 2:
-                continue
+        from .subtitle_reader import iter_vtt
 
-            timestamp_line = lines[1]
-            match = timestamp_pattern.match(timestamp_line)
-            if not match:
-                continue
-
-            time_parts = list(map(int, match.groups()))
-            start_time = sum(
-                [
-                    time_parts[0] * 3600000,
-                    time_parts[1] * 60000,
-                    time_parts[2] * 1000,
-                    time_parts[3],
-                ]
-            )
-            end_time = sum(
-                [
-                    time_parts[4] * 3600000,
-                    time_parts[5] * 60000,
-                    time_parts[6] * 1000,
-                    time_parts[7],
-                ]
-            )
-
-            text_line = " ".join(lines[2:])
-            cleaned_text = re.sub(r"<\d{2}:\d{2}:\d{2}\.\d{3}>", "", text_line)
-            cleaned_text = re.sub(r"</?c>", "", cleaned_text)
-            cleaned_text = cleaned_text.strip()
-
-            if cleaned_text and cleaned_text != " ":
-                segments.append(ASRDataSeg(cleaned_text, start_time, end_time))
-
-        return ASRData(segments)
+        return ASRData(list(iter_vtt(io.StringIO(vtt_str))))
 
     @staticmethod
     def from_youtube_vtt(vtt_str: str) -> "ASRData":
@@ -681,63 +558,9 @@ class ASRData:
         Returns:
             Parsed ASRData with word-level segments
         """
+        from .subtitle_reader import iter_youtube_vtt
 
-        def parse_timestamp(ts: str) -> int:
-            """Convert timestamp string to milliseconds"""
-            h, m, s = ts.split(":")
-            return int(float(h) * 3600000 + float(m) * 60000 + float(s) * 1000)
-
-        def split_timestamped_text(text: str) -> List[ASRDataSeg]:
-            """Extract word segments from timestamped text"""
-            pattern = re.compile(r"<(\d{2}:\d{2}:\d{2}\.\d{3})>([^<]*)")
-            matches = list(pattern.finditer(text))
-            word_segments = []
-
-            for i in range(len(matches) - 1):
-                current_match = matches[i]
-                next_match = matches[i + 1]
-
-                start_time = parse_timestamp(current_match.group(1))
-                end_time = parse_timestamp(next_match.group(1))
-                word = current_match.group(2).strip()
-
-                if word:
-                    word_segments.append(ASRDataSeg(word, start_time, end_time))
-
-            return word_segments
-
-        segments = []
-        blocks = re.split(r"\n\n+", vtt_str.strip())
-
-        timestamp_pattern = re.compile(
-            r"(\d{2}):(\d{2}):(\d{2}\.\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}\.\d{3})"
-        )
-        for block in blocks:
-            lines = block.strip().split("\n")
-            if not lines:
-                continue
-
-            match = timestamp_pattern.match(lines[0])
-            if not match:
-                continue
-
-            text = "\n".join(lines)
-
-            timestamp_row = re.search(r"\n(.*?<c>.*?</c>.*)", block)
-            if timestamp_row:
-                text = re.sub(r"<c>|</c>", "", timestamp_row.group(1))
-                block_start_time_string = (
-                    f"{match.group(1)}:{match.group(2)}:{match.group(3)}"
-                )
-                block_end_time_string = (
-                    f"{match.group(4)}:{match.group(5)}:{match.group(6)}"
-                )
-                text = f"<{block_start_time_string}>{text}<{block_end_time_string}>"
-
-                word_segments = split_timestamped_text(text)
-                segments.extend(word_segments)
-
-        return ASRData(segments)
+        return ASRData(list(iter_youtube_vtt(io.StringIO(vtt_str))))
 
     @staticmethod
     def from_ass(ass_str: str) -> "ASRData":
@@ -749,63 +572,6 @@ class ASRData:
         Returns:
             ASRData instance
         """
-        segments = []
-        ass_time_pattern = re.compile(
-            r"Dialogue: \d+,(\d+:\d{2}:\d{2}\.\d{2}),(\d+:\d{2}:\d{2}\.\d{2}),(.*?),.*?,\d+,\d+,\d+,.*?,(.*?)$"
-        )
-
-        def parse_ass_time(time_str: str) -> int:
-            """Convert ASS timestamp to milliseconds"""
-            hours, minutes, seconds = time_str.split(":")
-            seconds, centiseconds = seconds.split(".")
-            return (
-                int(hours) * 3600000
-                + int(minutes) * 60000
-                + int(seconds) * 1000
-                + int(centiseconds) * 10
-            )
+        from .subtitle_reader import iter_ass
 
-        has_translation = "Script generated by VideoCaptioner" in ass_str
-        temp_segments = {}
-
-        for line in ass_str.splitlines():
-            if line.startswith("Dialogue:"):
-                match = ass_time_pattern.match(line)
-                if match:
-                    start_time = parse_ass_time(match.group(1))
-                    end_time = parse_ass_time(match.group(2))
-                    style = match.group(3).strip()
-                    text = match.group(4)
-
-                    text = re.sub(r"\{[^}]*\}", "", text)
-                    text = text.replace("\\N", "\n")
-                    text = text.strip()
-
-                    if not text:
-                        continue
-
-                    if has_translation:
-                        time_key = f"{start_time}-{end_time}"
-                        if time_key in temp_segments:
-                            if style == "Default":
-                                temp_segments[time_key].translated_text = text
-                            else:
-                                temp_segments[time_key].text = text
-                            segments.append(temp_segments[time_key])
-                            del temp_segments[time_key]
-                        else:
-                            segment = ASRDataSeg(
-                                text="", start_time=start_time, end_time=end_time
-                            )
-                            if style == "Default":
-                                segment.translated_text = text
-                            else:
-                                segment.text = text
-                            temp_segments[time_key] = segment
-                    else:
-                        segments.append(ASRDataSeg(text, start_time, end_time))
-
-        for segment in temp_segments.values():
-            segments.append(segment)
-
-        return ASRData(segments)
+        return ASRData(list(iter_ass(io.StringIO(ass_str))))
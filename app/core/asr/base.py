@@ -1,21 +1,38 @@
 import os
+import shutil
 import threading
-import time
-import uuid
-import zlib
-from io import BytesIO
+from pathlib import Path
 from typing import Callable, Optional, Union, cast
 
-from pydub import AudioSegment
-
 from app.core.utils.cache import get_asr_cache, is_cache_enabled
 from app.core.utils.logger import setup_logger
+from app.core.utils.media_probe import (
+    compute_bytes_fingerprint,
+    compute_file_fingerprint,
+    get_media_duration,
+)
 
 from .asr_data import ASRData, ASRDataSeg
+from .quota import QuotaExceededError, QuotaReservation, get_quota_ledger
 
 logger = setup_logger("asr")
 
 
+def link_or_copy(src: str, dst: Path) -> None:
+    """Expose ``src`` at ``dst`` without copying data when possible.
+
+    Tries a hard link, then a symlink, and copies only as a last resort
+    (e.g. cross-device on Windows without symlink privilege).
+    """
+    for link in (os.link, os.symlink):
+        try:
+            link(os.path.abspath(src), dst)
+            return
+        except (OSError, NotImplementedError):
+            continue
+    shutil.copy2(src, dst)
+
+
 class BaseASR:
     """Base class for ASR (Automatic Speech Recognition) implementations.
 
@@ -42,22 +59,44 @@ class BaseASR:
     ):
         """Initialize ASR with audio data.
 
+        File paths are used as-is: the audio is only read into memory when a
+        subclass accesses ``file_binary`` (e.g. to upload it).
+
         Args:
             audio_input: Path to audio file or raw audio bytes
             use_cache: Whether to cache recognition results
             need_word_time_stamp: Whether to return word-level timestamps
         """
         self.audio_input = audio_input
-        self.file_binary = None
+        self._file_binary: Optional[bytes] = None
         self.use_cache = use_cache
+        self._quota_reservation: Optional[QuotaReservation] = None
         self._set_data()
         self._cache = get_asr_cache()
         self.audio_duration = self._get_audio_duration()
 
+    @property
+    def file_binary(self) -> Optional[bytes]:
+        """Raw audio bytes, loaded lazily for path inputs."""
+        if self._file_binary is None and isinstance(self.audio_input, str):
+            with open(self.audio_input, "rb") as f:
+                self._file_binary = f.read()
+        return self._file_binary
+
+    @file_binary.setter
+    def file_binary(self, value: Optional[bytes]) -> None:
+        self._file_binary = value
+
+    @property
+    def audio_path(self) -> Optional[str]:
+        """Input file path, or None for in-memory audio."""
+        return self.audio_input if isinstance(self.audio_input, str) else None
+
     def _set_data(self):
-        """Load audio data and compute CRC32 hash for cache key."""
+        """Validate audio input and compute CRC32 hash for cache key."""
         if isinstance(self.audio_input, bytes):
-            self.file_binary = self.audio_input
+            self._file_binary = self.audio_input
+            self.crc32_hex = compute_bytes_fingerprint(self.audio_input)
         elif isinstance(self.audio_input, str):
             ext = self.audio_input.split(".")[-1].lower()
             assert (
@@ -66,23 +105,32 @@ class BaseASR:
             assert os.path.exists(
                 self.audio_input
             ), f"File not found: {self.audio_input}"
-            with open(self.audio_input, "rb") as f:
-                self.file_binary = f.read()
+            self.crc32_hex = compute_file_fingerprint(self.audio_input)
         else:
             raise ValueError("audio_input must be provided as string or bytes")
-        crc32_value = zlib.crc32(self.file_binary) & 0xFFFFFFFF
-        self.crc32_hex = format(crc32_value, "08x")
 
     def _get_audio_duration(self) -> float:
-        """Get audio duration in seconds using pydub."""
-        if not self.file_binary:
+        """Get audio duration in seconds from the cached media probe."""
+        source = self.audio_path or self._file_binary
+        if not source:
             return 0.01
-        try:
-            audio = AudioSegment.from_file(BytesIO(self.file_binary))
-            return audio.duration_seconds
-        except Exception as e:
-            logger.warning(f"Failed to get audio duration: {e}")
+        duration = get_media_duration(source, fingerprint=self.crc32_hex)
+        if duration is None:
+            logger.warning("Failed to get audio duration, assuming 10 minutes")
             return 60.0 * 10
+        return duration
+
+    def _materialize_input(self, dst: Path) -> None:
+        """Make the input audio available at ``dst`` for external engines.
+
+        Path inputs are linked rather than copied; byte inputs are written out.
+        """
+        if self.audio_path is not None:
+            link_or_copy(self.audio_path, dst)
+        elif self._file_binary:
+            dst.write_bytes(self._file_binary)
+        else:
+            raise ValueError("No audio data available")
 
     def run(
         self, callback: Optional[Callable[[int, str], None]] = None, **kwargs
@@ -108,8 +156,13 @@ class BaseASR:
                 segments = self._make_segments(cached_result)
                 return ASRData(segments)
 
-        # Run ASR
-        resp_data = self._run(callback, **kwargs)
+        # Run ASR, settling any quota reserved by _check_rate_limit
+        try:
+            resp_data = self._run(callback, **kwargs)
+        except Exception:
+            self._settle_quota(success=False)
+            raise
+        self._settle_quota(success=True)
 
         # Cache result
         self._cache.set(cache_key, resp_data, expire=86400 * 2)
@@ -117,6 +170,22 @@ class BaseASR:
         segments = self._make_segments(resp_data)
         return ASRData(segments)
 
+    def _settle_quota(self, success: bool) -> None:
+        """Commit or release the quota reservation made for this call."""
+        reservation = self._quota_reservation
+        if reservation is None:
+            return
+        self._quota_reservation = None
+        ledger = get_quota_ledger(
+            self.RATE_LIMIT_MAX_CALLS,
+            self.RATE_LIMIT_MAX_DURATION,
+            self.RATE_LIMIT_TIME_WINDOW,
+        )
+        if success:
+            ledger.commit(reservation)
+        else:
+            ledger.release(reservation)
+
     def _get_key(self) -> str:
         """Get cache key for this ASR request.
 
@@ -156,44 +225,23 @@ class BaseASR:
         raise NotImplementedError("_run method must be implemented in subclass")
 
     def _check_rate_limit(self) -> None:
-        """Check rate limit for public charity services."""
-        service_name = self.__class__.__name__
-        tag = f"rate_limit:{service_name}"
-        time_limit = time.time() - self.RATE_LIMIT_TIME_WINDOW
+        """Reserve quota for this call on a public charity service.
 
-        # Query recent records
-        try:
-            query = "SELECT key FROM Cache WHERE tag = ? AND store_time >= ?"
-            results = self._cache._sql(query, (tag, time_limit)).fetchall()
-        except Exception as e:
-            raise RuntimeError(f"Failed to query rate limit: {e}")
-
-        # Get durations using cache API
-        durations = []
-        for (key,) in results:
-            duration = self._cache.get(key, default=None)
-            if duration is not None and isinstance(duration, (int, float)):
-                durations.append(duration)
-
-        call_count = len(durations)
-        total_duration = sum(durations)
-
-        # Check duration limit
-        if total_duration + self.audio_duration > self.RATE_LIMIT_MAX_DURATION:
-            error_msg = f"{service_name} duration limit exceeded"
-            logger.warning(error_msg)
-            raise RuntimeError(error_msg)
-
-        # Check call count limit
-        if call_count >= self.RATE_LIMIT_MAX_CALLS:
-            error_msg = f"{service_name} call count limit exceeded"
-            logger.warning(error_msg)
-            raise RuntimeError(error_msg)
-
-        # Record current call (store duration directly as float)
-        self._cache.set(
-            f"rate_limit_record:{service_name}:{uuid.uuid4()}",
-            self.audio_duration,
-            tag=tag,
-            expire=int(self.RATE_LIMIT_TIME_WINDOW) + 3600,
+        The reservation is committed by ``run`` once recognition succeeds and
+        released if it fails.
+
+        Raises:
+            RuntimeError: If the call count or duration limit is exceeded
+        """
+        ledger = get_quota_ledger(
+            self.RATE_LIMIT_MAX_CALLS,
+            self.RATE_LIMIT_MAX_DURATION,
+            self.RATE_LIMIT_TIME_WINDOW,
         )
+        try:
+            self._quota_reservation = ledger.reserve(
+                self.__class__.__name__, self.audio_duration
+            )
+        except QuotaExceededError as e:
+            logger.warning(str(e))
+            raise
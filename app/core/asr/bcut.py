@@ -1,11 +1,11 @@
 import json
-import time
 from typing import Any, Callable, List, Optional, Union
 
 import requests
 
 from .asr_data import ASRDataSeg
 from .base import BaseASR
+from .poller import get_task_poller
 from .status import ASRStatus
 
 __version__ = "0.0.3"
@@ -16,6 +16,10 @@ API_COMMIT_UPLOAD = API_BASE_URL + "/resource/create/complete"
 API_CREATE_TASK = API_BASE_URL + "/task"
 API_QUERY_RESULT = API_BASE_URL + "/task/result"
 
+# 任务状态
+TASK_STATE_ERROR = 3
+TASK_STATE_COMPLETE = 4
+
 
 class BcutASR(BaseASR):
     """Bilibili Bcut ASR API implementation.
@@ -163,15 +167,19 @@ class BcutASR(BaseASR):
 
         callback(*ASRStatus.TRANSCRIBING.callback_tuple())
 
-        # Poll task status until complete
-        task_resp = None
-        for _ in range(500):
-            task_resp = self.result()
-            if task_resp["state"] == 4:
-                break
-            time.sleep(1)
+        # Wait for the shared poller to report a final task state
+        future = get_task_poller().submit(
+            self.task_id or "",
+            query=self.result,
+            is_done=lambda r: r["state"] in (TASK_STATE_ERROR, TASK_STATE_COMPLETE),
+            expected_duration=self.audio_duration,
+        )
+        try:
+            task_resp = future.result()
+        except TimeoutError:
+            raise RuntimeError("ASR task failed or timeout")
 
-        if task_resp is None or task_resp["state"] != 4:
+        if task_resp["state"] != TASK_STATE_COMPLETE:
             raise RuntimeError("ASR task failed or timeout")
 
         callback(*ASRStatus.COMPLETED.callback_tuple())
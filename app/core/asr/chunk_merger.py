@@ -9,12 +9,15 @@
 """
 
 import difflib
+import math
+from itertools import takewhile
 from typing import List, Optional
 
-from ..utils.logger import setup_logger
+from ..utils.logger import rate_limit, setup_logger
 from .asr_data import ASRData, ASRDataSeg
+from .interval_index import IntervalIndex
 
-logger = setup_logger("chunk_merger")
+logger = rate_limit(setup_logger("chunk_merger"))
 
 
 class ChunkMerger:
@@ -72,7 +75,7 @@ class ChunkMerger:
         # 自动推断 offsets
         if chunk_offsets is None:
             chunk_offsets = self._infer_chunk_offsets(chunks, overlap_duration)
-            logger.info(f"自动推断 chunk_offsets: {chunk_offsets}")
+            logger.info("自动推断 chunk_offsets: %s", chunk_offsets)
 
         if len(chunks) != len(chunk_offsets):
             raise ValueError(
@@ -88,14 +91,14 @@ class ChunkMerger:
         # 逐对合并
         merged_segments = adjusted_chunks[0]
         for i in range(1, len(adjusted_chunks)):
-            logger.info(f"合并 chunk {i-1} 和 chunk {i}")
+            logger.debug("合并 chunk %d 和 chunk %d", i - 1, i)
             merged_segments = self._merge_two_sequences(
                 merged_segments,
                 adjusted_chunks[i],
                 overlap_duration,
             )
 
-        logger.info(f"合并完成，总片段数: {len(merged_segments)}")
+        logger.info("合并完成，总片段数: %d", len(merged_segments))
         return ASRData(merged_segments)
 
     def _merge_two_sequences(
@@ -140,14 +143,12 @@ class ChunkMerger:
         if best_match is None:
             # 未找到有效匹配，使用时间边界切分
             logger.warning("未找到有效文本匹配，使用时间边界切分")
-            # 找到 left 中最后一个在 right[0].start_time 之前结束的 segment
-            split_idx = left_len
-            right_start = right[0].start_time
-            for i in range(left_len - 1, -1, -1):
-                if left[i].end_time <= right_start:
-                    split_idx = i + 1
-                    break
-            logger.info(f"时间边界切分: left[:{split_idx}] + right")
+            # 从 left 中第一个延续到 right[0].start_time 之后的 segment 处切分
+            crossing = IntervalIndex.from_segments(left).overlapping(
+                right[0].start_time, math.inf
+            )
+            split_idx = crossing[0] if crossing and crossing[0] > 0 else left_len
+            logger.debug("时间边界切分: left[:%d] + right", split_idx)
             return left[:split_idx] + right
 
         # 使用最佳匹配结果
@@ -284,26 +285,24 @@ class ChunkMerger:
         if not segments:
             return []
 
-        overlap = []
-
+        # 只取完全落在窗口内的 segments：先按开始时间二分缩小候选范围，
+        # 再按结束时间逐个确认，遇到第一个不满足的即停止
+        index = IntervalIndex.from_segments(segments)
         if from_end:
-            # 从末尾往前提取
+            # 末尾窗口：开始时间不早于 threshold 的尾部 segments
             threshold = segments[-1].end_time - duration
-            for seg in reversed(segments):
-                if seg.start_time >= threshold:
-                    overlap.insert(0, seg)
-                else:
-                    break
-        else:
-            # 从开头往后提取
-            threshold = segments[0].start_time + duration
-            for seg in segments:
-                if seg.end_time <= threshold:
-                    overlap.append(seg)
-                else:
-                    break
-
-        return overlap
+            candidates = segments[index.count_starting_before(threshold) :]
+            overlap = list(
+                takewhile(lambda seg: seg.start_time >= threshold, reversed(candidates))
+            )
+            overlap.reverse()
+            return overlap
+
+        # 开头窗口：结束时间不晚于 threshold 的头部 segments
+        threshold = segments[0].start_time + duration
+        # 时间为整数毫秒，threshold + 1 使开始时间恰为 threshold 的也成为候选
+        candidates = segments[: index.count_starting_before(threshold + 1)]
+        return list(takewhile(lambda seg: seg.end_time <= threshold, candidates))
 
     def _infer_chunk_offsets(
         self, chunks: List[ASRData], overlap_duration: int
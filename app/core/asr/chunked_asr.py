@@ -4,24 +4,40 @@
 使用装饰器模式实现关注点分离。
 """
 
-import io
+import os
+import subprocess
+import tempfile
+import wave
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, List, Optional, Tuple
-
-from pydub import AudioSegment
-
-from ..utils.logger import setup_logger
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from ..utils.logger import rate_limit, setup_logger
+from ..utils.media_probe import (
+    MediaInfo,
+    compute_file_fingerprint,
+    probe_media,
+    register_media_info,
+)
 from .asr_data import ASRData
 from .base import BaseASR
 from .chunk_merger import ChunkMerger
 
-logger = setup_logger("chunked_asr")
+logger = rate_limit(setup_logger("chunked_asr"))
 
 # 常量定义
 MS_PER_SECOND = 1000
 DEFAULT_CHUNK_LENGTH_SEC = 60 * 10  # 20分钟
 DEFAULT_CHUNK_OVERLAP_SEC = 10  # 10秒重叠
 DEFAULT_CHUNK_CONCURRENCY = 3  # 3个并发
+# WAV 切块时每次复制的帧数
+WAV_COPY_FRAMES = 64 * 1024
+
+
+class AudioChunk(NamedTuple):
+    """音频块在源文件中的位置（毫秒）"""
+
+    duration_ms: int
+    offset_ms: int
 
 
 class ChunkedASR:
@@ -31,8 +47,10 @@ class ChunkedASR:
     适用于长音频的分块转录，避免 API 超时或内存溢出。
 
     工作流程：
-        1. 将长音频切割为多个重叠的块
-        2. 为每个块创建独立的 ASR 实例并发转录
+        1. 根据探测到的时长规划重叠的块（不解码音频）
+        2. 每个块在转录前才写入临时文件（WAV 按帧复制，其他格式用
+           ffmpeg -ss/-t 截取），以路径交给独立的 ASR 实例并发转录，
+           转录完成即删除，同时存在的块文件不超过并发数
         3. 使用 ChunkMerger 合并结果，消除重叠区域的重复内容
 
     示例:
@@ -52,6 +70,7 @@ class ChunkedASR:
         chunk_length: 每块长度（秒），默认 480 秒（8分钟）
         chunk_overlap: 块之间重叠时长（秒），默认 10 秒
         chunk_concurrency: 并发转录数量，默认 3
+        chunk_format: 音频块导出格式，默认 mp3（本地引擎需要 wav）
     """
 
     def __init__(
@@ -62,6 +81,7 @@ class ChunkedASR:
         chunk_length: int = DEFAULT_CHUNK_LENGTH_SEC,
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP_SEC,
         chunk_concurrency: int = DEFAULT_CHUNK_CONCURRENCY,
+        chunk_format: str = "mp3",
     ):
         self.asr_class = asr_class
         self.audio_path = audio_path
@@ -69,10 +89,7 @@ class ChunkedASR:
         self.chunk_length_ms = chunk_length * MS_PER_SECOND
         self.chunk_overlap_ms = chunk_overlap * MS_PER_SECOND
         self.chunk_concurrency = chunk_concurrency
-
-        # 读取完整音频文件（用于分块）
-        with open(audio_path, "rb") as f:
-            self.file_binary = f.read()
+        self.chunk_format = chunk_format
 
     def run(self, callback: Optional[Callable[[int, str], None]] = None) -> ASRData:
         """执行分块转录
@@ -83,7 +100,7 @@ class ChunkedASR:
         Returns:
             ASRData: 合并后的转录结果
         """
-        # 1. 分块音频
+        # 1. 规划分块（通过元数据探测得知时长，不解码音频）
         chunks = self._split_audio()
 
         # 2. 如果只有一块，直接创建单个 ASR 实例转录
@@ -92,7 +109,7 @@ class ChunkedASR:
             single_asr = self.asr_class(self.audio_path, **self.asr_kwargs)
             return single_asr.run(callback)
 
-        logger.info(f"音频分为 {len(chunks)} 块，开始并发转录")
+        logger.info("音频分为 %d 块，开始并发转录", len(chunks))
 
         # 3. 并发转录所有块
         chunk_results = self._transcribe_chunks(chunks, callback)
@@ -100,22 +117,16 @@ class ChunkedASR:
         # 4. 合并结果
         merged_result = self._merge_results(chunk_results, chunks)
 
-        logger.info(f"分块转录完成，共 {len(merged_result.segments)} 个片段")
+        logger.info("分块转录完成，共 %d 个片段", len(merged_result.segments))
         return merged_result
 
-    def _split_audio(self) -> List[Tuple[bytes, int]]:
-        """使用 pydub 将音频切割为重叠的块
+    def _split_audio(self) -> List[AudioChunk]:
+        """根据音频时长规划重叠的块
 
         Returns:
-            List[(chunk_bytes, offset_ms), ...]
-            每个元素包含音频块的字节数据和时间偏移（毫秒）
+            List[AudioChunk]，每个元素为块时长与在源音频中的偏移（毫秒）
         """
-        # 从字节数据加载音频
-        if self.file_binary is None:
-            raise ValueError("file_binary is None, cannot split audio")
-
-        audio = AudioSegment.from_file(io.BytesIO(self.file_binary))
-        total_duration_ms = len(audio)
+        total_duration_ms = self._get_total_duration_ms()
 
         logger.info(
             f"音频总时长: {total_duration_ms/1000:.1f}s, "
@@ -123,22 +134,12 @@ class ChunkedASR:
             f"重叠: {self.chunk_overlap_ms/1000:.1f}s"
         )
 
-        chunks = []
+        chunks: List[AudioChunk] = []
         start_ms = 0
 
         while start_ms < total_duration_ms:
             end_ms = min(start_ms + self.chunk_length_ms, total_duration_ms)
-            chunk = audio[start_ms:end_ms]
-
-            buffer = io.BytesIO()
-            chunk.export(buffer, format="mp3")
-            chunk_bytes = buffer.getvalue()
-
-            chunks.append((chunk_bytes, start_ms))
-            logger.debug(
-                f"切割 chunk {len(chunks)}: "
-                f"{start_ms/1000:.1f}s - {end_ms/1000:.1f}s ({len(chunk_bytes)} bytes)"
-            )
+            chunks.append(AudioChunk(end_ms - start_ms, start_ms))
 
             # 下一个块的起始位置（有重叠）
             start_ms += self.chunk_length_ms - self.chunk_overlap_ms
@@ -147,18 +148,103 @@ class ChunkedASR:
             if end_ms >= total_duration_ms:
                 break
 
-        # logger.info(f"音频切割完成，共 {len(chunks)} 个块")
-        return chunks
+        return chunks or [AudioChunk(total_duration_ms, 0)]
+
+    def _get_total_duration_ms(self) -> int:
+        info = probe_media(self.audio_path)
+        if info is not None:
+            return int(info.duration * MS_PER_SECOND)
+
+        # 探测失败时才解码音频获取时长
+        from pydub import AudioSegment
+
+        logger.warning("无法探测音频时长，解码音频获取")
+        return len(AudioSegment.from_file(self.audio_path))
+
+    def _is_wav_source(self) -> bool:
+        return os.path.splitext(self.audio_path)[1].lower() == ".wav"
+
+    def _extract_chunk(self, chunk: AudioChunk, work_dir: str, idx: int) -> str:
+        """把音频块写入临时文件并返回路径
+
+        WAV 源按帧定位后分段复制，其他格式由 ffmpeg 截取，内存占用与音频
+        长度无关。
+        """
+        chunk_path = os.path.join(work_dir, f"chunk_{idx}.{self.chunk_format}")
+        if self.chunk_format == "wav" and self._is_wav_source():
+            info = self._copy_wav_frames(chunk, chunk_path)
+        else:
+            info = self._cut_with_ffmpeg(chunk, chunk_path)
+
+        # 登记块的元数据，块 ASR 实例无需再探测
+        register_media_info(compute_file_fingerprint(chunk_path), info)
+        return chunk_path
+
+    def _copy_wav_frames(self, chunk: AudioChunk, chunk_path: str) -> MediaInfo:
+        with wave.open(self.audio_path, "rb") as src:
+            params = src.getparams()
+            rate = params.framerate
+            start = min(chunk.offset_ms * rate // MS_PER_SECOND, params.nframes)
+            remaining = min(
+                chunk.duration_ms * rate // MS_PER_SECOND, params.nframes - start
+            )
+            src.setpos(start)
+            with wave.open(chunk_path, "wb") as dst:
+                dst.setparams(params)
+                while remaining > 0:
+                    frames = src.readframes(min(WAV_COPY_FRAMES, remaining))
+                    if not frames:
+                        break
+                    dst.writeframes(frames)
+                    remaining -= len(frames) // (params.sampwidth * params.nchannels)
+        return MediaInfo(
+            duration=chunk.duration_ms / MS_PER_SECOND,
+            sample_rate=rate,
+            channels=params.nchannels,
+            codec="pcm",
+            format_name="wav",
+        )
+
+    def _cut_with_ffmpeg(self, chunk: AudioChunk, chunk_path: str) -> MediaInfo:
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-v",
+            "error",
+            "-ss",
+            f"{chunk.offset_ms / MS_PER_SECOND:.3f}",
+            "-t",
+            f"{chunk.duration_ms / MS_PER_SECOND:.3f}",
+            "-i",
+            self.audio_path,
+            "-vn",
+            chunk_path,
+        ]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
+        )
+        if result.returncode != 0 or not os.path.exists(chunk_path):
+            error = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"音频切块失败: {error}")
+        source_info = probe_media(self.audio_path)
+        return MediaInfo(
+            duration=chunk.duration_ms / MS_PER_SECOND,
+            sample_rate=source_info.sample_rate if source_info else 0,
+            channels=source_info.channels if source_info else 0,
+            format_name=self.chunk_format,
+        )
 
     def _transcribe_chunks(
         self,
-        chunks: List[Tuple[bytes, int]],
+        chunks: List[AudioChunk],
         callback: Optional[Callable[[int, str], None]],
     ) -> List[ASRData]:
         """并发转录多个音频块
 
         Args:
-            chunks: 音频块列表 [(chunk_bytes, offset_ms), ...]
+            chunks: 音频块列表
             callback: 进度回调
 
         Returns:
@@ -168,10 +254,15 @@ class ChunkedASR:
         total_chunks = len(chunks)
 
         def transcribe_single_chunk(
-            idx: int, chunk_bytes: bytes, offset_ms: int
+            idx: int, chunk: AudioChunk, work_dir: str
         ) -> Tuple[int, ASRData]:
             """转录单个音频块 - 为每个块创建独立的 ASR 实例"""
-            logger.info(f"开始转录 chunk {idx+1}/{total_chunks} (offset={offset_ms}ms)")
+            logger.info(
+                "开始转录 chunk %d/%d (offset=%dms)",
+                idx + 1,
+                total_chunks,
+                chunk.offset_ms,
+            )
 
             # 包装进度回调
             def chunk_callback(progress: int, message: str):
@@ -182,12 +273,13 @@ class ChunkedASR:
                     )
                     callback(overall_progress, f"{idx+1}/{total_chunks}: {message}")
 
-            # 为当前 chunk 创建独立的 ASR 实例
-            # 使用 chunk_bytes 作为音频输入
-            chunk_asr = self.asr_class(chunk_bytes, **self.asr_kwargs)
-
-            # 调用 ASR 的 run() 方法转录
-            asr_data = chunk_asr.run(chunk_callback)
+            chunk_path = self._extract_chunk(chunk, work_dir, idx)
+            try:
+                # 为当前 chunk 创建独立的 ASR 实例，以块文件路径作为输入
+                chunk_asr = self.asr_class(chunk_path, **self.asr_kwargs)
+                asr_data = chunk_asr.run(chunk_callback)
+            finally:
+                os.remove(chunk_path)
 
             logger.info(
                 f"Chunk {idx+1}/{total_chunks} 转录完成，"
@@ -196,21 +288,22 @@ class ChunkedASR:
             return idx, asr_data
 
         # 使用 ThreadPoolExecutor 并发转录
-        with ThreadPoolExecutor(max_workers=self.chunk_concurrency) as executor:
-            futures = {
-                executor.submit(transcribe_single_chunk, i, chunk_bytes, offset): i
-                for i, (chunk_bytes, offset) in enumerate(chunks)
-            }
-
-            for future in as_completed(futures):
-                idx, asr_data = future.result()
-                results[idx] = asr_data
-
-        logger.info(f"所有 {total_chunks} 个块转录完成")
+        with tempfile.TemporaryDirectory(prefix="chunked_asr_") as work_dir:
+            with ThreadPoolExecutor(max_workers=self.chunk_concurrency) as executor:
+                futures = {
+                    executor.submit(transcribe_single_chunk, i, chunk, work_dir): i
+                    for i, chunk in enumerate(chunks)
+                }
+
+                for future in as_completed(futures):
+                    idx, asr_data = future.result()
+                    results[idx] = asr_data
+
+        logger.info("所有 %d 个块转录完成", total_chunks)
         return [r for r in results if r is not None]  # 过滤 None
 
     def _merge_results(
-        self, chunk_results: List[ASRData], chunks: List[Tuple[bytes, int]]
+        self, chunk_results: List[ASRData], chunks: List[AudioChunk]
     ) -> ASRData:
         """使用 ChunkMerger 合并转录结果
 
@@ -224,7 +317,7 @@ class ChunkedASR:
         merger = ChunkMerger(min_match_count=2, fuzzy_threshold=0.7)
 
         # 提取每个 chunk 的时间偏移
-        chunk_offsets = [offset for _, offset in chunks]
+        chunk_offsets = [chunk.offset_ms for chunk in chunks]
 
         # 合并
         merged = merger.merge_chunks(
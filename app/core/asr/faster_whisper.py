@@ -1,21 +1,19 @@
 import hashlib
-import os
 import re
 import shutil
-import subprocess
 import tempfile
 from pathlib import Path
 from typing import Any, Callable, List, Optional, Union
 
-import GPUtil
-
-from ..utils.logger import setup_logger
-from ..utils.subprocess_helper import StreamReader
+from ..utils.logger import rate_limit, setup_logger
+from ..utils.subprocess_helper import ProgressThrottle, get_process_supervisor
 from .asr_data import ASRData, ASRDataSeg
 from .base import BaseASR
 from .status import ASRStatus
 
-logger = setup_logger("faster_whisper")
+logger = rate_limit(setup_logger("faster_whisper"))
+
+_PERCENT_PATTERN = re.compile(r"(\d+)%")
 
 
 class FasterWhisperASR(BaseASR):
@@ -51,6 +49,7 @@ class FasterWhisperASR(BaseASR):
         max_comma: int = 20,
         max_comma_cent: int = 50,
         prompt: Optional[str] = None,
+        threads: Optional[int] = None,
     ):
         super().__init__(audio_input, use_cache)
 
@@ -80,6 +79,7 @@ class FasterWhisperASR(BaseASR):
         self.max_comma = max_comma
         self.max_comma_cent = max_comma_cent
         self.prompt = prompt
+        self.threads = threads
 
         self.process = None
 
@@ -241,71 +241,52 @@ class FasterWhisperASR(BaseASR):
             wav_path = temp_dir / "audio.wav"
             output_path = wav_path.with_suffix(".srt")
 
-            if isinstance(self.audio_input, str):
-                shutil.copy2(self.audio_input, wav_path)
-            else:
-                if self.file_binary:
-                    wav_path.write_bytes(self.file_binary)
-                else:
-                    raise ValueError("No audio data available")
+            # 链接音频文件（无需复制）
+            self._materialize_input(wav_path)
 
             cmd = self._build_command(str(wav_path))
+            # 线程数只影响速度，不放入 _build_command 以免改变缓存 key
+            if self.threads:
+                cmd.extend(["--threads", str(self.threads)])
 
             logger.info("Faster Whisper command: %s", " ".join(cmd))
             callback(*ASRStatus.TRANSCRIBING.with_progress(5))
 
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
-            )
-
-            # 使用 StreamReader 处理输出
-            reader = StreamReader(self.process)
-            reader.start_reading()
-
             is_finish = False
             error_msg = ""
+            throttle = ProgressThrottle()
+
+            def on_line(_stream_name: str, line: str) -> None:
+                nonlocal is_finish, error_msg
+                line = line.strip()
+                if not line:
+                    return
+                # 解析进度百分比
+                match = _PERCENT_PATTERN.search(line)
+                if match:
+                    progress = int(match.group(1))
+                    if progress == 100:
+                        is_finish = True
+                    mapped_progress = int(5 + (progress * 0.9))
+                    if throttle.ready(mapped_progress):
+                        callback(mapped_progress, f"{mapped_progress} %")
+                if "Subtitles are written to" in line:
+                    is_finish = True
+                    callback(*ASRStatus.COMPLETED.callback_tuple())
+                if "error" in line or "Error" in line:
+                    error_msg += line
+                    logger.error(line)
+                elif match:
+                    # 进度行刷新频率很高，降为限速的 debug 日志
+                    logger.debug("%s", line)
+                else:
+                    logger.info(line)
 
-            # 实时处理输出
-            while True:
-                # 检查进程状态
-                if self.process.poll() is not None:
-                    # 进程已结束，读取剩余输出
-                    for stream_name, line in reader.get_remaining_output():
-                        line = line.strip()
-                        if line:
-                            if "error" in line:
-                                error_msg += line
-                            else:
-                                logger.info(line)
-                    break
-
-                # 读取输出
-                output = reader.get_output(timeout=0.1)
-                if output:
-                    stream_name, line = output
-                    line = line.strip()
-                    if line:
-                        # 解析进度百分比
-                        if match := re.search(r"(\d+)%", line):
-                            progress = int(match.group(1))
-                            if progress == 100:
-                                is_finish = True
-                            mapped_progress = int(5 + (progress * 0.9))
-                            callback(mapped_progress, f"{mapped_progress} %")
-                        if "Subtitles are written to" in line:
-                            is_finish = True
-                            callback(*ASRStatus.COMPLETED.callback_tuple())
-                        if "error" in line or "Error" in line:
-                            error_msg += line
-                            logger.error(line)
-                        else:
-                            logger.info(line)
+            # 输出由共享的监督线程逐行读取（stderr 合并到 stdout）
+            self.process = get_process_supervisor().start(
+                cmd, on_line, merge_stderr=True
+            )
+            self.process.wait()
 
             if not is_finish:
                 logger.error("Faster Whisper 错误: %s", error_msg)
@@ -331,7 +312,10 @@ class FasterWhisperASR(BaseASR):
 
 def is_rtx_50_series() -> bool:
     """检测是否为 RTX 50 系显卡"""
-    if GPUtil is None:
+    try:
+        # GPUtil 依赖 distutils，导入较慢，仅在需要时加载
+        import GPUtil
+    except ImportError:
         logger.debug("GPUtil 未安装，无法检测 GPU 型号")
         return False
     try:
@@ -340,8 +324,8 @@ def is_rtx_50_series() -> bool:
             gpu_name = gpu.name.lower()
             # 检测是否包含 50 系列标识，如 RTX 5090, RTX 5080 等
             if re.search(r"rtx\s*50\d{2}", gpu_name):
-                logger.info(f"检测到 RTX 50 系显卡: {gpu.name}")
+                logger.info("检测到 RTX 50 系显卡: %s", gpu.name)
                 return True
     except Exception as e:
-        logger.debug(f"无法检测 GPU 型号: {e}")
+        logger.debug("无法检测 GPU 型号: %s", e)
     return False
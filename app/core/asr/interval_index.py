@@ -0,0 +1,59 @@
+"""字幕片段的时间区间索引
+
+片段按开始时间排序，并为每个位置记录前缀最大结束时间：查找时先用二分
+定位开始时间，再向前回溯到前缀最大结束时间不再覆盖查询点为止，典型情况
+下为 O(log n)。查询结果均为原序列中的下标。
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .asr_data import ASRDataSeg
+
+
+class IntervalIndex:
+    """不可变的时间区间索引，片段变化后需要重新构建"""
+
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]):
+        if len(starts) != len(ends):
+            raise ValueError("starts 与 ends 长度不一致")
+        self._order = sorted(range(len(starts)), key=starts.__getitem__)
+        self._starts = [starts[i] for i in self._order]
+        self._ends = [ends[i] for i in self._order]
+        self._max_end = list(accumulate(self._ends, max))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable["ASRDataSeg"]) -> "IntervalIndex":
+        segments = list(segments)
+        return cls(
+            [seg.start_time for seg in segments], [seg.end_time for seg in segments]
+        )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def at(self, ms: int) -> Optional[int]:
+        """包含 ms 的片段（start <= ms < end），重叠时返回开始最晚的片段"""
+        pos = bisect_right(self._starts, ms) - 1
+        while pos >= 0 and self._max_end[pos] > ms:
+            if self._ends[pos] > ms:
+                return self._order[pos]
+            pos -= 1
+        return None
+
+    def overlapping(self, start: float, end: float) -> List[int]:
+        """与 [start, end) 有交集的片段，按开始时间排序"""
+        pos = bisect_left(self._starts, end) - 1
+        result = []
+        while pos >= 0 and self._max_end[pos] > start:
+            if self._ends[pos] > start:
+                result.append(self._order[pos])
+            pos -= 1
+        result.reverse()
+        return result
+
+    def count_starting_before(self, ms: float) -> int:
+        """开始时间早于 ms 的片段数量"""
+        return bisect_left(self._starts, ms)
@@ -0,0 +1,120 @@
+"""本地 ASR 引擎并发调度
+
+根据物理核心数与可用内存，为 whisper.cpp / faster-whisper 选择并发进程数
+与每进程线程数，并据此确定分块长度，使长音频可以在多核 CPU 上并行转录。
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import psutil
+
+from ..utils.logger import setup_logger
+from .chunked_asr import DEFAULT_CHUNK_OVERLAP_SEC
+
+logger = setup_logger("local_scheduler")
+
+# 每个进程至少分配的线程数（whisper 在 4 线程以下扩展性较好，再少效率下降）
+MIN_THREADS_PER_PROCESS = 4
+# 单进程最多使用的线程数（超过后收益递减）
+MAX_THREADS_PER_PROCESS = 8
+# 分块长度范围（秒）
+MIN_CHUNK_LENGTH = 60 * 5
+MAX_CHUNK_LENGTH = 60 * 20
+# 预留给系统及其他程序的内存比例
+MEMORY_HEADROOM = 0.2
+
+# 各模型单进程内存占用估算（GB）
+_MODEL_MEMORY_GB = {
+    "tiny": 0.5,
+    "base": 0.7,
+    "small": 1.2,
+    "medium": 2.5,
+    "large": 4.5,
+}
+_DEFAULT_MODEL_MEMORY_GB = 2.5
+
+
+@dataclass
+class LocalASRPlan:
+    """本地转录并发方案"""
+
+    processes: int  # 并发 whisper 进程数
+    threads_per_process: int  # 每个进程的线程数
+    chunk_length: int  # 分块长度（秒）
+
+
+def get_physical_cores() -> int:
+    """获取物理核心数，无法获取时退回逻辑核心数"""
+    cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    return max(1, cores)
+
+
+def get_available_memory_gb() -> float:
+    """获取当前可用内存（GB）"""
+    return psutil.virtual_memory().available / 1024**3
+
+
+def estimate_model_memory_gb(model: Optional[str]) -> float:
+    """根据模型名称估算单进程内存占用"""
+    name = (model or "").lower()
+    for key, memory in _MODEL_MEMORY_GB.items():
+        if key in name:
+            return memory
+    return _DEFAULT_MODEL_MEMORY_GB
+
+
+def plan_local_transcription(
+    audio_duration: float,
+    model: Optional[str] = None,
+    device: str = "cpu",
+    physical_cores: Optional[int] = None,
+    available_memory_gb: Optional[float] = None,
+) -> LocalASRPlan:
+    """为本地 whisper 引擎规划并发进程数、线程数与分块长度
+
+    Args:
+        audio_duration: 音频时长（秒）
+        model: 模型名称，用于估算内存占用
+        device: 运行设备，cuda 时只使用单进程（显存是瓶颈）
+        physical_cores: 物理核心数，默认自动检测
+        available_memory_gb: 可用内存，默认自动检测
+
+    Returns:
+        LocalASRPlan
+    """
+    cores = physical_cores or get_physical_cores()
+    memory = (
+        available_memory_gb
+        if available_memory_gb is not None
+        else get_available_memory_gb()
+    )
+
+    if device != "cpu":
+        return LocalASRPlan(
+            processes=1,
+            threads_per_process=min(cores, MAX_THREADS_PER_PROCESS),
+            chunk_length=MAX_CHUNK_LENGTH,
+        )
+
+    by_cores = cores // MIN_THREADS_PER_PROCESS
+    by_memory = int(memory * (1 - MEMORY_HEADROOM) // estimate_model_memory_gb(model))
+    by_duration = math.ceil(audio_duration / MIN_CHUNK_LENGTH)
+    processes = max(1, min(by_cores, by_memory, by_duration))
+
+    threads = max(1, min(cores // processes, MAX_THREADS_PER_PROCESS))
+    # 每个进程恰好分到一块（加上重叠部分，避免末尾多出一个极短的块）
+    chunk_length = math.ceil(audio_duration / processes) + DEFAULT_CHUNK_OVERLAP_SEC
+    chunk_length = int(min(max(chunk_length, MIN_CHUNK_LENGTH), MAX_CHUNK_LENGTH))
+
+    plan = LocalASRPlan(
+        processes=processes, threads_per_process=threads, chunk_length=chunk_length
+    )
+    logger.info(
+        f"本地转录调度: 物理核心 {cores}, 可用内存 {memory:.1f}GB, "
+        f"进程数 {plan.processes}, 每进程线程 {plan.threads_per_process}, "
+        f"分块 {plan.chunk_length}s"
+    )
+    return plan
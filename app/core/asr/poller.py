@@ -0,0 +1,286 @@
+"""Shared result poller for cloud ASR tasks.
+
+Cloud ASR services (e.g. Bcut) return a task ID and expect the client to poll
+for the result. Instead of every chunk worker polling on its own fixed
+interval, all outstanding task IDs are registered with a single background
+poller that schedules queries with a backoff derived from the expected
+processing time and wakes the waiting workers through futures.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logger import setup_logger
+
+logger = setup_logger("asr_poller")
+
+# 轮询间隔（秒）
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 15.0
+BACKOFF_FACTOR = 1.5
+# 即将到期的任务提前合并到同一轮查询
+BATCH_WINDOW = 0.5
+# 首次轮询延迟 = 音频时长 * 比例（云端识别通常远快于实时）
+INITIAL_DELAY_RATIO = 0.02
+# 超时 = max(DEFAULT_TIMEOUT, 音频时长 * 比例)
+DEFAULT_TIMEOUT = 600.0
+TIMEOUT_RATIO = 2.0
+
+QueryFunc = Callable[[str], Any]
+BatchQueryFunc = Callable[[List[str]], Dict[str, Any]]
+
+
+@dataclass(order=True)
+class _PollEntry:
+    next_poll: float
+    seq: int
+    task_id: str = field(compare=False)
+    query: Optional[QueryFunc] = field(compare=False)
+    batch_query: Optional[BatchQueryFunc] = field(compare=False)
+    is_done: Callable[[Any], bool] = field(compare=False)
+    future: Future = field(compare=False)
+    interval: float = field(compare=False)
+    max_interval: float = field(compare=False)
+    deadline: float = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+
+
+class TaskPoller:
+    """Background poller shared by all cloud ASR chunk workers.
+
+    Tasks are kept in a heap ordered by their next poll time. A single daemon
+    thread sleeps until the earliest entry is due, queries every due task
+    (grouping tasks that share a ``batch_query`` into one request) and either
+    resolves the task's future or reschedules it with exponential backoff.
+
+    Example:
+        >>> future = get_task_poller().submit(
+        ...     task_id, query=asr.result, is_done=lambda r: r["state"] == 4,
+        ...     expected_duration=asr.audio_duration,
+        ... )
+        >>> resp = future.result()
+    """
+
+    def __init__(
+        self,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        backoff_factor: float = BACKOFF_FACTOR,
+        batch_window: float = BATCH_WINDOW,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.batch_window = batch_window
+
+        self._heap: List[_PollEntry] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics: Dict[str, int] = {
+            "submitted": 0,
+            "requests": 0,
+            "batch_requests": 0,
+            "not_ready": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+        }
+
+    def submit(
+        self,
+        task_id: str,
+        is_done: Callable[[Any], bool],
+        query: Optional[QueryFunc] = None,
+        batch_query: Optional[BatchQueryFunc] = None,
+        expected_duration: float = 0.0,
+        timeout: Optional[float] = None,
+    ) -> Future:
+        """Register a remote task and return a future for its final response.
+
+        Args:
+            task_id: Remote task identifier
+            is_done: Predicate telling whether a query response is final
+            query: Function querying a single task, ``query(task_id)``
+            batch_query: Function querying many tasks at once,
+                ``batch_query([task_id, ...]) -> {task_id: response}``.
+                Tasks sharing the same function are polled together.
+            expected_duration: Audio duration in seconds, used to derive the
+                first poll delay, the backoff ceiling and the timeout
+            timeout: Seconds before the future fails with ``TimeoutError``
+
+        Returns:
+            Future resolved with the first response accepted by ``is_done``
+        """
+        if query is None and batch_query is None:
+            raise ValueError("Either query or batch_query must be provided")
+
+        now = time.monotonic()
+        initial_delay = min(
+            max(expected_duration * INITIAL_DELAY_RATIO, self.min_interval),
+            self.max_interval,
+        )
+        if timeout is None:
+            timeout = max(DEFAULT_TIMEOUT, expected_duration * TIMEOUT_RATIO)
+
+        future: Future = Future()
+        entry = _PollEntry(
+            next_poll=now + initial_delay,
+            seq=next(self._seq),
+            task_id=task_id,
+            query=query,
+            batch_query=batch_query,
+            is_done=is_done,
+            future=future,
+            interval=initial_delay,
+            max_interval=self.max_interval,
+            deadline=now + timeout,
+        )
+
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            self._metrics["submitted"] += 1
+            self._ensure_thread()
+            self._cond.notify()
+        return future
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return a snapshot of poll counters and the number of pending tasks."""
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._heap)
+        return metrics
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._loop, name="asr-task-poller", daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    # 空闲一段时间后退出线程，下次提交时重新创建
+                    if not self._cond.wait(timeout=60):
+                        if not self._heap:
+                            self._thread = None
+                            return
+                delay = self._heap[0].next_poll - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                due = self._pop_due()
+
+            self._poll(due)
+
+    def _pop_due(self) -> List[_PollEntry]:
+        horizon = time.monotonic() + self.batch_window
+        due = []
+        while self._heap and self._heap[0].next_poll <= horizon:
+            due.append(heapq.heappop(self._heap))
+        return due
+
+    def _poll(self, entries: List[_PollEntry]) -> None:
+        singles = [e for e in entries if e.batch_query is None]
+        groups: Dict[BatchQueryFunc, List[_PollEntry]] = {}
+        for entry in entries:
+            if entry.batch_query is not None:
+                groups.setdefault(entry.batch_query, []).append(entry)
+
+        reschedule: List[_PollEntry] = []
+
+        for entry in singles:
+            entry.attempts += 1
+            self._count("requests")
+            try:
+                resp = entry.query(entry.task_id)  # type: ignore[misc]
+            except Exception as e:
+                self._fail(entry, e)
+                continue
+            if self._settle(entry, resp):
+                reschedule.append(entry)
+
+        for batch_query, group in groups.items():
+            for entry in group:
+                entry.attempts += 1
+            self._count("requests")
+            self._count("batch_requests")
+            try:
+                responses = batch_query([e.task_id for e in group])
+            except Exception as e:
+                for entry in group:
+                    self._fail(entry, e)
+                continue
+            for entry in group:
+                if entry.task_id not in responses:
+                    reschedule.append(entry)
+                elif self._settle(entry, responses[entry.task_id]):
+                    reschedule.append(entry)
+
+        if not reschedule:
+            return
+
+        now = time.monotonic()
+        with self._cond:
+            for entry in reschedule:
+                if now >= entry.deadline:
+                    self._metrics["timeouts"] += 1
+                    entry.future.set_exception(
+                        TimeoutError(f"ASR task {entry.task_id} timed out")
+                    )
+                    continue
+                entry.interval = min(
+                    max(entry.interval * self.backoff_factor, self.min_interval),
+                    entry.max_interval,
+                )
+                entry.next_poll = min(now + entry.interval, entry.deadline)
+                entry.seq = next(self._seq)
+                heapq.heappush(self._heap, entry)
+            self._cond.notify()
+
+    def _settle(self, entry: _PollEntry, resp: Any) -> bool:
+        """Resolve the entry if finished. Returns True if it must be polled again."""
+        try:
+            done = entry.is_done(resp)
+        except Exception as e:
+            self._fail(entry, e)
+            return False
+        if done:
+            self._count("completed")
+            logger.info(
+                f"ASR 任务 {entry.task_id} 完成，轮询 {entry.attempts} 次, "
+                f"累计指标: {self.get_metrics()}"
+            )
+            entry.future.set_result(resp)
+            return False
+        self._count("not_ready")
+        return True
+
+    def _fail(self, entry: _PollEntry, error: Exception) -> None:
+        logger.warning(f"轮询 ASR 任务 {entry.task_id} 失败: {error}")
+        self._count("failed")
+        entry.future.set_exception(error)
+
+    def _count(self, name: str) -> None:
+        with self._cond:
+            self._metrics[name] += 1
+
+
+_task_poller: Optional[TaskPoller] = None
+_task_poller_lock = threading.Lock()
+
+
+def get_task_poller() -> TaskPoller:
+    """Get the process-wide task poller instance."""
+    global _task_poller
+    with _task_poller_lock:
+        if _task_poller is None:
+            _task_poller = TaskPoller()
+        return _task_poller
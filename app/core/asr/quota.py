@@ -0,0 +1,208 @@
+"""Sliding-window quota ledger for public ASR services.
+
+Each service keeps a ring buffer of ``(timestamp, duration, reservation_id)``
+entries covering the rate-limit window. The buffer is held in memory and
+persisted as a single diskcache value together with a version token:
+admission checks read one small key inside a SQLite transaction (safe across
+threads and processes) and reload the ledger only when another process
+changed it.
+
+Concurrent chunks use ``reserve`` -> ``commit``/``release``: a reservation
+counts against the quota immediately, so parallel chunks cannot overrun the
+limit together, and failed requests can give their share back.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from diskcache import Cache
+
+from ..utils.cache import get_asr_cache
+from ..utils.logger import setup_logger
+
+logger = setup_logger("asr_quota")
+
+# (timestamp, duration, reservation_id)
+_Entry = Tuple[float, float, str]
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a reservation would exceed the service quota."""
+
+
+@dataclass(frozen=True)
+class QuotaReservation:
+    """Handle for a pending quota reservation."""
+
+    service: str
+    reservation_id: str
+    duration: float
+
+
+class _ServiceLedger:
+    """In-memory mirror of one service's persisted ledger."""
+
+    def __init__(self, max_calls: int):
+        self.entries: Deque[_Entry] = deque(maxlen=max_calls)
+        self.total_duration = 0.0
+        self.version: Optional[str] = None
+
+    def load(self, entries: List[_Entry], version: Optional[str]) -> None:
+        self.entries.clear()
+        self.entries.extend(tuple(e) for e in entries)  # type: ignore[misc]
+        self.total_duration = sum(e[1] for e in self.entries)
+        self.version = version
+
+    def prune(self, cutoff: float) -> None:
+        while self.entries and self.entries[0][0] < cutoff:
+            self.total_duration -= self.entries.popleft()[1]
+
+
+class QuotaLedger:
+    """Per-service sliding-window quota ledger.
+
+    Args:
+        max_calls: Maximum calls within the window
+        max_duration: Maximum total audio seconds within the window
+        window: Window length in seconds
+        cache: Backing diskcache instance (defaults to the ASR cache)
+    """
+
+    def __init__(
+        self,
+        max_calls: int,
+        max_duration: float,
+        window: float,
+        cache: Optional[Cache] = None,
+    ):
+        self.max_calls = max_calls
+        self.max_duration = max_duration
+        self.window = window
+        self._cache = cache if cache is not None else get_asr_cache()
+        self._ledgers: Dict[str, _ServiceLedger] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, service: str, duration: float) -> QuotaReservation:
+        """Reserve quota for one call of ``duration`` seconds.
+
+        Raises:
+            QuotaExceededError: If the call or duration limit would be exceeded
+        """
+        reservation_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock, self._cache.transact():
+            ledger = self._sync(service)
+            ledger.prune(now - self.window)
+
+            if ledger.total_duration + duration > self.max_duration:
+                raise QuotaExceededError(f"{service} duration limit exceeded")
+            if len(ledger.entries) >= self.max_calls:
+                raise QuotaExceededError(f"{service} call count limit exceeded")
+
+            ledger.entries.append((now, duration, reservation_id))
+            ledger.total_duration += duration
+            self._persist(service, ledger)
+
+        return QuotaReservation(service, reservation_id, duration)
+
+    def commit(
+        self, reservation: QuotaReservation, duration: Optional[float] = None
+    ) -> None:
+        """Confirm a reservation, optionally correcting its duration."""
+        if duration is None or duration == reservation.duration:
+            return
+        self._update(reservation, duration)
+
+    def release(self, reservation: QuotaReservation) -> None:
+        """Give a reservation back (e.g. the request failed before upload)."""
+        self._update(reservation, None)
+
+    def usage(self, service: str) -> Tuple[int, float]:
+        """Return (call count, total duration) within the current window."""
+        with self._lock, self._cache.transact():
+            ledger = self._sync(service)
+            ledger.prune(time.time() - self.window)
+            return len(ledger.entries), ledger.total_duration
+
+    def _update(self, reservation: QuotaReservation, duration: Optional[float]):
+        with self._lock, self._cache.transact():
+            ledger = self._sync(reservation.service)
+            for i, (ts, old_duration, rid) in enumerate(ledger.entries):
+                if rid != reservation.reservation_id:
+                    continue
+                if duration is None:
+                    del ledger.entries[i]
+                    ledger.total_duration -= old_duration
+                else:
+                    ledger.entries[i] = (ts, duration, rid)
+                    ledger.total_duration += duration - old_duration
+                self._persist(reservation.service, ledger)
+                return
+
+    def _sync(self, service: str) -> _ServiceLedger:
+        """Reload the service ledger if another process changed it."""
+        ledger = self._ledgers.get(service)
+        if ledger is None:
+            ledger = self._ledgers[service] = _ServiceLedger(self.max_calls)
+
+        version = self._cache.get(self._version_key(service), default=None)
+        if version is None:
+            ledger.load(self._legacy_entries(service), None)
+            self._persist(service, ledger)
+        elif version != ledger.version:
+            entries = self._cache.get(self._data_key(service), default=[])
+            ledger.load(entries or [], str(version))  # type: ignore[arg-type]
+        return ledger
+
+    def _persist(self, service: str, ledger: _ServiceLedger) -> None:
+        # 随机版本号，其他进程据此判断是否需要重新加载
+        ledger.version = uuid.uuid4().hex
+        expire = self.window + 3600
+        self._cache.set(self._data_key(service), list(ledger.entries), expire=expire)
+        self._cache.set(self._version_key(service), ledger.version, expire=expire)
+
+    def _legacy_entries(self, service: str) -> List[_Entry]:
+        """Import records written by the previous per-call rate limiter."""
+        tag = f"rate_limit:{service}"
+        cutoff = time.time() - self.window
+        try:
+            rows = self._cache._sql(
+                "SELECT key, store_time FROM Cache WHERE tag = ? AND store_time >= ?"
+                " ORDER BY store_time",
+                (tag, cutoff),
+            ).fetchall()
+        except Exception as e:
+            logger.debug(f"读取旧限流记录失败: {e}")
+            return []
+        entries = []
+        for key, store_time in rows:
+            duration = self._cache.get(key, default=None)
+            if isinstance(duration, (int, float)):
+                entries.append((store_time, float(duration), str(key)))
+        return entries[-self.max_calls :]
+
+    @staticmethod
+    def _data_key(service: str) -> str:
+        return f"rate_limit_ledger:{service}"
+
+    @staticmethod
+    def _version_key(service: str) -> str:
+        return f"rate_limit_ledger_version:{service}"
+
+
+_ledgers: Dict[Tuple[int, float, float], QuotaLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_quota_ledger(max_calls: int, max_duration: float, window: float) -> QuotaLedger:
+    """Get the shared ledger for the given limits."""
+    key = (max_calls, max_duration, window)
+    with _ledgers_lock:
+        if key not in _ledgers:
+            _ledgers[key] = QuotaLedger(max_calls, max_duration, window)
+        return _ledgers[key]
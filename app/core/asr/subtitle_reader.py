@@ -0,0 +1,285 @@
+"""字幕流式解析
+
+各格式的解析函数从文本文件对象逐行读取并逐条产出 ASRDataSeg，不把整份
+字幕读入内存。双语 SRT 的识别先按书写系统判断（中/英、日/英等一眼可分），
+只有两行属于同一种多语言共用的书写系统（如英/法）时才回退到 langdetect。
+"""
+
+import io
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ..utils.text_utils import SHARED_SCRIPTS, dominant_script
+from .asr_data import ASRDataSeg
+
+# 双语判断的采样块数与阈值
+BILINGUAL_SAMPLE_SIZE = 50
+BILINGUAL_RATIO = 0.7
+
+_SRT_TIME_PATTERN = re.compile(
+    r"(\d{2}):(\d{2}):(\d{1,2})[.,](\d{3})\s-->\s(\d{2}):(\d{2}):(\d{1,2})[.,](\d{3})"
+)
+_VTT_TIME_PATTERN = re.compile(
+    r"(?:(\d{2,}):)?(\d{2}):(\d{2})\.(\d{3})\s*-->\s*"
+    r"(?:(\d{2,}):)?(\d{2}):(\d{2})\.(\d{3})"
+)
+_VTT_INLINE_TAG = re.compile(r"<\d{2}:\d{2}:\d{2}\.\d{3}>|</?c>")
+_YOUTUBE_TIME_PATTERN = re.compile(
+    r"(\d{2}:\d{2}:\d{2}\.\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2}\.\d{3})"
+)
+_YOUTUBE_WORD_PATTERN = re.compile(r"<(\d{2}:\d{2}:\d{2}\.\d{3})>([^<]*)")
+_YOUTUBE_WORD_ROW = re.compile(r"<c>.*?</c>")
+_ASS_DIALOGUE_PATTERN = re.compile(
+    r"Dialogue: \d+,(\d+:\d{2}:\d{2}\.\d{2}),(\d+:\d{2}:\d{2}\.\d{2}),(.*?),.*?,\d+,\d+,\d+,.*?,(.*?)$"
+)
+_ASS_OVERRIDE_TAG = re.compile(r"\{[^}]*\}")
+
+
+def _to_ms(hours, minutes, seconds, milliseconds) -> int:
+    return (
+        int(hours or 0) * 3600000
+        + int(minutes) * 60000
+        + int(seconds) * 1000
+        + int(milliseconds)
+    )
+
+
+def _iter_blocks(lines: Iterable[str]) -> Iterator[List[str]]:
+    """按空行（含只有空白的行）把行分组"""
+    block: List[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _seekable(f: TextIO) -> TextIO:
+    """需要预扫描时保证文件对象可回退"""
+    return f if f.seekable() else io.StringIO(f.read())
+
+
+# ---------------------------------------------------------------------------
+# 双语识别
+# ---------------------------------------------------------------------------
+
+
+def _compare_scripts(first: str, second: str) -> Optional[bool]:
+    """两行是否为不同语言；书写系统无法区分时返回 None"""
+    first_script, second_script = dominant_script(first), dominant_script(second)
+    if first_script is None or second_script is None:
+        return False
+    if first_script != second_script:
+        return True
+    if first_script in SHARED_SCRIPTS:
+        return None
+    return False
+
+
+def _langdetect_differs(first: str, second: str) -> bool:
+    from langdetect import DetectorFactory, LangDetectException, detect
+
+    # 固定随机种子，保证同一文件每次的判断结果一致
+    DetectorFactory.seed = 0
+    try:
+        return detect(first) != detect(second)
+    except LangDetectException:
+        return False
+
+
+def is_bilingual_sample(pairs: Iterable[Tuple[str, str]]) -> bool:
+    """根据采样的 (第一行, 第二行) 判断是否为双语字幕
+
+    不同语言的块占采样数量（BILINGUAL_SAMPLE_SIZE）的比例达到 BILINGUAL_RATIO
+    即视为双语。先用书写系统判断，结论已确定时不再调用 langdetect。
+    """
+    needed = BILINGUAL_RATIO * BILINGUAL_SAMPLE_SIZE
+    different = 0
+    ambiguous: List[Tuple[str, str]] = []
+    for first, second in pairs:
+        result = _compare_scripts(first, second)
+        if result is None:
+            ambiguous.append((first, second))
+        elif result:
+            different += 1
+
+    if different >= needed:
+        return True
+    if different + len(ambiguous) < needed:
+        return False
+    for first, second in ambiguous:
+        different += _langdetect_differs(first, second)
+        if different >= needed:
+            return True
+    return False
+
+
+def _scan_srt_bilingual(f: TextIO) -> bool:
+    """预扫描：所有块都是 4 行（序号、时间、两行文本）且采样判断为双语
+
+    遇到第一个非 4 行的块即停止，单语字幕通常只需读取开头几行。
+    """
+    sample: List[Tuple[str, str]] = []
+    for block in _iter_blocks(f):
+        if len(block) != 4:
+            return False
+        if len(sample) < BILINGUAL_SAMPLE_SIZE:
+            sample.append((block[2], block[3]))
+    return is_bilingual_sample(sample)
+
+
+# ---------------------------------------------------------------------------
+# 解析函数
+# ---------------------------------------------------------------------------
+
+
+def iter_srt(f: TextIO) -> Iterator[ASRDataSeg]:
+    """逐条解析 SRT
+
+    所有块均为 4 行且两行文本为不同语言时按双语解析（原文 + 译文），否则
+    多行文本以空格拼接。
+    """
+    f = _seekable(f)
+    start = f.tell()
+    is_bilingual = _scan_srt_bilingual(f)
+    f.seek(start)
+
+    for block in _iter_blocks(f):
+        if len(block) < 3:
+            continue
+        match = _SRT_TIME_PATTERN.match(block[1])
+        if not match:
+            continue
+        parts = match.groups()
+        start_time, end_time = _to_ms(*parts[:4]), _to_ms(*parts[4:])
+        if is_bilingual and len(block) == 4:
+            yield ASRDataSeg(block[2], start_time, end_time, block[3])
+        else:
+            yield ASRDataSeg(" ".join(block[2:]), start_time, end_time)
+
+
+def iter_vtt(f: TextIO) -> Iterator[ASRDataSeg]:
+    """逐条解析 WebVTT（cue 序号可有可无，小时部分可省略）"""
+    for block in _iter_blocks(f):
+        for pos, line in enumerate(block[:2]):
+            match = _VTT_TIME_PATTERN.match(line)
+            if match:
+                break
+        else:
+            continue
+        parts = match.groups()
+        text = _VTT_INLINE_TAG.sub("", " ".join(block[pos + 1 :])).strip()
+        if text:
+            yield ASRDataSeg(text, _to_ms(*parts[:4]), _to_ms(*parts[4:]))
+
+
+def _parse_youtube_time(ts: str) -> int:
+    h, m, s = ts.split(":")
+    return int(float(h) * 3600000 + float(m) * 60000 + float(s) * 1000)
+
+
+def iter_youtube_vtt(f: TextIO) -> Iterator[ASRDataSeg]:
+    """逐词解析 YouTube 自动字幕（带 <c> 标签的词级时间戳）
+
+    每个 cue 只取第一行带 <c> 标签的文本，其余为上一条 cue 的重复内容。
+    """
+    for block in _iter_blocks(f):
+        match = _YOUTUBE_TIME_PATTERN.match(block[0])
+        if not match:
+            continue
+        row = next((line for line in block[1:] if _YOUTUBE_WORD_ROW.search(line)), None)
+        if row is None:
+            continue
+        text = row.replace("<c>", "").replace("</c>", "")
+        text = f"<{match.group(1)}>{text}<{match.group(2)}>"
+        words = list(_YOUTUBE_WORD_PATTERN.finditer(text))
+        for current, following in zip(words, words[1:]):
+            word = current.group(2).strip()
+            if word:
+                yield ASRDataSeg(
+                    word,
+                    _parse_youtube_time(current.group(1)),
+                    _parse_youtube_time(following.group(1)),
+                )
+
+
+def _parse_ass_time(time_str: str) -> int:
+    hours, minutes, seconds = time_str.split(":")
+    seconds, centiseconds = seconds.split(".")
+    return (
+        int(hours) * 3600000
+        + int(minutes) * 60000
+        + int(seconds) * 1000
+        + int(centiseconds) * 10
+    )
+
+
+def iter_ass(f: TextIO) -> Iterator[ASRDataSeg]:
+    """逐条解析 ASS
+
+    本程序生成的 ASS 中双语字幕是时间相同的两条 Dialogue（Default 为译文
+    所在样式），按时间配对合并；未配对的在最后产出。
+    """
+    has_translation = False
+    pending: Dict[Tuple[int, int], ASRDataSeg] = {}
+
+    for line in f:
+        if not line.startswith("Dialogue:"):
+            if "Script generated by VideoCaptioner" in line:
+                has_translation = True
+            continue
+        match = _ASS_DIALOGUE_PATTERN.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+        start_time = _parse_ass_time(match.group(1))
+        end_time = _parse_ass_time(match.group(2))
+        style = match.group(3).strip()
+        text = _ASS_OVERRIDE_TAG.sub("", match.group(4)).replace("\\N", "\n").strip()
+        if not text:
+            continue
+
+        if not has_translation:
+            yield ASRDataSeg(text, start_time, end_time)
+            continue
+
+        key = (start_time, end_time)
+        segment = pending.pop(key, None)
+        is_new = segment is None
+        if segment is None:
+            segment = ASRDataSeg("", start_time, end_time)
+        if style == "Default":
+            segment.translated_text = text
+        else:
+            segment.text = text
+        if is_new:
+            pending[key] = segment
+        else:
+            yield segment
+
+    yield from pending.values()
+
+
+def contains(f: TextIO, needle: str) -> bool:
+    """逐行查找文本，查找后文件位置回到开头"""
+    start = f.tell()
+    try:
+        return any(needle in line for line in f)
+    finally:
+        f.seek(start)
+
+
+def iter_subtitle(f: TextIO, suffix: str) -> Iterator[ASRDataSeg]:
+    """按扩展名（.srt/.vtt/.ass）选择解析函数"""
+    suffix = suffix.lower()
+    if suffix == ".srt":
+        return iter_srt(f)
+    if suffix == ".vtt":
+        f = _seekable(f)
+        return iter_youtube_vtt(f) if contains(f, "<c>") else iter_vtt(f)
+    if suffix == ".ass":
+        return iter_ass(f)
+    raise ValueError(f"Unsupported file format: {suffix}")
@@ -0,0 +1,314 @@
+"""字幕流式序列化
+
+各格式的写入函数逐条把片段写入文本文件句柄，不在内存中拼接整份内容。
+布局相关的分支在写入前按布局选出格式化函数，时间戳字符串带缓存（词级
+字幕中相邻片段的结束/开始时间大量重复）。
+"""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TextIO
+
+from ..entities import SubtitleLayoutEnum
+
+if TYPE_CHECKING:
+    from .asr_data import ASRData, ASRDataSeg
+
+TextFormatter = Callable[[str, str], str]
+AssFormatter = Callable[[str, str, str, str], str]
+
+DEFAULT_ASS_STYLE = (
+    "[V4+ Styles]\n"
+    "Format: Name,Fontname,Fontsize,PrimaryColour,SecondaryColour,OutlineColour,BackColour,"
+    "Bold,Italic,Underline,StrikeOut,ScaleX,ScaleY,Spacing,Angle,BorderStyle,Outline,Shadow,"
+    "Alignment,MarginL,MarginR,MarginV,Encoding\n"
+    "Style: Default,MicrosoftYaHei-Bold,40,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,-1,0,0,0,100,100,"
+    "0,0,1,2,0,2,10,10,15,1\n"
+    "Style: Secondary,MicrosoftYaHei-Bold,30,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,-1,0,0,0,100,100,"
+    "0,0,1,2,0,2,10,10,15,1"
+)
+
+_ASS_DIALOGUE_TEMPLATE = "Dialogue: 0,{},{},{},,0,0,0,,{}\n"
+
+_JSON_STRING_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# 时间戳缓存容量
+_TIMESTAMP_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def ms_to_srt_time(ms: int) -> str:
+    """毫秒转 SRT 时间（HH:MM:SS,mmm）"""
+    total_seconds, milliseconds = divmod(ms, 1000)
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{int(milliseconds):03}"
+
+
+@lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def ms_to_vtt_time(ms: int) -> str:
+    """毫秒转 WebVTT 时间（HH:MM:SS.mmm）"""
+    return ms_to_srt_time(ms).replace(",", ".")
+
+
+@lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def ms_to_ass_time(ms: int) -> str:
+    """毫秒转 ASS 时间（H:MM:SS.cc）"""
+    total_seconds, milliseconds = divmod(ms, 1000)
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    centiseconds = int(milliseconds / 10)
+    return f"{int(hours):01}:{int(minutes):02}:{int(seconds):02}.{centiseconds:02}"
+
+
+# ---------------------------------------------------------------------------
+# 纯文本布局（SRT / VTT / TXT）
+# ---------------------------------------------------------------------------
+
+
+def _original_on_top(original: str, translated: str) -> str:
+    return f"{original}\n{translated}" if translated else original
+
+
+def _translate_on_top(original: str, translated: str) -> str:
+    return f"{translated}\n{original}" if translated else original
+
+
+def _only_original(original: str, translated: str) -> str:
+    return original
+
+
+def _only_translate(original: str, translated: str) -> str:
+    return translated if translated else original
+
+
+_TEXT_FORMATTERS: Dict[SubtitleLayoutEnum, TextFormatter] = {
+    SubtitleLayoutEnum.ORIGINAL_ON_TOP: _original_on_top,
+    SubtitleLayoutEnum.TRANSLATE_ON_TOP: _translate_on_top,
+    SubtitleLayoutEnum.ONLY_ORIGINAL: _only_original,
+}
+
+
+def select_text_formatter(layout: SubtitleLayoutEnum) -> TextFormatter:
+    """按布局选择文本格式化函数"""
+    return _TEXT_FORMATTERS.get(layout, _only_translate)
+
+
+# ---------------------------------------------------------------------------
+# ASS 布局
+# ---------------------------------------------------------------------------
+
+
+def _has_translation(translated: str) -> bool:
+    return bool(translated and translated.strip())
+
+
+def _ass_translate_on_top(start: str, end: str, original: str, translated: str) -> str:
+    if not _has_translation(translated):
+        return _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", original)
+    return _ASS_DIALOGUE_TEMPLATE.format(
+        start, end, "Secondary", original
+    ) + _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", translated)
+
+
+def _ass_original_on_top(start: str, end: str, original: str, translated: str) -> str:
+    if not _has_translation(translated):
+        return _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", original)
+    return _ASS_DIALOGUE_TEMPLATE.format(
+        start, end, "Secondary", translated
+    ) + _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", original)
+
+
+def _ass_only_original(start: str, end: str, original: str, translated: str) -> str:
+    return _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", original)
+
+
+def _ass_only_translate(start: str, end: str, original: str, translated: str) -> str:
+    text = translated if _has_translation(translated) else original
+    return _ASS_DIALOGUE_TEMPLATE.format(start, end, "Default", text)
+
+
+_ASS_FORMATTERS: Dict[SubtitleLayoutEnum, AssFormatter] = {
+    SubtitleLayoutEnum.TRANSLATE_ON_TOP: _ass_translate_on_top,
+    SubtitleLayoutEnum.ORIGINAL_ON_TOP: _ass_original_on_top,
+    SubtitleLayoutEnum.ONLY_ORIGINAL: _ass_only_original,
+}
+
+
+def select_ass_formatter(layout: SubtitleLayoutEnum) -> AssFormatter:
+    """按布局选择 Dialogue 行格式化函数"""
+    return _ASS_FORMATTERS.get(layout, _ass_only_translate)
+
+
+def build_ass_header(style_str: Optional[str] = None) -> str:
+    """Build the ASS header up to and including the [Events] format line."""
+    return (
+        "[Script Info]\n"
+        "; Script generated by VideoCaptioner\n"
+        "; https://github.com/weifeng2333\n"
+        "ScriptType: v4.00+\n"
+        "PlayResX: 1280\n"
+        "PlayResY: 720\n\n"
+        f"{style_str or DEFAULT_ASS_STYLE}\n\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+
+def format_ass_dialogues(
+    start_time: str,
+    end_time: str,
+    original: str,
+    translated: str,
+    layout: SubtitleLayoutEnum,
+) -> str:
+    """Format the Dialogue line(s) of one segment according to the layout.
+
+    Args:
+        start_time: ASS start timestamp
+        end_time: ASS end timestamp
+        original: Original text
+        translated: Translated text (may be empty)
+        layout: Subtitle layout mode
+
+    Returns:
+        One or two newline-terminated Dialogue lines
+    """
+    return select_ass_formatter(layout)(start_time, end_time, original, translated)
+
+
+# ---------------------------------------------------------------------------
+# 写入函数
+# ---------------------------------------------------------------------------
+
+
+def write_srt(
+    f: TextIO,
+    segments: Iterable["ASRDataSeg"],
+    layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+) -> None:
+    """写入 SRT（各条目之间以空行分隔）"""
+    fmt = select_text_formatter(layout)
+    write = f.write
+    for n, seg in enumerate(segments, 1):
+        if n > 1:
+            write("\n")
+        write(
+            f"{n}\n{ms_to_srt_time(seg.start_time)} --> "
+            f"{ms_to_srt_time(seg.end_time)}\n"
+            f"{fmt(seg.text, seg.translated_text)}\n"
+        )
+
+
+def write_vtt(
+    f: TextIO,
+    segments: Iterable["ASRDataSeg"],
+    layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+) -> None:
+    """写入 WebVTT"""
+    fmt = select_text_formatter(layout)
+    write = f.write
+    write("WEBVTT\n")
+    for n, seg in enumerate(segments, 1):
+        write(
+            f"\n{n}\n{ms_to_vtt_time(seg.start_time)} --> "
+            f"{ms_to_vtt_time(seg.end_time)}\n"
+            f"{fmt(seg.text, seg.translated_text)}\n"
+        )
+
+
+def write_txt(
+    f: TextIO,
+    segments: Iterable["ASRDataSeg"],
+    layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+) -> None:
+    """写入纯文本（无时间戳，条目之间换行）"""
+    fmt = select_text_formatter(layout)
+    write = f.write
+    for n, seg in enumerate(segments):
+        if n:
+            write("\n")
+        write(fmt(seg.text, seg.translated_text))
+
+
+def write_ass(
+    f: TextIO,
+    segments: Iterable["ASRDataSeg"],
+    style_str: Optional[str] = None,
+    layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+) -> None:
+    """写入 ASS"""
+    fmt = select_ass_formatter(layout)
+    write = f.write
+    write(build_ass_header(style_str))
+    for seg in segments:
+        write(
+            fmt(
+                ms_to_ass_time(seg.start_time),
+                ms_to_ass_time(seg.end_time),
+                seg.text,
+                seg.translated_text,
+            )
+        )
+
+
+def write_json(f: TextIO, segments: Iterable["ASRDataSeg"]) -> None:
+    """写入与 json.dump(ASRData.to_json(), ensure_ascii=False) 相同的内容"""
+    encode = _JSON_STRING_ENCODER.encode
+    write = f.write
+    write("{")
+    for n, seg in enumerate(segments, 1):
+        if n > 1:
+            write(", ")
+        write(
+            f'"{n}": {{"start_time": {seg.start_time}, "end_time": {seg.end_time}, '
+            f'"original_subtitle": {encode(seg.text)}, '
+            f'"translated_subtitle": {encode(seg.translated_text)}}}'
+        )
+    write("}")
+
+
+# ---------------------------------------------------------------------------
+# 后台保存
+# ---------------------------------------------------------------------------
+
+
+class BackgroundSaver:
+    """在后台线程中保存字幕文件
+
+    提交时复制一份片段快照，调用方可以继续修改原数据；文件按提交顺序由
+    同一个线程写入。wait() 等待已提交的写入完成并抛出其中的第一个异常。
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="subtitle-saver"
+        )
+        self._pending: List[Future] = []
+
+    def save(
+        self, asr_data: "ASRData", save_path: str, sidecar: bool = False, **kwargs
+    ) -> None:
+        """提交保存任务，参数同 ASRData.save；sidecar 为 True 时随后写入 .asrd"""
+        snapshot = asr_data.copy()
+
+        def job() -> None:
+            snapshot.save(save_path, **kwargs)
+            if sidecar:
+                from . import asr_binary
+
+                asr_binary.save_sidecar(snapshot, save_path)
+
+        self._pending.append(self._executor.submit(job))
+
+    def wait(self) -> None:
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
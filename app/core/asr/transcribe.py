@@ -1,11 +1,13 @@
+from typing import TYPE_CHECKING, Optional
+
 from app.core.asr.asr_data import ASRData
-from app.core.asr.bcut import BcutASR
-from app.core.asr.chunked_asr import ChunkedASR
-from app.core.asr.faster_whisper import FasterWhisperASR
-from app.core.asr.jianying import JianYingASR
-from app.core.asr.whisper_api import WhisperAPI
-from app.core.asr.whisper_cpp import WhisperCppASR
+from app.core.asr.local_scheduler import plan_local_transcription
 from app.core.entities import TranscribeConfig, TranscribeModelEnum
+from app.core.utils.media_probe import get_media_duration
+
+# 各引擎在创建实例时才导入，只加载实际使用的那个（及其依赖）
+if TYPE_CHECKING:
+    from app.core.asr.chunked_asr import ChunkedASR
 
 
 def transcribe(audio_path: str, config: TranscribeConfig, callback=None) -> ASRData:
@@ -42,7 +44,7 @@ def transcribe(audio_path: str, config: TranscribeConfig, callback=None) -> ASRD
     return asr_data
 
 
-def _create_asr_instance(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_asr_instance(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create appropriate ASR instance based on configuration.
 
     Args:
@@ -73,8 +75,11 @@ def _create_asr_instance(audio_path: str, config: TranscribeConfig) -> ChunkedAS
         raise ValueError(f"Invalid transcription model: {model_type}")
 
 
-def _create_jianying_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_jianying_asr(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create JianYing ASR instance with chunking support."""
+    from app.core.asr.chunked_asr import ChunkedASR
+    from app.core.asr.jianying import JianYingASR
+
     asr_kwargs = {
         "use_cache": True,
         "need_word_time_stamp": config.need_word_time_stamp,
@@ -84,8 +89,11 @@ def _create_jianying_asr(audio_path: str, config: TranscribeConfig) -> ChunkedAS
     )
 
 
-def _create_bijian_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_bijian_asr(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create Bijian ASR instance with chunking support."""
+    from app.core.asr.bcut import BcutASR
+    from app.core.asr.chunked_asr import ChunkedASR
+
     asr_kwargs = {
         "use_cache": True,
         "need_word_time_stamp": config.need_word_time_stamp,
@@ -93,25 +101,26 @@ def _create_bijian_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
     return ChunkedASR(asr_class=BcutASR, audio_path=audio_path, asr_kwargs=asr_kwargs)
 
 
-def _create_whisper_cpp_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_whisper_cpp_asr(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create WhisperCpp ASR instance with chunking support."""
+    from app.core.asr.whisper_cpp import WhisperCppASR
+
     asr_kwargs = {
         "use_cache": True,
         "need_word_time_stamp": config.need_word_time_stamp,
         "language": config.transcribe_language,
         "whisper_model": config.whisper_model.value if config.whisper_model else None,
     }
-    return ChunkedASR(
-        asr_class=WhisperCppASR,
-        audio_path=audio_path,
-        asr_kwargs=asr_kwargs,
-        chunk_concurrency=1,  # 本地转录使用单线程
-        chunk_length=60 * 20,  # 每块20分钟
+    return _create_local_chunked_asr(
+        WhisperCppASR, audio_path, asr_kwargs, model=asr_kwargs["whisper_model"]
     )
 
 
-def _create_whisper_api_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_whisper_api_asr(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create Whisper API ASR instance with chunking support."""
+    from app.core.asr.chunked_asr import ChunkedASR
+    from app.core.asr.whisper_api import WhisperAPI
+
     asr_kwargs = {
         "use_cache": True,
         "need_word_time_stamp": config.need_word_time_stamp,
@@ -120,14 +129,17 @@ def _create_whisper_api_asr(audio_path: str, config: TranscribeConfig) -> Chunke
         "api_key": config.whisper_api_key or "",
         "base_url": config.whisper_api_base or "",
         "prompt": config.whisper_api_prompt or "",
+        "upload_profile": config.whisper_api_upload_profile,
     }
     return ChunkedASR(
         asr_class=WhisperAPI, audio_path=audio_path, asr_kwargs=asr_kwargs
     )
 
 
-def _create_faster_whisper_asr(audio_path: str, config: TranscribeConfig) -> ChunkedASR:
+def _create_faster_whisper_asr(audio_path: str, config: TranscribeConfig) -> "ChunkedASR":
     """Create FasterWhisper ASR instance with chunking support."""
+    from app.core.asr.faster_whisper import FasterWhisperASR
+
     asr_kwargs = {
         "use_cache": True,
         "need_word_time_stamp": config.need_word_time_stamp,
@@ -149,12 +161,49 @@ def _create_faster_whisper_asr(audio_path: str, config: TranscribeConfig) -> Chu
         "one_word": config.faster_whisper_one_word,
         "prompt": config.faster_whisper_prompt,
     }
+    return _create_local_chunked_asr(
+        FasterWhisperASR,
+        audio_path,
+        asr_kwargs,
+        model=asr_kwargs["whisper_model"],
+        device=config.faster_whisper_device,
+    )
+
+
+def _create_local_chunked_asr(
+    asr_class: type,
+    audio_path: str,
+    asr_kwargs: dict,
+    model: Optional[str],
+    device: str = "cpu",
+) -> "ChunkedASR":
+    """Create chunked ASR for a local engine, split across CPU cores.
+
+    The local scheduler picks how many whisper processes run concurrently
+    and how many threads each one gets, based on physical cores and memory.
+    """
+    from app.core.asr.chunked_asr import ChunkedASR
+
+    duration = get_media_duration(audio_path)
+    if duration is None:
+        # 无法读取时长时按单进程处理
+        return ChunkedASR(
+            asr_class=asr_class,
+            audio_path=audio_path,
+            asr_kwargs=asr_kwargs,
+            chunk_concurrency=1,
+            chunk_length=60 * 20,
+            chunk_format="wav",
+        )
+
+    plan = plan_local_transcription(duration, model=model, device=device)
     return ChunkedASR(
-        asr_class=FasterWhisperASR,
+        asr_class=asr_class,
         audio_path=audio_path,
-        asr_kwargs=asr_kwargs,
-        chunk_concurrency=1,  # 本地转录使用单线程
-        chunk_length=60 * 20,  # 每块20分钟
+        asr_kwargs={**asr_kwargs, "threads": plan.threads_per_process},
+        chunk_concurrency=plan.processes,
+        chunk_length=plan.chunk_length,
+        chunk_format="wav",
     )
 
 
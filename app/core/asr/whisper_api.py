@@ -1,15 +1,92 @@
-from typing import Any, Callable, List, Optional, Union
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 from openai import OpenAI
 
 from app.core.llm.client import normalize_base_url
 
+from ..utils.cache import is_cache_enabled
 from ..utils.logger import setup_logger
 from .asr_data import ASRDataSeg
 from .base import BaseASR
 
 logger = setup_logger("whisper_api")
 
+# OpenAI Whisper API 单文件上传上限
+DEFAULT_MAX_FILE_SIZE = 25 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class UploadProfile:
+    """Audio transcoding profile applied before uploading to the API.
+
+    Attributes:
+        format: Container format passed to ffmpeg (e.g. ogg, mp3)
+        codec: Audio codec, None to use the container default
+        bitrate: Target bitrate, e.g. "32k"
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+        mime_type: MIME type sent with the upload
+        max_file_size: API file size limit in bytes
+    """
+
+    format: str
+    codec: Optional[str]
+    bitrate: str
+    sample_rate: int = 16000
+    channels: int = 1
+    mime_type: str = "audio/ogg"
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used in cache keys."""
+        return f"{self.format}-{self.codec}-{self.bitrate}-{self.sample_rate}-{self.channels}"
+
+    @property
+    def bitrate_bps(self) -> int:
+        value = self.bitrate.lower()
+        if value.endswith("k"):
+            return int(float(value[:-1]) * 1000)
+        return int(value)
+
+    def max_chunk_length(self, safety_ratio: float = 0.9) -> int:
+        """Longest chunk (seconds) whose encoded size stays under the size cap."""
+        return int(self.max_file_size * 8 / self.bitrate_bps * safety_ratio)
+
+
+UPLOAD_PROFILES = {
+    # 16 kHz 单声道 Opus，语音识别足够，体积约为默认 MP3 的 1/4
+    "opus": UploadProfile(format="ogg", codec="libopus", bitrate="32k"),
+    "mp3": UploadProfile(
+        format="mp3", codec=None, bitrate="64k", mime_type="audio/mpeg"
+    ),
+}
+DEFAULT_UPLOAD_PROFILE = "opus"
+
+# 文件头魔数 -> (扩展名, MIME)
+_AUDIO_SIGNATURES: List[Tuple[bytes, str, str]] = [
+    (b"RIFF", "wav", "audio/wav"),
+    (b"fLaC", "flac", "audio/flac"),
+    (b"OggS", "ogg", "audio/ogg"),
+    (b"ID3", "mp3", "audio/mpeg"),
+    (b"\xff\xfb", "mp3", "audio/mpeg"),
+    (b"\xff\xf3", "mp3", "audio/mpeg"),
+    (b"\xff\xf2", "mp3", "audio/mpeg"),
+]
+
+
+def detect_audio_format(data: bytes) -> Tuple[str, str]:
+    """Guess (extension, mime type) of audio bytes from their header."""
+    for signature, ext, mime in _AUDIO_SIGNATURES:
+        if data.startswith(signature):
+            return ext, mime
+    if data[4:8] == b"ftyp":
+        return "m4a", "audio/mp4"
+    return "mp3", "audio/mpeg"
+
 
 class WhisperAPI(BaseASR):
     """OpenAI-compatible Whisper API implementation.
@@ -27,6 +104,7 @@ class WhisperAPI(BaseASR):
         base_url: str = "",
         api_key: str = "",
         use_cache: bool = False,
+        upload_profile: Optional[Union[str, UploadProfile]] = DEFAULT_UPLOAD_PROFILE,
     ):
         """Initialize Whisper API.
 
@@ -39,6 +117,8 @@ class WhisperAPI(BaseASR):
             base_url: API base URL
             api_key: API key
             use_cache: Enable caching
+            upload_profile: Transcoding profile (name from UPLOAD_PROFILES or
+                UploadProfile instance), None to upload the input unchanged
         """
         super().__init__(audio_input, use_cache)
 
@@ -52,6 +132,10 @@ class WhisperAPI(BaseASR):
         self.language = language
         self.prompt = prompt
         self.need_word_time_stamp = need_word_time_stamp
+        if isinstance(upload_profile, str):
+            upload_profile = UPLOAD_PROFILES[upload_profile]
+        self.upload_profile = upload_profile
+        self._upload_file: Optional[Tuple[str, bytes, str]] = None
 
         self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
 
@@ -98,7 +182,7 @@ class WhisperAPI(BaseASR):
             completion = self.client.audio.transcriptions.create(
                 model=self.model,
                 response_format="verbose_json",
-                file=("audio.mp3", self.file_binary or b"", "audio/mp3"),
+                file=self._get_upload_file(),
                 prompt=self.prompt,
                 language=self.language,
                 timestamp_granularities=["word", "segment"],
@@ -111,3 +195,77 @@ class WhisperAPI(BaseASR):
         except Exception as e:
             logger.exception(f"WhisperAPI failed: {str(e)}")
             raise e
+
+    def _get_upload_file(self) -> Tuple[str, bytes, str]:
+        """Get (filename, data, mime) to upload, encoding once per content.
+
+        The encoded payload is kept on the instance and in the ASR disk cache,
+        so retries and re-runs of the same audio skip re-encoding.
+        """
+        if self._upload_file is not None:
+            return self._upload_file
+
+        data = self.file_binary or b""
+        profile = self.upload_profile
+        if profile is not None and data:
+            cache_key = f"whisper_api_upload:{self.crc32_hex}:{profile.key}"
+            encoded = self._cache.get(cache_key) if is_cache_enabled() else None
+            if encoded is None:
+                encoded = self._encode(data, profile)
+                if encoded is not None and is_cache_enabled():
+                    self._cache.set(cache_key, encoded, expire=86400 * 2)
+            if encoded is not None:
+                if len(encoded) > profile.max_file_size:
+                    logger.warning(
+                        f"上传文件 {len(encoded)} bytes 超过限制 {profile.max_file_size} bytes"
+                    )
+                self._upload_file = (
+                    f"audio.{profile.format}",
+                    encoded,
+                    profile.mime_type,
+                )
+                return self._upload_file
+
+        ext, mime = detect_audio_format(data)
+        self._upload_file = (f"audio.{ext}", data, mime)
+        return self._upload_file
+
+    @staticmethod
+    def _encode(data: bytes, profile: UploadProfile) -> Optional[bytes]:
+        """Transcode audio bytes with the given profile, None on failure.
+
+        Runs a single ffmpeg process over pipes, without decoding in Python.
+        """
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-vn",
+            "-ac",
+            str(profile.channels),
+            "-ar",
+            str(profile.sample_rate),
+        ]
+        if profile.codec:
+            cmd.extend(["-c:a", profile.codec])
+        cmd.extend(["-b:a", profile.bitrate, "-f", profile.format, "pipe:1"])
+        try:
+            result = subprocess.run(
+                cmd,
+                input=data,
+                capture_output=True,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
+            )
+            if result.returncode != 0 or not result.stdout:
+                raise RuntimeError(result.stderr.decode("utf-8", errors="replace"))
+        except Exception as e:
+            logger.warning(f"音频转码失败，使用原始音频上传: {e}")
+            return None
+        encoded = result.stdout
+        logger.info(
+            f"上传音频转码: {len(data)} -> {len(encoded)} bytes ({profile.key})"
+        )
+        return encoded
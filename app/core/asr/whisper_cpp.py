@@ -1,7 +1,6 @@
 import os
 import re
 import shutil
-import subprocess
 import sys
 import tempfile
 import time
@@ -9,13 +8,17 @@ from pathlib import Path
 from typing import Any, Callable, List, Optional, Union
 
 from ...config import MODEL_PATH
-from ..utils.logger import setup_logger
-from ..utils.subprocess_helper import StreamReader
+from ..utils.logger import rate_limit, setup_logger
+from ..utils.media_probe import get_media_duration
+from ..utils.subprocess_helper import ProgressThrottle, get_process_supervisor
 from .asr_data import ASRData, ASRDataSeg
 from .base import BaseASR
 from .status import ASRStatus
 
-logger = setup_logger("whisper_asr")
+logger = rate_limit(setup_logger("whisper_asr"))
+
+# whisper.cpp 输出的字幕行："[00:01:02.500 --> 00:01:05.000]  text"
+_SEGMENT_TIME_PATTERN = re.compile(r"\[(\d+):(\d{2}):(\d{2}(?:\.\d+)?)\s*-->")
 
 
 class WhisperCppASR(BaseASR):
@@ -32,6 +35,7 @@ class WhisperCppASR(BaseASR):
         whisper_model=None,
         use_cache: bool = False,
         need_word_time_stamp: bool = False,
+        threads: Optional[int] = None,
     ):
         super().__init__(audio_input, use_cache)
 
@@ -62,6 +66,7 @@ class WhisperCppASR(BaseASR):
         self.whisper_cpp_path = Path(whisper_cpp_path)
         self.need_word_time_stamp = need_word_time_stamp
         self.language = language
+        self.threads = threads
 
         self.process = None
 
@@ -96,6 +101,9 @@ class WhisperCppASR(BaseASR):
             "--output-srt",
         ]
 
+        if self.threads:
+            whisper_params.extend(["-t", str(self.threads)])
+
         if not is_const_me_version:
             if sys.platform != "darwin":
                 whisper_params.append("--no-gpu")
@@ -128,14 +136,8 @@ class WhisperCppASR(BaseASR):
             output_path = wav_path.with_suffix(".srt")
 
             try:
-                # 复制音频文件
-                if isinstance(self.audio_input, str):
-                    shutil.copy2(self.audio_input, wav_path)
-                else:
-                    if self.file_binary:
-                        wav_path.write_bytes(self.file_binary)
-                    else:
-                        raise ValueError("No audio data available")
+                # 链接音频文件（无需复制）
+                self._materialize_input(wav_path)
 
                 # Build command
                 whisper_params = self._build_command(
@@ -147,63 +149,28 @@ class WhisperCppASR(BaseASR):
                 total_duration = self.audio_duration
                 logger.info("Audio duration: %d seconds", total_duration)
 
-                # Start process
-                self.process = subprocess.Popen(
-                    whisper_params,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding="utf-8",
-                    bufsize=1,
-                )
-
-                logger.info(f"Whisper.cpp process started, PID: {self.process.pid}")
-
-                # Process output with StreamReader
-                reader = StreamReader(self.process)
-                reader.start_reading()
-
-                last_progress = 0
-
-                while True:
-                    # Check process status
-                    if self.process.poll() is not None:
-                        time.sleep(0.2)
-                        for stream_name, line in reader.get_remaining_output():
-                            if stream_name == "stderr":
-                                logger.debug(f"[stderr] {line.strip()}")
-                        break
-
-                    # Non-blocking output reading
-                    output = reader.get_output(timeout=0.1)
-                    if output:
-                        stream_name, line = output
-
-                        if stream_name == "stdout":
-                            logger.debug(f"[stdout] {line.strip()}")
-
-                            # Parse progress
-                            if " --> " in line and "[" in line:
-                                try:
-                                    time_str = (
-                                        line.split("[")[1].split(" -->")[0].strip()
-                                    )
-                                    parts = time_str.split(":")
-                                    current_time = sum(
-                                        float(x) * y
-                                        for x, y in zip(reversed(parts), [1, 60, 3600])
-                                    )
-                                    progress = int(
-                                        min(current_time / total_duration * 100, 98)
-                                    )
-
-                                    if progress > last_progress:
-                                        last_progress = progress
-                                        callback(progress, f"{progress}%")
-                                except (ValueError, IndexError) as e:
-                                    logger.debug(f"Progress parse failed: {e}")
-                        else:
-                            logger.debug(f"[stderr] {line.strip()}")
+                throttle = ProgressThrottle()
+
+                def on_line(stream_name: str, line: str) -> None:
+                    if stream_name != "stdout":
+                        logger.debug("[stderr] %s", line)
+                        return
+                    logger.debug("[stdout] %s", line)
+
+                    # Parse progress from "[00:01:02.500 --> ...]"
+                    match = _SEGMENT_TIME_PATTERN.search(line)
+                    if not match:
+                        return
+                    h, m, s = match.groups()
+                    current_time = int(h) * 3600 + int(m) * 60 + float(s)
+                    progress = int(min(current_time / total_duration * 100, 98))
+                    if throttle.ready(progress):
+                        callback(progress, f"{progress}%")
+
+                # Start process; output is read by the shared supervisor thread
+                self.process = get_process_supervisor().start(whisper_params, on_line)
+                logger.info("Whisper.cpp process started, PID: %s", self.process.pid)
+                self.process.wait()
 
                 # Check return code
                 if self.process.returncode != 0:
@@ -226,38 +193,16 @@ class WhisperCppASR(BaseASR):
             except Exception as e:
                 logger.exception("ASR processing failed")
                 if self.process and self.process.poll() is None:
-                    self.process.terminate()
-                    try:
-                        self.process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        self.process.kill()
-                        self.process.wait()
+                    self.process.cancel(grace=5)
                 raise RuntimeError(f"SRT generation failed: {str(e)}")
 
     def _get_key(self):
         return f"{self.crc32_hex}-{self.need_word_time_stamp}-{self.model_path}-{self.language}"
 
     def get_audio_duration(self, filepath: str) -> int:
-        """Get audio file duration in seconds using ffmpeg."""
-        try:
-            cmd = ["ffmpeg", "-i", filepath]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
-            )
-            info = result.stderr
-            if duration_match := re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", info):
-                hours, minutes, seconds = map(float, duration_match.groups())
-                duration_seconds = hours * 3600 + minutes * 60 + seconds
-                return int(duration_seconds)
-            return 600
-        except Exception as e:
-            logger.exception("Failed to get audio duration: %s", str(e))
-            return 600
+        """Get audio file duration in seconds from the cached media probe."""
+        duration = get_media_duration(filepath)
+        return int(duration) if duration is not None else 600
 
 
 def detect_whisper_executable() -> str:
@@ -0,0 +1,136 @@
+"""批量任务的分阶段调度器
+
+批量处理的每个文件由若干阶段组成（转录 -> 字幕处理 -> 视频合成），不同阶段
+消耗不同的资源：本地转录占用 CPU 核心，云端转录与 LLM 受网络与限流约束，
+视频合成占用编码器。调度器为每类资源维护独立的槽位池，任意文件的下一阶段
+只要对应资源池有空位即可启动，因此文件 A 翻译时文件 B 可以转录、文件 C 可以
+合成。等待通过条件变量唤醒，不做轮询。
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from .utils.logger import setup_logger
+
+logger = setup_logger("batch_scheduler")
+
+
+class ResourceKind(Enum):
+    """阶段消耗的资源类型"""
+
+    LOCAL_ASR = "local_asr"  # 本地转录（CPU 核心）
+    CLOUD_ASR = "cloud_asr"  # 云端转录（网络）
+    LLM = "llm"  # 断句/优化/翻译（共享 LLM 限流）
+    ENCODE = "encode"  # ffmpeg 视频合成（CPU 核心）
+
+
+# 各资源池默认槽位数。本地转录与视频合成内部已经按核心数并行，
+# 因此同一时刻只运行一个；网络类阶段可以多开几个。
+DEFAULT_POOL_SIZES: Dict[ResourceKind, int] = {
+    ResourceKind.LOCAL_ASR: 1,
+    ResourceKind.CLOUD_ASR: 3,
+    ResourceKind.LLM: 2,
+    ResourceKind.ENCODE: 1,
+}
+
+
+@dataclass
+class StageJob:
+    """一个待执行的阶段"""
+
+    key: str  # 所属任务标识（如文件路径）
+    stage: str  # 阶段名称
+    resource: ResourceKind
+    payload: Any = field(default=None, compare=False)
+
+
+class StageScheduler:
+    """按资源池分配槽位的阶段调度器
+
+    Example:
+        >>> scheduler = StageScheduler()
+        >>> scheduler.submit(StageJob(path, "transcribe", ResourceKind.LOCAL_ASR))
+        >>> job = scheduler.next_job()  # 阻塞直到有可运行的阶段
+        >>> ...  # 启动阶段，完成后
+        >>> scheduler.release(job)
+    """
+
+    def __init__(self, pool_sizes: Optional[Dict[ResourceKind, int]] = None):
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES)
+        if pool_sizes:
+            self.pool_sizes.update(pool_sizes)
+        self._running: Dict[ResourceKind, int] = {kind: 0 for kind in ResourceKind}
+        self._pending: Deque[StageJob] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def submit(self, job: StageJob) -> None:
+        """提交一个已就绪的阶段"""
+        with self._cond:
+            self._pending.append(job)
+            self._cond.notify_all()
+
+    def next_job(self, timeout: Optional[float] = None) -> Optional[StageJob]:
+        """取出下一个资源池有空位的阶段，并占用一个槽位
+
+        按提交顺序选择，但会跳过资源池已满的阶段，不让它们阻塞其他资源。
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            StageJob；调度器关闭或等待超时返回 None
+        """
+        with self._cond:
+            while not self._closed:
+                job = self._pop_runnable()
+                if job is not None:
+                    self._running[job.resource] += 1
+                    return job
+                if not self._cond.wait(timeout=timeout) and timeout is not None:
+                    return None
+            return None
+
+    def release(self, job: StageJob) -> None:
+        """阶段结束（成功或失败），归还槽位"""
+        with self._cond:
+            self._running[job.resource] = max(0, self._running[job.resource] - 1)
+            self._cond.notify_all()
+
+    def cancel(self, key: str) -> None:
+        """移除某个任务尚未开始的阶段"""
+        with self._cond:
+            self._pending = deque(job for job in self._pending if job.key != key)
+
+    def close(self) -> None:
+        """关闭调度器，唤醒所有等待者"""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def running(self, resource: ResourceKind) -> int:
+        with self._cond:
+            return self._running[resource]
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _pop_runnable(self) -> Optional[StageJob]:
+        for i, job in enumerate(self._pending):
+            if self._running[job.resource] < self.pool_sizes.get(job.resource, 1):
+                del self._pending[i]
+                return job
+        return None
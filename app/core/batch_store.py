@@ -0,0 +1,242 @@
+"""批量任务持久化存储
+
+使用 SQLite（WAL 模式）记录每个文件的任务类型、当前阶段、失败信息，以及各
+阶段产物。应用关闭或崩溃后重新打开时，未完成的任务从第一个未完成阶段继续；
+相同内容（按内容指纹）且配置相同的阶段直接复用已有产物，不再重复转录。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from app.config import APPDATA_PATH
+
+from .utils.logger import setup_logger
+
+logger = setup_logger("batch_store")
+
+BATCH_DB_PATH = APPDATA_PATH / "batch_jobs.db"
+
+# 任务状态（与 BatchTaskStatus 的成员名一致）
+STATUS_WAITING = "WAITING"
+STATUS_RUNNING = "RUNNING"
+STATUS_COMPLETED = "COMPLETED"
+STATUS_FAILED = "FAILED"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    file_path TEXT PRIMARY KEY,
+    task_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage_index INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    error TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    content_hash TEXT NOT NULL,
+    stage_key TEXT NOT NULL,
+    result TEXT NOT NULL,
+    files TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, stage_key)
+);
+"""
+
+
+@dataclass
+class JobRecord:
+    """一个批量任务的持久化状态"""
+
+    file_path: str
+    task_type: str
+    status: str
+    stage_index: int = 0
+    content_hash: Optional[str] = None
+    error: str = ""
+
+
+def make_stage_key(stage: str, config: Any, previous: str = "") -> str:
+    """生成阶段键：阶段名 + 配置 + 上一阶段键
+
+    串联上一阶段的键，保证上游配置变化时下游产物也会失效。
+    """
+    if is_dataclass(config) and not isinstance(config, type):
+        config = asdict(config)
+    payload = json.dumps(
+        [previous, stage, config], ensure_ascii=False, sort_keys=True, default=str
+    )
+    return f"{stage}:{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+
+def _file_signature(path: str) -> Optional[List[Union[int, str]]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+class BatchJobStore:
+    """批量任务与阶段产物的 SQLite 存储
+
+    每次写入都是一个独立事务，进程在任意时刻退出都不会留下半写的状态。
+
+    Args:
+        db_path: 数据库路径，默认位于 APPDATA_PATH
+    """
+
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        self.db_path = Path(db_path or BATCH_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # 任务
+    # ------------------------------------------------------------------
+
+    def upsert_job(self, file_path: str, task_type: str) -> JobRecord:
+        """登记任务；已存在且类型相同的未完成任务保留进度，否则重置"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT task_type, status FROM jobs WHERE file_path = ?", (file_path,)
+            ).fetchone()
+            if row and row[0] == task_type and row[1] != STATUS_COMPLETED:
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = '', updated_at = ?"
+                    " WHERE file_path = ?",
+                    (STATUS_WAITING, now, file_path),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jobs (file_path, task_type, status,"
+                    " stage_index, content_hash, error, created_at, updated_at)"
+                    " VALUES (?, ?, ?, 0, NULL, '', ?, ?)",
+                    (file_path, task_type, STATUS_WAITING, now, now),
+                )
+        job = self.get_job(file_path)
+        assert job is not None
+        return job
+
+    def get_job(self, file_path: str) -> Optional[JobRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_path, task_type, status, stage_index, content_hash, error"
+                " FROM jobs WHERE file_path = ?",
+                (file_path,),
+            ).fetchone()
+        return JobRecord(*row) if row else None
+
+    def update_job(
+        self,
+        file_path: str,
+        status: Optional[str] = None,
+        stage_index: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """更新任务的部分字段"""
+        fields = {
+            "status": status,
+            "stage_index": stage_index,
+            "content_hash": content_hash,
+            "error": error,
+        }
+        updates = {k: v for k, v in fields.items() if v is not None}
+        if not updates:
+            return
+        assignments = ", ".join(f"{k} = ?" for k in updates)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE file_path = ?",
+                (*updates.values(), time.time(), file_path),
+            )
+
+    def remove_job(self, file_path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE file_path = ?", (file_path,))
+
+    def clear_jobs(self) -> None:
+        """清空任务列表（保留阶段产物以便复用）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs")
+
+    def unfinished_jobs(self) -> List[JobRecord]:
+        """返回未完成的任务（等待中、运行中或失败），按登记顺序"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path, task_type, status, stage_index, content_hash, error"
+                " FROM jobs WHERE status != ? ORDER BY created_at",
+                (STATUS_COMPLETED,),
+            ).fetchall()
+        return [JobRecord(*row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # 阶段产物
+    # ------------------------------------------------------------------
+
+    def record_artifact(
+        self, content_hash: str, stage_key: str, result: Any, files: List[str]
+    ) -> None:
+        """记录阶段产物，files 中的文件在复用前会校验大小与修改时间"""
+        signatures = [sig for f in files if (sig := _file_signature(f))]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts"
+                " (content_hash, stage_key, result, files, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    content_hash,
+                    stage_key,
+                    json.dumps(result, ensure_ascii=False),
+                    json.dumps(signatures, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+
+    def find_artifact(self, content_hash: str, stage_key: str) -> Optional[Any]:
+        """查找可复用的阶段产物，产物文件缺失或被修改时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, files FROM artifacts"
+                " WHERE content_hash = ? AND stage_key = ?",
+                (content_hash, stage_key),
+            ).fetchone()
+        if not row:
+            return None
+        for signature in json.loads(row[1]):
+            if _file_signature(signature[0]) != signature:
+                logger.info(f"阶段产物已失效: {signature[0]}")
+                return None
+        return json.loads(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[BatchJobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_batch_job_store() -> BatchJobStore:
+    """获取全局批量任务存储"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BatchJobStore()
+        return _store
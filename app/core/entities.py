@@ -450,6 +450,8 @@ class AudioStreamInfo:
     codec: str  # 音频编解码器（如 aac, mp3, opus）
     language: str = ""  # 语言标签（如 eng, chi, deu）
     title: str = ""  # 音轨标题（可选）
+    channels: int = 0  # 声道数（未知时为 0）
+    is_default: bool = False  # 是否带有 default 处置标记
 
 
 @dataclass
@@ -485,6 +487,7 @@ class TranscribeConfig:
     whisper_api_base: Optional[str] = None
     whisper_api_model: Optional[str] = None
     whisper_api_prompt: Optional[str] = None
+    whisper_api_upload_profile: Optional[str] = "opus"  # None 表示上传原始音频
     # Faster Whisper 配置
     faster_whisper_program: Optional[str] = None
     faster_whisper_model: Optional[FasterWhisperModelEnum] = None
@@ -519,6 +522,7 @@ class TranscribeConfig:
             lines.append(f"API Model: {self.whisper_api_model}")
             if self.whisper_api_prompt:
                 lines.append(f"Prompt: {self.whisper_api_prompt[:30]}...")
+            lines.append(f"Upload Profile: {self.whisper_api_upload_profile or 'Original'}")
 
         elif self.transcribe_model == TranscribeModelEnum.FASTER_WHISPER:
             lines.append(
@@ -618,6 +622,7 @@ class SynthesisConfig:
     need_video: bool = True
     soft_subtitle: bool = True
     video_quality: VideoQualityEnum = VideoQualityEnum.MEDIUM
+    parallel_burn: bool = False
 
     def print_config(self) -> str:
         """Print video synthesis configuration"""
@@ -628,6 +633,8 @@ class SynthesisConfig:
             lines.append(f"Video Quality: {self.video_quality.value}")
             lines.append(f"  CRF: {self.video_quality.get_crf()}")
             lines.append(f"  Preset: {self.video_quality.get_preset()}")
+            if not self.soft_subtitle:
+                lines.append(f"Parallel Burn: {self.parallel_burn}")
         lines.append("=" * 44)
         return "\n".join(lines)
 
@@ -1,8 +1,23 @@
-"""LLM unified client module."""
+"""LLM unified client module.
 
-from .check_llm import check_llm_connection, get_available_models
-from .check_whisper import check_whisper_connection
-from .client import call_llm, get_llm_client
+Submodules import openai, so they are loaded on first attribute access.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .check_llm import check_llm_connection, get_available_models
+    from .check_whisper import check_whisper_connection
+    from .client import call_llm, get_llm_client
+
+_LAZY_EXPORTS = {
+    "check_llm_connection": ".check_llm",
+    "get_available_models": ".check_llm",
+    "check_whisper_connection": ".check_whisper",
+    "call_llm": ".client",
+    "get_llm_client": ".client",
+}
 
 __all__ = [
     "get_llm_client",
@@ -11,3 +26,12 @@ __all__ = [
     "get_available_models",
     "check_whisper_connection",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -105,7 +105,7 @@ def before_sleep_log(retry_state: RetryCallState) -> None:
     )
 
 
-@memoize(get_llm_cache(), expire=3600, typed=True)
+@memoize(get_llm_cache, single_flight="llm", expire=3600, typed=True)
 @retry(
     stop=stop_after_attempt(10),
     wait=wait_random_exponential(multiplier=1, min=5, max=60),
@@ -120,7 +120,8 @@ def call_llm(
 ) -> Any:
     """Call LLM API with automatic caching.
 
-    Uses global LLM client configured via environment variables.
+    Uses global LLM client configured via environment variables. Identical
+    requests issued concurrently share one API call (see SingleFlight).
 
     Args:
         messages: Chat messages list
@@ -0,0 +1,581 @@
+"""不依赖 Qt 的处理流程
+
+转录、字幕处理、视频合成以及全流程的阶段逻辑。进度通过普通回调
+``progress(value, message)`` 报告，失败直接抛出异常。GUI 中的 QThread
+只是这些函数的薄封装（把回调转成信号），命令行 ``python -m app.cli``
+在没有显示器的渲染机上直接调用它们。
+"""
+
+import datetime
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.core.asr import asr_binary, transcribe
+from app.core.asr.asr_data import ASRData
+from app.core.asr.subtitle_writer import BackgroundSaver
+from app.core.entities import (
+    FullProcessTask,
+    SubtitleConfig,
+    SubtitleLayoutEnum,
+    SubtitleProcessData,
+    SubtitleTask,
+    SynthesisTask,
+    TranscribeOutputFormatEnum,
+    TranscribeTask,
+    TranslatorServiceEnum,
+)
+from app.core.utils.logger import setup_logger
+from app.core.utils.video_utils import add_subtitles, video2audio
+
+logger = setup_logger("pipeline")
+
+# 进度回调：(进度值 0-100, 描述)
+ProgressCallback = Callable[[int, str], None]
+# 字幕更新回调：{序号: 文本} / ASRData.to_json()
+UpdateCallback = Callable[[Dict[str, str]], None]
+
+
+def _noop_progress(value: int, message: str) -> None:
+    pass
+
+
+def _scaled(
+    progress: ProgressCallback, start: float, span: float
+) -> ProgressCallback:
+    """把子阶段的 0-100 映射到 [start, start + span]"""
+    return lambda value, message: progress(int(start + value * span / 100), message)
+
+
+# ----------------------------------------------------------------------
+# 转录
+# ----------------------------------------------------------------------
+
+
+def _save(
+    saver: Optional[BackgroundSaver],
+    asr_data: ASRData,
+    save_path: str,
+    sidecar: bool = False,
+    **kwargs,
+) -> None:
+    """保存字幕；提供 saver 时在后台写入"""
+    if saver is not None:
+        saver.save(asr_data, save_path, sidecar=sidecar, **kwargs)
+        return
+    asr_data.save(save_path, **kwargs)
+    if sidecar:
+        asr_binary.save_sidecar(asr_data, save_path)
+
+
+def run_transcribe(
+    task: TranscribeTask, progress: Optional[ProgressCallback] = None
+) -> TranscribeTask:
+    """执行转录任务，返回更新了 output_path 的任务"""
+    transcribe_to_data(task, progress)
+    return task
+
+
+def transcribe_to_data(
+    task: TranscribeTask,
+    progress: Optional[ProgressCallback] = None,
+    saver: Optional[BackgroundSaver] = None,
+    file_handoff: bool = True,
+) -> ASRData:
+    """执行转录任务并返回字幕数据
+
+    Args:
+        task: 转录任务，output_path 会更新为实际使用的字幕路径
+        progress: 进度回调
+        saver: 提供时字幕文件在后台写入
+        file_handoff: 后续阶段是否从文件读取字幕；为 False 时（字幕数据在
+            内存中直接交给下一阶段）只保存配置的输出格式
+    """
+    progress = progress or _noop_progress
+    task.started_at = datetime.datetime.now()
+    if task.transcribe_config:
+        logger.info(f"\n{task.transcribe_config.print_config()}")
+
+    if not task.file_path:
+        raise ValueError("文件路径为空")
+    video_path = Path(task.file_path)
+    if not video_path.exists():
+        logger.error(f"视频文件不存在：{video_path}")
+        raise ValueError("视频文件不存在")
+    if not task.transcribe_config:
+        raise ValueError("转录配置为空")
+    if not task.output_path:
+        raise ValueError("输出路径为空")
+
+    # 检查是否已下载字幕文件
+    downloaded = find_downloaded_subtitle(task)
+    if downloaded:
+        task.output_path = downloaded
+        logger.info(f"字幕文件已下载，跳过转录。找到下载的字幕文件：{downloaded}")
+        progress(100, "字幕已下载")
+        return ASRData.from_subtitle_file(downloaded)
+
+    progress(5, "转换音频中")
+    logger.info("开始转换音频")
+
+    # 创建临时音频文件（delete=False 避免 Windows 权限问题）
+    temp_audio_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    temp_audio_path = temp_audio_file.name
+    temp_audio_file.close()  # 立即关闭文件句柄，让 ffmpeg 可以写入
+
+    try:
+        is_success = video2audio(
+            str(video_path),
+            output=temp_audio_path,
+            audio_track_index=task.selected_audio_track_index,
+        )
+        if not is_success:
+            logger.error("音频转换失败")
+            raise RuntimeError("音频转换失败")
+
+        progress(20, "语音转录中")
+        logger.info("开始语音转录")
+
+        asr_data = transcribe(
+            temp_audio_path,
+            task.transcribe_config,
+            callback=lambda value, message: progress(
+                int(min(20 + value * 0.8, 100)), message
+            ),
+        )
+
+        base_path = Path(task.output_path).with_suffix("")
+        handoff = task.need_next_task and file_handoff
+        for fmt in transcribe_output_formats(task, file_handoff):
+            save_path = str(base_path.with_suffix(f".{fmt}"))
+            # 后续阶段从 srt 的 .asrd 读取，不必重新解析并检测词级/句级
+            _save(saver, asr_data, save_path, sidecar=handoff and fmt == "srt")
+            logger.info("%s 字幕文件已保存到: %s", fmt.upper(), save_path)
+
+        progress(100, "转录完成")
+        return asr_data
+    finally:
+        Path(temp_audio_path).unlink(missing_ok=True)
+
+
+def find_downloaded_subtitle(task: TranscribeTask) -> Optional[str]:
+    """全流程任务中，若视频目录下已有下载的字幕则返回其路径"""
+    if not (task.need_next_task and task.file_path):
+        return None
+    subtitle_dir = Path(task.file_path).parent / "subtitle"
+    if not subtitle_dir.exists():
+        return None
+    downloaded_subtitles = list(subtitle_dir.glob("【下载字幕】*"))
+    return str(downloaded_subtitles[0]) if downloaded_subtitles else None
+
+
+def transcribe_output_formats(
+    task: TranscribeTask, file_handoff: bool = True
+) -> List[str]:
+    """根据配置的输出格式确定需要保存的字幕格式（小写扩展名）"""
+    assert task.transcribe_config is not None
+    output_format = (
+        task.transcribe_config.output_format or TranscribeOutputFormatEnum.SRT
+    )
+    if output_format == TranscribeOutputFormatEnum.ALL:
+        formats = [
+            fmt.value.lower()
+            for fmt in TranscribeOutputFormatEnum
+            if fmt != TranscribeOutputFormatEnum.ALL
+        ]
+    else:
+        formats = [output_format.value.lower()]
+    # 后续阶段以 srt 为字幕路径（界面中可编辑），数据从其 .asrd 读取
+    if task.need_next_task and file_handoff:
+        formats.append(TranscribeOutputFormatEnum.SRT.value.lower())
+    return list(dict.fromkeys(formats))
+
+
+# ----------------------------------------------------------------------
+# 字幕处理
+# ----------------------------------------------------------------------
+
+
+def need_llm(subtitle_config: SubtitleConfig, asr_data: ASRData) -> bool:
+    return (
+        subtitle_config.need_optimize
+        or asr_data.is_word_timestamp()
+        or (
+            subtitle_config.need_translate
+            and subtitle_config.translator_service
+            not in [
+                TranslatorServiceEnum.DEEPLX,
+                TranslatorServiceEnum.BING,
+                TranslatorServiceEnum.GOOGLE,
+            ]
+        )
+    )
+
+
+def setup_llm_config(subtitle_config: SubtitleConfig) -> SubtitleConfig:
+    """验证 LLM 连接并设置环境变量"""
+    from app.core.llm.check_llm import check_llm_connection
+
+    if not (
+        subtitle_config.base_url
+        and subtitle_config.api_key
+        and subtitle_config.llm_model
+    ):
+        raise Exception("LLM API 未配置, 请检查LLM配置")
+    success, message = check_llm_connection(
+        subtitle_config.base_url,
+        subtitle_config.api_key,
+        subtitle_config.llm_model,
+    )
+    if not success:
+        raise Exception(f"LLM API 测试失败: {message or ''}")
+    os.environ["OPENAI_BASE_URL"] = subtitle_config.base_url
+    os.environ["OPENAI_API_KEY"] = subtitle_config.api_key
+    return subtitle_config
+
+
+def _create_translator(subtitle_config: SubtitleConfig, update_callback):
+    from app.core.translate import (
+        BingTranslator,
+        DeepLXTranslator,
+        GoogleTranslator,
+        LLMTranslator,
+    )
+
+    translator_service = subtitle_config.translator_service
+    if not subtitle_config.target_language:
+        raise Exception("目标语言未配置")
+
+    if translator_service == TranslatorServiceEnum.OPENAI:
+        if not subtitle_config.llm_model:
+            raise Exception("LLM 模型未配置")
+        return LLMTranslator(
+            thread_num=subtitle_config.thread_num,
+            batch_num=subtitle_config.batch_size,
+            target_language=subtitle_config.target_language,
+            model=subtitle_config.llm_model,
+            custom_prompt=subtitle_config.custom_prompt_text or "",
+            is_reflect=subtitle_config.need_reflect,
+            update_callback=update_callback,
+        )
+    if translator_service == TranslatorServiceEnum.GOOGLE:
+        return GoogleTranslator(
+            thread_num=subtitle_config.thread_num,
+            batch_num=5,
+            target_language=subtitle_config.target_language,
+            timeout=20,
+            update_callback=update_callback,
+        )
+    if translator_service == TranslatorServiceEnum.BING:
+        return BingTranslator(
+            thread_num=subtitle_config.thread_num,
+            batch_num=10,
+            target_language=subtitle_config.target_language,
+            update_callback=update_callback,
+        )
+    if translator_service == TranslatorServiceEnum.DEEPLX:
+        os.environ["DEEPLX_ENDPOINT"] = subtitle_config.deeplx_endpoint or ""
+        return DeepLXTranslator(
+            thread_num=subtitle_config.thread_num,
+            batch_num=5,
+            target_language=subtitle_config.target_language,
+            timeout=20,
+            update_callback=update_callback,
+        )
+    raise Exception(f"不支持的翻译服务: {translator_service}")
+
+
+def run_subtitle(
+    task: SubtitleTask,
+    progress: Optional[ProgressCallback] = None,
+    on_update: Optional[UpdateCallback] = None,
+    on_update_all: Optional[Callable[[dict], None]] = None,
+    asr_data: Optional[ASRData] = None,
+    saver: Optional[BackgroundSaver] = None,
+) -> SubtitleTask:
+    """执行字幕断句、优化、翻译并保存
+
+    Args:
+        task: 字幕任务
+        progress: 进度回调
+        on_update: 每批字幕处理完成时回调 {序号: 文本}
+        on_update_all: 整体字幕变化（断句、优化、翻译完成）时回调
+        asr_data: 上一阶段在内存中交接的字幕数据，为 None 时读取 subtitle_path
+        saver: 提供时字幕文件在后台写入，调用方负责等待写入完成
+    """
+    # LLM 相关模块依赖 openai，只在字幕阶段加载
+    from app.core.optimize.optimize import SubtitleOptimizer
+    from app.core.split.split import SubtitleSplitter
+
+    progress = progress or _noop_progress
+    subtitle_config = task.subtitle_config
+    assert task.subtitle_path, "字幕文件路径为空"
+    assert subtitle_config is not None, "字幕配置为空"
+    logger.info(f"\n{subtitle_config.print_config()}")
+
+    def emit_all(data: ASRData) -> None:
+        if on_update_all:
+            on_update_all(data.to_json())
+
+    # 对断句字幕路径进行定义
+    subtitle_path = task.subtitle_path
+    output_name = (
+        Path(subtitle_path).stem.replace("【原始字幕】", "").replace("【下载字幕】", "")
+    )
+    split_path = str(Path(subtitle_path).parent / f"【断句字幕】{output_name}.srt")
+
+    if asr_data is None:
+        asr_data = ASRData.from_subtitle_file(subtitle_path)
+
+    # 1. 分割成字词级时间戳（对于非断句字幕且开启分割选项）
+    if subtitle_config.need_split and not asr_data.is_word_timestamp():
+        asr_data.split_to_word_segments()
+        emit_all(asr_data)
+
+    # 验证 LLM 配置
+    if need_llm(subtitle_config, asr_data):
+        progress(2, "开始验证 LLM 配置...")
+        subtitle_config = setup_llm_config(subtitle_config)
+
+    # 2. 重新断句（对于字词级字幕）
+    if asr_data.is_word_timestamp():
+        progress(5, "字幕断句...")
+        logger.info("正在字幕断句...")
+        splitter = SubtitleSplitter(
+            thread_num=subtitle_config.thread_num,
+            model=subtitle_config.llm_model,
+            max_word_count_cjk=subtitle_config.max_word_count_cjk,
+            max_word_count_english=subtitle_config.max_word_count_english,
+        )
+        asr_data = splitter.split_subtitle(asr_data)
+        _save(saver, asr_data, split_path, sidecar=True)
+        emit_all(asr_data)
+
+    total = max(len(asr_data.segments), 1)
+    finished = [0]
+
+    def update_callback(result: List[SubtitleProcessData]) -> None:
+        finished[0] += len(result)
+        value = min(int(finished[0] / total * 100), 100)
+        progress(value, f"{value}% 处理字幕")
+        if on_update:
+            on_update(
+                {
+                    str(data.index): data.translated_text
+                    or data.optimized_text
+                    or data.original_text
+                    for data in result
+                }
+            )
+
+    # 3. 优化字幕
+    if subtitle_config.need_optimize:
+        progress(0, "优化字幕...")
+        logger.info("正在优化字幕...")
+        finished[0] = 0
+        if not subtitle_config.llm_model:
+            raise Exception("LLM 模型未配置")
+        optimizer = SubtitleOptimizer(
+            thread_num=subtitle_config.thread_num,
+            batch_num=subtitle_config.batch_size,
+            model=subtitle_config.llm_model,
+            custom_prompt=subtitle_config.custom_prompt_text or "",
+            update_callback=update_callback,
+        )
+        asr_data = optimizer.optimize_subtitle(asr_data)
+        asr_data.remove_punctuation()
+        emit_all(asr_data)
+
+    # 4. 翻译字幕
+    if subtitle_config.need_translate:
+        progress(0, "翻译字幕...")
+        logger.info("正在翻译字幕...")
+        finished[0] = 0
+        translator = _create_translator(subtitle_config, update_callback)
+        asr_data = translator.translate_subtitle(asr_data)
+
+        # 移除末尾标点符号
+        asr_data.remove_punctuation()
+        emit_all(asr_data)
+
+        # 保存翻译结果(单语、双语)
+        if task.need_next_task and task.video_path:
+            for layout in SubtitleLayoutEnum:
+                save_path = str(
+                    Path(task.subtitle_path).parent
+                    / f"{Path(task.video_path).stem}-{layout.value}.srt"
+                )
+                _save(
+                    saver,
+                    asr_data,
+                    save_path,
+                    ass_style=subtitle_config.subtitle_style or "",
+                    layout=layout,
+                )
+                logger.info(f"翻译字幕保存到：{save_path}")
+
+    # 5. 保存字幕
+    _save(
+        saver,
+        asr_data,
+        task.output_path or "",
+        ass_style=subtitle_config.subtitle_style or "",
+        layout=subtitle_config.subtitle_layout or SubtitleLayoutEnum.ONLY_TRANSLATE,
+    )
+    logger.info(f"字幕保存到 {task.output_path}")
+
+    # 6. 保存srt/ass文件到视频目录（对于全流程任务）
+    if task.need_next_task and task.video_path:
+        video_path = Path(task.video_path)
+        _save(
+            saver,
+            asr_data,
+            str(video_path.parent / f"{video_path.stem}.srt"),
+            layout=subtitle_config.subtitle_layout,
+        )
+        _save(
+            saver,
+            asr_data,
+            str(video_path.parent / f"{video_path.stem}.ass"),
+            ass_style=subtitle_config.subtitle_style,
+            layout=subtitle_config.subtitle_layout,
+        )
+
+    progress(100, "优化完成")
+    logger.info("优化完成")
+    return task
+
+
+# ----------------------------------------------------------------------
+# 视频合成
+# ----------------------------------------------------------------------
+
+
+def run_synthesis(
+    task: SynthesisTask, progress: Optional[ProgressCallback] = None
+) -> SynthesisTask:
+    """将字幕合成到视频"""
+    progress = progress or _noop_progress
+    task.started_at = datetime.datetime.now()
+    synthesis_config = task.synthesis_config
+    assert synthesis_config is not None, "合成配置为空"
+    logger.info(f"\n{synthesis_config.print_config()}")
+
+    if not synthesis_config.need_video:
+        logger.info("不需要合成视频，跳过")
+        progress(100, "合成完成")
+        return task
+
+    logger.info(f"开始合成视频: {task.video_path}")
+    progress(5, "正在合成")
+
+    if not task.video_path:
+        raise ValueError("视频路径为空")
+    if not task.subtitle_path:
+        raise ValueError("字幕路径为空")
+    if not task.output_path:
+        raise ValueError("输出路径为空")
+    Path(task.output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def progress_callback(value, message):
+        value = int(5 + int(value) / 100 * 95)
+        logger.debug(f"合成进度: {value}% - {message}")
+        progress(value, f"{value}% {message}")
+
+    video_quality = synthesis_config.video_quality
+    add_subtitles(
+        task.video_path,
+        task.subtitle_path,
+        task.output_path,
+        crf=video_quality.get_crf(),
+        preset=video_quality.get_preset(),
+        soft_subtitle=synthesis_config.soft_subtitle,
+        progress_callback=progress_callback,
+        parallel=synthesis_config.parallel_burn,
+    )
+
+    progress(100, "合成完成")
+    logger.info(f"视频合成完成，保存路径: {task.output_path}")
+    return task
+
+
+# ----------------------------------------------------------------------
+# 全流程
+# ----------------------------------------------------------------------
+
+
+def run_full(
+    task: FullProcessTask, progress: Optional[ProgressCallback] = None
+) -> FullProcessTask:
+    """转录 -> 字幕优化/翻译 -> 视频合成
+
+    字幕数据在各阶段之间直接在内存中传递，字幕文件由后台线程写入
+    ``<输出目录>/subtitle``（转录阶段只写配置的输出格式），合成前等待写入
+    完成。最终视频写入 task.output_path。
+    """
+    progress = progress or _noop_progress
+    assert task.file_path and task.output_path, "文件路径为空"
+    task.started_at = datetime.datetime.now()
+    stem = Path(task.file_path).stem
+    subtitle_dir = Path(task.output_path).parent / "subtitle"
+
+    # 1. 转录生成字幕
+    progress(0, "开始转录")
+    transcribe_task = TranscribeTask(
+        file_path=task.file_path,
+        output_path=str(subtitle_dir / f"【原始字幕】{stem}.srt"),
+        transcribe_config=task.transcribe_config,
+        need_next_task=True,
+        queued_at=task.queued_at,
+    )
+    saver = BackgroundSaver()
+    try:
+        asr_data = transcribe_to_data(
+            transcribe_task,
+            _scaled(progress, 0, 40),
+            saver=saver,
+            file_handoff=False,
+        )
+
+        # 2. 字幕优化/翻译
+        progress(40, "开始优化字幕")
+        subtitle_task = SubtitleTask(
+            subtitle_path=transcribe_task.output_path or "",
+            video_path=task.file_path,
+            output_path=str(subtitle_dir / f"【样式字幕】{stem}.ass"),
+            subtitle_config=task.subtitle_config,
+            need_next_task=True,
+            queued_at=task.queued_at,
+        )
+        run_subtitle(
+            subtitle_task,
+            _scaled(progress, 40, 30),
+            asr_data=asr_data,
+            saver=saver,
+        )
+    except BaseException:
+        # 阶段已失败：仍等待写入结束，但写入错误只记录，保留原始异常
+        try:
+            saver.close()
+        except Exception as e:
+            logger.error(f"后台保存字幕失败: {e}")
+        raise
+    # 合成读取样式字幕文件，需等待写入完成
+    saver.close()
+
+    # 3. 视频合成
+    progress(70, "开始合成视频")
+    synthesis_task = SynthesisTask(
+        video_path=task.file_path,
+        subtitle_path=subtitle_task.output_path,
+        output_path=task.output_path,
+        synthesis_config=task.synthesis_config,
+        queued_at=task.queued_at,
+    )
+    run_synthesis(synthesis_task, _scaled(progress, 70, 30))
+
+    task.completed_at = datetime.datetime.now()
+    logger.info("处理完成")
+    progress(100, "处理完成")
+    return task
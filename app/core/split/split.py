@@ -1,10 +1,11 @@
 import difflib
+import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Union
 
 from app.core.asr.asr_data import ASRData, ASRDataSeg
 from app.core.split.split_by_llm import split_by_llm
-from app.core.utils.logger import setup_logger
+from app.core.utils.logger import rate_limit, setup_logger
 from app.core.utils.text_utils import (
     count_words,
     is_mainly_cjk,
@@ -12,7 +13,7 @@ from app.core.utils.text_utils import (
     is_space_separated_language,
 )
 
-logger = setup_logger("subtitle_splitter")
+logger = rate_limit(setup_logger("subtitle_splitter"))
 
 # ==================== 配置常量 ====================
 
@@ -235,10 +236,10 @@ class SubtitleSplitter:
         # 执行分割
         segments = []
         prev_index = 0
-        for index in adjusted_split_indices:
-            part = ASRData(asr_data.segments[prev_index : index + 1])
+        for split_index in adjusted_split_indices:
+            part = ASRData(asr_data.segments[prev_index : split_index + 1])
             segments.append(part)
-            prev_index = index + 1
+            prev_index = split_index + 1
 
         if prev_index < total_segs:
             part = ASRData(asr_data.segments[prev_index:])
@@ -496,7 +497,7 @@ class SubtitleSplitter:
                 seg.text.lower().startswith(word) for word in prefix_split_words
             ) and len(current_group) >= int(max_word_count * PREFIX_WORD_RATIO):
                 result.append(current_group)
-                logger.debug(f"在前缀词 {seg.text} 前分割")
+                logger.debug("在前缀词 %s 前分割", seg.text)
                 current_group = []
 
             # 后缀词分割
@@ -509,7 +510,7 @@ class SubtitleSplitter:
                 and len(current_group) >= int(max_word_count * SUFFIX_WORD_RATIO)
             ):
                 result.append(current_group)
-                logger.debug(f"在后缀词 {segments[i - 1].text} 后分割")
+                logger.debug("在后缀词 %s 后分割", segments[i - 1].text)
                 current_group = []
 
             current_group.append(seg)
@@ -698,9 +699,12 @@ class SubtitleSplitter:
         new_segments = []
 
         for sentence in sentences:
-            logger.debug("==========")
-            logger.debug(f"处理句子: {sentence}")
-            logger.debug("后续句子:" + "".join(asr_texts[asr_index : asr_index + 10]))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("==========")
+                logger.debug("处理句子: %s", sentence)
+                logger.debug(
+                    "后续句子:%s", "".join(asr_texts[asr_index : asr_index + 10])
+                )
 
             sentence_proc = preprocess_text(sentence)
             word_count = count_words(sentence_proc)
@@ -753,7 +757,7 @@ class SubtitleSplitter:
                         merged_text, merged_start_time, merged_end_time
                     )
 
-                    logger.debug(f"合并分段: {merged_seg.text}")
+                    logger.debug("合并分段: %s", merged_seg.text)
 
                     # 拆分超长分段
                     split_segs = self._split_long_segment(group)
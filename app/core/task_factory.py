@@ -69,6 +69,11 @@ class TaskFactory:
             whisper_api_base=cfg.whisper_api_base.value,
             whisper_api_model=cfg.whisper_api_model.value,
             whisper_api_prompt=cfg.whisper_api_prompt.value,
+            whisper_api_upload_profile=(
+                None
+                if cfg.whisper_api_upload_profile.value == "original"
+                else cfg.whisper_api_upload_profile.value
+            ),
             # Faster Whisper 配置
             faster_whisper_program=cfg.faster_whisper_program.value,
             faster_whisper_model=cfg.faster_whisper_model.value,
@@ -203,6 +208,7 @@ class TaskFactory:
             need_video=cfg.need_video.value,
             soft_subtitle=cfg.soft_subtitle.value,
             video_quality=cfg.video_quality.value,
+            parallel_burn=cfg.parallel_burn.value,
         )
 
         return SynthesisTask(
@@ -2,17 +2,33 @@
 翻译模块
 
 提供多种翻译服务：OpenAI LLM、Google、Bing、DeepLX
+
+各翻译器在首次访问时才导入，避免启动时加载 openai、requests 等依赖。
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from app.core.entities import SubtitleProcessData
-from app.core.translate.base import BaseTranslator
-from app.core.translate.bing_translator import BingTranslator
-from app.core.translate.deeplx_translator import DeepLXTranslator
-from app.core.translate.factory import TranslatorFactory
-from app.core.translate.google_translator import GoogleTranslator
-from app.core.translate.llm_translator import LLMTranslator
 from app.core.translate.types import TargetLanguage, TranslatorType
 
+if TYPE_CHECKING:
+    from app.core.translate.base import BaseTranslator
+    from app.core.translate.bing_translator import BingTranslator
+    from app.core.translate.deeplx_translator import DeepLXTranslator
+    from app.core.translate.factory import TranslatorFactory
+    from app.core.translate.google_translator import GoogleTranslator
+    from app.core.translate.llm_translator import LLMTranslator
+
+_LAZY_EXPORTS = {
+    "BaseTranslator": "app.core.translate.base",
+    "BingTranslator": "app.core.translate.bing_translator",
+    "DeepLXTranslator": "app.core.translate.deeplx_translator",
+    "TranslatorFactory": "app.core.translate.factory",
+    "GoogleTranslator": "app.core.translate.google_translator",
+    "LLMTranslator": "app.core.translate.llm_translator",
+}
+
 __all__ = [
     "BaseTranslator",
     "SubtitleProcessData",
@@ -24,3 +40,12 @@ __all__ = [
     "GoogleTranslator",
     "LLMTranslator",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
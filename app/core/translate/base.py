@@ -7,7 +7,11 @@ from typing import Callable, List, Optional
 from app.core.asr.asr_data import ASRData, ASRDataSeg
 from app.core.entities import SubtitleProcessData
 from app.core.translate.types import TargetLanguage
-from app.core.utils.cache import generate_cache_key, get_translate_cache
+from app.core.utils.cache import (
+    generate_cache_key,
+    get_single_flight,
+    get_translate_cache,
+)
 from app.core.utils.logger import setup_logger
 
 logger = setup_logger("subtitle_translator")
@@ -30,6 +34,8 @@ class BaseTranslator(ABC):
         self.update_callback = update_callback
         self.executor = None
         self._cache = get_translate_cache()
+        # 相同缓存键的并发请求只翻译一次，其余等待其结果
+        self._flight = get_single_flight("translate")
 
         self._init_thread_pool()
 
@@ -112,22 +118,31 @@ class BaseTranslator(ABC):
         """安全的翻译块"""
         try:
             cache_key = self._get_cache_key(chunk)
-            cached_result = self._cache.get(cache_key, default=None)
-            if cached_result is not None:
-                return cached_result
-
-            result = self._translate_chunk(chunk)
-
-            if self.update_callback:
-                self.update_callback(result)
-
-            self._cache.set(cache_key, result, expire=86400 * 7)
-            return result
+            return self._flight.do(
+                cache_key, self._translate_chunk_cached, cache_key, chunk
+            )
 
         except Exception as e:
             logger.exception(f"翻译失败: {str(e)}")
             raise
 
+    def _translate_chunk_cached(
+        self, cache_key: str, chunk: List[SubtitleProcessData]
+    ) -> List[SubtitleProcessData]:
+        """优先读取缓存，未命中时翻译并写入缓存"""
+        cached_result = self._cache.get(cache_key, default=None)
+        if cached_result is not None:
+            return cached_result
+
+        self._flight.record_miss()
+        result = self._translate_chunk(chunk)
+
+        if self.update_callback:
+            self.update_callback(result)
+
+        self._cache.set(cache_key, result, expire=86400 * 7)
+        return result
+
     @staticmethod
     def _set_segments_translated_text(
         original_segments: List[ASRDataSeg], translated_list: List[SubtitleProcessData]
@@ -1,58 +1,102 @@
-import re
-from typing import Dict, Optional
-
-from .text_utils import is_mainly_cjk
+"""ASS 字幕自动换行
 
+按码位预先计算的字宽表（以字号为单位）估算宽度，单次线性扫描累计行宽：
+CJK 字符之间可以任意断行，拉丁等使用空格分词的文字只在空格处断行（单词
+本身超过行宽时才在词内断开）。样式的 ScaleX、Spacing 一并计入宽度。
+ASS 文件逐行处理，不整体读入内存。
+"""
 
-def parse_ass_info(ass_content: str) -> tuple[int, Dict[str, int]]:
+import os
+import re
+import shutil
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+# 字宽表：低两位为宽度（半个字号为单位：0 不占宽度，1 半角，2 全角），
+# _BREAKABLE 位表示可在该字符前后任意断行（CJK 文字）
+_BREAKABLE = 4
+
+_ZERO_WIDTH_RANGES = (
+    (0x0300, 0x036F),  # 组合附加符号
+    (0x200B, 0x200F),  # 零宽字符
+    (0xFE00, 0xFE0F),  # 变体选择符
+)
+_FULL_WIDTH_RANGES = (
+    (0x1100, 0x115F, _BREAKABLE),  # 谚文字母
+    (0x2E80, 0x303F, 0),  # CJK 部首、符号和标点
+    (0x3040, 0x30FF, _BREAKABLE),  # 平假名、片假名
+    (0x3130, 0x318F, _BREAKABLE),  # 谚文兼容字母
+    (0x3400, 0x4DBF, _BREAKABLE),  # CJK 扩展 A
+    (0x4E00, 0x9FFF, _BREAKABLE),  # CJK 统一汉字
+    (0xAC00, 0xD7AF, _BREAKABLE),  # 谚文音节
+    (0xF900, 0xFAFF, _BREAKABLE),  # CJK 兼容汉字
+    (0xFF01, 0xFF60, 0),  # 全角 ASCII
+    (0xFFE0, 0xFFE6, 0),  # 全角符号
+)
+
+_OVERRIDE_TAG = re.compile(r"\{[^}]*\}")
+_DIALOGUE_FIELDS = 9  # Dialogue 行中 Text 之前的字段数
+
+
+def _build_width_table() -> array:
+    table = array("B", [1]) * 0x10000
+    for start, end in _ZERO_WIDTH_RANGES:
+        for code in range(start, end + 1):
+            table[code] = 0
+    for start, end, flags in _FULL_WIDTH_RANGES:
+        for code in range(start, end + 1):
+            table[code] = 2 | flags
+    return table
+
+
+_WIDTH_TABLE = _build_width_table()
+
+
+def _char_class(char: str) -> int:
+    code = ord(char)
+    # BMP 以外的字符（如 emoji）按全角计
+    return _WIDTH_TABLE[code] if code < 0x10000 else 2
+
+
+def char_width_units(char: str) -> int:
+    """字符宽度（半个字号为单位）"""
+    return _char_class(char) & 3
+
+
+@dataclass(frozen=True)
+class StyleMetrics:
+    """影响字宽的样式参数"""
+
+    font_size: float = 40
+    scale_x: float = 100
+    spacing: float = 0
+
+    @property
+    def unit(self) -> float:
+        """半个字号对应的像素宽度"""
+        return self.font_size * self.scale_x / 100 / 2
+
+
+def parse_ass_info(ass_content: str) -> Tuple[int, Dict[str, int]]:
     """
     从ASS文件内容中解析视频宽度和各样式的字体大小
 
     Returns:
         tuple: (视频宽度, {样式名: 字体大小})
     """
-    # 获取视频宽度
-    play_res_x = 1280  # 默认宽度
-    font_sizes = {"Default": 40}  # 默认字体大小
-
-    # 查找视频宽度
-    res_x_match = re.search(r"PlayResX:\s*(\d+)", ass_content)
-    if res_x_match:
-        play_res_x = int(res_x_match.group(1))
-
-    # 查找所有样式的字体大小
-    style_section = re.search(r"\[V4\+ Styles\].*?\[", ass_content, re.DOTALL)
-    if style_section:
-        style_content = style_section.group(0)
-
-        # 获取Format行定义的字段顺序
-        format_match = re.search(r"Format:(.*?)$", style_content, re.MULTILINE)
-        if format_match:
-            # 解析字段名称
-            fields = [f.strip() for f in format_match.group(1).split(",")]
-            # 找到Fontsize字段的位置
-            try:
-                fontsize_index = fields.index("Fontsize")
-                name_index = fields.index("Name")
-
-                # 使用正确的字段位置来匹配样式行
-                for style_line in re.finditer(
-                    r"Style:(.*?)$", style_content, re.MULTILINE
-                ):
-                    style_parts = [p.strip() for p in style_line.group(1).split(",")]
-                    if len(style_parts) >= max(fontsize_index + 1, name_index + 1):
-                        style_name = style_parts[name_index]
-                        font_size = int(style_parts[fontsize_index])
-                        font_sizes[style_name] = font_size
-            except ValueError:
-                pass
-
-    return play_res_x, font_sizes
+    parser = _AssHeaderParser()
+    for line in ass_content.splitlines():
+        parser.feed(line)
+    return parser.play_res_x, {
+        name: int(metrics.font_size) for name, metrics in parser.styles.items()
+    }
 
 
 def estimate_text_width(text: str, font_size: int) -> int:
     """
-    估算文本宽度（像素）
+    估算文本宽度（像素），ASS 覆盖标签不计宽度
 
     Args:
         text: 文本内容
@@ -61,15 +105,78 @@ def estimate_text_width(text: str, font_size: int) -> int:
     Returns:
         int: 估算的文本宽度（像素）
     """
-    # CJK字符通常是方形，宽度约等于字体大小
-    # 英文字符宽度约为字体大小的一半
-    width = 0
-    for char in text:
-        if re.match(r"[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]", char):
-            width += font_size
-        else:
-            width += font_size * 0.5
-    return int(width)
+    units = sum(map(char_width_units, _OVERRIDE_TAG.sub("", text)))
+    return int(units * font_size / 2)
+
+
+def wrap_text(text: str, max_width: float, metrics: StyleMetrics) -> str:
+    """
+    按行宽插入 \\N 换行（单次线性扫描）
+
+    CJK 字符之间、空格处为断行点；空格处断行时去掉该空格。覆盖标签
+    ``{...}`` 不计宽度也不会被拆开。已有 \\N 的文本视为手动排版，不处理。
+    """
+    if not text or "\\N" in text:
+        return text
+
+    unit, spacing = metrics.unit, metrics.spacing
+    lines: List[str] = []
+    line: List[str] = []  # 当前行的片段（字符或覆盖标签）
+    width = 0.0
+    # 当前行中最后一个断行点：(片段下标, 断行后保留部分的起始下标, 断点处宽度)
+    break_at: Optional[Tuple[int, int, float]] = None
+    prev_breakable = False
+    # 当前行是否已有文字；只有空格或标签时不记录断行点，避免产生空行
+    has_text = False
+
+    space_width = char_width_units(" ") * unit + spacing
+    pos, length = 0, len(text)
+    while pos < length:
+        char = text[pos]
+        if char == "{":
+            end = text.find("}", pos)
+            if end != -1:
+                line.append(text[pos : end + 1])
+                pos = end + 1
+                continue
+
+        pos += 1
+        if char == " ":
+            if not line and lines:  # 换行后的行首空格
+                continue
+            if has_text:
+                break_at = (len(line), len(line) + 1, width)
+            line.append(char)
+            width += space_width
+            prev_breakable = False
+            continue
+
+        char_class = _char_class(char)
+        breakable = bool(char_class & _BREAKABLE)
+        if has_text and (breakable or prev_breakable):
+            break_at = (len(line), len(line), width)
+        prev_breakable = breakable
+
+        char_width = (char_class & 3) * unit + spacing
+        if width + char_width > max_width and break_at is not None:
+            cut, keep, cut_width = break_at
+            lines.append("".join(line[:cut]).rstrip(" "))
+            line = line[keep:]
+            width -= cut_width + (space_width if keep > cut else 0)
+            break_at = None
+            has_text = any(p != " " and not p.startswith("{") for p in line)
+        if width + char_width > max_width and line:
+            # 没有断行点（单词超过行宽）时在词内断开
+            lines.append("".join(line))
+            line, width = [], 0.0
+            break_at = None
+        line.append(char)
+        width += char_width
+        has_text = True
+
+    if line:
+        lines.append("".join(line))
+    return "\\N".join(lines)
 
 
 def auto_wrap_text(text: str, max_width: int, font_size: int) -> str:
@@ -84,33 +191,76 @@ def auto_wrap_text(text: str, max_width: int, font_size: int) -> str:
     Returns:
         str: 处理后的文本
     """
-    if not text or "\\N" in text:  # 如果文本为空或已有换行符，则不处理
-        return text
-
-    # 如果不是主要由CJK字符组成，则不处理
-    if not is_mainly_cjk(text):
-        return text
-
-    # 分割文本为字符列表
-    chars = list(text)
-    current_line = ""
-    result = []
-
-    for char in chars:
-        temp_line = current_line + char
-        # 计算当前行宽度
-        line_width = estimate_text_width(temp_line, font_size)
-
-        if line_width > max_width:
-            result.append(current_line)
-            current_line = char
-        else:
-            current_line = temp_line
-
-    if current_line:
-        result.append(current_line)
-
-    return "\\N".join(result)
+    return wrap_text(text, max_width, StyleMetrics(font_size=font_size))
+
+
+class _AssHeaderParser:
+    """逐行收集 PlayResX 与 [V4+ Styles] 中各样式的字宽参数"""
+
+    def __init__(self):
+        self.play_res_x = 1280
+        self.styles: Dict[str, StyleMetrics] = {"Default": StyleMetrics()}
+        self._section = ""
+        self._format: List[str] = []
+
+    def feed(self, line: str) -> None:
+        # 首行可能带 UTF-8 BOM，原样写出，但解析时需要去掉
+        stripped = line.strip().lstrip("\ufeff")
+        if stripped.startswith("["):
+            self._section = stripped.lower()
+            self._format = []
+            return
+        if self._section == "[script info]" and stripped.startswith("PlayResX:"):
+            value = stripped.split(":", 1)[1].strip()
+            if value.isdigit():
+                self.play_res_x = int(value)
+        elif self._section in ("[v4+ styles]", "[v4 styles]"):
+            if stripped.startswith("Format:"):
+                self._format = [f.strip() for f in stripped[7:].split(",")]
+            elif stripped.startswith("Style:") and self._format:
+                self._add_style(stripped[6:].split(","))
+
+    def _add_style(self, values: List[str]) -> None:
+        fields = dict(zip(self._format, (v.strip() for v in values)))
+        name = fields.get("Name")
+        if not name:
+            return
+        try:
+            metrics = StyleMetrics(
+                font_size=float(fields.get("Fontsize", 40)),
+                scale_x=float(fields.get("ScaleX", 100)),
+                spacing=float(fields.get("Spacing", 0)),
+            )
+        except ValueError:
+            return
+        self.styles[name] = metrics
+
+
+def wrap_ass_lines(
+    lines: Iterable[str], out: TextIO, video_width: Optional[int] = None
+) -> None:
+    """逐行处理 ASS 内容并写入 out，只修改 Dialogue 行的 Text 字段"""
+    parser = _AssHeaderParser()
+    max_width: Optional[float] = None
+
+    for line in lines:
+        if not line.startswith("Dialogue:"):
+            parser.feed(line)
+            out.write(line)
+            continue
+
+        if max_width is None:
+            # 留出1%的边距
+            max_width = (video_width or parser.play_res_x) * 0.99
+        fields = line.split(",", _DIALOGUE_FIELDS)
+        if len(fields) <= _DIALOGUE_FIELDS:
+            out.write(line)
+            continue
+        text = fields[-1]
+        newline = text[len(text.rstrip("\r\n")) :]
+        metrics = parser.styles.get(fields[3].strip(), parser.styles["Default"])
+        fields[-1] = wrap_text(text[: len(text) - len(newline)], max_width, metrics)
+        out.write(",".join(fields) + newline)
 
 
 def auto_wrap_ass_file(
@@ -126,54 +276,24 @@ def auto_wrap_ass_file(
         input_file: 输入ASS文件路径
         output_file: 输出ASS文件路径，如果为None则覆盖输入文件
         video_width: 视频宽度，如果提供则覆盖ASS文件中的设置
-        video_height: 视频高度，如果提供则覆盖ASS文件中的设置
+        video_height: 未使用，保留以兼容旧调用
     """
     if output_file is None:
         output_file = input_file
 
-    # 读取ASS文件
-    with open(input_file, "r", encoding="utf-8") as f:
-        ass_content = f.read()
-
-    # 解析字体大小（在修改分辨率之前）
-    play_res_x, font_sizes = parse_ass_info(ass_content)
-
-    # 如果没有提供视频宽度，使用ASS文件中的宽度
-    if video_width is None:
-        video_width = play_res_x
-
-    # 计算最大文本宽度（考虑边距）
-    max_text_width = int(video_width * 0.99)  # 留出1%的边距
-
-    # 处理对话行
-    def process_dialogue_line(match):
-        full_line = match.group(0)
-
-        # 提取样式名
-        style_pattern = r"Dialogue:[^,]*,[^,]*,[^,]*,([^,]*),"
-        style_match = re.search(style_pattern, full_line)
-        style_name = style_match.group(1).strip() if style_match else "Default"
-
-        # 获取对应样式的字体大小
-        font_size = font_sizes.get(style_name, font_sizes["Default"])
-
-        # 获取文本内容
-        text_part = match.group(1)
-
-        # 处理文本部分
-        wrapped_text = auto_wrap_text(text_part, max_text_width, font_size)
-
-        # 替换原文本
-        return full_line.replace(text_part, wrapped_text)
-
-    # 使用正则表达式匹配并处理对话行
-    pattern = r"Dialogue:[^,]*(?:,[^,]*){8},(.*?)$"
-    processed_content = re.sub(
-        pattern, process_dialogue_line, ass_content, flags=re.MULTILINE
-    )
-
-    # 保存处理后的文件
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(processed_content)
+    out_dir = os.path.dirname(os.path.abspath(output_file))
+    fd, tmp_path = tempfile.mkstemp(suffix=".ass", dir=out_dir)
+    try:
+        with open(input_file, "r", encoding="utf-8", newline="") as src, open(
+            fd, "w", encoding="utf-8", newline=""
+        ) as dst:
+            wrap_ass_lines(src, dst, video_width)
+        # mkstemp 创建的文件权限为 0600，保持与原文件一致
+        shutil.copymode(input_file, tmp_path)
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
 
     return output_file
@@ -7,8 +7,12 @@ Can be used by translation, ASR, and other modules that need caching.
 import functools
 import hashlib
 import json
-from dataclasses import asdict, is_dataclass
-from typing import Any
+import pickle
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
 
 from diskcache import Cache
 
@@ -35,54 +39,169 @@ def is_cache_enabled() -> bool:
     return _cache_enabled
 
 
-# Predefined cache instances for common use cases
-_llm_cache = Cache(str(CACHE_PATH / "llm_translation"))
-_asr_cache = Cache(str(CACHE_PATH / "asr_results"), tag_index=True)
-_tts_cache = Cache(str(CACHE_PATH / "tts_audio"))
-_translate_cache = Cache(str(CACHE_PATH / "translate_results"))
-_version_state_cache = Cache(str(CACHE_PATH / "version_state"))
+# Predefined cache instances for common use cases, opened on first use so
+# that importing this module does not touch the SQLite files.
+_CACHE_SETTINGS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "llm": ("llm_translation", {}),
+    "asr": ("asr_results", {"tag_index": True}),
+    "tts": ("tts_audio", {}),
+    "translate": ("translate_results", {}),
+    "version_state": ("version_state", {}),
+    "media": ("media_info", {}),
+}
+_caches: Dict[str, Cache] = {}
+_caches_lock = threading.Lock()
+
+
+def _get_cache(name: str) -> Cache:
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                directory, options = _CACHE_SETTINGS[name]
+                cache = Cache(str(CACHE_PATH / directory), **options)
+                _caches[name] = cache
+    return cache
 
 
 def get_llm_cache() -> Cache:
     """Get LLM translation cache instance."""
-    return _llm_cache
+    return _get_cache("llm")
 
 
 def get_asr_cache() -> Cache:
     """Get ASR results cache instance."""
-    return _asr_cache
+    return _get_cache("asr")
 
 
 def get_translate_cache() -> Cache:
     """Get translate cache instance."""
-    return _translate_cache
+    return _get_cache("translate")
 
 
 def get_tts_cache() -> Cache:
     """Get TTS audio cache instance."""
-    return _tts_cache
+    return _get_cache("tts")
 
 
 def get_version_state_cache() -> Cache:
     """Get version check state cache instance."""
-    return _version_state_cache
+    return _get_cache("version_state")
 
 
-def memoize(cache_instance: Cache, **kwargs):
+def get_media_cache() -> Cache:
+    """Get media metadata cache instance."""
+    return _get_cache("media")
+
+
+@dataclass(frozen=True)
+class FlightStats:
+    """Counters of a SingleFlight group.
+
+    calls: total calls; coalesced: calls that waited on an identical call
+    already in flight; misses: calls that reached the upstream service;
+    hits: the remaining calls, answered from cache.
+    """
+
+    calls: int = 0
+    coalesced: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.calls - self.coalesced - self.misses
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls within the process.
+
+    The first call for a key runs the function; calls with the same key that
+    arrive while it is running wait for its result (or exception) instead of
+    running it again. Once the call finishes the key is released, so later
+    calls go through the cache as usual.
+
+    Functions run through do() should call record_miss() when they actually
+    reach the upstream service, which lets stats() tell cache hits apart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._counts: Counter = Counter()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self._counts["calls"] += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self._counts["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._counts["misses"] += 1
+
+    def stats(self) -> FlightStats:
+        with self._lock:
+            return FlightStats(
+                calls=self._counts["calls"],
+                coalesced=self._counts["coalesced"],
+                misses=self._counts["misses"],
+            )
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get the process-wide SingleFlight group with the given name."""
+    with _caches_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight()
+    return flight
+
+
+def memoize(
+    cache_instance: Union[Cache, Callable[[], Cache]],
+    single_flight: Optional[str] = None,
+    **kwargs,
+):
     """Decorator to cache function results with global switch support.
 
     This is a thin wrapper around diskcache.Cache.memoize() that respects
     the global cache enable/disable setting.
 
     Args:
-        cache_instance: Cache instance to use (from get_llm_cache(), etc.)
+        cache_instance: Cache instance, or a getter such as get_llm_cache so
+            the cache is only opened when the function is first called
+        single_flight: Name of a SingleFlight group. Identical calls (same
+            memoize key) made while one is in flight wait for its result
+            instead of calling the function again
         **kwargs: Arguments passed to cache.memoize() (expire, typed, etc.)
 
     Returns:
         Decorated function
 
     Examples:
-        @memoize(get_llm_cache(), expire=3600, typed=True)
+        @memoize(get_llm_cache, expire=3600, typed=True)
         def call_api(prompt: str):
             response = client.chat.completions.create(...)
             if not response.choices:
@@ -91,13 +210,37 @@ def memoize(cache_instance: Cache, **kwargs):
     """
 
     def decorator(func):
-        memoized_func = cache_instance.memoize(**kwargs)(func)
+        memoized: Dict[str, Callable] = {}
+        flight = get_single_flight(single_flight) if single_flight else None
+
+        if flight is None:
+            target = func
+        else:
+            # Same module and qualname as func, so memoize keys are unchanged
+            @functools.wraps(func)
+            def target(*args, **kw):
+                flight.record_miss()
+                return func(*args, **kw)
+
+        def get_memoized() -> Callable:
+            if "func" not in memoized:
+                cache = (
+                    cache_instance
+                    if isinstance(cache_instance, Cache)
+                    else cache_instance()
+                )
+                memoized["func"] = cache.memoize(**kwargs)(target)
+            return memoized["func"]
 
         @functools.wraps(func)
         def wrapper(*args, **kw):
-            if _cache_enabled:
-                return memoized_func(*args, **kw)
-            return func(*args, **kw)
+            if not _cache_enabled:
+                return func(*args, **kw)
+            cached_func = get_memoized()
+            if flight is None:
+                return cached_func(*args, **kw)
+            key = pickle.dumps(cached_func.__cache_key__(*args, **kw))
+            return flight.do(key, cached_func, *args, **kw)
 
         return wrapper
 
@@ -0,0 +1,87 @@
+"""播放器实时预览用的 ASS 字幕写入器
+
+编辑或翻译过程中字幕会被频繁修改。这里把每一行对应的 Dialogue 文本缓存
+在内存中，更新时只重新生成变动的行；整份内容的哈希不变时不重写文件，
+播放器也就不必重新加载字幕。
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from ..asr.subtitle_writer import (
+    build_ass_header,
+    format_ass_dialogues,
+    ms_to_ass_time,
+)
+from ..entities import SubtitleLayoutEnum
+from .logger import setup_logger
+
+logger = setup_logger("live_subtitle")
+
+
+class LiveAssWriter:
+    """按行缓存 Dialogue 文本的 ASS 写入器
+
+    行数据使用 ASRData.to_json() 中单个条目的格式（start_time、end_time、
+    original_subtitle、translated_subtitle）。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        style_str: Optional[str] = None,
+        layout: SubtitleLayoutEnum = SubtitleLayoutEnum.ORIGINAL_ON_TOP,
+    ):
+        self.path = path
+        self.layout = layout
+        self._header = build_ass_header(style_str)
+        self._lines: List[str] = []
+        self._digest: Optional[str] = None
+
+    def _format(self, row: Mapping[str, Any]) -> str:
+        return format_ass_dialogues(
+            ms_to_ass_time(row["start_time"]),
+            ms_to_ass_time(row["end_time"]),
+            row["original_subtitle"],
+            row["translated_subtitle"],
+            self.layout,
+        )
+
+    def set_style(self, style_str: Optional[str]) -> None:
+        """更换样式，只影响文件头"""
+        self._header = build_ass_header(style_str)
+
+    def reset(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        layout: Optional[SubtitleLayoutEnum] = None,
+    ) -> None:
+        """重新生成所有行（加载新字幕、增删行或布局变化时）"""
+        if layout is not None:
+            self.layout = layout
+        self._lines = [self._format(row) for row in rows]
+
+    def update_rows(self, rows: Dict[int, Mapping[str, Any]]) -> None:
+        """只重新生成变动的行"""
+        for index, row in rows.items():
+            if 0 <= index < len(self._lines):
+                self._lines[index] = self._format(row)
+
+    def render(self) -> str:
+        return self._header + "".join(self._lines)
+
+    def write(self) -> bool:
+        """内容有变化时写入文件
+
+        Returns:
+            文件是否被重写
+        """
+        content = self.render()
+        digest = hashlib.md5(content.encode("utf-8")).hexdigest()
+        if digest == self._digest:
+            return False
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        self._digest = digest
+        logger.debug("实时字幕已更新: %d 行", len(self._lines))
+        return True
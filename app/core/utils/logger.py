@@ -1,22 +1,245 @@
+import atexit
 import logging
 import logging.handlers
+import os
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from ...config import LOG_LEVEL, LOG_PATH
 
+# 设置特定库的日志级别为ERROR以减少日志噪音
+NOISY_LOGGERS = [
+    "urllib3",
+    "requests",
+    "openai",
+    "httpx",
+    "httpcore",
+    "ssl",
+    "certifi",
+]
+
+DEFAULT_INFO_FMT = "%(message)s"
+DEFAULT_FMT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+class LevelSpecificFormatter(logging.Formatter):
+    """INFO 级别使用简化格式，其他级别使用详细格式"""
+
+    def __init__(self, info_fmt: str, default_fmt: str, datefmt: str):
+        super().__init__(default_fmt, datefmt=datefmt)
+        self._info_formatter = logging.Formatter(info_fmt, datefmt=datefmt)
+
+    def format(self, record):
+        if record.levelno == logging.INFO:
+            return self._info_formatter.format(record)
+        return super().format(record)
+
+
+class _RoutingHandler(logging.Handler):
+    """日志后台线程中唯一的写入者
+
+    按记录上标注的目标写入控制台和日志文件；同一路径只打开一个文件句柄，
+    所有模块共享。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._console = logging.StreamHandler()
+        self._files: Dict[tuple, logging.Handler] = {}
+
+    def _file_handler(
+        self, log_file: str, formatter: logging.Formatter, key: tuple
+    ) -> logging.Handler:
+        handler = self._files.get(key)
+        if handler is None:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+            )
+            handler.setFormatter(formatter)
+            self._files[key] = handler
+        return handler
+
+    def emit(self, record):
+        done = getattr(record, "_log_flush", None)
+        if done is not None:
+            # flush_logs() 的哨兵：之前入队的记录都已处理
+            self.flush()
+            done.set()
+            return
+        target: _Target = getattr(record, "_log_target", None) or _DEFAULT_TARGET
+        if target.console:
+            self._console.setFormatter(target.formatter)
+            self._console.handle(record)
+        if target.log_file:
+            self._file_handler(target.log_file, target.formatter, target.key).handle(
+                record
+            )
+
+    def flush(self):
+        self._console.flush()
+        for handler in self._files.values():
+            handler.flush()
+
+    def close(self):
+        for handler in self._files.values():
+            handler.close()
+        self._files.clear()
+        super().close()
+
+
+class _Target:
+    """一个 setup_logger 调用对应的输出目标与格式"""
+
+    def __init__(
+        self,
+        info_fmt: str,
+        default_fmt: str,
+        datefmt: str,
+        log_file: str,
+        console: bool,
+    ):
+        self.console = console
+        self.log_file = log_file
+        self.formatter = LevelSpecificFormatter(info_fmt, default_fmt, datefmt)
+        self.key = (log_file, info_fmt, default_fmt, datefmt)
+
+
+class _TargetQueueHandler(logging.handlers.QueueHandler):
+    """调用线程中只做入队，格式化与写文件由后台线程完成"""
+
+    def __init__(self, log_queue, target: _Target):
+        super().__init__(log_queue)
+        self.target = target
+
+    def prepare(self, record):
+        # 在调用线程合并 msg % args（保证参数的值是当时的状态），异常堆栈
+        # 转成文本，避免把不可 pickle / 已变化的对象交给后台线程
+        record = super().prepare(record)
+        record._log_target = self.target  # type: ignore[attr-defined]
+        return record
+
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+_DEFAULT_TARGET = _Target(
+    DEFAULT_INFO_FMT, DEFAULT_FMT, DEFAULT_DATEFMT, str(LOG_PATH / "app.log"), True
+)
+
+
+def _ensure_listener() -> None:
+    """启动唯一的日志后台线程（首次调用时）"""
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is not None:
+            return
+        for lib in NOISY_LOGGERS:
+            logging.getLogger(lib).setLevel(logging.ERROR)
+        listener = logging.handlers.QueueListener(_log_queue, _RoutingHandler())
+        listener.start()
+        atexit.register(stop_logging)
+        _listener = listener
+
+
+def flush_logs() -> None:
+    """等待已入队的日志全部写出"""
+    listener = _listener
+    if listener is None:
+        return
+    done = threading.Event()
+    record = logging.makeLogRecord({"msg": "", "levelno": logging.NOTSET})
+    record._log_flush = done  # type: ignore[attr-defined]
+    _log_queue.put(record)
+    done.wait(timeout=5)
+
+
+def stop_logging() -> None:
+    """停止后台线程并关闭文件（进程退出时自动调用）"""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def _restart_after_fork() -> None:
+    # fork 出的子进程没有后台线程，重新启动一个
+    global _listener
+    if _listener is not None:
+        _listener = None
+        _ensure_listener()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+class RateLimitFilter(logging.Filter):
+    """限制同一调用位置的高频日志：每 interval 秒最多输出一条
+
+    被省略的条数会附加在下一条输出的日志后面。只作用于 max_level 及以下
+    的级别，警告和错误始终输出。
+    """
+
+    def __init__(self, interval: float = 1.0, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.interval = interval
+        self.max_level = max_level
+        self._last: Dict[Tuple[str, int], float] = {}
+        self._suppressed: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last.get(key, float("-inf")) < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._last[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            record.msg = f"{record.msg} (已省略 {suppressed} 条)"
+        return True
+
+
+def rate_limit(
+    logger: logging.Logger, interval: float = 1.0, max_level: int = logging.DEBUG
+) -> logging.Logger:
+    """为 logger 的高频低级别日志加上限速，返回 logger 本身"""
+    if not any(isinstance(f, RateLimitFilter) for f in logger.filters):
+        logger.addFilter(RateLimitFilter(interval, max_level))
+    return logger
+
 
 def setup_logger(
     name: str,
     level: int = LOG_LEVEL,
-    info_fmt: str = "%(message)s",  # INFO级别使用简化格式
-    default_fmt: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",  # 其他级别使用详细格式
-    datefmt: str = "%Y-%m-%d %H:%M:%S",
+    info_fmt: str = DEFAULT_INFO_FMT,  # INFO级别使用简化格式
+    default_fmt: str = DEFAULT_FMT,  # 其他级别使用详细格式
+    datefmt: str = DEFAULT_DATEFMT,
     log_file: str = str(LOG_PATH / "app.log"),
     console_output: bool = True,
 ) -> logging.Logger:
     """
     创建并配置一个日志记录器，INFO级别使用简化格式。
 
+    所有记录器共享一个队列：调用线程只把记录放入队列，由唯一的后台线程
+    格式化并写入控制台与日志文件（同一文件只有一个句柄）。
+
     参数：
     - name: 日志记录器的名称
     - level: 日志级别
@@ -24,51 +247,15 @@ def setup_logger(
     - default_fmt: 其他级别的日志格式字符串
     - datefmt: 时间格式字符串
     - log_file: 日志文件路径
+    - console_output: 是否输出到控制台
     """
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    if not logger.handlers:
-        # 创建级别特定的格式化器
-        class LevelSpecificFormatter(logging.Formatter):
-            def format(self, record):
-                if record.levelno == logging.INFO:
-                    self._style._fmt = info_fmt
-                else:
-                    self._style._fmt = default_fmt
-                return super().format(record)
-
-        level_formatter = LevelSpecificFormatter(default_fmt, datefmt=datefmt)
-
-        # 只在console_output为True时添加控制台处理器
-        if console_output:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(level)
-            console_handler.setFormatter(level_formatter)
-            logger.addHandler(console_handler)
-
-        # 文件处理器
-        if log_file:
-            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
-            )
-            file_handler.setLevel(level)
-            file_handler.setFormatter(level_formatter)
-            logger.addHandler(file_handler)
-
-    # 设置特定库的日志级别为ERROR以减少日志噪音
-    error_loggers = [
-        "urllib3",
-        "requests",
-        "openai",
-        "httpx",
-        "httpcore",
-        "ssl",
-        "certifi",
-    ]
-    for lib in error_loggers:
-        logging.getLogger(lib).setLevel(logging.ERROR)
+    if not any(isinstance(h, _TargetQueueHandler) for h in logger.handlers):
+        _ensure_listener()
+        target = _Target(info_fmt, default_fmt, datefmt, log_file, console_output)
+        logger.addHandler(_TargetQueueHandler(_log_queue, target))
 
     return logger
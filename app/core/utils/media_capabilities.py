@@ -0,0 +1,210 @@
+"""ffmpeg 能力探测注册表
+
+硬件加速器、编码器、滤镜与编解码器列表只取决于 ffmpeg 可执行文件本身，
+因此每个二进制版本（路径 + 大小 + 修改时间）只探测一次，结果持久化到磁盘
+缓存，之后的查询直接由内存回答，不再为每次合成启动一批 ffmpeg 进程。
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set
+
+from .cache import get_version_state_cache
+from .logger import setup_logger
+
+logger = setup_logger("media_capabilities")
+
+# 持久化结果的有效期（秒）。驱动变化不会改变 ffmpeg 二进制，因此设置有效期兜底
+CAPABILITY_EXPIRE = 86400 * 7
+
+_LIST_LINE_PATTERN = re.compile(r"^\s*([A-Z.]{6})\s+(\S+)")
+_FILTER_LINE_PATTERN = re.compile(r"^\s*[TSC.|]{2,3}\s+(\S+)\s+\S+->\S+")
+
+_CREATION_FLAGS = (
+    getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+)
+
+
+@dataclass
+class FFmpegCapabilities:
+    """ffmpeg 二进制的能力描述"""
+
+    binary: str = ""
+    version: str = ""
+    hwaccels: List[str] = field(default_factory=list)
+    encoders: List[str] = field(default_factory=list)
+    filters: List[str] = field(default_factory=list)
+    codecs: List[str] = field(default_factory=list)
+    # CUDA 设备能否初始化，None 表示尚未探测
+    cuda_usable: Optional[bool] = None
+
+    def __post_init__(self):
+        self._sets: Dict[str, Set[str]] = {}
+
+    def _lookup(self, name: str) -> Set[str]:
+        if name not in self._sets:
+            self._sets[name] = {item.lower() for item in getattr(self, name)}
+        return self._sets[name]
+
+    def has_hwaccel(self, name: str) -> bool:
+        return name.lower() in self._lookup("hwaccels")
+
+    def has_encoder(self, name: str) -> bool:
+        return name.lower() in self._lookup("encoders")
+
+    def has_filter(self, name: str) -> bool:
+        return name.lower() in self._lookup("filters")
+
+    def has_codec(self, name: str) -> bool:
+        return name.lower() in self._lookup("codecs")
+
+
+class CapabilityRegistry:
+    """按 ffmpeg 二进制版本缓存的能力注册表"""
+
+    def __init__(self, binary: str = "ffmpeg"):
+        self.binary = binary
+        self._capabilities: Dict[str, FFmpegCapabilities] = {}
+        self._lock = threading.Lock()
+
+    def get(self, refresh: bool = False) -> FFmpegCapabilities:
+        """获取当前 ffmpeg 的能力，必要时探测并持久化
+
+        Args:
+            refresh: 忽略缓存重新探测
+        """
+        key = self._binary_key()
+        if key is None:
+            logger.warning("未找到 ffmpeg 可执行文件")
+            return FFmpegCapabilities()
+
+        with self._lock:
+            caps = None if refresh else self._capabilities.get(key)
+            if caps is not None:
+                return caps
+
+            cache = get_version_state_cache()
+            cache_key = f"ffmpeg_capabilities:{key}"
+            if not refresh:
+                cached = cache.get(cache_key, default=None)
+                if isinstance(cached, dict):
+                    caps = FFmpegCapabilities(**cached)
+            if caps is None:
+                caps = self._probe(key.split("|", 1)[0])
+                cache.set(cache_key, asdict(caps), expire=CAPABILITY_EXPIRE)
+
+            self._capabilities[key] = caps
+            return caps
+
+    def cuda_available(self) -> bool:
+        """CUDA 硬件解码是否可用（探测结果随能力一起持久化）"""
+        caps = self.get()
+        if caps.cuda_usable is not None:
+            return caps.cuda_usable
+        if not caps.has_hwaccel("cuda"):
+            logger.info("CUDA不在支持的硬件加速器列表中")
+            usable = False
+        else:
+            output = self._run(["-hide_banner", "-init_hw_device", "cuda"], caps.binary)
+            # 如果输出中包含"Cannot load cuda" 或 "Failed to load"等错误信息，说明CUDA不可用
+            usable = output is not None and not any(
+                error in output.lower()
+                for error in ["cannot load cuda", "failed to load", "error"]
+            )
+            logger.info("CUDA可用" if usable else "CUDA设备初始化失败")
+
+        with self._lock:
+            caps.cuda_usable = usable
+            key = self._binary_key()
+            if key is not None:
+                get_version_state_cache().set(
+                    f"ffmpeg_capabilities:{key}", asdict(caps), expire=CAPABILITY_EXPIRE
+                )
+        return usable
+
+    def _binary_key(self) -> Optional[str]:
+        path = shutil.which(self.binary)
+        if not path:
+            return None
+        path = os.path.realpath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    def _probe(self, path: str) -> FFmpegCapabilities:
+        logger.info(f"探测 ffmpeg 能力: {path}")
+        version_output = self._run(["-hide_banner", "-version"], path) or ""
+        first_line = version_output.splitlines()[0] if version_output else ""
+        hwaccels = self._run(["-hide_banner", "-hwaccels"], path) or ""
+        encoders = self._run(["-hide_banner", "-encoders"], path) or ""
+        filters = self._run(["-hide_banner", "-filters"], path) or ""
+        codecs = self._run(["-hide_banner", "-codecs"], path) or ""
+
+        caps = FFmpegCapabilities(
+            binary=path,
+            version=first_line,
+            hwaccels=[
+                line.strip()
+                for line in hwaccels.splitlines()[1:]
+                if line.strip() and ":" not in line
+            ],
+            encoders=_parse_list(encoders),
+            filters=[
+                m.group(1)
+                for line in filters.splitlines()
+                if (m := _FILTER_LINE_PATTERN.match(line))
+            ],
+            codecs=_parse_list(codecs),
+        )
+        logger.info(
+            f"ffmpeg 能力: {caps.version}, 硬件加速 {caps.hwaccels}, "
+            f"编码器 {len(caps.encoders)} 个, 滤镜 {len(caps.filters)} 个"
+        )
+        return caps
+
+    @staticmethod
+    def _run(args: List[str], binary: str) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                [binary, *args],
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                creationflags=_CREATION_FLAGS,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"ffmpeg 探测失败: {e}")
+            return None
+        return result.stdout + result.stderr
+
+
+def _parse_list(output: str) -> List[str]:
+    """解析 -encoders / -codecs 输出（跳过 ------ 之前的图例）"""
+    _, sep, body = output.partition("------")
+    lines = body.splitlines() if sep else output.splitlines()
+    return [m.group(2) for line in lines if (m := _LIST_LINE_PATTERN.match(line))]
+
+
+_registry: Optional[CapabilityRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_capability_registry() -> CapabilityRegistry:
+    """获取全局 ffmpeg 能力注册表"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CapabilityRegistry()
+        return _registry
+
+
+def get_ffmpeg_capabilities(refresh: bool = False) -> FFmpegCapabilities:
+    """获取当前 ffmpeg 的能力描述"""
+    return get_capability_registry().get(refresh)
@@ -0,0 +1,254 @@
+"""媒体元数据探测
+
+统一读取音频时长、采样率、声道等信息，避免为获取时长而完整解码音频：
+1. WAV 直接解析文件头
+2. 其他格式调用一次 ffprobe（不可用时退回 ffmpeg -i 的头部信息）
+
+结果按内容指纹缓存在内存与磁盘中，同一内容只探测一次。
+"""
+
+import io
+import json
+import os
+import re
+import subprocess
+import threading
+import wave
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, TypeVar, Union, cast
+
+from .cache import get_asr_cache, is_cache_enabled
+from .logger import setup_logger
+
+logger = setup_logger("media_probe")
+
+# 流式计算 CRC32 时每次读取的字节数
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+# 内存缓存条目上限（按最近使用淘汰），完整结果另存于磁盘缓存
+FINGERPRINT_INDEX_SIZE = 4096
+MEDIA_INFO_CACHE_SIZE = 1024
+
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_AUDIO_STREAM_PATTERN = re.compile(r"Audio: (\w+).*?(\d+) Hz(?:, (mono|stereo))?")
+
+
+@dataclass
+class MediaInfo:
+    """媒体元数据"""
+
+    duration: float  # 时长（秒）
+    sample_rate: int = 0
+    channels: int = 0
+    codec: str = ""
+    format_name: str = ""
+
+
+# (path, size, mtime_ns) -> crc32，避免重复读取同一文件
+_fingerprint_index: "OrderedDict[tuple, str]" = OrderedDict()
+# 内容指纹 -> MediaInfo
+_media_info_cache: "OrderedDict[str, MediaInfo]" = OrderedDict()
+_lock = threading.Lock()
+
+_V = TypeVar("_V")
+
+
+def _lru_get(cache: "OrderedDict[Any, _V]", key: Any) -> Optional[_V]:
+    """读取 LRU 缓存并标记为最近使用，调用方需持有 _lock"""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: "OrderedDict[Any, _V]", key: Any, value: _V, limit: int) -> None:
+    """写入 LRU 缓存，超出上限时淘汰最久未使用的条目，调用方需持有 _lock"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def compute_file_fingerprint(path: str) -> str:
+    """流式计算文件 CRC32，并按 (path, size, mtime) 缓存结果
+
+    索引保存在内存与 ASR 磁盘缓存中，未修改的文件不会被再次读取。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        8 位十六进制 CRC32
+    """
+    stat = os.stat(path)
+    index_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _lock:
+        cached = _lru_get(_fingerprint_index, index_key)
+    if cached is not None:
+        return cached
+
+    cache = get_asr_cache()
+    disk_key = "fingerprint:{}:{}:{}".format(*index_key)
+    if is_cache_enabled():
+        cached = cast(Optional[str], cache.get(disk_key, default=None))
+    if cached is None:
+        crc = 0
+        with open(path, "rb") as f:
+            while block := f.read(FINGERPRINT_BLOCK_SIZE):
+                crc = zlib.crc32(block, crc)
+        cached = format(crc & 0xFFFFFFFF, "08x")
+        if is_cache_enabled():
+            cache.set(disk_key, cached, expire=86400 * 30)
+
+    with _lock:
+        _lru_put(_fingerprint_index, index_key, cached, FINGERPRINT_INDEX_SIZE)
+    return cached
+
+
+def compute_bytes_fingerprint(data: bytes) -> str:
+    """计算字节数据的 CRC32 指纹"""
+    return format(zlib.crc32(data) & 0xFFFFFFFF, "08x")
+
+
+def register_media_info(fingerprint: str, info: MediaInfo) -> None:
+    """登记已知内容的元数据（如分块时已知每块时长），后续探测直接命中"""
+    with _lock:
+        _lru_put(_media_info_cache, fingerprint, info, MEDIA_INFO_CACHE_SIZE)
+
+
+def probe_media(
+    source: Union[str, bytes], fingerprint: Optional[str] = None
+) -> Optional[MediaInfo]:
+    """探测媒体元数据，不解码音频数据
+
+    Args:
+        source: 文件路径或字节数据
+        fingerprint: 内容指纹，未提供时自动计算
+
+    Returns:
+        MediaInfo，探测失败返回 None
+    """
+    if fingerprint is None:
+        if isinstance(source, bytes):
+            fingerprint = compute_bytes_fingerprint(source)
+        else:
+            try:
+                fingerprint = compute_file_fingerprint(source)
+            except OSError as e:
+                logger.debug(f"读取媒体文件失败: {e}")
+                return None
+
+    with _lock:
+        info = _lru_get(_media_info_cache, fingerprint)
+    if info is not None:
+        return info
+
+    cache = get_asr_cache()
+    disk_key = f"media_info:{fingerprint}"
+    if is_cache_enabled():
+        cached = cache.get(disk_key, default=None)
+        if isinstance(cached, dict):
+            info = MediaInfo(**cached)
+
+    if info is None:
+        info = _read_wav_header(source) or _run_ffprobe(source) or _run_ffmpeg(source)
+        if info is None:
+            return None
+        if is_cache_enabled():
+            cache.set(disk_key, asdict(info), expire=86400 * 30)
+
+    register_media_info(fingerprint, info)
+    return info
+
+
+def get_media_duration(
+    source: Union[str, bytes], fingerprint: Optional[str] = None
+) -> Optional[float]:
+    """获取媒体时长（秒），探测失败返回 None"""
+    info = probe_media(source, fingerprint)
+    return info.duration if info else None
+
+
+def _read_wav_header(source: Union[str, bytes]) -> Optional[MediaInfo]:
+    """解析 WAV 文件头"""
+    try:
+        target = io.BytesIO(source) if isinstance(source, bytes) else source
+        with wave.open(target, "rb") as f:
+            return MediaInfo(
+                duration=f.getnframes() / float(f.getframerate()),
+                sample_rate=f.getframerate(),
+                channels=f.getnchannels(),
+                codec="pcm",
+                format_name="wav",
+            )
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+def _probe_command(cmd: list, source: Union[str, bytes]) -> Optional[str]:
+    """执行探测命令，字节数据通过 stdin 传入，返回 stdout+stderr"""
+    try:
+        result = subprocess.run(
+            cmd,
+            input=source if isinstance(source, bytes) else None,
+            capture_output=True,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"探测命令执行失败: {e}")
+        return None
+    return (result.stdout + result.stderr).decode("utf-8", errors="replace")
+
+
+def _run_ffprobe(source: Union[str, bytes]) -> Optional[MediaInfo]:
+    """使用 ffprobe 读取容器与音频流信息"""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "format=duration,format_name:stream=codec_name,sample_rate,channels",
+        "-of",
+        "json",
+        "pipe:0" if isinstance(source, bytes) else source,
+    ]
+    output = _probe_command(cmd, source)
+    if not output:
+        return None
+    try:
+        data = json.loads(output)
+        fmt = data.get("format", {})
+        stream = (data.get("streams") or [{}])[0]
+        return MediaInfo(
+            duration=float(fmt["duration"]),
+            sample_rate=int(stream.get("sample_rate", 0) or 0),
+            channels=int(stream.get("channels", 0) or 0),
+            codec=stream.get("codec_name", ""),
+            format_name=fmt.get("format_name", ""),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _run_ffmpeg(source: Union[str, bytes]) -> Optional[MediaInfo]:
+    """ffprobe 不可用时，从 ffmpeg -i 的头部信息中解析"""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-i",
+        "pipe:0" if isinstance(source, bytes) else source,
+    ]
+    output = _probe_command(cmd, source)
+    if not output or not (match := _DURATION_PATTERN.search(output)):
+        return None
+    hours, minutes, seconds = match.groups()
+    info = MediaInfo(duration=int(hours) * 3600 + int(minutes) * 60 + float(seconds))
+    if stream := _AUDIO_STREAM_PATTERN.search(output):
+        info.codec = stream.group(1)
+        info.sample_rate = int(stream.group(2))
+        info.channels = {"mono": 1, "stereo": 2}.get(stream.group(3) or "", 0)
+    return info
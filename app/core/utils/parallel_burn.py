@@ -0,0 +1,451 @@
+"""分段并行烧录硬字幕
+
+单个 ffmpeg 进程烧录硬字幕时，解码、libass 渲染与编码都串行在一条流水线上，
+多核 CPU 难以吃满。这里按关键帧把视频切成 N 段，每段在独立的 ffmpeg 进程中
+烧录（字幕时间轴平移到该段起点），最后用 concat 流复制拼接并混入原音轨。
+"""
+
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import psutil
+
+from ..entities import AudioStreamInfo
+from .logger import setup_logger
+from .subprocess_helper import ManagedProcess, get_process_supervisor
+
+logger = setup_logger("parallel_burn")
+
+# 每段最短时长（秒），过短的分段启动开销大于并行收益
+MIN_SEGMENT_DURATION = 60.0
+# 最多并行的 ffmpeg 进程数
+MAX_SEGMENTS = 8
+# 每个编码进程至少使用的线程数
+MIN_THREADS_PER_SEGMENT = 2
+# 支持时间轴平移的字幕格式
+SHIFTABLE_SUBTITLE_SUFFIXES = (".ass", ".srt")
+# 拼接阶段在总进度中的占比（%）
+CONCAT_PROGRESS_SHARE = 2
+
+_TIME_PATTERN = re.compile(r"time=(\d{2}):(\d{2}):(\d{2}\.\d{2})")
+_ASS_DIALOGUE_PATTERN = re.compile(
+    r"^(Dialogue:\s*[^,]*,)(\d+:\d{2}:\d{2}\.\d{2}),(\d+:\d{2}:\d{2}\.\d{2}),(.*)$"
+)
+_SRT_TIMING_PATTERN = re.compile(
+    r"(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})"
+)
+
+_CREATION_FLAGS = (
+    getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+)
+
+
+def get_default_segment_count(duration: float) -> int:
+    """根据物理核心数与视频时长估算并行分段数"""
+    cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    by_cores = cores // MIN_THREADS_PER_SEGMENT
+    by_duration = int(duration // MIN_SEGMENT_DURATION)
+    return max(1, min(by_cores, by_duration, MAX_SEGMENTS))
+
+
+def probe_keyframes(video_path: str, targets: List[float]) -> Optional[List[float]]:
+    """查找每个目标时间点之前最近的关键帧
+
+    通过 ffprobe 的 read_intervals 在每个目标点附近 seek 并只读取一个数据包，
+    seek 落点即为目标点之前的关键帧，无需扫描整个文件。
+
+    Args:
+        video_path: 视频文件路径
+        targets: 目标切分时间点（秒，相对视频起点）
+
+    Returns:
+        关键帧时间点列表（相对视频起点），ffprobe 不可用时返回 None
+    """
+    if not targets:
+        return []
+    intervals = ",".join(f"{t:.3f}%+#1" for t in targets)
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-read_intervals",
+        intervals,
+        "-show_entries",
+        "packet=pts_time,flags:format=start_time",
+        "-of",
+        "json",
+        video_path,
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=_CREATION_FLAGS,
+        )
+        data = json.loads(result.stdout or "{}")
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        logger.debug(f"ffprobe 查找关键帧失败: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+
+    start_time = float(data.get("format", {}).get("start_time", 0) or 0)
+    keyframes = set()
+    for packet in data.get("packets", []):
+        if "K" not in packet.get("flags", "") or "pts_time" not in packet:
+            continue
+        keyframes.add(round(float(packet["pts_time"]) - start_time, 3))
+    return sorted(keyframes)
+
+
+def plan_segments(
+    duration: float, segment_count: int, keyframes: Optional[List[float]] = None
+) -> List[Tuple[float, float]]:
+    """将视频时长划分为若干 (start, end) 分段
+
+    切分点优先对齐到不晚于等分点的关键帧，这样各进程从关键帧开始解码，
+    不会浪费时间解码再丢弃 seek 点之前的帧。
+
+    Args:
+        duration: 视频时长（秒）
+        segment_count: 期望的分段数
+        keyframes: 可用的关键帧时间点，为空时直接使用等分点
+
+    Returns:
+        首尾相接的分段列表
+    """
+    if segment_count <= 1 or duration <= 0:
+        return [(0.0, duration)]
+
+    targets = [duration * i / segment_count for i in range(1, segment_count)]
+    if keyframes:
+        cuts = set()
+        for target in targets:
+            candidates = [k for k in keyframes if 0 < k <= target]
+            if candidates:
+                cuts.add(max(candidates))
+        points = sorted(cuts)
+    else:
+        points = targets
+
+    bounds = [0.0] + [p for p in points if 0 < p < duration] + [duration]
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def _parse_ass_time(value: str) -> float:
+    h, m, s = value.split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def _format_ass_time(seconds: float) -> str:
+    centis = int(round(max(seconds, 0.0) * 100))
+    h, rem = divmod(centis, 360000)
+    m, rem = divmod(rem, 6000)
+    s, cs = divmod(rem, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def _format_srt_time(seconds: float) -> str:
+    millis = int(round(max(seconds, 0.0) * 1000))
+    h, rem = divmod(millis, 3600000)
+    m, rem = divmod(rem, 60000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def shift_subtitle_file(
+    subtitle_path: str, output_path: str, offset: float, duration: float
+) -> None:
+    """生成平移到分段时间轴的字幕文件
+
+    所有事件时间减去 offset；与 [0, duration) 无交集的事件被丢弃，
+    跨越分段起点的事件起始时间截断为 0。
+
+    Args:
+        subtitle_path: 原字幕文件（.ass 或 .srt）
+        output_path: 输出字幕文件
+        offset: 分段起点（秒）
+        duration: 分段时长（秒）
+    """
+    content = Path(subtitle_path).read_text(encoding="utf-8")
+    if Path(subtitle_path).suffix.lower() == ".ass":
+        shifted = _shift_ass(content, offset, duration)
+    else:
+        shifted = _shift_srt(content, offset, duration)
+    Path(output_path).write_text(shifted, encoding="utf-8")
+
+
+def _shift_ass(content: str, offset: float, duration: float) -> str:
+    lines = []
+    for line in content.splitlines():
+        match = _ASS_DIALOGUE_PATTERN.match(line)
+        if match:
+            prefix, start, end, rest = match.groups()
+            start_s = _parse_ass_time(start) - offset
+            end_s = _parse_ass_time(end) - offset
+            if end_s <= 0 or start_s >= duration:
+                continue
+            line = f"{prefix}{_format_ass_time(start_s)},{_format_ass_time(end_s)},{rest}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def _shift_srt(content: str, offset: float, duration: float) -> str:
+    blocks = []
+    for block in re.split(r"\n\s*\n", content.strip()):
+        match = _SRT_TIMING_PATTERN.search(block)
+        if not match:
+            continue
+        g = [int(x) for x in match.groups()]
+        start_s = g[0] * 3600 + g[1] * 60 + g[2] + g[3] / 1000 - offset
+        end_s = g[4] * 3600 + g[5] * 60 + g[6] + g[7] / 1000 - offset
+        if end_s <= 0 or start_s >= duration:
+            continue
+        timing = f"{_format_srt_time(start_s)} --> {_format_srt_time(end_s)}"
+        blocks.append(block[: match.start()] + timing + block[match.end() :])
+    return "\n\n".join(blocks) + "\n"
+
+
+def escape_filter_path(path: str) -> str:
+    """转义 -vf 滤镜参数中的文件路径（需再用单引号包裹）"""
+    return Path(path).as_posix().replace(":", r"\:")
+
+
+def _segment_filter(vf: str, subtitle_path: str, segment_subtitle: str) -> str:
+    """将完整滤镜串中的字幕路径替换为分段字幕，其余滤镜选项保持不变"""
+    escaped = escape_filter_path(subtitle_path)
+    if escaped not in vf:
+        raise ValueError(f"滤镜中未找到字幕路径: {vf}")
+    return vf.replace(escaped, escape_filter_path(segment_subtitle))
+
+
+def select_default_audio_stream(
+    audio_streams: Sequence[AudioStreamInfo],
+) -> Optional[int]:
+    """按 ffmpeg 默认流选择规则挑选音频流，返回其在文件中的流索引
+
+    单进程烧录不指定 -map，ffmpeg 会选 default 标记优先、声道数最多、
+    同分时靠前的音频流；分段拼接时需显式映射同一条音轨。
+    """
+    if not audio_streams:
+        return None
+    best = max(audio_streams, key=lambda s: (s.is_default, s.channels))
+    return best.index
+
+
+class _ProgressAggregator:
+    """汇总各分段 ffmpeg 的处理进度"""
+
+    def __init__(
+        self,
+        durations: List[float],
+        callback: Optional[Callable],
+        share: float = 100 - CONCAT_PROGRESS_SHARE,
+    ):
+        self.durations = durations
+        self.total = sum(durations) or 1.0
+        self.done = [0.0] * len(durations)
+        self.callback = callback
+        self.share = share
+        self.last_reported = -1
+        self._lock = threading.Lock()
+
+    def update(self, index: int, seconds: float) -> None:
+        if not self.callback:
+            return
+        with self._lock:
+            self.done[index] = min(seconds, self.durations[index])
+            progress = int(sum(self.done) / self.total * self.share)
+            if progress <= self.last_reported:
+                return
+            self.last_reported = progress
+            self.callback(f"{progress}", "正在合成")
+
+
+def burn_subtitles_parallel(
+    input_file: str,
+    subtitle_file: str,
+    output: str,
+    duration: float,
+    segment_count: int,
+    crf: int = 23,
+    preset: str = "medium",
+    vcodec: str = "libx264",
+    vf: Optional[str] = None,
+    audio_stream: Optional[int] = None,
+    use_cuda: bool = False,
+    progress_callback: Optional[Callable] = None,
+) -> None:
+    """分段并行烧录硬字幕
+
+    Args:
+        input_file: 输入视频
+        subtitle_file: 字幕文件（.ass 或 .srt）
+        output: 输出视频
+        duration: 视频时长（秒）
+        segment_count: 并行分段数
+        crf/preset/vcodec: 编码参数，与单进程路径一致
+        vf: 单进程路径使用的完整 -vf 滤镜串，各分段将其中的字幕路径替换为
+            分段字幕，默认 subtitles='<subtitle_file>'
+        audio_stream: 混入的原视频音频流索引（文件内的绝对索引），
+            默认使用第一条音轨
+        use_cuda: 是否使用 CUDA 硬件解码
+        progress_callback: 进度回调 (progress: str, message: str)
+
+    Raises:
+        RuntimeError: 任一分段或拼接失败
+        ValueError: vf 中不包含字幕路径
+    """
+    if vf is None:
+        vf = f"subtitles='{escape_filter_path(subtitle_file)}'"
+    # 提前校验，避免启动分段进程后才失败
+    _segment_filter(vf, subtitle_file, subtitle_file)
+    audio_map = "1:a:0?" if audio_stream is None else f"1:{audio_stream}"
+
+    nominal = [duration * i / segment_count for i in range(1, segment_count)]
+    keyframes = probe_keyframes(input_file, nominal)
+    segments = plan_segments(duration, segment_count, keyframes)
+    if keyframes is None:
+        logger.info("ffprobe 不可用，按等分点切分（精确 seek）")
+
+    cores = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    threads = max(1, cores // len(segments))
+    logger.info(
+        f"分段并行烧录: {len(segments)} 段, 每段 {threads} 线程, "
+        f"切分点 {[round(s, 2) for s, _ in segments[1:]]}"
+    )
+
+    aggregator = _ProgressAggregator(
+        [end - start for start, end in segments], progress_callback
+    )
+    processes: List[ManagedProcess] = []
+    processes_lock = threading.Lock()
+    cancelled = threading.Event()
+
+    with tempfile.TemporaryDirectory(prefix="VideoCaptioner_burn_") as work_dir:
+        suffix = Path(subtitle_file).suffix.lower()
+
+        def register(process: ManagedProcess) -> None:
+            with processes_lock:
+                processes.append(process)
+                if cancelled.is_set():
+                    process.kill()
+
+        def encode_segment(index: int) -> str:
+            start, end = segments[index]
+            seg_subtitle = os.path.join(work_dir, f"segment_{index:03d}{suffix}")
+            seg_video = os.path.join(work_dir, f"segment_{index:03d}.mkv")
+            shift_subtitle_file(subtitle_file, seg_subtitle, start, end - start)
+
+            cmd = ["ffmpeg", "-hide_banner"]
+            if use_cuda:
+                cmd.extend(["-hwaccel", "cuda"])
+            cmd.extend(["-ss", f"{start:.3f}", "-t", f"{end - start:.3f}"])
+            cmd.extend(
+                [
+                    "-i",
+                    input_file,
+                    "-map",
+                    "0:v:0",
+                    "-an",
+                    "-vcodec",
+                    vcodec,
+                    "-crf",
+                    str(crf),
+                    "-preset",
+                    preset,
+                    "-threads",
+                    str(threads),
+                    "-vf",
+                    _segment_filter(vf, subtitle_file, seg_subtitle),
+                    "-y",
+                    seg_video,
+                ]
+            )
+            _run_ffmpeg(
+                cmd,
+                on_time=lambda t: aggregator.update(index, t),
+                register=register,
+            )
+            return seg_video
+
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = [executor.submit(encode_segment, i) for i in range(len(segments))]
+            try:
+                segment_files = [f.result() for f in futures]
+            except Exception:
+                cancelled.set()
+                with processes_lock:
+                    for process in processes:
+                        if process.poll() is None:
+                            process.kill()
+                raise
+
+        list_file = os.path.join(work_dir, "segments.txt")
+        with open(list_file, "w", encoding="utf-8") as f:
+            for path in segment_files:
+                escaped = Path(path).as_posix().replace("'", r"'\''")
+                f.write(f"file '{escaped}'\n")
+
+        concat_cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            list_file,
+            "-i",
+            input_file,
+            "-map",
+            "0:v:0",
+            "-map",
+            audio_map,
+            "-c",
+            "copy",
+            "-y",
+            output,
+        ]
+        logger.info(f"拼接分段执行命令: {subprocess.list2cmdline(concat_cmd)}")
+        _run_ffmpeg(concat_cmd)
+
+    if progress_callback:
+        progress_callback("100", "合成完成")
+
+
+def _run_ffmpeg(
+    cmd: List[str],
+    on_time: Optional[Callable[[float], None]] = None,
+    register: Optional[Callable[[ManagedProcess], None]] = None,
+) -> None:
+    """执行 ffmpeg 并解析 stderr 中的 time= 进度，失败时抛出 RuntimeError"""
+
+    def on_line(_stream_name: str, line: str) -> None:
+        if on_time and (match := _TIME_PATTERN.search(line)):
+            h, m, s = map(float, match.groups())
+            on_time(h * 3600 + m * 60 + s)
+
+    # 各分段的 ffmpeg 输出由同一个监督线程读取
+    process = get_process_supervisor().start(cmd, on_line, tail_size=20)
+    if register:
+        register(process)
+
+    return_code = process.wait()
+    if return_code != 0:
+        logger.error(f"ffmpeg 执行失败，返回码: {return_code}")
+        logger.error(f"命令: {subprocess.list2cmdline(cmd)}")
+        logger.error("错误信息: " + "\n".join(process.tail))
+        raise RuntimeError(f"FFmpeg 返回码: {return_code}")
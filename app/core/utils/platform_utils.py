@@ -6,7 +6,8 @@ import os
 from app.config import APPDATA_PATH, RESOURCE_PATH, MODEL_PATH
 import platform
 import subprocess
-from typing import TYPE_CHECKING, Path # Added Path to typing import
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 def get_model_path(model_name: str) -> Path:
     """
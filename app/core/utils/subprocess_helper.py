@@ -1,168 +1,250 @@
-"""子进程输出流处理工具模块"""
+"""子进程输出流处理工具模块
 
-import queue
+所有子进程的 stdout/stderr 由同一个后台事件循环线程多路复用读取：调用方
+提供逐行回调即可，不再为每个进程启动两个读取线程、也不再轮询队列。
+"""
+
+import asyncio
+import codecs
+import os
+import re
 import subprocess
 import threading
-from typing import Callable, Optional, Tuple
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, List, Optional, Set
 
 from ..utils.logger import setup_logger
 
 logger = setup_logger("subprocess_helper")
 
+# 每次从管道读取的字节数
+READ_CHUNK_SIZE = 64 * 1024
+# 没有换行符时单行的最大长度，超过后直接作为一行交付
+MAX_LINE_LENGTH = 64 * 1024
+# 进度条（tqdm、ffmpeg）用 \r 原地刷新，\r 与 \n 都视为行结束
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
 
-class StreamReader:
-    """通用的子进程输出流读取器"""
+_CREATION_FLAGS = (
+    getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+)
 
-    def __init__(self, process: subprocess.Popen):
-        """
-        初始化流读取器
+LineHandler = Callable[[str, str], None]
 
-        Args:
-            process: 子进程对象
-        """
-        self.process = process
-        self.output_queue = queue.Queue()
-        self.threads = []
-
-    def start_reading(self) -> None:
-        """启动异步读取stdout和stderr"""
-        # 启动stdout读取线程
-        if self.process.stdout:
-            stdout_thread = threading.Thread(
-                target=self._read_stream,
-                args=(self.process.stdout, "stdout"),
-                daemon=True,
-            )
-            stdout_thread.start()
-            self.threads.append(stdout_thread)
-
-        # 启动stderr读取线程
-        if self.process.stderr:
-            stderr_thread = threading.Thread(
-                target=self._read_stream,
-                args=(self.process.stderr, "stderr"),
-                daemon=True,
-            )
-            stderr_thread.start()
-            self.threads.append(stderr_thread)
-
-    def _read_stream(self, stream, stream_name: str) -> None:
-        """读取流并放入队列"""
-        try:
-            for line in iter(stream.readline, ""):
-                if line:
-                    self.output_queue.put((stream_name, line))
-        except Exception as e:
-            logger.debug(f"读取 {stream_name} 结束: {e}")
-        finally:
-            stream.close()
-
-    def get_output(self, timeout: float = 0.1) -> Optional[Tuple[str, str]]:
-        """
-        获取输出
 
-        Args:
-            timeout: 等待超时时间
+class ProgressThrottle:
+    """进度事件节流
 
-        Returns:
-            (stream_name, line) 或 None
-        """
+    只有进度增加且距上次输出超过 interval 秒时才放行，100% 总是放行。
+    """
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.last_progress = float("-inf")
+        self._last_time = float("-inf")
+
+    def ready(self, progress: float) -> bool:
+        if progress <= self.last_progress:
+            return False
+        now = time.monotonic()
+        if progress < 100 and now - self._last_time < self.interval:
+            return False
+        self.last_progress = progress
+        self._last_time = now
+        return True
+
+
+class ManagedProcess:
+    """由 ProcessSupervisor 管理的子进程句柄"""
+
+    def __init__(self, cmd: List[str], on_line: Optional[LineHandler], tail_size: int):
+        self.cmd = cmd
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.cancelled = False
+        # 最近的输出行，用于失败时输出错误信息
+        self.tail: Deque[str] = deque(maxlen=tail_size)
+        self._on_line = on_line
+        self._done: "Future[int]" = Future()
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _deliver(self, stream_name: str, line: str) -> None:
+        if not line:
+            return
+        self.tail.append(line)
+        if self._on_line is None:
+            return
         try:
-            return self.output_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
-
-    def get_remaining_output(self) -> list:
-        """获取队列中剩余的所有输出"""
-        output = []
-        while not self.output_queue.empty():
-            try:
-                output.append(self.output_queue.get_nowait())
-            except queue.Empty:
-                break
-        return output
+            self._on_line(stream_name, line)
+        except Exception:
+            logger.exception("处理子进程输出失败: %s", line)
+
+    def poll(self) -> Optional[int]:
+        """进程仍在运行时返回 None"""
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """等待进程结束且输出读取完毕，返回退出码"""
+        return self._done.result(timeout)
+
+    def cancel(self, grace: float = 3.0) -> None:
+        """终止进程，grace 秒后仍未退出则强制结束"""
+        self.cancelled = True
+        if self._loop is not None and not self._done.done():
+            self._loop.call_soon_threadsafe(self._terminate, grace)
+
+    def kill(self) -> None:
+        self.cancel(grace=0)
+
+    def _terminate(self, grace: float) -> None:
+        process, loop = self._process, self._loop
+        if process is None or loop is None or process.returncode is not None:
+            return
+        try:
+            if grace > 0:
+                process.terminate()
+                loop.call_later(grace, self._terminate, 0)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
 
-    def is_empty(self) -> bool:
-        """检查队列是否为空"""
-        return self.output_queue.empty()
 
+class ProcessSupervisor:
+    """在一个后台线程的事件循环中启动并监督多个子进程
 
-def run_process_with_stream_reader(
-    cmd: list,
-    stdout_handler: Optional[Callable[[str], None]] = None,
-    stderr_handler: Optional[Callable[[str], None]] = None,
-    **popen_kwargs,
-) -> subprocess.Popen:
+    回调在该线程中执行，应尽快返回（例如只解析进度、发信号），否则会拖慢
+    其它进程的输出读取。
     """
-    运行子进程并使用StreamReader处理输出
 
-    Args:
-        cmd: 命令列表
-        stdout_handler: stdout行处理函数
-        stderr_handler: stderr行处理函数
-        **popen_kwargs: 传递给subprocess.Popen的额外参数
-
-    Returns:
-        子进程对象
-
-    Example:
-        ```python
-        def handle_stdout(line):
-            print(f"[stdout] {line.strip()}")
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                # Windows 下 new_event_loop 默认是 Proactor，支持子进程管道
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="process-supervisor", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def start(
+        self,
+        cmd: List[str],
+        on_line: Optional[LineHandler] = None,
+        merge_stderr: bool = False,
+        encoding: str = "utf-8",
+        tail_size: int = 50,
+        **popen_kwargs,
+    ) -> ManagedProcess:
+        """
+        启动子进程，输出按行交给 on_line(stream_name, line)
 
-        def handle_stderr(line):
-            print(f"[stderr] {line.strip()}")
+        Args:
+            cmd: 命令列表
+            on_line: 行回调，stream_name 为 "stdout" 或 "stderr"，行不含换行符
+            merge_stderr: 是否把 stderr 合并到 stdout
+            encoding: 输出编码，无法解码的字节会被替换
+            tail_size: 保留的最近输出行数
+            **popen_kwargs: 传递给子进程创建的额外参数（cwd、env 等）
 
-        process = run_process_with_stream_reader(
-            ["ls", "-la"],
-            stdout_handler=handle_stdout,
-            stderr_handler=handle_stderr
+        Returns:
+            进程句柄；启动失败（如可执行文件不存在）时直接抛出异常
+        """
+        loop = self._ensure_loop()
+        handle = ManagedProcess(cmd, on_line, tail_size)
+        popen_kwargs.setdefault("creationflags", _CREATION_FLAGS)
+        future = asyncio.run_coroutine_threadsafe(
+            self._spawn(handle, merge_stderr, encoding, popen_kwargs), loop
         )
-        process.wait()
-        ```
-    """
-    # 设置默认参数
-    default_kwargs = {
-        "stdout": subprocess.PIPE,
-        "stderr": subprocess.PIPE,
-        "text": True,
-        "encoding": "utf-8",
-        "bufsize": 1,  # 行缓冲
-    }
-    default_kwargs.update(popen_kwargs)
-
-    # 启动进程
-    process = subprocess.Popen(cmd, **default_kwargs)
-
-    # 创建流读取器
-    reader = StreamReader(process)
-    reader.start_reading()
-
-    # 处理输出的线程
-    def process_output():
+        future.result()
+        return handle
+
+    def run(
+        self, cmd: List[str], on_line: Optional[LineHandler] = None, **kwargs
+    ) -> ManagedProcess:
+        """启动子进程并等待结束"""
+        handle = self.start(cmd, on_line, **kwargs)
+        handle.wait()
+        return handle
+
+    async def _spawn(
+        self, handle: ManagedProcess, merge_stderr: bool, encoding: str, kwargs: dict
+    ) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *handle.cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+            **kwargs,
+        )
+        handle._process = process
+        handle._loop = asyncio.get_running_loop()
+        handle.pid = process.pid
+        task = asyncio.get_running_loop().create_task(
+            self._supervise(handle, process, encoding)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _supervise(
+        self, handle: ManagedProcess, process: asyncio.subprocess.Process, encoding: str
+    ) -> None:
+        try:
+            pumps = [self._pump(process.stdout, "stdout", handle, encoding)]
+            if process.stderr is not None:
+                pumps.append(self._pump(process.stderr, "stderr", handle, encoding))
+            await asyncio.gather(*pumps)
+            handle.returncode = await process.wait()
+        except BaseException as e:
+            handle._done.set_exception(e)
+            raise
+        handle._done.set_result(handle.returncode)
+
+    @staticmethod
+    async def _pump(
+        stream: Optional[asyncio.StreamReader],
+        stream_name: str,
+        handle: ManagedProcess,
+        encoding: str,
+    ) -> None:
+        if stream is None:
+            return
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        buffer = ""
         while True:
-            # 检查进程状态
-            if process.poll() is not None:
-                # 进程已结束，读取剩余输出
-                for stream_name, line in reader.get_remaining_output():
-                    if stream_name == "stdout" and stdout_handler:
-                        stdout_handler(line)
-                    elif stream_name == "stderr" and stderr_handler:
-                        stderr_handler(line)
+            chunk = await stream.read(READ_CHUNK_SIZE)
+            if not chunk:
                 break
-
-            # 读取输出
-            output = reader.get_output()
-            if output:
-                stream_name, line = output
-                if stream_name == "stdout" and stdout_handler:
-                    stdout_handler(line)
-                elif stream_name == "stderr" and stderr_handler:
-                    stderr_handler(line)
-
-    # 如果提供了处理函数，启动处理线程
-    if stdout_handler or stderr_handler:
-        handler_thread = threading.Thread(target=process_output, daemon=True)
-        handler_thread.start()
-
-    return process
+            buffer += decoder.decode(chunk)
+            *lines, buffer = _LINE_BREAK.split(buffer)
+            for line in lines:
+                handle._deliver(stream_name, line)
+            if len(buffer) > MAX_LINE_LENGTH:
+                handle._deliver(stream_name, buffer)
+                buffer = ""
+        buffer += decoder.decode(b"", final=True)
+        for line in _LINE_BREAK.split(buffer):
+            handle._deliver(stream_name, line)
+
+
+_supervisor: Optional[ProcessSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    """获取全局的子进程监督器"""
+    global _supervisor
+    if _supervisor is None:
+        with _supervisor_lock:
+            if _supervisor is None:
+                _supervisor = ProcessSupervisor()
+    return _supervisor
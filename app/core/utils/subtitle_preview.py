@@ -1,12 +1,24 @@
+"""字幕样式预览图渲染
+
+同一组（样式、文本、尺寸、背景图）只渲染一次：结果按内容哈希缓存在
+PREVIEW_CACHE_DIR 中，命中时不再启动 ffmpeg。界面通过 PreviewRenderer 在
+后台线程渲染，新请求提交后尚未开始的旧请求直接丢弃。
+"""
+
+import hashlib
 import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from app.config import CACHE_PATH, RESOURCE_PATH
 
 from .ass_auto_wrap import auto_wrap_ass_file
 from .logger import setup_logger
+from .media_capabilities import get_ffmpeg_capabilities
 
 logger = setup_logger("subtitle_preview")
 
@@ -26,7 +38,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
 
 ASS_TEMP_FILENAME = CACHE_PATH / "preview.ass"  # 预览的临时 ASS 文件路径
-PREVIEW_IMAGE_FILENAME = CACHE_PATH / "preview.png"  # 预览的图片路径
+PREVIEW_CACHE_DIR = CACHE_PATH / "preview"  # 预览图缓存目录
+PREVIEW_CACHE_LIMIT = 64  # 最多保留的预览图数量
 DEFAULT_BG_PATH = RESOURCE_PATH / "assets" / "default_bg.png"
 
 
@@ -48,6 +61,7 @@ def generate_ass_file(
     preview_text: Tuple[str, Optional[str]],
     video_width: int = 1280,
     video_height: int = 720,
+    output_path: Path = ASS_TEMP_FILENAME,
 ) -> str:
     """生成临时 ASS 文件"""
     original_text, translate_text = preview_text
@@ -67,9 +81,9 @@ def generate_ass_file(
         video_width=video_width,
         video_height=video_height,
     )
-    ASS_TEMP_FILENAME.parent.mkdir(parents=True, exist_ok=True)
-    ASS_TEMP_FILENAME.write_text(ass_content, encoding="utf-8")
-    return str(ASS_TEMP_FILENAME)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(ass_content, encoding="utf-8")
+    return str(output_path)
 
 
 def ensure_background(bg_path: Path) -> Path:
@@ -93,6 +107,108 @@ def ensure_background(bg_path: Path) -> Path:
     return bg_path
 
 
+@dataclass(frozen=True)
+class PreviewRequest:
+    """一次预览渲染的全部输入"""
+
+    style_str: str
+    preview_text: Tuple[str, Optional[str]]
+    bg_path: str
+    width: int
+    height: int
+
+    def cache_key(self) -> str:
+        """缓存键；背景图按路径、大小与修改时间区分，替换图片后重新渲染"""
+        bg = ensure_background(Path(self.bg_path))
+        try:
+            stat = bg.stat()
+            bg_stamp = f"{bg}|{stat.st_size}|{stat.st_mtime_ns}"
+        except OSError:
+            bg_stamp = str(bg)
+        original_text, translate_text = self.preview_text
+        parts = (
+            self.style_str,
+            original_text,
+            translate_text or "",
+            f"{self.width}x{self.height}",
+            bg_stamp,
+        )
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _prune_preview_cache(keep: Path) -> None:
+    """只保留最近生成的 PREVIEW_CACHE_LIMIT 张预览图"""
+    try:
+        images = sorted(
+            PREVIEW_CACHE_DIR.glob("*.png"),
+            key=lambda p: p.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for image in images[PREVIEW_CACHE_LIMIT:]:
+            if image != keep:
+                image.unlink()
+    except OSError as e:
+        logger.debug(f"清理预览缓存失败: {e}")
+
+
+def cached_preview(request: PreviewRequest) -> Optional[str]:
+    """已渲染过的预览图路径，未命中返回 None"""
+    output_path = PREVIEW_CACHE_DIR / f"{request.cache_key()}.png"
+    return str(output_path) if output_path.is_file() else None
+
+
+def render_preview(request: PreviewRequest) -> str:
+    """渲染预览图（命中缓存时直接返回），返回图片路径"""
+    key = request.cache_key()
+    output_path = PREVIEW_CACHE_DIR / f"{key}.png"
+    if output_path.is_file():
+        return str(output_path)
+
+    PREVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    ass_path = PREVIEW_CACHE_DIR / f"{key}.ass"
+    tmp_path = PREVIEW_CACHE_DIR / f"{key}.tmp.png"
+    try:
+        ass_file = generate_ass_file(
+            request.style_str,
+            request.preview_text,
+            request.width,
+            request.height,
+            output_path=ass_path,
+        )
+        ass_file = auto_wrap_ass_file(ass_file)
+        bg_path_obj = ensure_background(Path(request.bg_path))
+
+        ass_file_processed = ass_file.replace("\\", "/").replace(":", r"\\:")
+        # 部分精简版 ffmpeg 只编译了 subtitles 滤镜
+        capabilities = get_ffmpeg_capabilities()
+        subtitle_filter = (
+            "subtitles"
+            if capabilities.filters and not capabilities.has_filter("ass")
+            else "ass"
+        )
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-i",
+            str(bg_path_obj),
+            "-vf",
+            f"{subtitle_filter}={ass_file_processed}",
+            "-frames:v",
+            "1",
+            str(tmp_path),
+        ]
+        run_subprocess(cmd)
+        # 渲染失败时不留下缓存
+        if tmp_path.is_file():
+            os.replace(tmp_path, output_path)
+            _prune_preview_cache(output_path)
+    finally:
+        for path in (ass_path, tmp_path):
+            if path.exists():
+                path.unlink()
+    return str(output_path)
+
+
 def generate_preview(
     style_str: str,
     preview_text: Tuple[str, Optional[str]],
@@ -101,28 +217,61 @@ def generate_preview(
     height: int,
 ) -> str:
     """生成预览图片"""
+    return render_preview(
+        PreviewRequest(style_str, tuple(preview_text), bg_path, width, height)
+    )
 
-    ass_file = generate_ass_file(style_str, preview_text, width, height)
-    ass_file = auto_wrap_ass_file(ass_file)
-    bg_path_obj = ensure_background(Path(bg_path))
 
-    output_path = PREVIEW_IMAGE_FILENAME
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+class PreviewRenderer:
+    """在单个后台线程中渲染预览图
 
-    ass_file_processed = ass_file.replace("\\", "/").replace(":", r"\\:")
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(bg_path_obj),
-        "-vf",
-        f"ass={ass_file_processed}",
-        "-frames:v",
-        "1",
-        str(output_path),
-    ]
-    run_subprocess(cmd)
-    return str(output_path)
+    每次 submit 都使之前提交的请求过期：尚未开始的过期请求直接跳过，已在
+    渲染的请求完成后结果仍写入缓存，但不再回调。回调在渲染线程中执行。
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="subtitle-preview"
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def submit(
+        self, request: PreviewRequest, callback: Callable[[str], None]
+    ) -> None:
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._executor.submit(self._run, generation, request, callback)
+
+    def cancel(self) -> None:
+        """丢弃所有已提交的请求"""
+        with self._lock:
+            self._generation += 1
+
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self._generation
+
+    def _run(
+        self,
+        generation: int,
+        request: PreviewRequest,
+        callback: Callable[[str], None],
+    ) -> None:
+        if not self._is_current(generation):
+            return
+        try:
+            preview_path = render_preview(request)
+        except Exception as e:
+            logger.error(f"生成预览失败: {e}")
+            return
+        if self._is_current(generation):
+            callback(preview_path)
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
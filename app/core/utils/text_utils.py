@@ -4,6 +4,9 @@
 """
 
 import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Optional
 
 # ==================== Unicode 字符范围定义 ====================
 
@@ -17,6 +20,28 @@ _SPACE_SEPARATED_LANGUAGES = (
     r"^[a-zA-Z0-9\'\u0400-\u04ff\u0370-\u03ff\u0600-\u06ff\u0590-\u05ff\u0e00-\u0e7f]+$"
 )
 
+# 书写系统的码位区间（起始, 结束, 名称），按起始码位排序
+_SCRIPT_RANGES = (
+    (0x0041, 0x005A, "latin"),
+    (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x04FF, "cyrillic"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x1000, 0x109F, "myanmar"),
+    (0x1780, 0x17FF, "khmer"),
+    (0x3040, 0x30FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xAC00, 0xD7AF, "hangul"),
+)
+_SCRIPT_STARTS = [start for start, _, _ in _SCRIPT_RANGES]
+
+# 被多种语言共用的书写系统，仅凭书写系统无法区分语言
+SHARED_SCRIPTS = frozenset({"latin", "cyrillic", "arabic", "devanagari"})
+
 
 def is_pure_punctuation(text: str) -> bool:
     """检查文本是否仅包含标点符号"""
@@ -103,3 +128,27 @@ def count_words(text: str) -> int:
     word_count = len(word_text.strip().split())
 
     return char_count + word_count
+
+
+def dominant_script(text: str) -> Optional[str]:
+    """返回文本中占多数的书写系统
+
+    含假名的文本视为日文（汉字计入 "kana"），数字、标点和空白不参与统计。
+
+    Args:
+        text: 待检测的文本
+
+    Returns:
+        书写系统名称（如 "latin"、"han"、"kana"、"hangul"），无法判断时返回 None
+    """
+    counts: Counter = Counter()
+    for char in text:
+        code = ord(char)
+        pos = bisect_right(_SCRIPT_STARTS, code) - 1
+        if pos >= 0 and code <= _SCRIPT_RANGES[pos][1]:
+            counts[_SCRIPT_RANGES[pos][2]] += 1
+    if not counts:
+        return None
+    if "kana" in counts:
+        counts["kana"] += counts.pop("han", 0)
+    return counts.most_common(1)[0][0]
@@ -1,18 +1,42 @@
+import hashlib
+import json
 import os
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
+from dataclasses import asdict, replace
 from pathlib import Path
 from typing import Callable, Literal, Optional
 
 from ..entities import AudioStreamInfo, VideoInfo
 from ..utils.ass_auto_wrap import auto_wrap_ass_file
+from ..utils.cache import get_media_cache, is_cache_enabled
 from ..utils.logger import setup_logger
+from ..utils.media_capabilities import get_capability_registry
+from ..utils.parallel_burn import (
+    SHIFTABLE_SUBTITLE_SUFFIXES,
+    burn_subtitles_parallel,
+    escape_filter_path,
+    get_default_segment_count,
+    select_default_audio_stream,
+)
+from ..utils.subprocess_helper import ProgressThrottle, get_process_supervisor
 
 logger = setup_logger("video_utils")
 
+_DURATION_PATTERN = re.compile(r"Duration: (\d{2}):(\d{2}):(\d{2}\.\d{2})")
+_TIME_PATTERN = re.compile(r"time=(\d{2}):(\d{2}):(\d{2}\.\d{2})")
+
+# 元数据内存缓存：video_info:{path}:{size}:{mtime_ns} -> VideoInfo（不含缩略图）
+# 按最近使用淘汰，完整结果另存于磁盘缓存
+VIDEO_INFO_CACHE_SIZE = 1024
+_video_info_memory: "OrderedDict[str, VideoInfo]" = OrderedDict()
+_video_info_lock = threading.Lock()
+
 
 @contextmanager
 def temporary_subtitle_file(subtitle_path: str):
@@ -106,43 +130,9 @@ def video2audio(input_file: str, output: str = "", audio_track_index: int = 0) -
 
 
 def check_cuda_available() -> bool:
-    """检查CUDA是否可用"""
-    logger.info("检查CUDA是否可用")
+    """检查CUDA是否可用（结果由能力注册表按 ffmpeg 版本缓存）"""
     try:
-        # 首先检查ffmpeg是否支持cuda
-        result = subprocess.run(
-            ["ffmpeg", "-hwaccels"],
-            capture_output=True,
-            text=True,
-            creationflags=(
-                getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
-            ),
-        )
-        if "cuda" not in result.stdout.lower():
-            logger.info("CUDA不在支持的硬件加速器列表中")
-            return False
-
-        # 进一步检查CUDA设备信息
-        result = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-init_hw_device", "cuda"],
-            capture_output=True,
-            text=True,
-            creationflags=(
-                getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
-            ),
-        )
-
-        # 如果stderr中包含"Cannot load cuda" 或 "Failed to load"等错误信息，说明CUDA不可用
-        if any(
-            error in result.stderr.lower()
-            for error in ["cannot load cuda", "failed to load", "error"]
-        ):
-            logger.info("CUDA设备初始化失败")
-            return False
-
-        logger.info("CUDA可用")
-        return True
-
+        return get_capability_registry().cuda_available()
     except Exception as e:
         logger.exception(f"检查CUDA出错: {str(e)}")
         return False
@@ -167,7 +157,21 @@ def add_subtitles(
     vcodec: str = "libx264",
     soft_subtitle: bool = False,
     progress_callback: Optional[Callable] = None,
+    parallel: bool = False,
+    segments: Optional[int] = None,
 ) -> None:
+    """为视频添加字幕
+
+    Args:
+        input_file: 输入视频路径
+        subtitle_file: 字幕文件路径
+        output: 输出视频路径
+        crf/preset/vcodec: 硬字幕编码参数
+        soft_subtitle: 是否使用软字幕
+        progress_callback: 进度回调 (progress: str, message: str)
+        parallel: 硬字幕是否按关键帧分段并行烧录（仅支持 ASS/SRT 字幕）
+        segments: 并行分段数，默认按物理核心数与视频时长自动计算
+    """
     assert Path(input_file).is_file(), "输入文件不存在"
     assert Path(subtitle_file).is_file(), "字幕文件不存在"
 
@@ -228,9 +232,7 @@ def add_subtitles(
                 raise
         else:
             # 使用硬字幕
-            subtitle_path_escaped = (
-                Path(processed_subtitle).as_posix().replace(":", r"\:")
-            )
+            subtitle_path_escaped = escape_filter_path(processed_subtitle)
 
             # 根据输出文件后缀决定vf参数
             if Path(output).suffix.lower() == ".ass":
@@ -242,8 +244,27 @@ def add_subtitles(
                 vcodec = "libvpx-vp9"
                 logger.info("WebM格式视频，使用libvpx-vp9编码器")
 
+            capabilities = get_capability_registry().get()
+            if capabilities.encoders and not capabilities.has_encoder(vcodec):
+                raise RuntimeError(f"当前 ffmpeg 不支持编码器 {vcodec}")
+
             # 检查CUDA是否可用
             use_cuda = check_cuda_available()
+
+            if parallel and _burn_in_parallel(
+                input_file,
+                processed_subtitle,
+                output,
+                crf=crf,
+                preset=preset,
+                vcodec=vcodec,
+                vf=vf,
+                use_cuda=use_cuda,
+                segments=segments,
+                progress_callback=progress_callback,
+            ):
+                return
+
             cmd = ["ffmpeg"]
             if use_cuda:
                 logger.info("使用CUDA加速")
@@ -270,76 +291,44 @@ def add_subtitles(
             cmd_str = subprocess.list2cmdline(cmd)
             logger.info(f"添加硬字幕执行命令: {cmd_str}")
 
+            total_duration: Optional[float] = None
+            throttle = ProgressThrottle()
+
+            def on_line(_stream_name: str, line: str) -> None:
+                nonlocal total_duration
+                if total_duration is None:
+                    duration_match = _DURATION_PATTERN.search(line)
+                    if duration_match:
+                        total_duration = _match_seconds(duration_match)
+                        logger.info("视频总时长: %s秒", total_duration)
+                    return
+                if not progress_callback:
+                    return
+                # 解析当前处理时间并计算进度百分比
+                time_match = _TIME_PATTERN.search(line)
+                if time_match and total_duration:
+                    current_time = _match_seconds(time_match)
+                    progress = round(current_time / total_duration * 100)
+                    if throttle.ready(progress):
+                        progress_callback(f"{progress}", "正在合成")
+
             process = None
             try:
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    creationflags=(
-                        getattr(subprocess, "CREATE_NO_WINDOW", 0)
-                        if os.name == "nt"
-                        else 0
-                    ),
-                )
-
-                # 实时读取输出并调用回调函数
-                total_duration = None
-                current_time = 0
-
-                while True:
-                    output_line = process.stderr.readline()
-                    if not output_line or (process.poll() is not None):
-                        break
-                    if not progress_callback:
-                        continue
-
-                    if total_duration is None:
-                        duration_match = re.search(
-                            r"Duration: (\d{2}):(\d{2}):(\d{2}\.\d{2})", output_line
-                        )
-                        if duration_match:
-                            h, m, s = map(float, duration_match.groups())
-                            total_duration = h * 3600 + m * 60 + s
-                            logger.info(f"视频总时长: {total_duration}秒")
-
-                    # 解析当前处理时间
-                    time_match = re.search(
-                        r"time=(\d{2}):(\d{2}):(\d{2}\.\d{2})", output_line
-                    )
-                    if time_match:
-                        h, m, s = map(float, time_match.groups())
-                        current_time = h * 3600 + m * 60 + s
-
-                    # 计算进度百分比
-                    if total_duration:
-                        progress = (current_time / total_duration) * 100
-                        progress_callback(f"{round(progress)}", "正在合成")
+                process = get_process_supervisor().start(cmd, on_line)
+                return_code = process.wait()
 
                 if progress_callback:
                     progress_callback("100", "合成完成")
 
                 # 检查进程的返回码
-                return_code = process.wait()
                 if return_code != 0:
-                    error_info = process.stderr.read()
                     logger.error("== ffmpeg 添加硬字幕失败 ==")
                     logger.error(f"返回码: {return_code}")
                     logger.error(f"命令: {cmd_str}")
-                    if error_info:
-                        logger.error(f"错误信息: {error_info}")
+                    logger.error("错误信息: " + "\n".join(process.tail))
                     raise Exception(f"FFmpeg 返回码: {return_code}")
                 logger.info("视频合成完成")
 
-            except subprocess.SubprocessError as e:
-                logger.error("== ffmpeg 进程执行异常 ==")
-                logger.error(f"错误: {str(e)}")
-                if process and process.poll() is None:
-                    process.kill()
-                raise
             except Exception as e:
                 logger.error(f"视频合成过程出错: {str(e)}")
                 if process and process.poll() is None:
@@ -347,23 +336,212 @@ def add_subtitles(
                 raise
 
 
+def _match_seconds(match: "re.Match[str]") -> float:
+    h, m, s = map(float, match.groups())
+    return h * 3600 + m * 60 + s
+
+
+def _burn_in_parallel(
+    input_file: str,
+    subtitle_file: str,
+    output: str,
+    crf: int,
+    preset: str,
+    vcodec: str,
+    vf: str,
+    use_cuda: bool,
+    segments: Optional[int],
+    progress_callback: Optional[Callable],
+) -> bool:
+    """尝试分段并行烧录硬字幕，不适用或失败时返回 False 以回退到单进程"""
+    if Path(subtitle_file).suffix.lower() not in SHIFTABLE_SUBTITLE_SUFFIXES:
+        logger.info("字幕格式不支持分段并行烧录，使用单进程")
+        return False
+
+    video_info = get_video_info(input_file)
+    if video_info is None or video_info.duration_seconds <= 0:
+        logger.info("无法获取视频时长，使用单进程烧录")
+        return False
+    duration = video_info.duration_seconds
+
+    segment_count = segments or get_default_segment_count(duration)
+    if segment_count < 2:
+        logger.info("视频较短或核心数不足，使用单进程烧录")
+        return False
+
+    try:
+        burn_subtitles_parallel(
+            input_file,
+            subtitle_file,
+            output,
+            duration=duration,
+            segment_count=segment_count,
+            crf=crf,
+            preset=preset,
+            vcodec=vcodec,
+            vf=vf,
+            audio_stream=select_default_audio_stream(video_info.audio_streams),
+            use_cuda=use_cuda,
+            progress_callback=progress_callback,
+        )
+    except Exception as e:
+        logger.warning(f"分段并行烧录失败，回退到单进程: {e}")
+        Path(output).unlink(missing_ok=True)
+        return False
+    logger.info("视频合成完成")
+    return True
+
+
 def get_video_info(
-    file_path: str, thumbnail_path: Optional[str] = None
+    file_path: str, thumbnail_path: Optional[str] = None, use_cache: bool = True
 ) -> Optional["VideoInfo"]:
     """获取媒体文件信息（支持视频和音频文件）
 
     Args:
         file_path: 媒体文件路径（视频或音频）
         thumbnail_path: 缩略图保存路径（可选，仅对视频文件有效）
+        use_cache: 是否使用按 (path, size, mtime) 缓存的元数据
 
     Returns:
         VideoInfo 对象，失败返回 None
         对于纯音频文件，视频相关字段（width/height/fps）将为 0
     """
     try:
-        # 执行 ffmpeg 获取视频信息
+        info = probe_video_info(file_path, use_cache=use_cache)
+        if info is None:
+            return None
+
+        # 提取缩略图（如果指定了路径且有视频流）
+        if thumbnail_path and info.duration_seconds > 0 and info.video_codec:
+            if _thumbnail_is_fresh(file_path, thumbnail_path) or _extract_thumbnail(
+                file_path, info.duration_seconds * 0.3, thumbnail_path
+            ):
+                info = replace(info, thumbnail_path=thumbnail_path)
+        return info
+    except Exception as e:
+        logger.exception(f"获取视频信息时出错: {str(e)}")
+        return None
+
+
+def probe_video_info(file_path: str, use_cache: bool = True) -> Optional[VideoInfo]:
+    """探测媒体元数据（不含缩略图），优先 ffprobe JSON，不可用时解析 ffmpeg -i 输出"""
+    if use_cache:
+        cached = _get_cached_video_info(file_path)
+        if cached is not None:
+            return cached
+
+    info = _probe_with_ffprobe(file_path)
+    if info is None:
+        info = _probe_with_ffmpeg(file_path)
+    if info is None:
+        return None
+
+    if info.audio_streams:
+        logger.info(f"检测到 {len(info.audio_streams)} 条音轨")
+    _set_cached_video_info(file_path, info)
+    return info
+
+
+def _video_info_key(file_path: str) -> Optional[str]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return f"video_info:{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _get_cached_video_info(file_path: str) -> Optional[VideoInfo]:
+    key = _video_info_key(file_path)
+    if key is None:
+        return None
+    with _video_info_lock:
+        info = _video_info_memory.get(key)
+        if info is not None:
+            _video_info_memory.move_to_end(key)
+    if info is not None or not is_cache_enabled():
+        return info
+
+    data = get_media_cache().get(key, default=None)
+    if not isinstance(data, dict):
+        return None
+    data["audio_streams"] = [AudioStreamInfo(**s) for s in data["audio_streams"]]
+    info = VideoInfo(**data)
+    _remember_video_info(key, info)
+    return info
+
+
+def _remember_video_info(key: str, info: VideoInfo) -> None:
+    with _video_info_lock:
+        _video_info_memory[key] = info
+        _video_info_memory.move_to_end(key)
+        while len(_video_info_memory) > VIDEO_INFO_CACHE_SIZE:
+            _video_info_memory.popitem(last=False)
+
+
+def _set_cached_video_info(file_path: str, info: VideoInfo) -> None:
+    key = _video_info_key(file_path)
+    if key is None:
+        return
+    info = replace(info, thumbnail_path="")
+    _remember_video_info(key, info)
+    if is_cache_enabled():
+        get_media_cache().set(key, asdict(info), expire=86400 * 30)
+
+
+def get_thumbnail_path(file_path: str, directory: Optional[str] = None) -> str:
+    """按 (路径, 大小, 修改时间) 指纹命名的缩略图路径
+
+    同名的不同视频、被修改过的视频得到不同的文件名，已存在的缩略图可以
+    直接复用。
+
+    Args:
+        file_path: 媒体文件路径
+        directory: 缩略图目录，默认系统临时目录
+    """
+    key = _video_info_key(file_path) or os.path.abspath(file_path)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(
+        directory or tempfile.gettempdir(),
+        f"{Path(file_path).stem}_{digest}_thumbnail.jpg",
+    )
+
+
+def _thumbnail_is_fresh(file_path: str, thumbnail_path: str) -> bool:
+    """只复用按当前文件指纹命名的缩略图，其他路径总是重新生成"""
+    expected = get_thumbnail_path(file_path, os.path.dirname(thumbnail_path))
+    if os.path.basename(thumbnail_path) != os.path.basename(expected):
+        return False
+    try:
+        return os.path.getsize(thumbnail_path) > 0
+    except OSError:
+        return False
+
+
+def _parse_frame_rate(value: str) -> float:
+    num, _, den = (value or "0/1").partition("/")
+    try:
+        return float(num) / float(den or 1) if float(den or 1) else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _probe_with_ffprobe(file_path: str) -> Optional[VideoInfo]:
+    """使用 ffprobe JSON 输出获取媒体信息，ffprobe 不可用时返回 None"""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration,bit_rate:stream=index,codec_type,codec_name,width,height,"
+        "avg_frame_rate,r_frame_rate,sample_rate,channels:"
+        "stream_tags=language,title:stream_disposition=attached_pic,default",
+        "-of",
+        "json",
+        file_path,
+    ]
+    try:
         result = subprocess.run(
-            ["ffmpeg", "-i", file_path],
+            cmd,
             capture_output=True,
             text=True,
             encoding="utf-8",
@@ -372,88 +550,152 @@ def get_video_info(
                 getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
             ),
         )
-        info = result.stderr
-
-        # 提取时长
-        duration_seconds = 0.0
-        if duration_match := re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", info):
-            hours, minutes, seconds = map(float, duration_match.groups())
-            duration_seconds = hours * 3600 + minutes * 60 + seconds
-
-        # 提取比特率
-        bitrate_kbps = 0
-        if bitrate_match := re.search(r"bitrate: (\d+) kb/s", info):
-            bitrate_kbps = int(bitrate_match.group(1))
-
-        # 提取视频流信息
-        width, height, fps, video_codec = 0, 0, 0.0, ""
-        has_video_stream = False
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        # ffprobe 存在但无法解析文件，交给 ffmpeg 兜底
+        return None
+    try:
+        data = json.loads(result.stdout or "{}")
+    except ValueError:
+        return None
+    return _video_info_from_ffprobe(file_path, data)
+
+
+def _video_info_from_ffprobe(file_path: str, data: dict) -> Optional[VideoInfo]:
+    """将 ffprobe JSON 转换为 VideoInfo"""
+    fmt = data.get("format", {})
+    streams = data.get("streams", [])
+
+    video = next(
+        (
+            s
+            for s in streams
+            if s.get("codec_type") == "video"
+            and not s.get("disposition", {}).get("attached_pic")
+        ),
+        None,
+    )
+    audio_streams = [
+        AudioStreamInfo(
+            index=int(s.get("index", 0)),
+            codec=s.get("codec_name", ""),
+            language=s.get("tags", {}).get("language", ""),
+            title=s.get("tags", {}).get("title", ""),
+            channels=int(s.get("channels", 0) or 0),
+            is_default=bool(s.get("disposition", {}).get("default")),
+        )
+        for s in streams
+        if s.get("codec_type") == "audio"
+    ]
+    if video is None and not audio_streams:
+        logger.error("文件既没有视频流也没有音频流，可能不是有效的媒体文件")
+        return None
+
+    first_audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+    fps = 0.0
+    if video:
+        fps = _parse_frame_rate(video.get("avg_frame_rate", "")) or _parse_frame_rate(
+            video.get("r_frame_rate", "")
+        )
+
+    return VideoInfo(
+        file_name=Path(file_path).stem,
+        file_path=file_path,
+        width=int(video.get("width", 0)) if video else 0,
+        height=int(video.get("height", 0)) if video else 0,
+        fps=round(fps, 3),
+        duration_seconds=float(fmt.get("duration", 0) or 0),
+        bitrate_kbps=int(fmt.get("bit_rate", 0) or 0) // 1000,
+        video_codec=video.get("codec_name", "") if video else "",
+        audio_codec=first_audio.get("codec_name", ""),
+        audio_sampling_rate=int(first_audio.get("sample_rate", 0) or 0),
+        thumbnail_path="",
+        audio_streams=audio_streams,
+    )
+
+
+def _probe_with_ffmpeg(file_path: str) -> Optional[VideoInfo]:
+    """解析 ffmpeg -i 的输出获取媒体信息（ffprobe 不可用时的兜底）"""
+    result = subprocess.run(
+        ["ffmpeg", "-i", file_path],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        creationflags=(
+            getattr(subprocess, "CREATE_NO_WINDOW", 0) if os.name == "nt" else 0
+        ),
+    )
+    info = result.stderr
+
+    # 提取时长
+    duration_seconds = 0.0
+    if duration_match := re.search(r"Duration: (\d+):(\d+):(\d+\.\d+)", info):
+        hours, minutes, seconds = map(float, duration_match.groups())
+        duration_seconds = hours * 3600 + minutes * 60 + seconds
+
+    # 提取比特率
+    bitrate_kbps = 0
+    if bitrate_match := re.search(r"bitrate: (\d+) kb/s", info):
+        bitrate_kbps = int(bitrate_match.group(1))
+
+    # 提取视频流信息（逐行匹配，避免跨整个输出的 DOTALL 回溯）
+    width, height, fps, video_codec = 0, 0, 0.0, ""
+    for line in info.splitlines():
+        if "Video:" not in line or "attached pic" in line:
+            continue
         if video_stream_match := re.search(
-            r"Stream #.*?Video: (\w+)(?:\s*\([^)]*\))?.* (\d+)x(\d+).*?(?:(\d+(?:\.\d+)?)\s*(?:fps|tb[rn]))",
-            info,
-            re.DOTALL,
+            r"Video: (\w+).*? (\d+)x(\d+).*?(\d+(?:\.\d+)?)\s*(?:fps|tb[rn])", line
         ):
             video_codec = video_stream_match.group(1)
             width = int(video_stream_match.group(2))
             height = int(video_stream_match.group(3))
             fps = float(video_stream_match.group(4))
-            has_video_stream = True
-
-        # 提取第一条音频流信息（用于兼容性）
-        audio_codec, audio_sampling_rate = "", 0
-        if audio_stream_match := re.search(
-            r"Stream #\d+:\d+.*Audio: (\w+).* (\d+) Hz", info
-        ):
-            audio_codec = audio_stream_match.group(1)
-            audio_sampling_rate = int(audio_stream_match.group(2))
-
-        # 提取所有音频流信息（用于多音轨选择）
-        audio_streams: list[AudioStreamInfo] = []
-        for match in re.finditer(
-            r"Stream #\d+:(\d+)(?:\[0x[0-9a-fA-F]+\])?(?:\(([a-z]{3})\))?: Audio: (\w+)",
-            info,
-        ):
-            audio_streams.append(
-                AudioStreamInfo(
-                    index=int(match.group(1)),
-                    codec=match.group(3),
-                    language=match.group(2) or "",
-                )
+            break
+
+    # 提取第一条音频流信息（用于兼容性）
+    audio_codec, audio_sampling_rate = "", 0
+    if audio_stream_match := re.search(
+        r"Stream #\d+:\d+.*Audio: (\w+).* (\d+) Hz", info
+    ):
+        audio_codec = audio_stream_match.group(1)
+        audio_sampling_rate = int(audio_stream_match.group(2))
+
+    # 提取所有音频流信息（用于多音轨选择）
+    audio_streams: list[AudioStreamInfo] = []
+    for match in re.finditer(
+        r"Stream #\d+:(\d+)(?:\[0x[0-9a-fA-F]+\])?(?:\(([a-z]{3})\))?: Audio: (\w+)",
+        info,
+    ):
+        audio_streams.append(
+            AudioStreamInfo(
+                index=int(match.group(1)),
+                codec=match.group(3),
+                language=match.group(2) or "",
             )
-
-        if audio_streams:
-            logger.info(f"检测到 {len(audio_streams)} 条音轨")
-
-        # 验证文件是否包含有效的媒体流
-        if not has_video_stream and not audio_streams:
-            logger.error("文件既没有视频流也没有音频流，可能不是有效的媒体文件")
-            return None
-
-        # 提取缩略图（如果指定了路径且有视频流）
-        final_thumbnail_path = ""
-        if thumbnail_path and duration_seconds > 0 and has_video_stream:
-            if _extract_thumbnail(file_path, duration_seconds * 0.3, thumbnail_path):
-                final_thumbnail_path = thumbnail_path
-
-        # 构造并返回 VideoInfo 对象
-        return VideoInfo(
-            file_name=Path(file_path).stem,
-            file_path=file_path,
-            width=width,
-            height=height,
-            fps=fps,
-            duration_seconds=duration_seconds,
-            bitrate_kbps=bitrate_kbps,
-            video_codec=video_codec,
-            audio_codec=audio_codec,
-            audio_sampling_rate=audio_sampling_rate,
-            thumbnail_path=final_thumbnail_path,
-            audio_streams=audio_streams,
         )
-    except Exception as e:
-        logger.exception(f"获取视频信息时出错: {str(e)}")
+
+    # 验证文件是否包含有效的媒体流
+    if not video_codec and not audio_streams:
+        logger.error("文件既没有视频流也没有音频流，可能不是有效的媒体文件")
         return None
 
+    return VideoInfo(
+        file_name=Path(file_path).stem,
+        file_path=file_path,
+        width=width,
+        height=height,
+        fps=fps,
+        duration_seconds=duration_seconds,
+        bitrate_kbps=bitrate_kbps,
+        video_codec=video_codec,
+        audio_codec=audio_codec,
+        audio_sampling_rate=audio_sampling_rate,
+        thumbnail_path="",
+        audio_streams=audio_streams,
+    )
+
 
 def _extract_thumbnail(video_path: str, seek_time: float, thumbnail_path: str) -> bool:
     """提取视频缩略图
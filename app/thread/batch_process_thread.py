@@ -1,23 +1,53 @@
-import queue
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
-from typing import Dict, Optional
-
-from PyQt5.QtCore import QThread, pyqtSignal
-
+from typing import Any, Dict, List, Optional
+
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from app.common.config import cfg
+from app.core.batch_scheduler import ResourceKind, StageJob, StageScheduler
+from app.core.batch_store import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    BatchJobStore,
+    get_batch_job_store,
+    make_stage_key,
+)
 from app.core.entities import (
     BatchTaskStatus,
     BatchTaskType,
+    SynthesisTask,
     TranscribeTask,
 )
 from app.core.task_factory import TaskFactory
 from app.core.utils.logger import setup_logger
+from app.core.utils.media_probe import compute_file_fingerprint
 from app.thread.subtitle_thread import SubtitleThread
 from app.thread.transcript_thread import TranscriptThread
 from app.thread.video_synthesis_thread import VideoSynthesisThread
 
 logger = setup_logger("batch_process_thread")
 
+STAGE_TRANSCRIBE = "transcribe"
+STAGE_SUBTITLE = "subtitle"
+STAGE_SYNTHESIS = "synthesis"
+
+# 各任务类型依次执行的阶段
+TASK_STAGES: Dict[BatchTaskType, List[str]] = {
+    BatchTaskType.TRANSCRIBE: [STAGE_TRANSCRIBE],
+    BatchTaskType.SUBTITLE: [STAGE_SUBTITLE],
+    BatchTaskType.TRANS_SUB: [STAGE_TRANSCRIBE, STAGE_SUBTITLE],
+    BatchTaskType.FULL_PROCESS: [STAGE_TRANSCRIBE, STAGE_SUBTITLE, STAGE_SYNTHESIS],
+}
+
+# 在本机运行的转录引擎，其余为云端服务
+LOCAL_TRANSCRIBE_MODELS = {"FASTER_WHISPER", "WHISPER_CPP"}
+
+# 同时计算输入文件指纹的线程数
+FINGERPRINT_WORKERS = 2
+
 
 class BatchTask:
     def __init__(self, file_path: str, task_type: BatchTaskType):
@@ -27,310 +57,320 @@ class BatchTask:
         self.progress = 0
         self.error_message = ""
         self.current_thread: Optional[QThread] = None
+        self.current_job: Optional[StageJob] = None
+        self.stage_index = 0
+        # 上一阶段的输出（转录字幕路径 / (视频路径, 字幕路径) / 合成视频路径）
+        self.stage_result = None
+        # 输入文件内容指纹与上一阶段的阶段键，用于复用阶段产物
+        self.content_hash: Optional[str] = None
+        self.stage_key = ""
+
+    @property
+    def stages(self) -> List[str]:
+        return TASK_STAGES[self.task_type]
 
 
 class BatchProcessThread(QThread):
+    """批量处理调度线程
+
+    每个文件按阶段拆分后交给 StageScheduler，不同资源（本地转录、云端转录、
+    LLM、视频编码）各有独立槽位，不同文件的不同阶段可以同时运行。
+
+    任务状态与阶段产物记录在 BatchJobStore 中：重新添加的任务会跳过输入内容
+    与配置都未变化、且产物文件仍然存在的阶段。输入文件的内容指纹在单独的
+    线程池中计算，算好后才提交第一个阶段，调度线程不读取文件。
+    """
+
     # 信号定义
     task_progress = pyqtSignal(str, int, str)  # file_path, progress, status
     task_error = pyqtSignal(str, str)  # file_path, error_message
     task_completed = pyqtSignal(str)  # file_path
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[ResourceKind, int]] = None,
+        store: Optional[BatchJobStore] = None,
+    ):
         super().__init__()
-        self.task_queue = queue.Queue()
+        self.scheduler = StageScheduler(pool_sizes)
+        self.store = store if store is not None else get_batch_job_store()
         self.current_tasks: Dict[str, BatchTask] = {}
-        self.max_concurrent_tasks = 1
         self.is_running = False
         self.factory = TaskFactory()
-        self.threads = []  # 保存所有创建的线程
+        self.threads: List[QThread] = []  # 保存所有创建的线程
+        self._lock = threading.Lock()
+        self._fingerprint_executor = ThreadPoolExecutor(
+            max_workers=FINGERPRINT_WORKERS, thread_name_prefix="batch-fingerprint"
+        )
 
     def add_task(self, task: BatchTask):
-        self.task_queue.put(task)
-        self.current_tasks[task.file_path] = task
+        with self._lock:
+            self.current_tasks[task.file_path] = task
+        self.store.upsert_job(task.file_path, task.task_type.name)
+        if task.content_hash is None:
+            self._fingerprint_executor.submit(self._fingerprint_and_submit, task)
+        else:
+            self._submit_stage(task)
         if not self.isRunning():
             self.is_running = True
+            self.scheduler.reopen()
             self.start()
 
     def run(self):
         while self.is_running:
-            # 检查是否有正在运行的任务数量是否达到上限
-            running_tasks = sum(
-                1
-                for task in self.current_tasks.values()
-                if task.status == BatchTaskStatus.RUNNING
+            job = self.scheduler.next_job()
+            if job is None:
+                break
+            batch_task: BatchTask = job.payload[0]
+            if not self._is_current(batch_task):
+                # 任务已被取消
+                self.scheduler.release(job)
+                continue
+            batch_task.current_job = job
+            self._prune_threads()
+            try:
+                self._start_stage(batch_task, job)
+            except Exception as e:
+                logger.exception(f"处理任务失败: {str(e)}")
+                self._on_stage_error(batch_task, job, str(e))
+
+    # ------------------------------------------------------------------
+    # 阶段调度
+    # ------------------------------------------------------------------
+
+    def _resource_for(self, stage: str) -> ResourceKind:
+        if stage == STAGE_TRANSCRIBE:
+            model = cfg.transcribe_model.value
+            if model is not None and model.name in LOCAL_TRANSCRIBE_MODELS:
+                return ResourceKind.LOCAL_ASR
+            return ResourceKind.CLOUD_ASR
+        if stage == STAGE_SUBTITLE:
+            return ResourceKind.LLM
+        return ResourceKind.ENCODE
+
+    def _fingerprint_and_submit(self, batch_task: BatchTask) -> None:
+        """计算输入文件指纹（用于复用阶段产物）后提交当前阶段"""
+        try:
+            content_hash = compute_file_fingerprint(batch_task.file_path)
+        except OSError as e:
+            logger.error(f"读取输入文件失败: {batch_task.file_path}: {e}")
+            self._fail(batch_task, str(e))
+            return
+        if not self._is_current(batch_task):
+            return  # 任务已被取消
+        batch_task.content_hash = content_hash
+        self.store.update_job(batch_task.file_path, content_hash=content_hash)
+        self._submit_stage(batch_task)
+
+    def _submit_stage(self, batch_task: BatchTask) -> None:
+        stage = batch_task.stages[batch_task.stage_index]
+        self.scheduler.submit(
+            StageJob(
+                key=batch_task.file_path,
+                stage=stage,
+                resource=self._resource_for(stage),
+                payload=(batch_task, ""),
             )
+        )
 
-            if running_tasks < self.max_concurrent_tasks:
-                try:
-                    # 非阻塞方式获取任务
-                    task = self.task_queue.get_nowait()
-                    self._process_task(task)
-                except queue.Empty:
-                    time.sleep(0.1)  # 避免CPU过度使用
-            else:
-                time.sleep(0.1)
-
-    def _process_task(self, batch_task: BatchTask):
-        try:
+    def _start_stage(self, batch_task: BatchTask, job: StageJob) -> None:
+        if batch_task.stage_index == 0:
             batch_task.status = BatchTaskStatus.RUNNING
             self.task_progress.emit(
                 batch_task.file_path, 0, str(BatchTaskStatus.RUNNING)
             )
+            self.store.update_job(batch_task.file_path, status=STATUS_RUNNING)
 
-            if batch_task.task_type == BatchTaskType.TRANSCRIBE:
-                self._handle_transcribe_task(batch_task)
-            elif batch_task.task_type == BatchTaskType.SUBTITLE:
-                self._handle_subtitle_task(batch_task)
-            elif batch_task.task_type == BatchTaskType.TRANS_SUB:
-                self._handle_trans_sub_task(batch_task)
-            elif batch_task.task_type == BatchTaskType.FULL_PROCESS:
-                self._handle_full_process_task(batch_task)
-
-        except Exception as e:
-            logger.exception(f"处理任务失败: {str(e)}")
-            batch_task.status = BatchTaskStatus.FAILED
-            batch_task.error_message = str(e)
-            self.task_error.emit(batch_task.file_path, str(e))
-
-    def _on_progress_wrapper(self, batch_task: BatchTask, progress: int, message: str):
-        """进度信号包装器"""
-        self.task_progress.emit(batch_task.file_path, progress, message)
-
-    def _on_error_wrapper(self, batch_task: BatchTask, error: str):
-        """错误信号包装器"""
-        batch_task.status = BatchTaskStatus.FAILED
-        batch_task.error_message = error
-        self.task_error.emit(batch_task.file_path, error)
-
-    def _on_finished_wrapper(self, batch_task: BatchTask, task=None):
-        """完成信号包装器"""
-        batch_task.status = BatchTaskStatus.COMPLETED
-        batch_task.progress = 100
-        self.task_completed.emit(batch_task.file_path)
-        if batch_task.current_thread in self.threads:
-            self.threads.remove(batch_task.current_thread)
-
-    def _handle_transcribe_task(self, batch_task: BatchTask):
-        # self.max_concurrent_tasks = 3
-        task = self.factory.create_transcribe_task(batch_task.file_path)
-        thread = TranscriptThread(task)
-        batch_task.current_thread = thread
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        thread.progress.connect(  # type: ignore
-            partial(self._on_progress_wrapper, batch_task)  # type: ignore
-        )
-        thread.error.connect(  # type: ignore
-            partial(self._on_error_wrapper, batch_task)  # type: ignore
-        )
-        thread.finished.connect(  # type: ignore
-            partial(self._on_finished_wrapper, batch_task)  # type: ignore
-        )
-
-        thread.start()
-
-    def _handle_subtitle_task(self, batch_task: BatchTask):
-        logger.info(f"开始处理字幕任务: {batch_task.file_path}")
+        has_next = batch_task.stage_index + 1 < len(batch_task.stages)
+        task: Any
+        if job.stage == STAGE_TRANSCRIBE:
+            task = self.factory.create_transcribe_task(
+                batch_task.file_path, need_next_task=has_next
+            )
+        elif job.stage == STAGE_SUBTITLE:
+            if batch_task.stage_result is None:
+                task = self.factory.create_subtitle_task(batch_task.file_path)
+            else:
+                task = self.factory.create_subtitle_task(
+                    batch_task.stage_result,
+                    batch_task.file_path,
+                    need_next_task=True,
+                )
+        else:
+            video_path, subtitle_path = batch_task.stage_result
+            task = self.factory.create_synthesis_task(video_path, subtitle_path)
+
+        # 输入内容与配置都未变化且产物仍在时，直接跳过该阶段
+        config = getattr(task, f"{job.stage}_config", None)
+        stage_key = make_stage_key(job.stage, config, batch_task.stage_key)
+        artifact = self.store.find_artifact(batch_task.content_hash, stage_key)
+        if artifact is not None:
+            logger.info(f"复用阶段 {job.stage} 的已有结果: {batch_task.file_path}")
+            self._release(batch_task, job)
+            self._advance(batch_task, job, stage_key, artifact)
+            if batch_task.status == BatchTaskStatus.RUNNING:
+                self._on_stage_progress(batch_task, 0, self.tr("复用已有结果"))
+            return
+        job.payload = (batch_task, stage_key)
+        logger.info(f"开始阶段 {job.stage}: {batch_task.file_path}")
+
+        thread: QThread
+        if job.stage == STAGE_TRANSCRIBE:
+            thread = TranscriptThread(task)
+        elif job.stage == STAGE_SUBTITLE:
+            thread = SubtitleThread(task)
+        else:
+            thread = VideoSynthesisThread(task)
 
-        task = self.factory.create_subtitle_task(batch_task.file_path)
-        thread = SubtitleThread(task)
         batch_task.current_thread = thread
-
-        # 保存线程引用
         self.threads.append(thread)
 
+        # 回调只更新调度状态并发射信号，直接在阶段线程中执行即可
         thread.progress.connect(  # type: ignore
-            partial(self._on_progress_wrapper, batch_task)  # type: ignore
+            partial(self._on_stage_progress, batch_task), Qt.DirectConnection
         )
         thread.error.connect(  # type: ignore
-            partial(self._on_error_wrapper, batch_task)  # type: ignore
+            partial(self._on_stage_error, batch_task, job), Qt.DirectConnection
         )
         thread.finished.connect(  # type: ignore
-            partial(self._on_finished_wrapper, batch_task)  # type: ignore
-        )
-
-        thread.start()
-
-    def _handle_trans_sub_task(self, batch_task: BatchTask):
-        trans_task = self.factory.create_transcribe_task(
-            batch_task.file_path, need_next_task=True
-        )
-        thread = TranscriptThread(trans_task)
-        batch_task.current_thread = thread
-        self.current_tasks[batch_task.file_path] = batch_task
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        thread.progress.connect(
-            partial(self._on_trans_sub_progress_wrapper, batch_task)
+            partial(self._on_stage_finished, batch_task, job), Qt.DirectConnection
         )
-        thread.error.connect(partial(self._on_error_wrapper, batch_task))
-        thread.finished.connect(
-            partial(self._on_trans_sub_finished_wrapper, batch_task)
-        )
-
-        thread.start()
-
-    def _on_trans_sub_progress_wrapper(
-        self, batch_task: BatchTask, progress: int, message: str
-    ):
-        """转录+字幕任务进度包装器"""
-        progress = progress // 2  # 转录占50%进度
-        self.task_progress.emit(batch_task.file_path, progress, message)
-
-    def _on_trans_sub_finished_wrapper(
-        self, batch_task: BatchTask, task: TranscribeTask
-    ):
-        """转录+字幕任务转录完成包装器"""
-        if batch_task.current_thread in self.threads:
-            self.threads.remove(batch_task.current_thread)
-
-        # 创建字幕任务
-        if not task.output_path:
-            raise ValueError("Task output_path is None")
-        subtitle_task = self.factory.create_subtitle_task(
-            task.output_path, batch_task.file_path, need_next_task=True
-        )
-        thread = SubtitleThread(subtitle_task)
-        batch_task.current_thread = thread
-        self.current_tasks[batch_task.file_path] = batch_task
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        from functools import partial
-
-        thread.progress.connect(
-            partial(self._on_trans_sub_subtitle_progress_wrapper, batch_task)
-        )
-        thread.error.connect(partial(self._on_error_wrapper, batch_task))
-        thread.finished.connect(partial(self._on_finished_wrapper, batch_task))
-
         thread.start()
 
-    def _on_trans_sub_subtitle_progress_wrapper(
-        self, batch_task: BatchTask, progress: int, message: str
-    ):
-        """转录+字幕任务字幕进度包装器"""
-        progress = 50 + progress // 2  # 字幕处理占后50%进度
-        self.task_progress.emit(batch_task.file_path, progress, message)
-
-    def _handle_full_process_task(self, batch_task: BatchTask):
-        # 首先创建转录任务
-        trans_task = self.factory.create_transcribe_task(
-            batch_task.file_path, need_next_task=True
-        )
-        thread = TranscriptThread(trans_task)
-        batch_task.current_thread = thread
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        thread.progress.connect(partial(self.on_full_process_progress, batch_task))
-        thread.error.connect(partial(self._on_error_wrapper, batch_task))
-        thread.finished.connect(partial(self.on_full_process_finished, batch_task))
+    def _on_stage_progress(self, batch_task: BatchTask, progress: int, message: str):
+        """将阶段进度映射到整个任务的进度区间"""
+        if batch_task.status != BatchTaskStatus.RUNNING:
+            return
+        count = len(batch_task.stages)
+        start = batch_task.stage_index * 100 // count
+        value = start + progress // count
+        batch_task.progress = value
+        self.task_progress.emit(batch_task.file_path, value, message)
+
+    def _release(self, batch_task: BatchTask, job: StageJob) -> None:
+        """归还阶段占用的槽位（每个阶段只归还一次）"""
+        with self._lock:
+            if batch_task.current_job is not job:
+                return
+            batch_task.current_job = None
+        self.scheduler.release(job)
+
+    def _is_current(self, batch_task: BatchTask) -> bool:
+        """任务仍在队列中（未被 stop_task 移除或被同路径的新任务替换）"""
+        with self._lock:
+            return self.current_tasks.get(batch_task.file_path) is batch_task
+
+    def _on_stage_error(self, batch_task: BatchTask, job: StageJob, error: str):
+        self._release(batch_task, job)
+        if not self._is_current(batch_task):
+            return  # 任务已停止，忽略其阶段线程的结果
+        self._fail(batch_task, error)
+
+    def _fail(self, batch_task: BatchTask, error: str) -> None:
+        batch_task.status = BatchTaskStatus.FAILED
+        batch_task.error_message = error
+        self.store.update_job(batch_task.file_path, status=STATUS_FAILED, error=error)
+        self.task_error.emit(batch_task.file_path, error)
 
-        thread.start()
+    def _on_stage_finished(self, batch_task: BatchTask, job: StageJob, *result):
+        if batch_task.status == BatchTaskStatus.FAILED or not self._is_current(
+            batch_task
+        ):
+            self._release(batch_task, job)
+            return
+
+        stage_result: Any = None
+        files: List[str] = []
+        if job.stage == STAGE_TRANSCRIBE:
+            task: TranscribeTask = result[0]
+            if not task.output_path:
+                self._on_stage_error(batch_task, job, "Task output_path is None")
+                return
+            stage_result = task.output_path
+            files = [task.output_path]
+        elif job.stage == STAGE_SUBTITLE:
+            stage_result = list(result)
+            files = [result[1]]
+        elif job.stage == STAGE_SYNTHESIS:
+            synthesis_task: SynthesisTask = result[0]
+            # 记录非空结果，find_artifact 返回 None 表示没有可复用的产物
+            stage_result = synthesis_task.output_path or ""
+            files = [stage_result]
+
+        stage_key = job.payload[1]
+        if batch_task.content_hash:
+            self.store.record_artifact(
+                batch_task.content_hash,
+                stage_key,
+                stage_result,
+                [f for f in files if f],
+            )
+        self._release(batch_task, job)
+        self._advance(batch_task, job, stage_key, stage_result)
+
+    def _advance(
+        self, batch_task: BatchTask, job: StageJob, stage_key: str, stage_result: Any
+    ) -> None:
+        """记录阶段完成，提交下一阶段或结束任务"""
+        if job.stage == STAGE_SUBTITLE and stage_result is not None:
+            stage_result = tuple(stage_result)
+        batch_task.stage_result = stage_result
+        batch_task.stage_key = stage_key
+        batch_task.stage_index += 1
+        if batch_task.stage_index < len(batch_task.stages):
+            self.store.update_job(
+                batch_task.file_path, stage_index=batch_task.stage_index
+            )
+            if self._is_current(batch_task):
+                self._submit_stage(batch_task)
+            return
 
-    def on_full_process_progress(
-        self, batch_task: BatchTask, progress: int, message: str
-    ):
-        """处理全流程任务的转录进度"""
-        if batch_task.status == BatchTaskStatus.RUNNING:
-            progress_value = progress // 3  # 转录占33%进度
-            self.task_progress.emit(batch_task.file_path, progress_value, message)
-
-    def on_full_process_finished(self, batch_task: BatchTask, task: TranscribeTask):
-        """处理转录完成后开始字幕任务"""
-        if batch_task.current_thread in self.threads:
-            self.threads.remove(batch_task.current_thread)
-
-        # 转录完成后创建字幕任务
-        if not task.output_path:
-            raise ValueError("Task output_path is None")
-        subtitle_task = self.factory.create_subtitle_task(
-            task.output_path,
+        batch_task.status = BatchTaskStatus.COMPLETED
+        batch_task.progress = 100
+        self.store.update_job(
             batch_task.file_path,
-            need_next_task=True,
+            status=STATUS_COMPLETED,
+            stage_index=batch_task.stage_index,
         )
-        thread = SubtitleThread(subtitle_task)
-        batch_task.current_thread = thread
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        thread.progress.connect(
-            partial(self.on_full_process_subtitle_progress, batch_task)
-        )
-        thread.error.connect(partial(self._on_error_wrapper, batch_task))
-        thread.finished.connect(
-            partial(self.on_full_process_subtitle_finished, batch_task)
-        )
-
-        thread.start()
-
-    def on_full_process_subtitle_progress(
-        self, batch_task: BatchTask, progress: int, message: str
-    ):
-        """处理全流程任务中字幕部分的进度"""
-        if batch_task.status == BatchTaskStatus.RUNNING:
-            progress_value = 33 + progress // 3  # 字幕处理占中间33%进度
-            self.task_progress.emit(batch_task.file_path, progress_value, message)
-
-    def on_full_process_subtitle_finished(
-        self, batch_task: BatchTask, video_path: str, subtitle_path: str
-    ):
-        """处理字幕完成后开始视频合成任务"""
-        if batch_task.current_thread in self.threads:
-            self.threads.remove(batch_task.current_thread)
-
-        # 字幕完成后创建视频合成任务
-        synthesis_task = self.factory.create_synthesis_task(video_path, subtitle_path)
-        thread = VideoSynthesisThread(synthesis_task)
-        batch_task.current_thread = thread
-
-        # 保存线程引用
-        self.threads.append(thread)
-
-        thread.progress.connect(
-            partial(self.on_full_process_synthesis_progress, batch_task)
-        )
-        thread.error.connect(partial(self._on_error_wrapper, batch_task))
-        thread.finished.connect(partial(self._on_finished_wrapper, batch_task))
+        self.task_completed.emit(batch_task.file_path)
 
-        thread.start()
+    def _prune_threads(self) -> None:
+        """释放已结束阶段线程的引用"""
+        self.threads = [t for t in self.threads if t.isRunning()]
 
-    def on_full_process_synthesis_progress(
-        self, batch_task: BatchTask, progress: int, message: str
-    ):
-        """处理全流程任务中视频合成部分的进度"""
-        if batch_task.status == BatchTaskStatus.RUNNING:
-            progress_value = 66 + progress // 3  # 视频合成占最后34%进度
-            self.task_progress.emit(batch_task.file_path, progress_value, message)
+    # ------------------------------------------------------------------
+    # 停止
+    # ------------------------------------------------------------------
 
     def stop_task(self, file_path: str):
-        if file_path in self.current_tasks:
-            task = self.current_tasks[file_path]
-            if task.current_thread:
-                if hasattr(task.current_thread, "stop"):
-                    task.current_thread.stop()  # type: ignore
-            del self.current_tasks[file_path]
-            # 从队列中移除任务
-            with self.task_queue.mutex:
-                self.task_queue.queue.clear()
-
-    def stop_all(self):
+        with self._lock:
+            task = self.current_tasks.pop(file_path, None)
+        self.store.remove_job(file_path)
+        self.scheduler.cancel(file_path)
+        if task is None:
+            return
+        if task.current_thread and hasattr(task.current_thread, "stop"):
+            task.current_thread.stop()  # type: ignore
+        # 被停止的线程不一定会发出完成信号，这里主动归还槽位
+        if task.current_job is not None:
+            self._release(task, task.current_job)
+
+    def stop_all(self, forget: bool = False):
+        """停止所有任务
+
+        Args:
+            forget: 同时从任务存储中移除（否则下次启动时可以继续）
+        """
         self.is_running = False
+        self.scheduler.close()
         # 停止所有线程
         for thread in self.threads:
             if hasattr(thread, "stop"):
                 thread.stop()  # type: ignore
             thread.wait()  # 等待线程结束
         self.threads.clear()
-        self.current_tasks.clear()
-        # 清空任务队列
-        with self.task_queue.mutex:
-            self.task_queue.queue.clear()
+        with self._lock:
+            self.current_tasks.clear()
+        if forget:
+            self.store.clear_jobs()
+        self.wait()
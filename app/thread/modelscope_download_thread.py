@@ -1,7 +1,6 @@
 import re
 import sys
 
-from modelscope.hub.snapshot_download import snapshot_download
 from PyQt5.QtCore import QThread, pyqtSignal
 
 
@@ -62,6 +61,9 @@ class ModelscopeDownloadThread(QThread):
             sys.stderr = CustomOutput(self.custom_write)
 
             try:
+                # modelscope 依赖较多，仅在下载时导入
+                from modelscope.hub.snapshot_download import snapshot_download
+
                 # 下载模型
                 snapshot_download(self.model_id, local_dir=self.save_path)
             finally:
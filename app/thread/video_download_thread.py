@@ -3,7 +3,6 @@ import re
 from pathlib import Path
 
 import requests
-import yt_dlp
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from app.common.config import cfg
@@ -173,6 +172,9 @@ class VideoDownloadThread(QThread):
                 logger.info(f"使用cookiefile: {cookiefile_path}")
                 initial_ydl_opts["cookiefile"] = str(cookiefile_path)
 
+        # yt_dlp 导入较慢，仅在下载时加载
+        import yt_dlp
+
         with yt_dlp.YoutubeDL(initial_ydl_opts) as ydl:
             # 提取视频信息（不下载）
             info_dict = ydl.extract_info(self.url, download=False)
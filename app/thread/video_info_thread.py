@@ -1,11 +1,8 @@
-import tempfile
-from pathlib import Path
-
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from app.core.entities import VideoInfo
 from app.core.utils.logger import setup_logger
-from app.core.utils.video_utils import get_video_info
+from app.core.utils.video_utils import get_thumbnail_path, get_video_info
 
 logger = setup_logger("video_info_thread")
 
@@ -20,10 +17,8 @@ class VideoInfoThread(QThread):
 
     def run(self):
         try:
-            # 生成缩略图到临时文件
-            temp_dir = tempfile.gettempdir()
-            file_name = Path(self.file_path).stem
-            thumbnail_path = f"{temp_dir}/{file_name}_thumbnail.jpg"
+            # 缩略图按文件指纹命名，保存在临时目录
+            thumbnail_path = get_thumbnail_path(self.file_path)
 
             # 使用统一的 get_video_info 函数
             video_info = get_video_info(self.file_path, thumbnail_path=thumbnail_path)
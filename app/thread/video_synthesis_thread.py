@@ -1,10 +1,8 @@
-import datetime
-
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from app.core.entities import SynthesisTask
+from app.core.pipeline import run_synthesis
 from app.core.utils.logger import setup_logger
-from app.core.utils.video_utils import add_subtitles
 
 logger = setup_logger("video_synthesis_thread")
 
@@ -21,55 +19,12 @@ class VideoSynthesisThread(QThread):
 
     def run(self):
         try:
-            self.task.started_at = datetime.datetime.now()
-            logger.info(f"\n{self.task.synthesis_config.print_config()}")
-            video_file = self.task.video_path
-            subtitle_file = self.task.subtitle_path
-            output_path = self.task.output_path
-            soft_subtitle = self.task.synthesis_config.soft_subtitle
-            need_video = self.task.synthesis_config.need_video
-
-            if not need_video:
-                logger.info("不需要合成视频，跳过")
-                self.progress.emit(100, self.tr("合成完成"))
-                self.finished.emit(self.task)
-                return
-
-            logger.info(f"开始合成视频: {video_file}")
-            self.progress.emit(5, self.tr("正在合成"))
-
-            if not video_file:
-                raise ValueError(self.tr("视频路径为空"))
-            if not subtitle_file:
-                raise ValueError(self.tr("字幕路径为空"))
-            if not output_path:
-                raise ValueError(self.tr("输出路径为空"))
-
-            # 获取视频质量参数
-            video_quality = self.task.synthesis_config.video_quality
-            crf = video_quality.get_crf()
-            preset = video_quality.get_preset()
-
-            add_subtitles(
-                video_file,
-                subtitle_file,
-                output_path,
-                crf=crf,
-                preset=preset,
-                soft_subtitle=soft_subtitle,
-                progress_callback=self.progress_callback,
-            )
-
-            self.progress.emit(100, self.tr("合成完成"))
-            logger.info(f"视频合成完成，保存路径: {output_path}")
-
+            run_synthesis(self.task, self.progress_callback)
             self.finished.emit(self.task)
         except Exception as e:
             logger.exception(f"视频合成失败: {e}")
-            self.error.emit(str(e))
+            self.error.emit(self.tr(str(e)))
             self.progress.emit(100, self.tr("视频合成失败"))
 
     def progress_callback(self, value, message):
-        progress = int(5 + int(value) / 100 * 95)
-        logger.debug(f"合成进度: {progress}% - {message}")
-        self.progress.emit(progress, str(progress) + "% " + message)
+        self.progress.emit(int(value), self.tr(message))
@@ -38,6 +38,7 @@ from app.core.entities import (
     SupportedVideoFormats,
 )
 from app.thread.batch_process_thread import (
+    TASK_STAGES,
     BatchProcessThread,
     BatchTask,
 )
@@ -53,6 +54,7 @@ class BatchProcessInterface(QWidget):
 
         self.init_ui()
         self.setup_connections()
+        self.restore_tasks()
 
     def init_ui(self):
         # 创建主布局
@@ -131,6 +133,42 @@ class BatchProcessInterface(QWidget):
         self.task_table.setContextMenuPolicy(Qt.CustomContextMenu)  # type: ignore
         self.task_table.customContextMenuRequested.connect(self.show_context_menu)
 
+    def restore_tasks(self):
+        """恢复上次未完成的任务（开始处理后从第一个未完成阶段继续）"""
+        jobs = [
+            job
+            for job in self.batch_thread.store.unfinished_jobs()
+            if os.path.exists(job.file_path) and job.task_type in BatchTaskType.__members__
+        ]
+        if not jobs:
+            return
+
+        # 表格只支持一种任务类型，恢复第一个任务的类型（不触发清空）
+        task_type = BatchTaskType[jobs[0].task_type]
+        self.task_type_combo.blockSignals(True)
+        self.task_type_combo.setCurrentText(str(task_type))
+        self.task_type_combo.blockSignals(False)
+
+        stage_count = len(TASK_STAGES[task_type])
+        for job in jobs:
+            if job.task_type != task_type.name:
+                continue
+            self.add_task_to_table(job.file_path)
+            row = self.task_table.rowCount() - 1
+            self.task_table.cellWidget(row, 1).setValue(
+                job.stage_index * 100 // stage_count
+            )
+            if job.error:
+                self.task_table.item(row, 2).setToolTip(job.error)
+
+        InfoBar.info(
+            title=self.tr("恢复任务"),
+            content=f"已恢复 {self.task_table.rowCount()} 个未完成的任务",
+            duration=INFOBAR_DURATION_SUCCESS,
+            position=InfoBarPosition.TOP,
+            parent=self,
+        )
+
     def on_add_file_clicked(self):
         task_type = self.task_type_combo.currentText()
         file_filter = ""
@@ -218,23 +256,32 @@ class BatchProcessInterface(QWidget):
             )
             return
 
-        for file_path in valid_files:
-            # 检查是否已存在相同任务
-            exists = False
-            for row in range(self.task_table.rowCount()):
-                if self.task_table.item(row, 0).toolTip() == file_path:
-                    exists = True
-                    InfoBar.warning(
-                        title="任务已存在",
-                        content="任务已存在",
-                        duration=INFOBAR_DURATION_WARNING,
-                        position=InfoBarPosition.TOP_RIGHT,
-                        parent=self,
-                    )
-                    break
-
-            if not exists:
+        # 一次性收集已有任务，避免每个文件都遍历整张表
+        existing = {
+            self.task_table.item(row, 0).toolTip()
+            for row in range(self.task_table.rowCount())
+        }
+        duplicates = 0
+
+        self.task_table.setUpdatesEnabled(False)
+        try:
+            for file_path in valid_files:
+                if file_path in existing:
+                    duplicates += 1
+                    continue
+                existing.add(file_path)
                 self.add_task_to_table(file_path)
+        finally:
+            self.task_table.setUpdatesEnabled(True)
+
+        if duplicates:
+            InfoBar.warning(
+                title="任务已存在",
+                content=f"{duplicates} 个任务已存在",
+                duration=INFOBAR_DURATION_WARNING,
+                position=InfoBarPosition.TOP_RIGHT,
+                parent=self,
+            )
 
     def filter_files(self, file_paths, task_type: BatchTaskType):
         valid_extensions = {}
@@ -419,7 +466,7 @@ class BatchProcessInterface(QWidget):
                 break
 
     def clear_tasks(self):
-        self.batch_thread.stop_all()
+        self.batch_thread.stop_all(forget=True)
         self.task_table.setRowCount(0)
 
     def on_task_type_changed(self, task_type):
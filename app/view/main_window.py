@@ -17,12 +17,10 @@ from qfluentwidgets import (
 from app.common.config import cfg
 from app.components.DonateDialog import DonateDialog
 from app.components.FasterWhisperSettingWidget import FasterWhisperDownloadDialog
+from app.components.LazyInterface import LazyInterface
 from app.config import ASSETS_PATH, GITHUB_REPO_URL, MODEL_PATH
 from app.thread.version_checker_thread import VersionChecker
-from app.view.batch_process_interface import BatchProcessInterface
 from app.view.home_interface import HomeInterface
-from app.view.setting_interface import SettingInterface
-from app.view.subtitle_style_interface import SubtitleStyleInterface
 
 LOGO_PATH = ASSETS_PATH / "logo.png"
 
@@ -34,9 +32,16 @@ class MainWindow(FluentWindow):
 
         # 创建子界面
         self.homeInterface = HomeInterface(self)
-        self.settingInterface = SettingInterface(self)
-        self.subtitleStyleInterface = SubtitleStyleInterface(self)
-        self.batchProcessInterface = BatchProcessInterface(self)
+        # 其余界面在首次切换到对应页面时才创建
+        self.settingInterface = LazyInterface(
+            "settingInterface", self._create_setting_interface, self
+        )
+        self.subtitleStyleInterface = LazyInterface(
+            "SubtitleStyleInterface", self._create_subtitle_style_interface, self
+        )
+        self.batchProcessInterface = LazyInterface(
+            "batchProcessInterface", self._create_batch_process_interface, self
+        )
 
         # 初始化版本检查器
         self.versionChecker = VersionChecker()
@@ -57,6 +62,24 @@ class MainWindow(FluentWindow):
 
         atexit.register(self.stop)
 
+    @staticmethod
+    def _create_setting_interface(parent):
+        from app.view.setting_interface import SettingInterface
+
+        return SettingInterface(parent)
+
+    @staticmethod
+    def _create_subtitle_style_interface(parent):
+        from app.view.subtitle_style_interface import SubtitleStyleInterface
+
+        return SubtitleStyleInterface(parent)
+
+    @staticmethod
+    def _create_batch_process_interface(parent):
+        from app.view.batch_process_interface import BatchProcessInterface
+
+        return BatchProcessInterface(parent)
+
     def initNavigation(self):
         """初始化导航栏"""
         # 添加导航项
@@ -32,7 +32,6 @@ from app.core.constant import (
     INFOBAR_DURATION_WARNING,
 )
 from app.core.entities import LLMServiceEnum, TranslatorServiceEnum
-from app.core.llm.check_llm import check_llm_connection, get_available_models
 from app.core.utils.cache import disable_cache, enable_cache
 
 
@@ -152,6 +151,13 @@ class SettingInterface(ScrollArea):
             cfg.soft_subtitle,
             self.subtitleGroup,
         )
+        self.parallelBurnCard = SwitchSettingCard(
+            FIF.SPEED_HIGH,
+            self.tr("分段并行烧录"),
+            self.tr("硬字幕按关键帧分段后多进程并行编码，多核 CPU 上合成更快"),
+            cfg.parallel_burn,
+            self.subtitleGroup,
+        )
         self.videoQualityCard = ComboBoxSettingCard(
             cfg.video_quality,
             FIF.SPEED_HIGH,
@@ -249,6 +255,7 @@ class SettingInterface(ScrollArea):
         self.subtitleGroup.addSettingCard(self.needVideoCard)
         self.subtitleGroup.addSettingCard(self.softSubtitleCard)
         self.subtitleGroup.addSettingCard(self.videoQualityCard)
+        self.subtitleGroup.addSettingCard(self.parallelBurnCard)
 
         self.saveGroup.addSettingCard(self.savePathCard)
         self.saveGroup.addSettingCard(self.cacheEnabledCard)
@@ -1082,6 +1089,8 @@ class LLMConnectionThread(QThread):
     def run(self):
         """检查 LLM 连接并获取模型列表"""
         try:
+            from app.core.llm import check_llm_connection, get_available_models
+
             is_success, message = check_llm_connection(
                 self.api_base, self.api_key, self.model
             )
@@ -4,9 +4,16 @@ import os
 import sys
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTime, pyqtSignal
+from typing import Any, Dict, List, Optional, Set, Union
+
+from PyQt5.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    Qt,
+    QTime,
+    QTimer,
+    pyqtSignal,
+)
 from PyQt5.QtGui import QCloseEvent, QColor, QDragEnterEvent, QDropEvent, QKeyEvent
 from PyQt5.QtWidgets import (
     QAbstractItemView,
@@ -39,6 +46,7 @@ from app.common.signal_bus import signalBus
 from app.components.SubtitleSettingDialog import SubtitleSettingDialog
 from app.config import SUBTITLE_STYLE_PATH
 from app.core.asr.asr_data import ASRData
+from app.core.asr.interval_index import IntervalIndex
 from app.core.constant import (
     INFOBAR_DURATION_ERROR,
     INFOBAR_DURATION_INFO,
@@ -54,37 +62,49 @@ from app.core.entities import (
 from app.core.task_factory import TaskFactory
 from app.core.translate.types import TargetLanguage
 from app.core.utils.get_subtitle_style import get_subtitle_style
+from app.core.utils.live_subtitle import LiveAssWriter
 from app.core.utils.platform_utils import open_folder
 from app.thread.subtitle_thread import SubtitleThread
 
 
 class SubtitleTableModel(QAbstractTableModel):
+    """字幕表格模型
+
+    各行按顺序存放在列表中，并维护 key → 行号 的索引。翻译过程中的增量更新
+    只记录变动的行，由定时器合并后统一发出 dataChanged。
+    """
+
+    # 合并增量更新通知的间隔（毫秒）
+    UPDATE_INTERVAL_MS = 100
+
     def __init__(self, data: Union[str, Dict[str, Any]] = ""):
         super().__init__()
-        self._data: Dict[str, Any] = {}
+        self._rows: List[Dict[str, Any]] = []
+        self._row_of: Dict[str, int] = {}
+        self._dirty_rows: Set[int] = set()
+        self._time_index: Optional[IntervalIndex] = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.UPDATE_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush_updates)
         if isinstance(data, str):
             self.load_data(data)
         else:
-            self._data = data
+            self.update_all(data)
 
     def load_data(self, data: str):
         """加载字幕数据"""
         try:
-            self._data = json.loads(data)
-            self.layoutChanged.emit()
+            self.update_all(json.loads(data))
         except json.JSONDecodeError:
             pass
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:  # type: ignore
-        if not index.isValid() or not self._data:
+        if not index.isValid() or index.row() >= len(self._rows):
             return None
 
-        row = index.row()
         col = index.column()
-        segment = self._data.get(str(row + 1))
-
-        if not segment:
-            return None
+        segment = self._rows[index.row()]
 
         if role == Qt.DisplayRole or role == Qt.EditRole:  # type: ignore
             if col == 0:
@@ -109,16 +129,12 @@ class SubtitleTableModel(QAbstractTableModel):
         return None
 
     def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:  # type: ignore
-        if not index.isValid() or not self._data:
+        if not index.isValid() or index.row() >= len(self._rows):
             return False
 
         if role == Qt.EditRole:  # type: ignore
-            row = index.row()
+            segment = self._rows[index.row()]
             col = index.column()
-            segment = self._data.get(str(row + 1))
-
-            if not segment:
-                return False
 
             if col == 2:
                 segment["original_subtitle"] = value
@@ -156,7 +172,9 @@ class SubtitleTableModel(QAbstractTableModel):
         return None
 
     def rowCount(self, parent: Optional[QModelIndex] = None) -> int:
-        return len(self._data)
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._rows)
 
     def columnCount(self, parent: Optional[QModelIndex] = None) -> int:
         return 4
@@ -168,34 +186,93 @@ class SubtitleTableModel(QAbstractTableModel):
             return Qt.ItemIsEditable | Qt.ItemIsEnabled | Qt.ItemIsSelectable  # type: ignore
         return Qt.ItemIsEnabled | Qt.ItemIsSelectable  # type: ignore
 
-    def update_data(self, new_data: Dict[str, str]) -> None:
-        """更新字幕数据"""
-        updated_rows = set()
+    def segment(self, row: int) -> Dict[str, Any]:
+        """获取指定行的字幕数据"""
+        return self._rows[row]
+
+    def row_at(self, ms: int) -> Optional[int]:
+        """播放位置 ms 所在的字幕行"""
+        if self._time_index is None:
+            self._time_index = IntervalIndex(
+                [row["start_time"] for row in self._rows],
+                [row["end_time"] for row in self._rows],
+            )
+        return self._time_index.at(ms)
+
+    def to_json(self) -> Dict[str, Any]:
+        """导出为 ASRData.to_json() 格式"""
+        return {str(i): segment for i, segment in enumerate(self._rows, 1)}
 
-        # 更新内部数据
+    def update_data(self, new_data: Dict[str, str]) -> None:
+        """更新译文，变动的行稍后统一通知视图"""
         for key, value in new_data.items():
-            if key in self._data:
-                self._data[key]["translated_subtitle"] = value
-                row = list(self._data.keys()).index(key)
-                updated_rows.add(row)
-
-        # 如果有更新，发出dataChanged信号
-        if updated_rows:
-            min_row = min(updated_rows)
-            max_row = max(updated_rows)
-            top_left = self.index(min_row, 2)
-            bottom_right = self.index(max_row, 3)
-            self.dataChanged.emit(top_left, bottom_right, [Qt.DisplayRole, Qt.EditRole])  # type: ignore
+            row = self._row_of.get(key)
+            if row is None:
+                continue
+            self._rows[row]["translated_subtitle"] = value
+            self._dirty_rows.add(row)
+
+        if self._dirty_rows and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush_updates(self) -> None:
+        """按连续行区间发出待通知的 dataChanged"""
+        self._flush_timer.stop()
+        rows = sorted(self._dirty_rows)
+        self._dirty_rows.clear()
+        roles = [Qt.DisplayRole, Qt.EditRole]  # type: ignore
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                top_left = self.index(rows[start], 2)
+                bottom_right = self.index(rows[i - 1], 3)
+                self.dataChanged.emit(top_left, bottom_right, roles)
+                start = i
 
     def update_all(self, data: Dict[str, Any]) -> None:
         """更新所有数据"""
-        self._data = data
-        self.layoutChanged.emit()
+        self._flush_timer.stop()
+        self._dirty_rows.clear()
+        self.beginResetModel()
+        self._rows = list(data.values())
+        self._row_of = {key: row for row, key in enumerate(data)}
+        self._time_index = None
+        self.endResetModel()
+
+    def merge_rows(self, rows: List[int]) -> None:
+        """把首行到末行之间的字幕合并为一行（文本取自选中的行）"""
+        if len(rows) < 2:
+            return
+        self.flush_updates()
+        first, last = rows[0], rows[-1]
+        merged_item = {
+            "start_time": self._rows[first]["start_time"],
+            "end_time": self._rows[last]["end_time"],
+            "original_subtitle": " ".join(
+                self._rows[row]["original_subtitle"] for row in rows
+            ),
+            "translated_subtitle": " ".join(
+                self._rows[row]["translated_subtitle"] for row in rows
+            ),
+        }
+
+        self.beginRemoveRows(QModelIndex(), first + 1, last)
+        del self._rows[first + 1 : last + 1]
+        # 合并后按新的行号重新编号
+        self._row_of = {str(row + 1): row for row in range(len(self._rows))}
+        self._time_index = None
+        self.endRemoveRows()
+
+        self._rows[first] = merged_item
+        self.dataChanged.emit(self.index(first, 0), self.index(first, 3))
 
 
 class SubtitleInterface(QWidget):
     finished = pyqtSignal(str, str)
 
+    # 字幕修改后刷新播放器字幕的合并窗口（毫秒）
+    PLAYER_REFRESH_INTERVAL_MS = 300
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.setAcceptDrops(True)
@@ -442,8 +519,7 @@ class SubtitleInterface(QWidget):
             return
         original_subtitle_save_path = Path(str(self.task.subtitle_path))
         asr_data = ASRData.from_subtitle_file(str(original_subtitle_save_path))
-        self.model._data = asr_data.to_json()
-        self.model.layoutChanged.emit()
+        self.model.update_all(asr_data.to_json())
         self.status_label.setText(self.tr("已加载文件"))
 
     def start_subtitle_optimization(self, need_create_task: bool = True) -> None:
@@ -577,7 +653,7 @@ class SubtitleInterface(QWidget):
 
         try:
             # 转换并保存字幕
-            asr_data = ASRData.from_json(self.model._data)
+            asr_data = ASRData.from_json(self.model.to_json())
             layout = cfg.subtitle_layout.value
 
             if file_path.endswith(".ass"):
@@ -625,8 +701,7 @@ class SubtitleInterface(QWidget):
     def load_subtitle_file(self, file_path: str) -> None:
         self.subtitle_path = file_path
         asr_data = ASRData.from_subtitle_file(file_path)
-        self.model._data = asr_data.to_json()
-        self.model.layoutChanged.emit()
+        self.model.update_all(asr_data.to_json())
         self.status_label.setText(self.tr("已加载文件"))
 
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
@@ -681,30 +756,69 @@ class SubtitleInterface(QWidget):
         self.video_player = MyVideoWidget()
         self.video_player.resize(800, 600)
 
-        def signal_update() -> None:
-            if not self.model._data:
+        writer = LiveAssWriter(
+            os.path.join(tempfile.gettempdir(), "temp_subtitle.ass")
+        )
+        dirty_rows: Set[int] = set()
+        needs_reset = True
+        refresh_timer = QTimer(self.video_player)
+        refresh_timer.setSingleShot(True)
+        refresh_timer.setInterval(self.PLAYER_REFRESH_INTERVAL_MS)
+
+        def refresh_player() -> None:
+            nonlocal needs_reset
+            if not self.model.rowCount():
                 return
             ass_style_name = cfg.subtitle_style_name.value
             ass_style_path = SUBTITLE_STYLE_PATH / f"{ass_style_name}.txt"
             if ass_style_path.exists():
-                subtitle_style_srt = ass_style_path.read_text(encoding="utf-8")
+                writer.set_style(ass_style_path.read_text(encoding="utf-8"))
             else:
-                subtitle_style_srt = None
-            temp_srt_path = os.path.join(tempfile.gettempdir(), "temp_subtitle.ass")
-            asr_data = ASRData.from_json(self.model._data)
-            asr_data.save(
-                temp_srt_path,
-                layout=cfg.subtitle_layout.value,
-                ass_style=subtitle_style_srt or "",
-            )
-            signalBus.add_subtitle(temp_srt_path)
+                writer.set_style(None)
+            if needs_reset:
+                rows = (self.model.segment(r) for r in range(self.model.rowCount()))
+                writer.reset(rows, layout=cfg.subtitle_layout.value)
+                needs_reset = False
+            else:
+                writer.update_rows({r: self.model.segment(r) for r in dirty_rows})
+            dirty_rows.clear()
+            # 内容没有变化时不让播放器重新加载
+            if writer.write():
+                signalBus.add_subtitle(writer.path)
+
+        def on_rows_changed(top_left: QModelIndex, bottom_right: QModelIndex, *_):
+            dirty_rows.update(range(top_left.row(), bottom_right.row() + 1))
+            refresh_timer.start()
+
+        def on_reset() -> None:
+            nonlocal needs_reset
+            needs_reset = True
+            refresh_timer.start()
+
+        refresh_timer.timeout.connect(refresh_player)
+
+        def highlight_row(position: int) -> None:
+            # 正在编辑时不移动当前行，以免打断输入
+            if self.subtitle_table.state() == QAbstractItemView.EditingState:
+                return
+            row = self.model.row_at(position)
+            current = self.subtitle_table.currentIndex()
+            if row is None or (current.isValid() and current.row() == row):
+                return
+            index = self.model.index(row, 2)
+            self.subtitle_table.setCurrentIndex(index)
+            self.subtitle_table.scrollTo(index)
+
+        self.video_player.vlc_player.positionChanged.connect(highlight_row)
 
         # 如果有字幕文件,则添加字幕
-        signal_update()
+        refresh_player()
 
-        signalBus.subtitle_layout_changed.connect(signal_update)
-        self.model.dataChanged.connect(signal_update)
-        self.model.layoutChanged.connect(signal_update)
+        # 修改会在短时间窗口内合并后再刷新播放器
+        signalBus.subtitle_layout_changed.connect(on_reset)
+        self.model.dataChanged.connect(on_rows_changed)
+        self.model.modelReset.connect(on_reset)
+        self.model.rowsRemoved.connect(on_reset)
 
         # 如果有关联的视频文件,则自动加载
         # Note: SubtitleTask doesn't have file_path attribute
@@ -716,7 +830,7 @@ class SubtitleInterface(QWidget):
 
     def on_subtitle_clicked(self, index: QModelIndex) -> None:
         row = index.row()
-        item = list(self.model._data.values())[row]
+        item = self.model.segment(row)
         start_time = item["start_time"]  # 毫秒
         end_time = (
             item["end_time"] - 50
@@ -762,55 +876,7 @@ class SubtitleInterface(QWidget):
         if not rows or len(rows) < 2:
             return
 
-        # 获取选中行的数据
-        data = self.model._data
-        data_list = list(data.values())
-
-        # 获取第一行和最后一行的时间戳
-        first_row = data_list[rows[0]]
-        last_row = data_list[rows[-1]]
-        start_time = first_row["start_time"]
-        end_time = last_row["end_time"]
-
-        # 合并字幕内容
-        original_subtitles = []
-        translated_subtitles = []
-        for row in rows:
-            item = data_list[row]
-            original_subtitles.append(item["original_subtitle"])
-            translated_subtitles.append(item["translated_subtitle"])
-
-        merged_original = " ".join(original_subtitles)
-        merged_translated = " ".join(translated_subtitles)
-
-        # 创建新的合并后的字幕项
-        merged_item = {
-            "start_time": start_time,
-            "end_time": end_time,
-            "original_subtitle": merged_original,
-            "translated_subtitle": merged_translated,
-        }
-
-        # 获取所有需要保留的键
-        keys = list(data.keys())
-        preserved_keys = keys[: rows[0]] + keys[rows[-1] + 1 :]
-
-        # 创建新的数据字典
-        new_data = {}
-        for i, key in enumerate(preserved_keys):
-            if i == rows[0]:
-                new_key = f"{len(new_data) + 1}"
-                new_data[new_key] = merged_item
-            new_key = f"{len(new_data) + 1}"
-            new_data[new_key] = data[key]
-
-        # 如果合并的是最后几行，需要确保合并项被添加
-        if rows[0] >= len(preserved_keys):
-            new_key = f"{len(new_data) + 1}"
-            new_data[new_key] = merged_item
-
-        # 更新模型数据
-        self.model.update_all(new_data)
+        self.model.merge_rows(rows)
 
         # 显示成功提示
         InfoBar.success(
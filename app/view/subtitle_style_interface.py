@@ -1,7 +1,7 @@
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFontDatabase
 from PyQt5.QtWidgets import QFileDialog, QHBoxLayout, QVBoxLayout, QWidget
 from qfluentwidgets import (
@@ -30,7 +30,11 @@ from app.config import ASSETS_PATH, SUBTITLE_STYLE_PATH
 from app.core.constant import INFOBAR_DURATION_SUCCESS, INFOBAR_DURATION_WARNING
 from app.core.entities import SubtitleLayoutEnum
 from app.core.utils.platform_utils import open_folder
-from app.core.utils.subtitle_preview import generate_preview
+from app.core.utils.subtitle_preview import (
+    PreviewRenderer,
+    PreviewRequest,
+    cached_preview,
+)
 
 PERVIEW_TEXTS = {
     "长文本": (
@@ -56,46 +60,26 @@ DEFAULT_BG_PORTRAIT = {
 }
 
 
-class PreviewThread(QThread):
-    previewReady = pyqtSignal(str)
-
-    def __init__(
-        self,
-        style_str: str,
-        preview_text: Tuple[str, Optional[str]],
-        bg_path: str,
-        width: int,
-        height: int,
-    ):
-        """
-        Args:
-            style_str: ASS 样式字符串
-            preview_text: 预览文本元组 (主字幕, 副字幕), 副字幕可选
-        """
-        super().__init__()
-        self.style_str = style_str
-        self.preview_text = preview_text
-        self.bg_path = bg_path
-        self.width = width
-        self.height = height
-
-    def run(self):
-        preview_path = generate_preview(
-            style_str=self.style_str,
-            preview_text=self.preview_text,
-            bg_path=self.bg_path,
-            width=self.width,
-            height=self.height,
-        )
-        self.previewReady.emit(preview_path)
+class SubtitleStyleInterface(QWidget):
+    # 设置连续变化（如拖动字号）时，停止变化这么久之后才渲染预览
+    PREVIEW_DEBOUNCE_MS = 200
 
+    previewReady = pyqtSignal(str)
 
-class SubtitleStyleInterface(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setObjectName("SubtitleStyleInterface")
         self.setWindowTitle(self.tr("字幕样式配置"))
 
+        # 预览在后台线程渲染，结果通过信号回到界面线程
+        self._preview_renderer = PreviewRenderer()
+        self._pending_preview: Optional[PreviewRequest] = None
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(self.PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self._renderPreview)
+        self.previewReady.connect(self.onPreviewReady)
+
         # 创建主布局
         self.hBoxLayout = QHBoxLayout(self)
 
@@ -540,7 +524,26 @@ class SubtitleStyleInterface(QWidget):
         return f"[V4+ Styles]\n{style_format}\n{main_style}\n{sub_style}"
 
     def updatePreview(self):
-        """更新预览图片"""
+        """更新预览图片：命中缓存立即显示，否则防抖后交给后台渲染"""
+        request = self._buildPreviewRequest()
+        cached_path = cached_preview(request)
+        if cached_path:
+            self._preview_timer.stop()
+            self._preview_renderer.cancel()
+            self._pending_preview = None
+            self.onPreviewReady(cached_path)
+            return
+        self._pending_preview = request
+        self._preview_timer.start()
+
+    def _renderPreview(self):
+        if self._pending_preview is None:
+            return
+        request, self._pending_preview = self._pending_preview, None
+        self._preview_renderer.submit(request, self.previewReady.emit)
+
+    def _buildPreviewRequest(self) -> PreviewRequest:
+        """根据当前设置生成预览请求"""
         # 生成 ASS 样式字符串
         style_str = self.generateAssStyles()
 
@@ -576,16 +579,13 @@ class SubtitleStyleInterface(QWidget):
             width = default_preview["width"]
             height = default_preview["height"]
 
-        # 创建预览线程
-        self.preview_thread = PreviewThread(
+        return PreviewRequest(
             style_str=style_str,
             preview_text=(main_text, sub_text),
             bg_path=path,
             width=width,
             height=height,
         )
-        self.preview_thread.previewReady.connect(self.onPreviewReady)
-        self.preview_thread.start()
 
     def onPreviewReady(self, preview_path):
         """预览图片生成完成的回调"""
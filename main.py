@@ -10,7 +10,9 @@ import platform
 import sys
 import traceback
 
-from app.config import TRANSLATIONS_PATH
+from app.config import TRANSLATIONS_PATH, setup_environment
+
+setup_environment()
 
 # Add project root directory to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -376,7 +376,7 @@ def mock_llm_client(monkeypatch):
         return True, None
 
     monkeypatch.setattr(
-        "app.thread.subtitle_thread.check_llm_connection", mock_check_llm_connection
+        "app.core.llm.check_llm.check_llm_connection", mock_check_llm_connection
     )
 
     return mock_client
@@ -0,0 +1,62 @@
+""".asrd 二进制容器测试"""
+
+import pytest
+
+from app.core.asr import asr_binary
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+
+
+def _as_tuples(asr_data: ASRData):
+    return [
+        (seg.text, seg.translated_text, seg.start_time, seg.end_time)
+        for seg in asr_data
+    ]
+
+
+def test_round_trip_preserves_text_and_word_level_flag(tmp_path):
+    data = ASRData(
+        [
+            ASRDataSeg("第一行\n第二行", 0, 1200, "line one\nline two"),
+            ASRDataSeg("émoji 🎬", 1500, 3_600_000_123),
+            ASRDataSeg("last", 3_600_000_200, 3_600_000_900, "最后"),
+        ]
+    )
+    path = tmp_path / "data.asrd"
+
+    data.save(str(path))
+    loaded = ASRData.from_subtitle_file(str(path))
+
+    assert _as_tuples(loaded) == _as_tuples(data)
+    assert loaded.is_word_timestamp() is False
+
+    words = ASRData([ASRDataSeg(w, i * 100, i * 100 + 90) for i, w in enumerate("abc")])
+    words.save(str(path))
+    loaded = asr_binary.load(str(path))
+    assert loaded._word_level is True
+    # 片段被替换后标记失效，重新检测
+    loaded.segments = [ASRDataSeg("a whole sentence", 0, 1000)]
+    assert loaded.is_word_timestamp() is False
+
+
+def test_sidecar_is_used_until_source_changes(tmp_path):
+    source = tmp_path / "sub.srt"
+    data = ASRData([ASRDataSeg("Hello", 0, 1000, "你好")])
+    data.save(str(source))
+    asr_binary.save_sidecar(data, str(source))
+
+    # srt 中两行会按单语拼接，.asrd 保留原文与译文
+    loaded = ASRData.from_subtitle_file(str(source))
+    assert _as_tuples(loaded) == [("Hello", "你好", 0, 1000)]
+
+    source.write_text("1\n00:00:00,000 --> 00:00:02,000\nEdited\n", encoding="utf-8")
+    assert asr_binary.load_sidecar(str(source)) is None
+    assert _as_tuples(ASRData.from_subtitle_file(str(source))) == [
+        ("Edited", "", 0, 2000)
+    ]
+
+
+def test_invalid_file_rejected(tmp_path):
+    path = tmp_path / "bad.asrd"
+    path.write_bytes(b"not an asrd container" * 4)
+    with pytest.raises(asr_binary.ASRBinaryError):
+        asr_binary.load(str(path))
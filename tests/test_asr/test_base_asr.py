@@ -0,0 +1,78 @@
+"""BaseASR 输入处理测试（路径优先、流式指纹、零拷贝链接）"""
+
+import os
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+from pydub import AudioSegment
+
+from app.core.asr import base
+from app.core.asr.base import BaseASR, link_or_copy
+from app.core.utils.media_probe import compute_file_fingerprint
+
+
+class DummyASR(BaseASR):
+    def _run(self, callback=None, **kwargs):
+        return {}
+
+    def _make_segments(self, resp_data):
+        return []
+
+
+def _make_wav(path: Path, duration_ms: int = 1500) -> Path:
+    AudioSegment.silent(duration=duration_ms, frame_rate=16000).export(
+        path, format="wav"
+    )
+    return path
+
+
+class TestFingerprint:
+    def test_matches_crc32_of_content(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        expected = format(zlib.crc32(path.read_bytes()) & 0xFFFFFFFF, "08x")
+        assert compute_file_fingerprint(str(path)) == expected
+
+    def test_index_skips_rereading(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        first = compute_file_fingerprint(str(path))
+        with patch("builtins.open", side_effect=AssertionError("re-read")):
+            assert compute_file_fingerprint(str(path)) == first
+
+    def test_modified_file_is_rehashed(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        first = compute_file_fingerprint(str(path))
+        _make_wav(path, duration_ms=3000)
+        os.utime(path, ns=(0, 1))
+        assert compute_file_fingerprint(str(path)) != first
+
+
+class TestPathInput:
+    def test_path_input_is_not_read(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        asr = DummyASR(str(path))
+
+        assert asr._file_binary is None
+        assert asr.audio_duration == 1.5
+        assert asr.file_binary == path.read_bytes()
+
+    def test_materialize_links_input(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        asr = DummyASR(str(path))
+        dst = tmp_path / "work" / "audio.wav"
+        dst.parent.mkdir()
+
+        asr._materialize_input(dst)
+
+        assert dst.read_bytes() == path.read_bytes()
+        assert asr._file_binary is None
+
+    def test_link_falls_back_to_copy(self, tmp_path: Path):
+        path = _make_wav(tmp_path / "a.wav")
+        dst = tmp_path / "b.wav"
+        with patch.object(base.os, "link", side_effect=OSError), patch.object(
+            base.os, "symlink", side_effect=OSError
+        ):
+            link_or_copy(str(path), dst)
+        assert not dst.is_symlink()
+        assert dst.read_bytes() == path.read_bytes()
@@ -800,3 +800,46 @@ class TestStrictMode:
         # 验证无重复
         assert actual.count("S5") == 1
         assert actual.count("S6") == 1
+
+
+# ============================================================================
+# 重叠区域提取
+# ============================================================================
+
+
+class TestExtractOverlapSegments:
+    """重叠窗口只包含完全落在窗口内的 segments"""
+
+    @pytest.fixture
+    def segments(self):
+        return [
+            ASRDataSeg("a", 0, 1000),
+            ASRDataSeg("b", 1000, 2500),
+            ASRDataSeg("c", 2500, 4000),
+            ASRDataSeg("d", 4000, 5000),
+        ]
+
+    def test_from_end_excludes_segment_crossing_window_start(self, segments):
+        # 窗口 [2000, 5000]：b 跨越窗口起点，不计入
+        overlap = ChunkMerger()._extract_overlap_segments(
+            segments, from_end=True, duration=3000
+        )
+        assert [seg.text for seg in overlap] == ["c", "d"]
+
+    def test_from_start_excludes_segment_crossing_window_end(self, segments):
+        # 窗口 [0, 3000]：c 跨越窗口终点，不计入
+        overlap = ChunkMerger()._extract_overlap_segments(
+            segments, from_end=False, duration=3000
+        )
+        assert [seg.text for seg in overlap] == ["a", "b"]
+
+    def test_boundaries_are_inclusive(self, segments):
+        merger = ChunkMerger()
+        from_end = merger._extract_overlap_segments(
+            segments, from_end=True, duration=2500
+        )
+        from_start = merger._extract_overlap_segments(
+            segments, from_end=False, duration=2500
+        )
+        assert [seg.text for seg in from_end] == ["c", "d"]
+        assert [seg.text for seg in from_start] == ["a", "b"]
@@ -15,6 +15,7 @@
 
 import io
 import tempfile
+import wave
 from pathlib import Path
 from typing import Callable, List, Optional
 
@@ -275,11 +276,58 @@ class TestAudioSplitting:
 
             assert len(chunks) == 2
             # 第二块应该只有 120 秒
-            chunk2_audio = AudioSegment.from_file(io.BytesIO(chunks[1][0]))
-            assert abs(len(chunk2_audio) - 120 * 1000) < 100  # 允许误差 100ms
+            assert abs(chunks[1].duration_ms - 120 * 1000) < 100  # 允许误差 100ms
+            with tempfile.TemporaryDirectory() as work_dir:
+                chunk_path = chunked._extract_chunk(chunks[1], work_dir, 1)
+                chunk2_audio = AudioSegment.from_file(chunk_path)
+            assert abs(len(chunk2_audio) - 120 * 1000) < 100
         finally:
             Path(audio_input).unlink()
 
+    def test_wav_chunks_streamed_from_file(self, tmp_path, monkeypatch):
+        """测试 WAV 按帧切块：不解码整段音频，块以文件路径交给 ASR"""
+        audio_input = tmp_path / "long.wav"
+        tone = AudioSegment.silent(duration=25 * 1000, frame_rate=16000)
+        tone.set_channels(1).export(str(audio_input), format="wav")
+
+        def no_decode(*args, **kwargs):
+            raise AssertionError("audio should not be decoded")
+
+        seen_inputs = []
+
+        class PathASR(MockASR):
+            def __init__(self, audio_input, **kwargs):
+                seen_inputs.append(audio_input)
+                super().__init__(audio_input, **kwargs)
+
+            def _run(self, callback=None, **kwargs):
+                with wave.open(self.audio_input, "rb") as f:
+                    seconds = f.getnframes() // f.getframerate()
+                return {
+                    "segments": [
+                        {"text": f"s{i}", "start": i, "end": i + 1}
+                        for i in range(seconds)
+                    ]
+                }
+
+        monkeypatch.setattr(AudioSegment, "from_file", no_decode)
+        chunked = ChunkedASR(
+            asr_class=PathASR,
+            audio_path=str(audio_input),
+            chunk_length=10,
+            chunk_overlap=2,
+            chunk_format="wav",
+        )
+        result = chunked.run()
+
+        offsets = [chunk.offset_ms for chunk in chunked._split_audio()]
+        assert offsets == [0, 8000, 16000]
+        assert len(seen_inputs) == 3
+        assert all(isinstance(path, str) for path in seen_inputs)
+        # 块文件转录后即删除
+        assert not any(Path(path).exists() for path in seen_inputs)
+        assert result.segments[-1].end_time == 25 * 1000
+
 
 # ============================================================================
 # 测试并发转录
@@ -0,0 +1,61 @@
+"""时间区间索引测试"""
+
+import math
+import random
+
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.core.asr.interval_index import IntervalIndex
+
+
+def _random_intervals(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for _ in range(count):
+        start = rng.randint(0, 10_000)
+        starts.append(start)
+        ends.append(start + rng.randint(0, 800))
+    return starts, ends
+
+
+def test_queries_match_linear_scan():
+    starts, ends = _random_intervals(300)
+    index = IntervalIndex(starts, ends)
+    for ms in range(-50, 11_000, 37):
+        covering = [i for i in range(len(starts)) if starts[i] <= ms < ends[i]]
+        hit = index.at(ms)
+        if covering:
+            assert hit in covering
+            assert starts[hit] == max(starts[i] for i in covering)
+        else:
+            assert hit is None
+
+        expected = [
+            i for i in range(len(starts)) if starts[i] < ms + 500 and ends[i] > ms
+        ]
+        assert sorted(index.overlapping(ms, ms + 500)) == sorted(expected)
+
+
+def test_count_starting_before():
+    index = IntervalIndex([0, 900, 2100, 5000], [1000, 2000, 3000, 6000])
+    assert index.count_starting_before(2100) == 2
+    assert index.count_starting_before(2101) == 3
+
+
+def test_asr_data_index_is_invalidated_on_mutation():
+    data = ASRData(
+        [
+            ASRDataSeg("a", 0, 1000),
+            ASRDataSeg("b", 1000, 2000),
+            ASRDataSeg("c", 2500, 3000),
+        ]
+    )
+    assert data.time_index().at(1500) == 1
+    assert data.time_index() is data.time_index()
+
+    data.merge_segments(0, 1)
+    assert data.time_index().at(1500) == 0
+    assert data.time_index().overlapping(2200, math.inf) == [1]
+
+    data.segments = [ASRDataSeg("z", 5000, 6000)]
+    assert data.time_index().at(1500) is None
+    assert data.time_index().at(5500) == 0
@@ -0,0 +1,158 @@
+"""本地 ASR 并发调度测试
+
+包含调度方案的单元测试，以及使用真实 whisper.cpp 引擎在合成音频上的
+实时率（RTF）基准：对比单进程基线与调度方案下 ChunkedASR 的整体耗时，
+只记录结果，不做断言。
+"""
+
+import importlib
+import logging
+import time
+from pathlib import Path
+
+import pytest
+from pydub.generators import Sine
+
+from app.config import MODEL_PATH
+from app.core.asr.base import BaseASR
+from app.core.asr.chunked_asr import ChunkedASR
+from app.core.asr.local_scheduler import (
+    MAX_CHUNK_LENGTH,
+    MIN_CHUNK_LENGTH,
+    get_physical_cores,
+    plan_local_transcription,
+)
+from app.core.asr.whisper_cpp import WhisperCppASR, detect_whisper_executable
+
+# app.core.asr 导出的 transcribe 函数遮蔽了同名模块
+transcribe = importlib.import_module("app.core.asr.transcribe")
+
+
+class TestPlanLocalTranscription:
+    def test_many_cores_long_audio(self):
+        plan = plan_local_transcription(
+            7200, model="base", physical_cores=32, available_memory_gb=64
+        )
+        assert plan.processes == 8
+        assert plan.threads_per_process == 4
+        assert plan.chunk_length == 7200 // 8 + 10
+
+    def test_limited_by_memory(self):
+        plan = plan_local_transcription(
+            7200, model="large-v3", physical_cores=32, available_memory_gb=12
+        )
+        assert plan.processes == 2
+        assert plan.threads_per_process == 8
+
+    def test_short_audio_uses_single_process(self):
+        plan = plan_local_transcription(
+            120, model="base", physical_cores=32, available_memory_gb=64
+        )
+        assert plan.processes == 1
+        assert plan.chunk_length == MIN_CHUNK_LENGTH
+
+    def test_few_cores(self):
+        plan = plan_local_transcription(
+            7200, model="base", physical_cores=2, available_memory_gb=64
+        )
+        assert plan.processes == 1
+        assert plan.threads_per_process == 2
+
+    def test_cuda_uses_single_process(self):
+        plan = plan_local_transcription(
+            7200, device="cuda", physical_cores=32, available_memory_gb=64
+        )
+        assert plan.processes == 1
+        assert plan.chunk_length == MAX_CHUNK_LENGTH
+
+    def test_one_chunk_per_process(self):
+        plan = plan_local_transcription(
+            1800, model="base", physical_cores=32, available_memory_gb=64
+        )
+        step = plan.chunk_length - 10
+        chunks = -(-(1800 - plan.chunk_length) // step) + 1
+        assert chunks == plan.processes
+
+
+class TestCreateLocalChunkedASR:
+    def test_plan_applied_to_chunked_asr(self, monkeypatch):
+        monkeypatch.setattr(transcribe, "get_media_duration", lambda _: 7200.0)
+        monkeypatch.setattr(
+            transcribe,
+            "plan_local_transcription",
+            lambda duration, **kwargs: plan_local_transcription(
+                duration, physical_cores=32, available_memory_gb=64, **kwargs
+            ),
+        )
+        chunked = transcribe._create_local_chunked_asr(
+            BaseASR, "audio.wav", {"language": "en"}, model="base"
+        )
+
+        assert chunked.chunk_concurrency == 8
+        assert chunked.chunk_length_ms == (7200 // 8 + 10) * 1000
+        assert chunked.asr_kwargs == {"language": "en", "threads": 4}
+
+    def test_unknown_duration_uses_single_process(self, monkeypatch):
+        monkeypatch.setattr(transcribe, "get_media_duration", lambda _: None)
+        chunked = transcribe._create_local_chunked_asr(
+            BaseASR, "audio.wav", {}, model="base"
+        )
+
+        assert chunked.chunk_concurrency == 1
+        assert "threads" not in chunked.asr_kwargs
+
+
+# ============================================================================
+# RTF 基准
+# ============================================================================
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_MODEL = "tiny"
+BENCHMARK_DURATION = 10 * 60
+
+
+def _whisper_cpp_available() -> bool:
+    try:
+        detect_whisper_executable()
+    except RuntimeError:
+        return False
+    return any(Path(MODEL_PATH).glob(f"*ggml*{BENCHMARK_MODEL}*.bin"))
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(
+    not _whisper_cpp_available(), reason="whisper.cpp or ggml tiny model not found"
+)
+def test_benchmark_parallel_rtf(tmp_path: Path):
+    audio_path = tmp_path / "synthetic.wav"
+    tone = Sine(440).to_audio_segment(duration=BENCHMARK_DURATION * 1000)
+    tone.set_frame_rate(16000).set_channels(1).export(audio_path, format="wav")
+    cores = get_physical_cores()
+
+    def measure(concurrency: int, threads: int, chunk_length: int) -> float:
+        chunked = ChunkedASR(
+            asr_class=WhisperCppASR,
+            audio_path=str(audio_path),
+            asr_kwargs={"whisper_model": BENCHMARK_MODEL, "threads": threads},
+            chunk_concurrency=concurrency,
+            chunk_length=chunk_length,
+            chunk_format="wav",
+        )
+        start = time.perf_counter()
+        chunked.run()
+        return (time.perf_counter() - start) / BENCHMARK_DURATION
+
+    baseline_rtf = measure(1, cores, 60 * 20)
+    plan = plan_local_transcription(BENCHMARK_DURATION, model=BENCHMARK_MODEL)
+    parallel_rtf = measure(plan.processes, plan.threads_per_process, plan.chunk_length)
+
+    logger.info(
+        "RTF baseline (1x%d): %.4f, planned (%dx%d): %.4f, speedup %.2fx",
+        cores,
+        baseline_rtf,
+        plan.processes,
+        plan.threads_per_process,
+        parallel_rtf,
+        baseline_rtf / parallel_rtf,
+    )
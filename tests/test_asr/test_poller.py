@@ -0,0 +1,75 @@
+"""TaskPoller 单元测试"""
+
+import threading
+
+import pytest
+
+from app.core.asr.poller import TaskPoller
+
+
+@pytest.fixture
+def poller():
+    return TaskPoller(
+        min_interval=0.01, max_interval=0.05, backoff_factor=2, batch_window=0.005
+    )
+
+
+class TestTaskPoller:
+    def test_resolves_after_ready(self, poller):
+        calls = []
+
+        def query(task_id):
+            calls.append(task_id)
+            return {"state": 4 if len(calls) >= 3 else 1}
+
+        future = poller.submit("t1", query=query, is_done=lambda r: r["state"] == 4)
+
+        assert future.result(timeout=5) == {"state": 4}
+        assert calls == ["t1", "t1", "t1"]
+        metrics = poller.get_metrics()
+        assert metrics["requests"] == 3
+        assert metrics["not_ready"] == 2
+        assert metrics["completed"] == 1
+        assert metrics["pending"] == 0
+
+    def test_batch_query_groups_due_tasks(self, poller):
+        lock = threading.Lock()
+        batches = []
+
+        def batch_query(task_ids):
+            with lock:
+                batches.append(sorted(task_ids))
+            return {task_id: "done" for task_id in task_ids}
+
+        poller.batch_window = 1.0
+        futures = [
+            poller.submit(f"t{i}", batch_query=batch_query, is_done=lambda r: r == "done")
+            for i in range(3)
+        ]
+
+        assert [f.result(timeout=5) for f in futures] == ["done"] * 3
+        assert batches == [["t0", "t1", "t2"]]
+        assert poller.get_metrics()["batch_requests"] == 1
+
+    def test_query_error_propagates(self, poller):
+        def query(task_id):
+            raise ConnectionError("boom")
+
+        future = poller.submit("t1", query=query, is_done=lambda r: True)
+
+        with pytest.raises(ConnectionError):
+            future.result(timeout=5)
+        assert poller.get_metrics()["failed"] == 1
+
+    def test_timeout(self, poller):
+        future = poller.submit(
+            "t1", query=lambda t: None, is_done=lambda r: False, timeout=0.1
+        )
+
+        with pytest.raises(TimeoutError):
+            future.result(timeout=5)
+        assert poller.get_metrics()["timeouts"] == 1
+
+    def test_requires_query(self, poller):
+        with pytest.raises(ValueError):
+            poller.submit("t1", is_done=lambda r: True)
@@ -0,0 +1,94 @@
+"""QuotaLedger 滑动窗口配额测试"""
+
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from diskcache import Cache
+
+from app.core.asr import quota
+from app.core.asr.quota import QuotaExceededError, QuotaLedger
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    with Cache(str(tmp_path / "cache"), tag_index=True) as c:
+        yield c
+
+
+def make_ledger(cache, max_calls=3, max_duration=100.0, window=60.0):
+    return QuotaLedger(max_calls, max_duration, window, cache=cache)
+
+
+class TestQuotaLedger:
+    def test_call_limit(self, cache):
+        ledger = make_ledger(cache)
+        for _ in range(3):
+            ledger.reserve("svc", 1)
+        with pytest.raises(QuotaExceededError, match="call count"):
+            ledger.reserve("svc", 1)
+
+    def test_duration_limit(self, cache):
+        ledger = make_ledger(cache)
+        ledger.reserve("svc", 80)
+        with pytest.raises(QuotaExceededError, match="duration"):
+            ledger.reserve("svc", 30)
+
+    def test_services_are_independent(self, cache):
+        ledger = make_ledger(cache, max_calls=1)
+        ledger.reserve("a", 1)
+        ledger.reserve("b", 1)
+
+    def test_release_returns_quota(self, cache):
+        ledger = make_ledger(cache)
+        reservation = ledger.reserve("svc", 80)
+        ledger.release(reservation)
+        ledger.reserve("svc", 80)
+        assert ledger.usage("svc") == (1, 80)
+
+    def test_commit_corrects_duration(self, cache):
+        ledger = make_ledger(cache)
+        reservation = ledger.reserve("svc", 80)
+        ledger.commit(reservation, duration=20)
+        assert ledger.usage("svc") == (1, 20)
+
+    def test_window_slides(self, cache):
+        ledger = make_ledger(cache, max_calls=1)
+        with patch.object(quota.time, "time", return_value=1000.0):
+            ledger.reserve("svc", 1)
+        with patch.object(quota.time, "time", return_value=1061.0):
+            ledger.reserve("svc", 1)
+
+    def test_shared_across_instances(self, cache):
+        """Two ledgers on one cache behave like two processes."""
+        first = make_ledger(cache)
+        second = make_ledger(cache)
+        first.reserve("svc", 50)
+        second.reserve("svc", 40)
+        with pytest.raises(QuotaExceededError):
+            first.reserve("svc", 20)
+        assert second.usage("svc") == (2, 90)
+
+    def test_concurrent_reservations_do_not_overrun(self, cache):
+        ledger = make_ledger(cache, max_calls=100, max_duration=10)
+        admitted = []
+
+        def worker():
+            try:
+                ledger.reserve("svc", 1)
+                admitted.append(1)
+            except QuotaExceededError:
+                pass
+
+        threads = [threading.Thread(target=worker) for _ in range(30)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(admitted) == 10
+
+    def test_imports_legacy_records(self, cache):
+        cache.set("rate_limit_record:svc:1", 70.0, tag="rate_limit:svc")
+        ledger = make_ledger(cache)
+        assert ledger.usage("svc") == (1, 70.0)
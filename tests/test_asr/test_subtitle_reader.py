@@ -0,0 +1,66 @@
+"""字幕流式解析测试"""
+
+import io
+
+from app.core.asr import subtitle_reader
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.core.asr.subtitle_reader import iter_srt, iter_subtitle
+from app.core.entities import SubtitleLayoutEnum
+
+
+def _bilingual_srt(
+    count: int, translation: str, original: str = "Sentence number"
+) -> str:
+    segments = [
+        ASRDataSeg(f"{original} {i}", i * 1000, i * 1000 + 900, translation)
+        for i in range(count)
+    ]
+    return ASRData(segments).to_srt(layout=SubtitleLayoutEnum.ORIGINAL_ON_TOP)
+
+
+def test_bilingual_srt_detected_by_script_without_langdetect(monkeypatch):
+    def fail(*_args):
+        raise AssertionError("langdetect should not be needed")
+
+    monkeypatch.setattr(subtitle_reader, "_langdetect_differs", fail)
+
+    segments = list(iter_srt(io.StringIO(_bilingual_srt(60, "这是译文"))))
+    assert len(segments) == 60
+    assert (segments[0].text, segments[0].translated_text) == (
+        "Sentence number 0",
+        "这是译文",
+    )
+
+    # 同一书写系统的非共用文字（中/中）直接判为单语
+    single = list(iter_srt(io.StringIO(_bilingual_srt(60, "第二行", "第一行"))))
+    assert single[0].translated_text == ""
+
+
+def test_shared_script_falls_back_to_langdetect(monkeypatch):
+    calls = []
+
+    def differs(first, second):
+        calls.append(first)
+        return True
+
+    monkeypatch.setattr(subtitle_reader, "_langdetect_differs", differs)
+    segments = list(iter_srt(io.StringIO(_bilingual_srt(60, "Une traduction"))))
+
+    assert segments[0].translated_text == "Une traduction"
+    # 达到阈值（50 × 0.7）后不再继续检测
+    assert len(calls) == 35
+
+
+def test_vtt_round_trip_keeps_first_cue_and_optional_ids():
+    data = ASRData([ASRDataSeg("hello", 0, 1500), ASRDataSeg("world", 2000, 3250)])
+    loaded = list(iter_subtitle(io.StringIO(data.to_vtt()), ".vtt"))
+    assert [(s.text, s.start_time, s.end_time) for s in loaded] == [
+        ("hello", 0, 1500),
+        ("world", 2000, 3250),
+    ]
+
+    without_ids = "WEBVTT\n\n00:01.000 --> 00:02.000\nno id\n"
+    loaded = list(iter_subtitle(io.StringIO(without_ids), ".vtt"))
+    assert [(s.text, s.start_time, s.end_time) for s in loaded] == [
+        ("no id", 1000, 2000)
+    ]
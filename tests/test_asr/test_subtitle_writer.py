@@ -0,0 +1,74 @@
+"""字幕流式序列化测试"""
+
+import io
+import json
+import logging
+import time
+
+import pytest
+
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.core.asr.subtitle_writer import write_json, write_srt
+from app.core.entities import SubtitleLayoutEnum
+
+logger = logging.getLogger(__name__)
+
+
+def _word_level_data(count: int) -> ASRData:
+    return ASRData(
+        [
+            ASRDataSeg(f"word{i}", i * 300, i * 300 + 300, "词" if i % 2 else "")
+            for i in range(count)
+        ]
+    )
+
+
+def test_srt_and_json_writers_match_reference_format():
+    data = ASRData(
+        [
+            ASRDataSeg("hello", 0, 1500, "你好"),
+            ASRDataSeg('say "hi"', 3_601_000, 3_602_345),
+        ]
+    )
+
+    srt = io.StringIO()
+    write_srt(srt, data.segments, SubtitleLayoutEnum.TRANSLATE_ON_TOP)
+    assert srt.getvalue() == (
+        "1\n00:00:00,000 --> 00:00:01,500\n你好\nhello\n"
+        "\n"
+        "2\n01:00:01,000 --> 01:00:02,345\nsay \"hi\"\n"
+    )
+
+    buffer = io.StringIO()
+    write_json(buffer, data.segments)
+    assert buffer.getvalue() == json.dumps(data.to_json(), ensure_ascii=False)
+
+
+def test_vtt_save(tmp_path):
+    data = ASRData([ASRDataSeg("hello", 0, 1500), ASRDataSeg("world", 2000, 3250)])
+    path = tmp_path / "out.vtt"
+
+    data.save(str(path), layout=SubtitleLayoutEnum.ONLY_ORIGINAL)
+
+    content = path.read_text(encoding="utf-8")
+    assert content == (
+        "WEBVTT\n"
+        "\n1\n00:00:00.000 --> 00:00:01.500\nhello\n"
+        "\n2\n00:00:02.000 --> 00:00:03.250\nworld\n"
+    )
+    assert content == data.to_vtt(layout=SubtitleLayoutEnum.ONLY_ORIGINAL)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("suffix", [".srt", ".ass", ".txt", ".json", ".vtt"])
+def test_benchmark_word_level_save(tmp_path, suffix):
+    """10 万条词级片段的写入耗时，只记录不断言"""
+    data = _word_level_data(100_000)
+    path = tmp_path / f"words{suffix}"
+
+    start = time.perf_counter()
+    data.save(str(path))
+    elapsed = time.perf_counter() - start
+
+    logger.info("%s: %.0f ms, %d bytes", suffix, elapsed * 1000, path.stat().st_size)
+    assert path.stat().st_size > 0
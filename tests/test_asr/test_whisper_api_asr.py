@@ -7,6 +7,8 @@ import pytest
 
 from app.core.asr import WhisperAPI
 from app.core.asr.asr_data import ASRData
+from app.core.asr.chunked_asr import DEFAULT_CHUNK_LENGTH_SEC
+from app.core.asr.whisper_api import UPLOAD_PROFILES, detect_audio_format
 from tests.test_asr.conftest import assert_asr_result_valid
 
 
@@ -100,3 +102,48 @@ class TestWhisperAPI:
         print("=" * 60)
 
         assert_asr_result_valid(result, min_segments=0)
+
+
+class TestUploadProfile:
+    """Unit tests for upload transcoding (no API calls)."""
+
+    def test_max_chunk_length_respects_size_cap(self) -> None:
+        profile = UPLOAD_PROFILES["opus"]
+        seconds = profile.max_chunk_length()
+        assert seconds * profile.bitrate_bps / 8 < profile.max_file_size
+
+    def test_default_chunk_fits_every_profile(self) -> None:
+        for profile in UPLOAD_PROFILES.values():
+            assert DEFAULT_CHUNK_LENGTH_SEC <= profile.max_chunk_length()
+
+    def test_detect_audio_format(self) -> None:
+        assert detect_audio_format(b"RIFF\x00\x00\x00\x00WAVE") == ("wav", "audio/wav")
+        assert detect_audio_format(b"ID3\x04")[0] == "mp3"
+        assert detect_audio_format(b"OggS\x00")[0] == "ogg"
+
+    def test_upload_is_encoded_once(self, test_audio_path_en: Path) -> None:
+        whisper_api = WhisperAPI(
+            audio_input=str(test_audio_path_en),
+            whisper_model="whisper-1",
+            base_url="https://api.example.com/v1",
+            api_key="sk-test",
+        )
+        name, data, mime = whisper_api._get_upload_file()
+
+        assert name == "audio.ogg"
+        assert mime == "audio/ogg"
+        assert data.startswith(b"OggS")
+        assert whisper_api._get_upload_file()[1] is data
+
+    def test_original_upload_keeps_input(self, test_audio_path_en: Path) -> None:
+        whisper_api = WhisperAPI(
+            audio_input=str(test_audio_path_en),
+            whisper_model="whisper-1",
+            base_url="https://api.example.com/v1",
+            api_key="sk-test",
+            upload_profile=None,
+        )
+        name, data, mime = whisper_api._get_upload_file()
+
+        assert name == "audio.mp3"
+        assert data == whisper_api.file_binary
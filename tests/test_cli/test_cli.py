@@ -0,0 +1,132 @@
+"""命令行入口测试"""
+
+import io
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.cli import (
+    COMMAND_FULL,
+    CliJob,
+    build_jobs,
+    build_parser,
+    collect_inputs,
+    run_jobs,
+)
+from app.core.entities import SynthesisConfig, SynthesisTask
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg not available"
+)
+
+SRT = "1\n00:00:00,000 --> 00:00:01,500\nhello\n\n2\n00:00:01,500 --> 00:00:02,000\nworld\n"
+
+
+def _make_video(path: Path, duration: int = 2) -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size=160x120:rate=10:duration={duration}",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "ultrafast",
+            "-y",
+            str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+def _events(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_core_pipeline_does_not_import_qt():
+    code = (
+        "import sys, app.cli, app.core.pipeline;"
+        "print(any(m.startswith(('PyQt5', 'qfluentwidgets')) for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parents[2],
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_collect_inputs_filters_directory(tmp_path: Path):
+    (tmp_path / "a.mp4").touch()
+    (tmp_path / "b.txt").touch()
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "c.mkv").touch()
+    suffixes = {".mp4", ".mkv"}
+
+    assert [Path(p).name for p in collect_inputs([str(tmp_path)], suffixes)] == [
+        "a.mp4"
+    ]
+    found = collect_inputs([str(tmp_path), str(tmp_path / "a.mp4")], suffixes, True)
+    assert sorted(Path(p).name for p in found) == ["a.mp4", "c.mkv"]
+
+    with pytest.raises(FileNotFoundError):
+        collect_inputs([str(tmp_path / "missing.mp4")], suffixes)
+
+
+def test_full_jobs_use_per_file_work_dir(tmp_path: Path):
+    (tmp_path / "talk.mp4").touch()
+    args = build_parser().parse_args(
+        [COMMAND_FULL, str(tmp_path), "-o", str(tmp_path / "out"), "--translate"]
+    )
+    [job] = build_jobs(args)
+    assert job.task.output_path == str(tmp_path / "out" / "talk" / "talk_final.mp4")
+    assert job.task.subtitle_config.need_translate
+    assert job.task.transcribe_config.need_word_time_stamp
+
+
+def test_failed_job_reports_error_event(tmp_path: Path):
+    job = CliJob(
+        "synthesize",
+        str(tmp_path / "missing.mp4"),
+        SynthesisTask(
+            video_path="",
+            subtitle_path="",
+            output_path=str(tmp_path / "out.mp4"),
+            synthesis_config=SynthesisConfig(),
+        ),
+    )
+    stream = io.StringIO()
+    assert run_jobs([job], stream=stream) == 1
+    events = _events(stream)
+    assert events[0]["event"] == "start"
+    assert events[-1]["event"] == "error"
+
+
+@requires_ffmpeg
+def test_synthesize_directory_with_process_pool(tmp_path: Path):
+    for name in ("a", "b"):
+        _make_video(tmp_path / f"{name}.mp4")
+        (tmp_path / f"{name}.srt").write_text(SRT, encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    args = build_parser().parse_args(
+        ["synthesize", str(tmp_path), "-o", str(out_dir), "--soft-subtitle"]
+    )
+    stream = io.StringIO()
+    assert run_jobs(build_jobs(args), max_workers=2, stream=stream) == 0
+
+    events = _events(stream)
+    done = {Path(e["file"]).name for e in events if e["event"] == "done"}
+    assert done == {"a.mp4", "b.mp4"}
+    assert all(e["event"] != "error" for e in events)
+    assert (out_dir / "a_final.mp4").exists()
+    assert (out_dir / "b_final.mp4").exists()
@@ -0,0 +1,74 @@
+"""阶段间字幕交接测试"""
+
+from pathlib import Path
+
+import pytest
+
+from app.core import pipeline
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.core.asr.subtitle_writer import BackgroundSaver
+from app.core.entities import (
+    FullProcessTask,
+    SubtitleConfig,
+    SubtitleTask,
+    TranscribeConfig,
+    TranscribeOutputFormatEnum,
+    TranscribeTask,
+)
+
+
+def test_in_memory_handoff_only_saves_requested_formats():
+    task = TranscribeTask(
+        transcribe_config=TranscribeConfig(
+            output_format=TranscribeOutputFormatEnum.TXT
+        ),
+        need_next_task=True,
+    )
+    assert pipeline.transcribe_output_formats(task) == ["txt", "srt"]
+    assert pipeline.transcribe_output_formats(task, file_handoff=False) == ["txt"]
+
+
+def test_run_subtitle_uses_handed_over_data(tmp_path: Path, monkeypatch):
+    def fail_parse(path):
+        raise AssertionError(f"subtitle stage re-read {path}")
+
+    monkeypatch.setattr(ASRData, "from_subtitle_file", staticmethod(fail_parse))
+    asr_data = ASRData(
+        [ASRDataSeg("hello there", 0, 1000), ASRDataSeg("general kenobi", 1000, 2000)]
+    )
+    output = tmp_path / "subtitle" / "【样式字幕】clip.ass"
+    task = SubtitleTask(
+        subtitle_path=str(tmp_path / "subtitle" / "【原始字幕】clip.srt"),
+        video_path=str(tmp_path / "clip.mp4"),
+        output_path=str(output),
+        subtitle_config=SubtitleConfig(need_split=False),
+        need_next_task=True,
+    )
+
+    saver = BackgroundSaver()
+    pipeline.run_subtitle(task, asr_data=asr_data, saver=saver)
+    # 写入在后台进行，快照与之后对数据的修改无关
+    asr_data.segments[1].text = "changed"
+    saver.close()
+
+    assert "general kenobi" in output.read_text(encoding="utf-8")
+    assert (tmp_path / "clip.srt").exists()
+    assert (tmp_path / "clip.ass").exists()
+
+
+def test_run_full_keeps_stage_error_over_save_error(tmp_path: Path, monkeypatch):
+    def failing_transcribe(task, progress, saver, file_handoff):
+        # 写入目标是目录，后台保存必然失败
+        target = tmp_path / "busy.srt"
+        target.mkdir()
+        saver.save(ASRData([ASRDataSeg("hello", 0, 1000)]), str(target))
+        raise RuntimeError("transcribe failed")
+
+    monkeypatch.setattr(pipeline, "transcribe_to_data", failing_transcribe)
+    task = FullProcessTask(
+        file_path=str(tmp_path / "clip.mp4"),
+        output_path=str(tmp_path / "out" / "clip.mp4"),
+    )
+
+    with pytest.raises(RuntimeError, match="transcribe failed"):
+        pipeline.run_full(task)
@@ -156,6 +156,24 @@ class TestDetermineNumSegments:
         assert num_segments == 1
 
 
+class TestSplitAsrData:
+    """测试 _split_asr_data 方法"""
+
+    def test_cuts_at_largest_gap_near_split_point(self):
+        """在分割点附近取最大间隔，而不是最近的停顿"""
+        gaps = {49: 400, 60: 2000}  # 片段 i 与 i+1 之间的间隔（毫秒）
+        segments = []
+        current_time = 0
+        for i in range(100):
+            segments.append(ASRDataSeg(f"word{i}", current_time, current_time + 300))
+            current_time += 300 + gaps.get(i, 100)
+
+        splitter = SubtitleSplitter(thread_num=1, model="gpt-4o-mini")
+        parts = splitter._split_asr_data(ASRData(segments), num_segments=2)
+
+        assert [len(part.segments) for part in parts] == [61, 39]
+
+
 class TestGroupByTimeGaps:
     """测试 _group_by_time_gaps 方法"""
 
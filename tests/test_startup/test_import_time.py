@@ -0,0 +1,99 @@
+"""启动导入耗时预算测试
+
+用 ``python -X importtime`` 在全新进程中测量冷启动导入，防止重量级依赖
+（openai、yt_dlp、pydub 等）重新回到启动路径上。预算留有较大余量，
+主要约束是这些依赖不应在启动时被导入。
+"""
+
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+ROOT = Path(__file__).parents[2]
+
+# 只在实际使用时才应导入的依赖
+HEAVY_MODULES = (
+    "openai",
+    "yt_dlp",
+    "pydub",
+    "langdetect",
+    "vlc",
+    "GPUtil",
+    "modelscope",
+)
+
+CLI_BUDGET_MS = 500
+GUI_BUDGET_MS = 1500
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _profile_import(module: str) -> Tuple[float, Dict[str, int]]:
+    """返回 (模块累计导入毫秒, {已导入模块: 累计微秒})"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules[module] / 1000, modules
+
+
+def _assert_no_heavy_modules(modules: Dict[str, int]) -> None:
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"启动时导入了重量级依赖: {loaded}"
+
+
+@pytest.mark.parametrize("module", ["app.cli", "app.core.pipeline"])
+def test_headless_import_budget(module: str):
+    elapsed_ms, modules = _profile_import(module)
+    _assert_no_heavy_modules(modules)
+    assert "PyQt5" not in modules
+    assert elapsed_ms < CLI_BUDGET_MS, f"{module} 导入耗时 {elapsed_ms:.0f}ms"
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("qfluentwidgets") is None,
+    reason="qfluentwidgets not installed",
+)
+def test_main_window_import_budget():
+    elapsed_ms, modules = _profile_import("app.view.main_window")
+    _assert_no_heavy_modules(modules)
+    # 非首页界面在首次切换时才导入
+    for deferred in (
+        "app.view.setting_interface",
+        "app.view.subtitle_style_interface",
+        "app.view.batch_process_interface",
+    ):
+        assert deferred not in modules, f"{deferred} 不应在启动时导入"
+    assert elapsed_ms < GUI_BUDGET_MS, f"主窗口导入耗时 {elapsed_ms:.0f}ms"
+
+
+def test_imports_have_no_side_effects():
+    code = (
+        "import os; path = os.environ['PATH'];"
+        "from app.core.utils import cache; import app.config;"
+        "print(len(cache._caches), os.environ['PATH'] == path)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    assert result.stdout.split() == ["0", "True"]
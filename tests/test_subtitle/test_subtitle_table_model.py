@@ -0,0 +1,56 @@
+"""字幕表格模型测试"""
+
+from PyQt5.QtCore import Qt
+
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.view.subtitle_interface import SubtitleTableModel
+
+
+def _make_model(count: int = 6) -> SubtitleTableModel:
+    segments = [
+        ASRDataSeg(f"line {i}", i * 1000, i * 1000 + 900) for i in range(count)
+    ]
+    return SubtitleTableModel(ASRData(segments).to_json())
+
+
+def test_update_data_coalesces_into_contiguous_ranges():
+    model = _make_model()
+    changes = []
+    model.dataChanged.connect(
+        lambda top_left, bottom_right, _roles=None: changes.append(
+            (top_left.row(), bottom_right.row())
+        )
+    )
+
+    model.update_data({"1": "a"})
+    model.update_data({"2": "b", "5": "e", "missing": "x"})
+    assert changes == []
+    assert model._flush_timer.isActive()
+
+    model.flush_updates()
+    assert changes == [(0, 1), (4, 4)]
+    assert model.data(model.index(4, 3), Qt.DisplayRole) == "e"  # type: ignore
+
+
+def test_merge_rows_removes_rows_and_renumbers():
+    model = _make_model()
+    removed = []
+    model.rowsRemoved.connect(lambda _p, first, last: removed.append((first, last)))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    model.merge_rows([1, 2, 3])
+
+    assert removed == [(2, 3)]
+    assert resets == []
+    assert model.rowCount() == 4
+    merged = model.segment(1)
+    assert merged["original_subtitle"] == "line 1 line 2 line 3"
+    assert (merged["start_time"], merged["end_time"]) == (1000, 3900)
+
+    # 合并后的 key 按新行号对应
+    model.update_data({"3": "after merge"})
+    model.flush_updates()
+    assert model.segment(2)["original_subtitle"] == "line 4"
+    assert model.segment(2)["translated_subtitle"] == "after merge"
+    assert list(model.to_json()) == ["1", "2", "3", "4"]
@@ -0,0 +1,133 @@
+"""批量处理调度线程测试"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+from app.core.batch_store import BatchJobStore
+from app.core.entities import BatchTaskType, SynthesisTask, TranscribeTask
+from app.thread import batch_process_thread
+from app.thread.batch_process_thread import BatchProcessThread, BatchTask
+
+
+@pytest.fixture
+def fake_stages(tmp_path: Path, monkeypatch):
+    """用假线程替换三个阶段，记录实际启动的阶段
+
+    转录阶段在 started.gate 打开后才完成。
+    """
+
+    class Started(list):
+        gate = threading.Event()
+
+    started = Started()
+    started.gate.set()
+
+    class FakeTranscript(QThread):
+        finished = pyqtSignal(TranscribeTask)
+        progress = pyqtSignal(int, str)
+        error = pyqtSignal(str)
+
+        def __init__(self, task):
+            super().__init__()
+            self.task = task
+
+        def run(self):
+            started.append("transcribe")
+            started.gate.wait(10)
+            output = tmp_path / "raw.srt"
+            output.write_text("raw", encoding="utf-8")
+            self.task.output_path = str(output)
+            self.finished.emit(self.task)
+
+    class FakeSubtitle(QThread):
+        finished = pyqtSignal(str, str)
+        progress = pyqtSignal(int, str)
+        error = pyqtSignal(str)
+
+        def __init__(self, task):
+            super().__init__()
+            self.task = task
+
+        def run(self):
+            started.append("subtitle")
+            output = tmp_path / "styled.ass"
+            output.write_text("styled", encoding="utf-8")
+            self.finished.emit(self.task.video_path, str(output))
+
+    class FakeSynthesis(QThread):
+        finished = pyqtSignal(SynthesisTask)
+        progress = pyqtSignal(int, str)
+        error = pyqtSignal(str)
+
+        def __init__(self, task):
+            super().__init__()
+            self.task = task
+
+        def run(self):
+            started.append("synthesis")
+            output = tmp_path / "out.mp4"
+            output.write_bytes(b"video")
+            self.task.output_path = str(output)
+            self.finished.emit(self.task)
+
+    monkeypatch.setattr(batch_process_thread, "TranscriptThread", FakeTranscript)
+    monkeypatch.setattr(batch_process_thread, "SubtitleThread", FakeSubtitle)
+    monkeypatch.setattr(batch_process_thread, "VideoSynthesisThread", FakeSynthesis)
+    return started
+
+
+def _run_to_completion(store: BatchJobStore, video: Path) -> None:
+    dispatcher = BatchProcessThread(store=store)
+    done = threading.Event()
+    dispatcher.task_completed.connect(lambda _: done.set(), Qt.DirectConnection)
+    dispatcher.task_error.connect(lambda _, e: pytest.fail(e), Qt.DirectConnection)
+    dispatcher.add_task(BatchTask(str(video), BatchTaskType.FULL_PROCESS))
+    assert done.wait(10)
+    dispatcher.stop_all()
+
+
+def test_rerun_reuses_every_stage(qapp, tmp_path: Path, fake_stages):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"source")
+    store = BatchJobStore(tmp_path / "batch.db")
+
+    _run_to_completion(store, video)
+    assert fake_stages == ["transcribe", "subtitle", "synthesis"]
+
+    # 输入与配置未变化，产物仍在：包括合成阶段在内都直接复用
+    _run_to_completion(store, video)
+    assert fake_stages == ["transcribe", "subtitle", "synthesis"]
+    store.close()
+
+
+def test_result_after_stop_is_ignored(qapp, tmp_path: Path, fake_stages):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"source")
+    store = BatchJobStore(tmp_path / "batch.db")
+    dispatcher = BatchProcessThread(store=store)
+    completed = []
+    dispatcher.task_completed.connect(completed.append, Qt.DirectConnection)
+
+    fake_stages.gate.clear()
+    task = BatchTask(str(video), BatchTaskType.TRANSCRIBE)
+    dispatcher.add_task(task)
+    for _ in range(500):
+        if task.current_thread is not None:
+            break
+        time.sleep(0.01)
+    thread = task.current_thread
+    assert thread is not None
+
+    dispatcher.stop_task(str(video))
+    fake_stages.gate.set()
+    assert thread.wait(10000)
+
+    assert completed == []
+    assert task.stage_index == 0
+    assert store.unfinished_jobs() == []
+    dispatcher.stop_all()
+    store.close()
@@ -0,0 +1,112 @@
+"""批量任务分阶段调度器测试"""
+
+import threading
+import time
+
+from app.core.batch_scheduler import ResourceKind, StageJob, StageScheduler
+
+
+def _job(key: str, stage: str, resource: ResourceKind) -> StageJob:
+    return StageJob(key=key, stage=stage, resource=resource)
+
+
+def test_full_pool_does_not_block_other_resources():
+    scheduler = StageScheduler({ResourceKind.LOCAL_ASR: 1, ResourceKind.LLM: 1})
+    scheduler.submit(_job("a", "transcribe", ResourceKind.LOCAL_ASR))
+    scheduler.submit(_job("b", "transcribe", ResourceKind.LOCAL_ASR))
+    scheduler.submit(_job("c", "subtitle", ResourceKind.LLM))
+
+    first = scheduler.next_job(timeout=0.1)
+    second = scheduler.next_job(timeout=0.1)
+    assert (first.key, second.key) == ("a", "c")
+    # b 的本地转录需要等 a 释放槽位
+    assert scheduler.next_job(timeout=0.05) is None
+
+    scheduler.release(first)
+    assert scheduler.next_job(timeout=0.1).key == "b"
+
+
+def test_release_wakes_waiting_worker():
+    scheduler = StageScheduler({ResourceKind.ENCODE: 1})
+    running = _job("a", "synthesis", ResourceKind.ENCODE)
+    scheduler.submit(running)
+    assert scheduler.next_job(timeout=0.1) is running
+    scheduler.submit(_job("b", "synthesis", ResourceKind.ENCODE))
+
+    result = {}
+
+    def worker():
+        start = time.perf_counter()
+        result["job"] = scheduler.next_job(timeout=5)
+        result["waited"] = time.perf_counter() - start
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.release(running)
+    thread.join(timeout=2)
+
+    assert result["job"].key == "b"
+    assert result["waited"] < 1
+
+
+def test_cancel_and_close():
+    scheduler = StageScheduler()
+    scheduler.submit(_job("a", "transcribe", ResourceKind.CLOUD_ASR))
+    scheduler.submit(_job("b", "transcribe", ResourceKind.CLOUD_ASR))
+    scheduler.cancel("a")
+    assert scheduler.next_job(timeout=0.1).key == "b"
+
+    waiter = threading.Thread(target=lambda: scheduler.next_job())
+    waiter.start()
+    scheduler.close()
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+
+
+def test_pipeline_stages_overlap():
+    """三个文件走完整流程：不同文件的不同阶段应同时运行"""
+    stages = [
+        ("transcribe", ResourceKind.LOCAL_ASR),
+        ("subtitle", ResourceKind.LLM),
+        ("synthesis", ResourceKind.ENCODE),
+    ]
+    scheduler = StageScheduler()
+    active = set()
+    max_overlap = []
+    lock = threading.Lock()
+    done = threading.Event()
+    finished = []
+
+    def run_stage(job: StageJob, index: int):
+        with lock:
+            active.add(job.stage)
+            max_overlap.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.discard(job.stage)
+        scheduler.release(job)
+        if index + 1 < len(stages):
+            stage, resource = stages[index + 1]
+            scheduler.submit(StageJob(job.key, stage, resource, payload=index + 1))
+        else:
+            finished.append(job.key)
+            if len(finished) == 3:
+                done.set()
+
+    for key in "abc":
+        scheduler.submit(StageJob(key, *stages[0], payload=0))
+
+    def loop():
+        while not done.is_set():
+            job = scheduler.next_job(timeout=0.5)
+            if job is not None:
+                threading.Thread(target=run_stage, args=(job, job.payload)).start()
+
+    dispatcher = threading.Thread(target=loop)
+    dispatcher.start()
+    assert done.wait(timeout=5)
+    dispatcher.join(timeout=2)
+
+    assert sorted(finished) == ["a", "b", "c"]
+    assert max(max_overlap) >= 2
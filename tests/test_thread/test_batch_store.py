@@ -0,0 +1,97 @@
+"""批量任务持久化存储测试"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from app.core.batch_store import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    STATUS_WAITING,
+    BatchJobStore,
+    make_stage_key,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "batch_jobs.db"
+
+
+def test_jobs_survive_reopen(db_path: Path):
+    store = BatchJobStore(db_path)
+    store.upsert_job("/videos/a.mp4", "FULL_PROCESS")
+    store.upsert_job("/videos/b.mp4", "FULL_PROCESS")
+    store.update_job("/videos/a.mp4", status=STATUS_RUNNING, stage_index=1)
+    store.update_job("/videos/b.mp4", status=STATUS_COMPLETED, stage_index=3)
+    store.close()
+
+    # 模拟崩溃后重启
+    reopened = BatchJobStore(db_path)
+    jobs = reopened.unfinished_jobs()
+    assert [job.file_path for job in jobs] == ["/videos/a.mp4"]
+    assert jobs[0].stage_index == 1
+    assert jobs[0].status == STATUS_RUNNING
+
+
+def test_upsert_keeps_progress_of_same_task_type(db_path: Path):
+    store = BatchJobStore(db_path)
+    store.upsert_job("a.mp4", "FULL_PROCESS")
+    store.update_job("a.mp4", stage_index=2, status=STATUS_FAILED, error="boom")
+
+    job = store.upsert_job("a.mp4", "FULL_PROCESS")
+    assert (job.stage_index, job.status, job.error) == (2, STATUS_WAITING, "")
+
+    job = store.upsert_job("a.mp4", "TRANSCRIBE")
+    assert (job.task_type, job.stage_index) == ("TRANSCRIBE", 0)
+
+
+def test_remove_and_clear(db_path: Path):
+    store = BatchJobStore(db_path)
+    for name in ("a", "b", "c"):
+        store.upsert_job(name, "TRANSCRIBE")
+    store.remove_job("a")
+    assert {job.file_path for job in store.unfinished_jobs()} == {"b", "c"}
+    store.clear_jobs()
+    assert store.unfinished_jobs() == []
+
+
+def test_artifact_reuse_is_validated(db_path: Path, tmp_path: Path):
+    store = BatchJobStore(db_path)
+    subtitle = tmp_path / "out.srt"
+    subtitle.write_text("1\n00:00:00,000 --> 00:00:01,000\nhi\n", encoding="utf-8")
+
+    key = make_stage_key("transcribe", {"model": "base"})
+    store.record_artifact("crc1", key, str(subtitle), [str(subtitle)])
+    assert store.find_artifact("crc1", key) == str(subtitle)
+    assert store.find_artifact("crc2", key) is None
+
+    # 产物被修改后不再复用
+    stat = subtitle.stat()
+    os.utime(subtitle, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.find_artifact("crc1", key) is None
+
+    store.record_artifact("crc1", key, str(subtitle), [str(subtitle)])
+    subtitle.unlink()
+    assert store.find_artifact("crc1", key) is None
+
+
+@dataclass
+class _Config:
+    model: str
+    language: str
+
+
+def test_stage_key_chains_upstream_config():
+    transcribe_a = make_stage_key("transcribe", _Config("base", "en"))
+    transcribe_b = make_stage_key("transcribe", _Config("large", "en"))
+    assert transcribe_a == make_stage_key("transcribe", _Config("base", "en"))
+    assert transcribe_a != transcribe_b
+
+    subtitle_config = {"translate": True}
+    assert make_stage_key("subtitle", subtitle_config, transcribe_a) != make_stage_key(
+        "subtitle", subtitle_config, transcribe_b
+    )
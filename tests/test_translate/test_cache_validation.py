@@ -1,5 +1,7 @@
 """Tests for cache validation functionality."""
 
+import threading
+import time
 from typing import Any
 
 import pytest
@@ -8,6 +10,7 @@ from diskcache import Cache
 from app.core.utils.cache import (
     disable_cache,
     enable_cache,
+    get_single_flight,
     memoize,
 )
 
@@ -195,3 +198,80 @@ class TestCacheValidation:
 
         # Re-enable cache
         enable_cache()
+
+    def test_single_flight_coalesces_concurrent_calls(
+        self, test_cache: Cache
+    ) -> None:
+        """Test that identical in-flight calls share one execution."""
+        call_count = 0
+        started = threading.Event()
+        release = threading.Event()
+
+        @memoize(test_cache, single_flight="test_coalesce")
+        def slow_value(x: int) -> int:
+            nonlocal call_count
+            call_count += 1
+            started.set()
+            release.wait(5)
+            return x * 2
+
+        flight = get_single_flight("test_coalesce")
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(slow_value(21)))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        assert started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while flight.stats().coalesced < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [42] * 4
+        assert call_count == 1
+
+        # Later calls are answered by the cache
+        assert slow_value(21) == 42
+        stats = flight.stats()
+        assert (stats.calls, stats.coalesced, stats.misses, stats.hits) == (
+            5,
+            3,
+            1,
+            1,
+        )
+
+    def test_single_flight_shares_exceptions(self) -> None:
+        """Test that waiters receive the leader's exception."""
+        flight = get_single_flight("test_exception")
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def failing() -> None:
+            started.set()
+            release.wait(5)
+            raise ValueError("upstream error")
+
+        def call() -> None:
+            try:
+                flight.do("key", failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        threads[0].start()
+        assert started.wait(5)
+        threads[1].start()
+        deadline = time.monotonic() + 5
+        while flight.stats().coalesced < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert errors == ["upstream error"] * 2
@@ -0,0 +1,88 @@
+"""ASS 自动换行测试"""
+
+import os
+import stat
+
+from app.core.utils.ass_auto_wrap import (
+    StyleMetrics,
+    auto_wrap_ass_file,
+    estimate_text_width,
+    wrap_text,
+)
+
+
+def _lines(wrapped: str):
+    return wrapped.split("\\N")
+
+
+def test_wrap_respects_width_and_word_boundaries():
+    metrics = StyleMetrics(font_size=40)
+
+    cjk = wrap_text("这是一个非常长的中文字幕需要被自动换行", 400, metrics)
+    assert _lines(cjk) == ["这是一个非常长的中文", "字幕需要被自动换行"]
+
+    latin = wrap_text("The quick brown fox jumps over the lazy dog", 400, metrics)
+    assert _lines(latin) == ["The quick brown fox", "jumps over the lazy", "dog"]
+    assert all(estimate_text_width(line, 40) <= 400 for line in _lines(latin))
+
+    # 覆盖标签不计宽度、不被拆开；ScaleX 计入字宽
+    tagged = wrap_text("{\\b1}一二三四五{\\b0}六七八", 200, metrics)
+    assert _lines(tagged) == ["{\\b1}一二三四五{\\b0}", "六七八"]
+    narrow = StyleMetrics(font_size=40, scale_x=50)
+    assert wrap_text("一二三四五六七八", 200, narrow) == "一二三四五六七八"
+
+
+def test_leading_spaces_do_not_produce_empty_line():
+    metrics = StyleMetrics(font_size=20)
+    for text in ("   leading", "  一二三四五", "{\\b1} hello world"):
+        lines = _lines(wrap_text(text, 60, metrics))
+        assert all(line.strip() for line in lines), lines
+        assert "".join(lines).replace(" ", "") == text.replace(" ", "")
+
+
+def test_auto_wrap_ass_file_only_touches_dialogue_text(tmp_path):
+    content = (
+        "[Script Info]\n"
+        "PlayResX: 410\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, ScaleX, Spacing\n"
+        "Style: Default,Arial,40,100,0\n"
+        "Style: Small,Arial,20,100,0\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, "
+        "MarginL, MarginR, MarginV, Effect, Text\n"
+        "Dialogue: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,一二三四五六七八九十一二\n"
+        "Dialogue: 0,0:00:01.00,0:00:02.00,Small,,0,0,0,,一二三四五六七八九十一二\n"
+    )
+    source = tmp_path / "in.ass"
+    source.write_text(content, encoding="utf-8")
+
+    auto_wrap_ass_file(str(source))
+
+    lines = source.read_text(encoding="utf-8").splitlines()
+    assert lines[:10] == content.splitlines()[:10]
+    assert lines[10].endswith(",,一二三四五六七八九十\\N一二")
+    assert lines[11].endswith(",,一二三四五六七八九十一二")
+
+
+def test_auto_wrap_ass_file_keeps_mode_and_reads_after_bom(tmp_path):
+    content = (
+        "\ufeff[Script Info]\n"
+        "PlayResX: 200\n"
+        "\n"
+        "[Events]\n"
+        "Dialogue: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,一二三四五六七八\n"
+    )
+    source = tmp_path / "in.ass"
+    source.write_text(content, encoding="utf-8")
+    os.chmod(source, 0o644)
+
+    auto_wrap_ass_file(str(source))
+
+    assert stat.S_IMODE(source.stat().st_mode) == 0o644
+    lines = source.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "\ufeff[Script Info]"
+    # PlayResX 200 → 可用宽度 198，默认 40 号字每行 4 个字
+    assert lines[4].endswith(",,一二三四\\N五六七八")
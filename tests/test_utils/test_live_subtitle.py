@@ -0,0 +1,44 @@
+"""播放器实时字幕写入测试"""
+
+from pathlib import Path
+
+from app.core.asr.asr_data import ASRData, ASRDataSeg
+from app.core.entities import SubtitleLayoutEnum
+from app.core.utils.live_subtitle import LiveAssWriter
+
+
+def _asr_data() -> ASRData:
+    return ASRData(
+        [
+            ASRDataSeg("hello", 0, 1000, "你好"),
+            ASRDataSeg("world", 1000, 2500),
+            ASRDataSeg("again", 3000, 4000, "再来"),
+        ]
+    )
+
+
+def test_matches_full_serialization(tmp_path: Path):
+    data = _asr_data()
+    for layout in SubtitleLayoutEnum:
+        writer = LiveAssWriter(str(tmp_path / "live.ass"))
+        writer.reset(data.to_json().values(), layout=layout)
+        assert writer.render() == data.to_ass(layout=layout)
+
+
+def test_patches_rows_and_skips_unchanged_writes(tmp_path: Path):
+    path = tmp_path / "live.ass"
+    data = _asr_data()
+    rows = list(data.to_json().values())
+    writer = LiveAssWriter(str(path), layout=SubtitleLayoutEnum.ONLY_TRANSLATE)
+    writer.reset(rows)
+
+    assert writer.write()
+    assert not writer.write()
+
+    rows[1]["translated_subtitle"] = "世界"
+    writer.update_rows({1: rows[1]})
+    assert writer.write()
+    assert "Default,,0,0,0,,世界" in path.read_text(encoding="utf-8")
+
+    data.segments[1].translated_text = "世界"
+    assert writer.render() == data.to_ass(layout=SubtitleLayoutEnum.ONLY_TRANSLATE)
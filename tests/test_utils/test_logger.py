@@ -0,0 +1,96 @@
+"""异步日志测试"""
+
+import logging
+import threading
+from pathlib import Path
+
+from app.core.utils import logger as logger_module
+from app.core.utils.logger import (
+    RateLimitFilter,
+    flush_logs,
+    rate_limit,
+    setup_logger,
+)
+
+
+def _file_logger(name: str, path: Path) -> logging.Logger:
+    return setup_logger(name, log_file=str(path), console_output=False)
+
+
+def _read(path: Path) -> str:
+    flush_logs()
+    return path.read_text(encoding="utf-8")
+
+
+def test_loggers_share_one_background_writer(tmp_path: Path):
+    log_file = tmp_path / "app.log"
+    first = _file_logger("test_logger.first", log_file)
+    second = _file_logger("test_logger.second", log_file)
+    first.info("hello %s", "first")
+    second.warning("hello %s", "second")
+
+    content = _read(log_file)
+    assert "hello first" in content
+    assert "test_logger.second - WARNING - hello second" in content
+
+    listener = logger_module._listener
+    assert listener is not None
+    routing = listener.handlers[0]
+    paths = [h.baseFilename for h in routing._files.values()]
+    assert paths.count(str(log_file)) == 1
+
+
+def test_args_are_formatted_in_calling_thread(tmp_path: Path):
+    log_file = tmp_path / "args.log"
+    log = _file_logger("test_logger.args", log_file)
+    items = ["a"]
+    log.info("items: %s", items)
+    items.append("b")
+
+    assert "items: ['a']" in _read(log_file)
+
+
+def test_rate_limit_filter_suppresses_repeats():
+    log = logging.getLogger("test_logger.rate")
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    records = []
+
+    class _Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    log.addHandler(_Collect())
+    rate_limit(log, interval=60)
+    rate_limit(log, interval=60)
+    assert sum(isinstance(f, RateLimitFilter) for f in log.filters) == 1
+
+    def tick(i):
+        log.debug("tick %d", i)
+
+    for i in range(5):
+        tick(i)
+    log.warning("warn")
+    assert records == ["tick 0", "warn"]
+
+    # 间隔过后输出下一条，并带上被省略的条数
+    log.filters[0]._last.clear()
+    tick(99)
+    assert records[-1] == "tick 99 (已省略 4 条)"
+
+
+def test_logging_from_threads_is_not_lost(tmp_path: Path):
+    log_file = tmp_path / "threads.log"
+    log = _file_logger("test_logger.threads", log_file)
+
+    def work(n):
+        for i in range(50):
+            log.info("worker %d line %d", n, i)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(_read(log_file).splitlines()) == 200
@@ -0,0 +1,86 @@
+"""ffmpeg 能力注册表测试（使用伪造的 ffmpeg 输出，不依赖本机 ffmpeg）"""
+
+from pathlib import Path
+
+import pytest
+from diskcache import Cache
+
+from app.core.utils import media_capabilities
+from app.core.utils.media_capabilities import CapabilityRegistry
+
+FAKE_OUTPUTS = {
+    "-version": "ffmpeg version 7.0-test Copyright (c) 2000-2024\nbuilt with gcc\n",
+    "-hwaccels": "Hardware acceleration methods:\ncuda\nvaapi\n\n",
+    "-encoders": (
+        "Encoders:\n V..... = Video\n A..... = Audio\n ------\n"
+        " V....D libx264              libx264 H.264\n"
+        " V....D libvpx-vp9           libvpx VP9\n"
+        " A....D aac                  AAC\n"
+    ),
+    "-filters": (
+        "Filters:\n  T.. = Timeline support\n  | = Source or sink filter\n"
+        " ... ass               V->V       Render ASS subtitles.\n"
+        " TSC scale             V->V       Scale the input video.\n"
+    ),
+    "-codecs": (
+        "Codecs:\n D..... = Decoding supported\n -------\n"
+        " DEV.LS h264                 H.264\n"
+        " DEA.L. aac                  AAC\n"
+    ),
+    "-init_hw_device": "",
+}
+
+
+@pytest.fixture
+def registry(tmp_path: Path, monkeypatch):
+    cache = Cache(str(tmp_path / "cache"))
+    monkeypatch.setattr(media_capabilities, "get_version_state_cache", lambda: cache)
+    monkeypatch.setattr(
+        CapabilityRegistry, "_binary_key", lambda self: "/usr/bin/ffmpeg|1|1"
+    )
+    calls = []
+
+    def fake_run(args, binary):
+        calls.append(args[1])
+        return FAKE_OUTPUTS[args[1]]
+
+    monkeypatch.setattr(CapabilityRegistry, "_run", staticmethod(fake_run))
+    yield CapabilityRegistry(), calls
+    cache.close()
+
+
+def test_parses_ffmpeg_lists(registry):
+    reg, _ = registry
+    caps = reg.get()
+    assert caps.version.startswith("ffmpeg version 7.0-test")
+    assert caps.hwaccels == ["cuda", "vaapi"]
+    assert caps.has_encoder("libx264") and caps.has_encoder("libvpx-vp9")
+    assert not caps.has_encoder("h264_nvenc")
+    assert caps.has_filter("ass") and not caps.has_filter("subtitles")
+    assert caps.has_codec("h264")
+
+
+def test_probes_once_per_binary(registry):
+    reg, calls = registry
+    reg.get()
+    reg.get()
+    assert calls.count("-encoders") == 1
+
+    # 新实例（模拟重启）从磁盘缓存恢复，不再启动进程
+    CapabilityRegistry().get()
+    assert calls.count("-encoders") == 1
+
+
+def test_cuda_result_is_persisted(registry):
+    reg, calls = registry
+    assert reg.cuda_available() is True
+    assert reg.cuda_available() is True
+    assert CapabilityRegistry().cuda_available() is True
+    assert calls.count("-init_hw_device") == 1
+
+
+def test_refresh_reprobes(registry):
+    reg, calls = registry
+    reg.get()
+    reg.get(refresh=True)
+    assert calls.count("-encoders") == 2
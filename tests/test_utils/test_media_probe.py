@@ -0,0 +1,86 @@
+"""媒体元数据探测测试"""
+
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pydub import AudioSegment
+
+from app.core.utils import media_probe
+from app.core.utils.media_probe import (
+    MediaInfo,
+    compute_bytes_fingerprint,
+    get_media_duration,
+    probe_media,
+    register_media_info,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+def _make_wav(path: Path, duration_ms: int = 2500) -> Path:
+    AudioSegment.silent(duration=duration_ms, frame_rate=16000).export(
+        path, format="wav"
+    )
+    return path
+
+
+def test_wav_header_without_subprocess(tmp_path: Path):
+    path = _make_wav(tmp_path / "a.wav")
+    with patch.object(media_probe.subprocess, "run", side_effect=AssertionError):
+        info = probe_media(str(path))
+
+    assert info is not None
+    assert info.duration == pytest.approx(2.5)
+    assert info.sample_rate == 16000
+    assert info.channels == 1
+
+
+def test_wav_duration(tmp_path: Path):
+    path = _make_wav(tmp_path / "a.wav")
+    assert get_media_duration(str(path)) == pytest.approx(2.5)
+    assert get_media_duration(str(tmp_path / "missing.wav")) is None
+
+
+def test_wav_bytes(tmp_path: Path):
+    data = _make_wav(tmp_path / "a.wav").read_bytes()
+    assert get_media_duration(data) == pytest.approx(2.5)
+
+
+def test_result_is_cached_by_fingerprint(tmp_path: Path):
+    path = _make_wav(tmp_path / "a.wav")
+    first = probe_media(str(path))
+    with patch.object(media_probe, "_read_wav_header", side_effect=AssertionError):
+        assert probe_media(str(path)) is first
+
+
+def test_registered_info_is_used():
+    data = b"not really audio"
+    register_media_info(compute_bytes_fingerprint(data), MediaInfo(duration=42.0))
+    assert get_media_duration(data) == 42.0
+
+
+def test_memory_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(media_probe, "MEDIA_INFO_CACHE_SIZE", 2)
+    monkeypatch.setattr(media_probe, "_media_info_cache", OrderedDict())
+    for name in ("a", "b"):
+        register_media_info(name, MediaInfo(duration=1.0))
+    probe_media(b"", fingerprint="a")  # a 变为最近使用
+    register_media_info("c", MediaInfo(duration=1.0))
+
+    assert list(media_probe._media_info_cache) == ["a", "c"]
+
+
+def test_compressed_audio_via_ffmpeg():
+    info = probe_media(str(FIXTURES / "audio" / "en.mp3"))
+    if info is None:
+        pytest.skip("ffprobe/ffmpeg not available")
+    assert info.duration > 0
+    assert info.sample_rate > 0
+
+
+def test_unreadable_returns_none(tmp_path: Path):
+    path = tmp_path / "broken.mp3"
+    path.write_bytes(b"\x00" * 64)
+    assert probe_media(str(path)) is None
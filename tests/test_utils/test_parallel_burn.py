@@ -0,0 +1,266 @@
+"""分段并行烧录硬字幕测试
+
+包含分段规划、字幕时间轴平移的单元测试，以及基于合成视频的端到端测试和
+与单进程路径对比的基准测试（需要本机 ffmpeg，只记录耗时不断言）。
+"""
+
+import logging
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core.entities import AudioStreamInfo
+from app.core.utils import parallel_burn
+from app.core.utils.parallel_burn import (
+    burn_subtitles_parallel,
+    escape_filter_path,
+    plan_segments,
+    select_default_audio_stream,
+    shift_subtitle_file,
+)
+from app.core.utils.video_utils import add_subtitles, get_video_info
+
+logger = logging.getLogger(__name__)
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg not available"
+)
+
+ASS_HEADER = (
+    "[Script Info]\n"
+    "ScriptType: v4.00+\n"
+    "PlayResX: 320\n"
+    "PlayResY: 240\n"
+    "\n"
+    "[V4+ Styles]\n"
+    "Format: Name,Fontname,Fontsize,PrimaryColour,SecondaryColour,OutlineColour,"
+    "BackColour,Bold,Italic,Underline,StrikeOut,ScaleX,ScaleY,Spacing,Angle,"
+    "BorderStyle,Outline,Shadow,Alignment,MarginL,MarginR,MarginV,Encoding\n"
+    "Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,"
+    "0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1\n"
+    "\n"
+    "[Events]\n"
+    "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+)
+
+
+def _write_ass(path: Path, events) -> None:
+    lines = [
+        f"Dialogue: 0,{start},{end},Default,,0,0,0,,{text}"
+        for start, end, text in events
+    ]
+    path.write_text(ASS_HEADER + "\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _make_video(path: Path, duration: int, size: str = "320x240") -> None:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc=size={size}:rate=25:duration={duration}",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:duration={duration}",
+            "-c:v",
+            "libx264",
+            "-g",
+            "50",
+            "-preset",
+            "ultrafast",
+            "-c:a",
+            "aac",
+            "-shortest",
+            "-y",
+            str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+class TestPlanSegments:
+    def test_single_segment(self):
+        assert plan_segments(100, 1) == [(0.0, 100)]
+
+    def test_even_split_without_keyframes(self):
+        segments = plan_segments(90, 3)
+        assert segments == [(0.0, 30.0), (30.0, 60.0), (60.0, 90)]
+
+    def test_snaps_to_previous_keyframe(self):
+        keyframes = [0.0, 8.0, 16.0, 24.0, 32.0]
+        segments = plan_segments(40, 2, keyframes)
+        assert segments == [(0.0, 16.0), (16.0, 40)]
+
+    def test_merges_cuts_on_same_keyframe(self):
+        keyframes = [0.0, 50.0]
+        segments = plan_segments(90, 3, keyframes)
+        assert segments == [(0.0, 50.0), (50.0, 90)]
+
+    def test_segments_are_contiguous(self):
+        segments = plan_segments(3600, 7, [i * 2.5 for i in range(1440)])
+        assert segments[0][0] == 0.0
+        assert segments[-1][1] == 3600
+        for (_, end), (start, _) in zip(segments, segments[1:]):
+            assert end == start
+
+
+class TestShiftSubtitle:
+    def test_shift_ass(self, tmp_path: Path):
+        src = tmp_path / "in.ass"
+        _write_ass(
+            src,
+            [
+                ("0:00:01.00", "0:00:02.00", "before"),
+                ("0:00:09.50", "0:00:10.50", "straddle"),
+                ("0:00:12.00", "0:00:13.25", "inside"),
+                ("0:00:25.00", "0:00:26.00", "after"),
+            ],
+        )
+        dst = tmp_path / "out.ass"
+        shift_subtitle_file(str(src), str(dst), offset=10, duration=10)
+
+        content = dst.read_text(encoding="utf-8")
+        assert "[V4+ Styles]" in content
+        dialogues = [l for l in content.splitlines() if l.startswith("Dialogue:")]
+        assert dialogues == [
+            "Dialogue: 0,0:00:00.00,0:00:00.50,Default,,0,0,0,,straddle",
+            "Dialogue: 0,0:00:02.00,0:00:03.25,Default,,0,0,0,,inside",
+        ]
+
+    def test_shift_srt(self, tmp_path: Path):
+        src = tmp_path / "in.srt"
+        src.write_text(
+            "1\n00:00:01,000 --> 00:00:02,000\nbefore\n\n"
+            "2\n00:01:05,500 --> 00:01:07,000\ninside\nsecond line\n\n"
+            "3\n00:03:00,000 --> 00:03:01,000\nafter\n",
+            encoding="utf-8",
+        )
+        dst = tmp_path / "out.srt"
+        shift_subtitle_file(str(src), str(dst), offset=60, duration=60)
+
+        assert dst.read_text(encoding="utf-8") == (
+            "2\n00:00:05,500 --> 00:00:07,000\ninside\nsecond line\n"
+        )
+
+
+def test_select_default_audio_stream():
+    assert select_default_audio_stream([]) is None
+    streams = [
+        AudioStreamInfo(index=1, codec="aac", channels=2),
+        AudioStreamInfo(index=2, codec="ac3", channels=6),
+        AudioStreamInfo(index=3, codec="aac", channels=6),
+    ]
+    assert select_default_audio_stream(streams) == 2
+    streams[0].is_default = True
+    assert select_default_audio_stream(streams) == 1
+
+
+def test_segments_keep_filter_options_and_audio_stream(tmp_path: Path, monkeypatch):
+    subtitle = tmp_path / "sub.ass"
+    _write_ass(subtitle, [("0:00:01.00", "0:00:02.00", "line")])
+    commands = []
+    monkeypatch.setattr(parallel_burn, "probe_keyframes", lambda *_: None)
+    monkeypatch.setattr(
+        parallel_burn, "_run_ffmpeg", lambda cmd, **_: commands.append(cmd)
+    )
+
+    vf = f"ass='{escape_filter_path(str(subtitle))}':fontsdir='/fonts',scale=640:-2"
+    burn_subtitles_parallel(
+        "input.mp4",
+        str(subtitle),
+        str(tmp_path / "output.mp4"),
+        duration=120,
+        segment_count=2,
+        vf=vf,
+        audio_stream=3,
+    )
+
+    *segment_cmds, concat_cmd = commands
+    assert len(segment_cmds) == 2
+    for cmd in segment_cmds:
+        segment_vf = cmd[cmd.index("-vf") + 1]
+        assert segment_vf.startswith("ass='")
+        assert segment_vf.endswith("':fontsdir='/fonts',scale=640:-2")
+        assert escape_filter_path(str(subtitle)) not in segment_vf
+    assert concat_cmd[concat_cmd.index("1:3") - 1] == "-map"
+
+
+@requires_ffmpeg
+def test_parallel_burn_produces_full_video(tmp_path: Path):
+    video = tmp_path / "input.mp4"
+    _make_video(video, duration=6)
+    subtitle = tmp_path / "sub.ass"
+    _write_ass(
+        subtitle,
+        [
+            ("0:00:00.50", "0:00:02.50", "first"),
+            ("0:00:03.00", "0:00:05.50", "second"),
+        ],
+    )
+    output = tmp_path / "output.mp4"
+    progress = []
+
+    burn_subtitles_parallel(
+        str(video),
+        str(subtitle),
+        str(output),
+        duration=6,
+        segment_count=3,
+        preset="ultrafast",
+        progress_callback=lambda value, msg: progress.append(int(value)),
+    )
+
+    info = get_video_info(str(output))
+    assert info is not None
+    assert info.duration_seconds == pytest.approx(6, abs=0.2)
+    assert info.audio_codec == "aac"
+    assert progress[-1] == 100
+    assert progress == sorted(progress)
+
+
+@pytest.mark.slow
+@requires_ffmpeg
+def test_benchmark_parallel_burn(tmp_path: Path):
+    duration = 60
+    video = tmp_path / "input.mp4"
+    _make_video(video, duration=duration, size="1280x720")
+    subtitle = tmp_path / "sub.ass"
+    _write_ass(
+        subtitle,
+        [
+            (f"0:00:{i:02d}.00", f"0:00:{i:02d}.90", f"line {i}")
+            for i in range(duration)
+        ],
+    )
+
+    def measure(parallel: bool, name: str) -> float:
+        start = time.perf_counter()
+        add_subtitles(
+            str(video),
+            str(subtitle),
+            str(tmp_path / name),
+            preset="veryfast",
+            parallel=parallel,
+            segments=4 if parallel else None,
+        )
+        return time.perf_counter() - start
+
+    single = measure(False, "single.mp4")
+    parallel = measure(True, "parallel.mp4")
+    logger.info(
+        "burn-in %ds 720p: single %.2fs, parallel %.2fs, speedup %.2fx",
+        duration,
+        single,
+        parallel,
+        single / parallel,
+    )
+
+    info = get_video_info(str(tmp_path / "parallel.mp4"))
+    assert info is not None
+    assert info.duration_seconds == pytest.approx(duration, abs=0.5)
@@ -0,0 +1,78 @@
+"""子进程监督器测试"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from app.core.utils.subprocess_helper import (
+    ProcessSupervisor,
+    ProgressThrottle,
+)
+
+
+def _python(code: str):
+    return [sys.executable, "-c", code]
+
+
+def test_lines_from_both_streams_and_carriage_returns():
+    lines = []
+    handle = ProcessSupervisor().run(
+        _python(
+            "import sys\n"
+            "sys.stdout.write('a\\nb\\r\\n')\n"
+            "sys.stderr.write('10%\\r20%\\r30%\\n')\n"
+            "sys.stdout.write('tail-without-newline')\n"
+        ),
+        lambda stream, line: lines.append((stream, line)),
+    )
+    assert handle.returncode == 0
+    assert [line for stream, line in lines if stream == "stdout"] == [
+        "a",
+        "b",
+        "tail-without-newline",
+    ]
+    assert [line for stream, line in lines if stream == "stderr"] == [
+        "10%",
+        "20%",
+        "30%",
+    ]
+
+
+def test_many_processes_share_one_thread():
+    supervisor = ProcessSupervisor()
+    threads = set()
+    handles = [
+        supervisor.start(
+            _python(f"print({i}); raise SystemExit({i})"),
+            lambda _s, _l: threads.add(threading.current_thread().name),
+        )
+        for i in range(4)
+    ]
+    assert [h.wait(timeout=30) for h in handles] == [0, 1, 2, 3]
+    assert threads == {"process-supervisor"}
+    assert handles[3].tail[-1] == "3"
+
+
+def test_cancel_terminates_process():
+    handle = ProcessSupervisor().start(_python("import time; time.sleep(30)"))
+    started = time.monotonic()
+    handle.cancel(grace=1)
+    assert handle.wait(timeout=10) != 0
+    assert handle.cancelled
+    assert time.monotonic() - started < 10
+
+
+def test_missing_executable_raises():
+    with pytest.raises(OSError):
+        ProcessSupervisor().start(["definitely-not-a-real-program-xyz"])
+
+
+def test_progress_throttle():
+    throttle = ProgressThrottle(interval=60)
+    assert throttle.ready(1)
+    assert not throttle.ready(1)
+    assert not throttle.ready(50)
+    assert throttle.ready(100)
+    assert not throttle.ready(100)
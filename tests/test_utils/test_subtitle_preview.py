@@ -0,0 +1,77 @@
+"""字幕样式预览缓存与后台渲染测试"""
+
+import threading
+
+import pytest
+
+from app.core.utils import subtitle_preview
+from app.core.utils.media_capabilities import FFmpegCapabilities
+from app.core.utils.subtitle_preview import (
+    PreviewRenderer,
+    PreviewRequest,
+    cached_preview,
+    render_preview,
+)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """记录渲染的文本，并写出输出图片代替真正调用 ffmpeg"""
+    rendered = []
+    gate = threading.Event()
+    gate.set()
+
+    def run(cmd):
+        gate.wait(5)
+        ass_path = cmd[cmd.index("-vf") + 1].split("=", 1)[1]
+        rendered.append(open(ass_path, encoding="utf-8").read().rsplit(",", 1)[1])
+        with open(cmd[-1], "wb") as f:
+            f.write(b"png")
+
+    monkeypatch.setattr(subtitle_preview, "PREVIEW_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(subtitle_preview, "run_subprocess", run)
+    monkeypatch.setattr(
+        subtitle_preview, "get_ffmpeg_capabilities", FFmpegCapabilities
+    )
+    background = tmp_path / "bg.png"
+    background.write_bytes(b"bg")
+    return rendered, gate, str(background)
+
+
+def _request(text: str, bg_path: str) -> PreviewRequest:
+    return PreviewRequest("[V4+ Styles]", (text, None), bg_path, 640, 360)
+
+
+def test_same_request_rendered_once(fake_ffmpeg):
+    rendered, _, bg_path = fake_ffmpeg
+
+    assert cached_preview(_request("a", bg_path)) is None
+    first = render_preview(_request("a", bg_path))
+    assert render_preview(_request("a", bg_path)) == first
+    assert cached_preview(_request("a", bg_path)) == first
+    render_preview(_request("b", bg_path))
+
+    assert [text.strip() for text in rendered] == ["a", "b"]
+
+
+def test_renderer_drops_stale_requests(fake_ffmpeg):
+    rendered, gate, bg_path = fake_ffmpeg
+    delivered = []
+    done = threading.Event()
+
+    def callback(path):
+        delivered.append(path)
+        done.set()
+
+    renderer = PreviewRenderer()
+    gate.clear()
+    renderer.submit(_request("first", bg_path), callback)
+    renderer.submit(_request("second", bg_path), callback)
+    renderer.submit(_request("third", bg_path), callback)
+    gate.set()
+    assert done.wait(5)
+    renderer.shutdown()
+
+    # 已开始的 first 照常完成（写入缓存），second 未开始即被跳过
+    assert "second" not in "".join(rendered)
+    assert delivered == [cached_preview(_request("third", bg_path))]
@@ -0,0 +1,186 @@
+"""媒体信息探测与缓存测试"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+from diskcache import Cache
+
+from app.core.entities import AudioStreamInfo, VideoInfo
+from app.core.utils import video_utils
+from app.core.utils.video_utils import (
+    _video_info_from_ffprobe,
+    get_thumbnail_path,
+    get_video_info,
+)
+
+FFPROBE_JSON = {
+    "streams": [
+        {
+            "index": 0,
+            "codec_name": "mjpeg",
+            "codec_type": "video",
+            "width": 600,
+            "height": 600,
+            "disposition": {"attached_pic": 1},
+        },
+        {
+            "index": 1,
+            "codec_name": "h264",
+            "codec_type": "video",
+            "width": 1920,
+            "height": 1080,
+            "avg_frame_rate": "30000/1001",
+            "r_frame_rate": "30000/1001",
+            "disposition": {"attached_pic": 0},
+        },
+        {
+            "index": 2,
+            "codec_name": "aac",
+            "codec_type": "audio",
+            "sample_rate": "48000",
+            "tags": {"language": "eng", "title": "Main"},
+        },
+        {
+            "index": 3,
+            "codec_name": "opus",
+            "codec_type": "audio",
+            "sample_rate": "48000",
+            "tags": {"language": "jpn"},
+        },
+    ],
+    "format": {"duration": "125.400000", "bit_rate": "5120000"},
+}
+
+
+def test_video_info_from_ffprobe():
+    info = _video_info_from_ffprobe("/videos/movie.mkv", FFPROBE_JSON)
+    assert info is not None
+    assert info.file_name == "movie"
+    assert (info.width, info.height, info.video_codec) == (1920, 1080, "h264")
+    assert info.fps == pytest.approx(29.97)
+    assert info.duration_seconds == pytest.approx(125.4)
+    assert info.bitrate_kbps == 5120
+    assert (info.audio_codec, info.audio_sampling_rate) == ("aac", 48000)
+    assert info.audio_streams == [
+        AudioStreamInfo(index=2, codec="aac", language="eng", title="Main"),
+        AudioStreamInfo(index=3, codec="opus", language="jpn"),
+    ]
+
+
+def test_audio_only_with_cover_art():
+    data = {
+        "streams": [FFPROBE_JSON["streams"][0], FFPROBE_JSON["streams"][2]],
+        "format": {"duration": "3.5"},
+    }
+    info = _video_info_from_ffprobe("song.mp3", data)
+    assert info is not None
+    assert info.video_codec == "" and info.width == 0
+
+
+def test_no_streams_returns_none():
+    assert _video_info_from_ffprobe("x.bin", {"streams": [], "format": {}}) is None
+
+
+@pytest.fixture
+def fake_probe(tmp_path: Path, monkeypatch):
+    """替换真实探测，记录调用次数"""
+    cache = Cache(str(tmp_path / "cache"))
+    monkeypatch.setattr(video_utils, "get_media_cache", lambda: cache)
+    monkeypatch.setattr(video_utils, "_video_info_memory", OrderedDict())
+
+    stats = {"calls": 0}
+
+    def probe(path):
+        stats["calls"] += 1
+        return VideoInfo(
+            file_name=Path(path).stem,
+            file_path=path,
+            width=0,
+            height=0,
+            fps=0.0,
+            duration_seconds=1.0,
+            bitrate_kbps=0,
+            video_codec="",
+            audio_codec="aac",
+            audio_sampling_rate=16000,
+            thumbnail_path="",
+            audio_streams=[AudioStreamInfo(index=0, codec="aac")],
+        )
+
+    monkeypatch.setattr(video_utils, "_probe_with_ffprobe", probe)
+    yield stats
+    cache.close()
+
+
+def _make_files(tmp_path: Path, count: int):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"file_{i}.m4a"
+        path.write_bytes(b"x")
+        paths.append(str(path))
+    return paths
+
+
+def test_cache_hit_skips_probe(tmp_path, fake_probe, monkeypatch):
+    monkeypatch.setattr(video_utils, "is_cache_enabled", lambda: True)
+    path = _make_files(tmp_path, 1)[0]
+    first = get_video_info(path)
+    assert fake_probe["calls"] == 1
+
+    # 清空内存缓存，模拟重启后从磁盘缓存读取
+    monkeypatch.setattr(video_utils, "_video_info_memory", OrderedDict())
+    second = get_video_info(path)
+    assert fake_probe["calls"] == 1
+    assert second == first
+    assert second.audio_streams[0] == AudioStreamInfo(index=0, codec="aac")
+
+
+def test_modified_file_is_reprobed(tmp_path, fake_probe):
+    path = _make_files(tmp_path, 1)[0]
+    get_video_info(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    get_video_info(path)
+    assert fake_probe["calls"] == 2
+
+
+def test_memory_cache_is_bounded(tmp_path, fake_probe, monkeypatch):
+    # 关闭磁盘缓存，被淘汰的条目只能重新探测
+    monkeypatch.setattr(video_utils, "is_cache_enabled", lambda: False)
+    monkeypatch.setattr(video_utils, "VIDEO_INFO_CACHE_SIZE", 2)
+    first, second, third = _make_files(tmp_path, 3)
+    get_video_info(first)
+    get_video_info(second)
+    get_video_info(first)  # first 变为最近使用
+    get_video_info(third)
+    assert fake_probe["calls"] == 3
+
+    get_video_info(first)
+    assert fake_probe["calls"] == 3
+    get_video_info(second)
+    assert fake_probe["calls"] == 4
+
+
+def test_thumbnail_path_depends_on_file_identity(tmp_path):
+    first = tmp_path / "a" / "clip.mp4"
+    second = tmp_path / "b" / "clip.mp4"
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_bytes(b"video")
+    thumbs = str(tmp_path / "thumbs")
+
+    first_thumb = get_thumbnail_path(str(first), thumbs)
+    assert first_thumb != get_thumbnail_path(str(second), thumbs)
+
+    # 已存在且按当前指纹命名的缩略图才复用
+    Path(first_thumb).parent.mkdir()
+    Path(first_thumb).write_bytes(b"jpg")
+    assert video_utils._thumbnail_is_fresh(str(first), first_thumb)
+    assert not video_utils._thumbnail_is_fresh(str(second), first_thumb)
+
+    stat = os.stat(first)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_thumbnail_path(str(first), thumbs) != first_thumb
+    assert not video_utils._thumbnail_is_fresh(str(first), first_thumb)